@@ -27,6 +27,7 @@ import grid as gri               # NRPy+: Functions having to do with numerical
 import indexedexp as ixp         # NRPy+: Symbolic indexed expression (e.g., tensors, vectors, etc.) support
 import reference_metric as rfm   # NRPy+: Reference metric support
 from pickling import pickle_NRPy_env   # NRPy+: Pickle/unpickle NRPy+ environment, for parallel codegen
+import autotune                  # NRPy+: Per-kernel codegen options tuned against compiled runtime
 import os, time, sys             # Standard Python modules for multiplatform OS-level functions, benchmarking
 import sympy as sp               # SymPy: The Python computer algebra package upon which NRPy+ depends
 import BSSN.BSSN_RHSs as rhs
@@ -36,6 +37,7 @@ import BSSN.Psi4 as psi4
 import BSSN.Psi4_tetrads as psi4tet
 import SpinWeight_minus2_SphHarmonics.SpinWeight_minus2_SphHarmonics as SWm2SH
 import loop as lp
+import MoLtimestepping.MoL as MoL  # NRPy+: Method of Lines timestepping (fused RK update)
 
 ###############################################
 # Helper Python functions for C code generation
@@ -59,7 +61,9 @@ def print_msg_with_timing(desc, msg="Symbolic", startstop="start", starttime=0.0
 
 
 # get_loopopts() sets up options for NRPy+'s loop module
-def get_loopopts(points_to_update, enable_SIMD, enable_rfm_precompute, OMP_pragma_on, enable_xxs=True):
+# tile_size=[T0,T1,T2]: block the loop into tiles of T0 x T1 x T2 points (T=0: no blocking
+#   in that direction), parallelized with OpenMP over tiles; OMP_pragma_on is then ignored.
+def get_loopopts(points_to_update, enable_SIMD, enable_rfm_precompute, OMP_pragma_on, enable_xxs=True, tile_size=None):
     loopopts = points_to_update + ",includebraces=False"
     if enable_SIMD:
         loopopts += ",enable_SIMD"
@@ -69,7 +73,9 @@ def get_loopopts(points_to_update, enable_SIMD, enable_rfm_precompute, OMP_pragm
         pass
     else:
         loopopts += ",Read_xxs"
-    if OMP_pragma_on != "i2":
+    if tile_size is not None and any(int(tile) != 0 for tile in tile_size):
+        loopopts += ",tile_size=[" + ",".join(str(int(tile)) for tile in tile_size) + "]"
+    elif OMP_pragma_on != "i2":
         loopopts += ",pragma_on_"+OMP_pragma_on
     return loopopts
 
@@ -276,16 +282,98 @@ def BSSN_RHSs__generate_symbolic_expressions(LapseCondition="OnePlusLog",
     return [betaU, BSSN_RHSs_SymbExpressions]
 
 
+# SymbExpressions_opcounts() returns, for each lhrh in SymbExpressions, the
+#   operations needed to evaluate its rhs after CSE: a dict mapping each distinct
+#   subexpression to its own operation count (an n-term Add or Mul counts n-1, any
+#   other function or power counts 1), and a dict mapping each finite-difference
+#   derivative it reads to the number of multiply-adds in its stencil.
+#   Summing over the union of these dicts for a group of expressions estimates
+#   the group's cost, with subexpressions and derivatives shared within the
+#   group counted once, as the CSE in FD_outputC() would.
+def SymbExpressions_opcounts(SymbExpressions, upwindcontrolvec=""):
+    import finite_difference_helpers as fdhelp
+    FDparams = fdhelp.FDparams(PRECISION="", FD_CD_order=-1, enable_FD_functions=False, enable_SIMD=False, DIM=3,
+                               MemAllocStyle="", upwindcontrolvec=upwindcontrolvec, fullindent="", outCparams="")
+    stencil_opcount_dict = {}
+    opcounts = []
+    for lhsrhs in SymbExpressions:
+        subexpr_opcounts = {}
+        for subexpr in sp.preorder_traversal(lhsrhs.rhs):
+            if subexpr.is_Atom or subexpr in subexpr_opcounts:
+                continue
+            subexpr_opcounts[subexpr] = len(subexpr.args) - 1 if (subexpr.is_Add or subexpr.is_Mul) else 1
+        deriv_opcounts = {}
+        deriv_vars = fdhelp.generate_list_of_deriv_vars_from_lhrh_sympyexpr_list([lhsrhs], FDparams)
+        _base_gfs, deriv_ops = fdhelp.extract_from_list_of_deriv_vars__base_gfs_and_deriv_ops_lists(deriv_vars)
+        for deriv_var, deriv_op in zip(deriv_vars, deriv_ops):
+            if deriv_op not in stencil_opcount_dict:
+                stencil_opcount_dict[deriv_op] = len(fin.compute_fdcoeffs_fdstencl(deriv_op)[0])
+            deriv_opcounts[str(deriv_var)] = stencil_opcount_dict[deriv_op]
+        opcounts.append((subexpr_opcounts, deriv_opcounts))
+    return opcounts
+
+
+# balanced_shards_of_SymbExpressions() splits SymbExpressions (a list of lhrh's) into
+#   num_shards groups of roughly equal CSE-aware operation count (see
+#   SymbExpressions_opcounts()). Expressions are assigned greedily, most expensive
+#   first, each to the group whose total cost would be smallest after adding it,
+#   so that expressions sharing many subexpressions tend to land in the same group.
+#   Returns the groups (each in the original order of SymbExpressions) and their costs.
+def balanced_shards_of_SymbExpressions(SymbExpressions, num_shards, upwindcontrolvec=""):
+    opcounts = SymbExpressions_opcounts(SymbExpressions, upwindcontrolvec=upwindcontrolvec)
+
+    def cost(opcount):
+        return sum(opcount[0].values()) + sum(opcount[1].values())
+
+    def added_cost(shard_opcount, opcount):
+        return (sum(val for key, val in opcount[0].items() if key not in shard_opcount[0]) +
+                sum(val for key, val in opcount[1].items() if key not in shard_opcount[1]))
+
+    shard_exprs_idxs = [[] for _ in range(num_shards)]
+    shard_opcounts = [({}, {}) for _ in range(num_shards)]
+    shard_costs = [0] * num_shards
+    for idx in sorted(range(len(SymbExpressions)), key=lambda i: -cost(opcounts[i])):
+        which = min(range(num_shards),
+                    key=lambda k: (shard_costs[k] + added_cost(shard_opcounts[k], opcounts[idx]), k))
+        shard_costs[which] += added_cost(shard_opcounts[which], opcounts[idx])
+        shard_opcounts[which][0].update(opcounts[idx][0])
+        shard_opcounts[which][1].update(opcounts[idx][1])
+        shard_exprs_idxs[which].append(idx)
+    shards = [[SymbExpressions[idx] for idx in sorted(idxs)] for idxs in shard_exprs_idxs if len(idxs) > 0]
+    costs = [shard_costs[k] for k in range(num_shards) if len(shard_exprs_idxs[k]) > 0]
+    return shards, costs
+
+
 # Register C code rhs_eval() for BSSN RHS expressions
+# num_shards > 1: Split the BSSN RHS expressions into num_shards groups of roughly
+#   equal CSE-aware operation count (see balanced_shards_of_SymbExpressions()). Each
+#   group gets its own C function rhs_eval__shardN() (and so its own .c file and
+#   loop over the grid), and rhs_eval() calls them in turn. The C compiler can then
+#   process the shards in parallel (e.g., make -j).
+# enable_fused_RK_update=True: Instead of rhs_gfs, take a MoL_fused_RK_update_struct *RK_update
+#   and write the RK update (e.g., y_n + a*dt*rhs, and the running total) directly from the
+#   stencil loop, to be used with MoL's enable_fused_RK_update=True; see MoL.fused_RK_update_Ccode().
 def add_rhs_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.join("."),
                                    enable_rfm_precompute=True, enable_golden_kernels=False,
                                    enable_SIMD=True, enable_split_for_optimizations_doesnt_help=False,
                                    LapseCondition="OnePlusLog", ShiftCondition="GammaDriving2ndOrder_Covariant",
                                    enable_KreissOliger_dissipation=False, enable_stress_energy_source_terms=False,
                                    leave_Ricci_symbolic=True, OMP_pragma_on="i2",
-                                   func_name_suffix=""):
+                                   func_name_suffix="", num_shards=1, tile_size=None,
+                                   enable_fused_RK_update=False):
     if includes is None:
         includes = []
+    if enable_fused_RK_update and par.parval_from_str("grid::GridFuncMemAccess") == "ETK":
+        print("Error: enable_fused_RK_update=True is not supported with ETK output.")
+        sys.exit(1)
+    if num_shards > 1 and (enable_split_for_optimizations_doesnt_help or
+                           par.parval_from_str("grid::GridFuncMemAccess") == "ETK"):
+        print("Error: num_shards > 1 is not supported with enable_split_for_optimizations_doesnt_help=True or ETK output.")
+        sys.exit(1)
+    # Codegen options tuned for this kernel & CPU (see autotune.py) take precedence
+    func_name = "rhs_eval" + func_name_suffix
+    enable_SIMD, OMP_pragma_on, tile_size, tuned_outCparams = \
+        autotune.apply_tuned_options(func_name, enable_SIMD, OMP_pragma_on, tile_size)
     if enable_SIMD:
         includes += [os.path.join("SIMD", "SIMD_intrinsics.h")]
     enable_FD_functions = bool(par.parval_from_str("finite_difference::enable_FD_functions"))
@@ -294,7 +382,6 @@ def add_rhs_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.jo
 
     # Set up the C function for the BSSN RHSs
     desc = "Evaluate the BSSN RHSs"
-    func_name = "rhs_eval" + func_name_suffix
     params = "const paramstruct *restrict params, "
     if enable_rfm_precompute:
         params += "const rfm_struct *restrict rfmstruct, "
@@ -302,6 +389,14 @@ def add_rhs_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.jo
         params += "REAL *restrict xx[3], "
     params += """
               const REAL *restrict auxevol_gfs,const REAL *restrict in_gfs,REAL *restrict rhs_gfs"""
+    rhs_gfs_or_RK_update = "rhs_gfs"
+    if enable_fused_RK_update:
+        params = params.replace("REAL *restrict rhs_gfs", "const MoL_fused_RK_update_struct *restrict RK_update")
+        rhs_gfs_or_RK_update = "RK_update"
+
+    # The RHSs are written to rhs_gfs, or with enable_fused_RK_update=True, as the RK update
+    def RHSs_Ccode(Ccode):
+        return MoL.fused_RK_update_Ccode(Ccode) if enable_fused_RK_update else Ccode
 
     betaU, BSSN_RHSs_SymbExpressions = \
         BSSN_RHSs__generate_symbolic_expressions(LapseCondition=LapseCondition, ShiftCondition=ShiftCondition,
@@ -318,9 +413,10 @@ def add_rhs_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.jo
         enableCparameters=False
 
     FD_outCparams = "outCverbose=False,enable_SIMD=" + str(enable_SIMD)
-    FD_outCparams += ",GoldenKernelsEnable=" + str(enable_golden_kernels)
+    FD_outCparams += ",GoldenKernelsEnable=" + str(enable_golden_kernels) + tuned_outCparams
 
-    loopopts = get_loopopts("InteriorPoints", enable_SIMD, enable_rfm_precompute, OMP_pragma_on)
+    loopopts = get_loopopts("InteriorPoints", enable_SIMD, enable_rfm_precompute, OMP_pragma_on,
+                            tile_size=tile_size)
     FDorder = par.parval_from_str("finite_difference::FD_CENTDERIVS_ORDER")
     starttime = print_msg_with_timing("BSSN_RHSs (FD order="+str(FDorder)+")", msg="Ccodegen", startstop="start")
     if enable_split_for_optimizations_doesnt_help and FDorder == 6:
@@ -335,20 +431,47 @@ def add_rhs_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.jo
         preloop += """#pragma omp parallel
     {
 """
-        preloopbody = fin.FD_outputC("returnstring", BSSN_RHSs_SymbExpressions_pt1,
-                                     params=FD_outCparams,
-                                     upwindcontrolvec=betaU)
+        preloopbody = RHSs_Ccode(fin.FD_outputC("returnstring", BSSN_RHSs_SymbExpressions_pt1,
+                                                params=FD_outCparams,
+                                                upwindcontrolvec=betaU))
         preloop += "\n#pragma omp for\n" + lp.simple_loop(loopopts, preloopbody)
         preloop += "\n#pragma omp for\n"
-        body = fin.FD_outputC("returnstring", BSSN_RHSs_SymbExpressions_pt2,
-                              params=FD_outCparams,
-                              upwindcontrolvec=betaU)
+        body = RHSs_Ccode(fin.FD_outputC("returnstring", BSSN_RHSs_SymbExpressions_pt2,
+                                         params=FD_outCparams,
+                                         upwindcontrolvec=betaU))
         postloop = "\n    } // END #pragma omp parallel\n"
+    elif num_shards > 1:
+        shards, shard_costs = balanced_shards_of_SymbExpressions(BSSN_RHSs_SymbExpressions, num_shards,
+                                                                 upwindcontrolvec=betaU)
+        shard_args = "params, " + ("rfmstruct, " if enable_rfm_precompute else "xx, ") + "auxevol_gfs, in_gfs, " + rhs_gfs_or_RK_update
+        dispatcher_body = ""
+        for which, shard in enumerate(shards):
+            shard_name = func_name + "__shard" + str(which)
+            shard_body = RHSs_Ccode(fin.FD_outputC("returnstring", shard,
+                                                   params=FD_outCparams,
+                                                   upwindcontrolvec=betaU))
+            add_to_Cfunction_dict(
+                includes=includes,
+                desc=desc + ", shard " + str(which) + " of " + str(len(shards)) + " (" + str(len(shard)) +
+                     " RHSs; CSE-aware op count ~" + str(shard_costs[which]) + ")",
+                name=shard_name, params=params,
+                preloop=preloop, body=shard_body, loopopts=loopopts,
+                rel_path_to_Cparams=rel_path_to_Cparams, enableCparameters=enableCparameters)
+            dispatcher_body += "  " + shard_name + "(" + shard_args + ");\n"
+        print_msg_with_timing("BSSN_RHSs (FD order="+str(FDorder)+", "+str(len(shards))+" shards)", msg="Ccodegen",
+                              startstop="stop", starttime=starttime)
+        add_to_Cfunction_dict(
+            includes=includes + (["NRPy_function_prototypes.h"] if "NRPy_function_prototypes.h" not in includes else []),
+            desc=desc + ", by calling each of its " + str(len(shards)) + " shards",
+            name=func_name, params=params,
+            body=dispatcher_body,
+            rel_path_to_Cparams=rel_path_to_Cparams, enableCparameters=False)
+        return pickle_NRPy_env()
     else:
         preloop += ""
-        body = fin.FD_outputC("returnstring", BSSN_RHSs_SymbExpressions,
-                              params=FD_outCparams,
-                              upwindcontrolvec=betaU)
+        body = RHSs_Ccode(fin.FD_outputC("returnstring", BSSN_RHSs_SymbExpressions,
+                                         params=FD_outCparams,
+                                         upwindcontrolvec=betaU))
         postloop = ""
     print_msg_with_timing("BSSN_RHSs (FD order="+str(FDorder)+")", msg="Ccodegen", startstop="stop", starttime=starttime)
 
@@ -399,9 +522,13 @@ def Ricci__generate_symbolic_expressions():
 def add_Ricci_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.join("."),
                                      enable_rfm_precompute=True, enable_golden_kernels=False, enable_SIMD=True,
                                      enable_split_for_optimizations_doesnt_help=False, OMP_pragma_on="i2",
-                                     func_name_suffix=""):
+                                     func_name_suffix="", tile_size=None):
     if includes is None:
         includes = []
+    # Codegen options tuned for this kernel & CPU (see autotune.py) take precedence
+    func_name = "Ricci_eval" + func_name_suffix
+    enable_SIMD, OMP_pragma_on, tile_size, tuned_outCparams = \
+        autotune.apply_tuned_options(func_name, enable_SIMD, OMP_pragma_on, tile_size)
     if enable_SIMD:
         includes += [os.path.join("SIMD", "SIMD_intrinsics.h")]
     enable_FD_functions = bool(par.parval_from_str("finite_difference::enable_FD_functions"))
@@ -410,7 +537,6 @@ def add_Ricci_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.
 
     # Set up the C function for the 3-Ricci tensor
     desc = "Evaluate the 3-Ricci tensor"
-    func_name = "Ricci_eval" + func_name_suffix
     params = "const paramstruct *restrict params, "
     if enable_rfm_precompute:
         params += "const rfm_struct *restrict rfmstruct, "
@@ -421,8 +547,9 @@ def add_Ricci_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.
     # Construct body:
     Ricci_SymbExpressions = Ricci__generate_symbolic_expressions()
     FD_outCparams = "outCverbose=False,enable_SIMD=" + str(enable_SIMD)
-    FD_outCparams += ",GoldenKernelsEnable=" + str(enable_golden_kernels)
-    loopopts = get_loopopts("InteriorPoints", enable_SIMD, enable_rfm_precompute, OMP_pragma_on)
+    FD_outCparams += ",GoldenKernelsEnable=" + str(enable_golden_kernels) + tuned_outCparams
+    loopopts = get_loopopts("InteriorPoints", enable_SIMD, enable_rfm_precompute, OMP_pragma_on,
+                            tile_size=tile_size)
 
     FDorder = par.parval_from_str("finite_difference::FD_CENTDERIVS_ORDER")
     starttime = print_msg_with_timing("3-Ricci tensor (FD order="+str(FDorder)+")", msg="Ccodegen", startstop="start")
@@ -470,6 +597,70 @@ def add_Ricci_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.
     return pickle_NRPy_env()
 
 
+# Register C function Ricci_and_rhs_eval(), which evaluates the BSSN RHSs, together
+#   with the 3-Ricci tensor they depend on, in one of two ways:
+# fuse_Ricci=False ("split"): call Ricci_eval(), which writes the six RbarDD AUXEVOL
+#   gridfunctions, then rhs_eval() (with leave_Ricci_symbolic=True), which reads them back.
+# fuse_Ricci=True ("fused"): call rhs_eval() with leave_Ricci_symbolic=False, which
+#   evaluates the 3-Ricci tensor inline at each point, from the same metric derivatives
+#   it already reads. RbarDD is then neither registered nor stored, saving the
+#   write & read of six 3D arrays per call, at the cost of more work per point.
+#   Any BSSN_constraints() must then also be registered with leave_Ricci_symbolic=False.
+# The choice may be made by the autotuner (knob fuse_Ricci; see
+#   benchmarks/bench_fused_Ricci_rhs_eval.py), whose profile takes precedence.
+# enable_fused_RK_update=True: as in add_rhs_eval_to_Cfunction_dict(), rhs_gfs is replaced by RK_update.
+def add_Ricci_and_rhs_eval_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.join("."),
+                                             enable_rfm_precompute=True, enable_golden_kernels=False,
+                                             enable_SIMD=True, LapseCondition="OnePlusLog",
+                                             ShiftCondition="GammaDriving2ndOrder_Covariant",
+                                             enable_KreissOliger_dissipation=False,
+                                             enable_stress_energy_source_terms=False,
+                                             OMP_pragma_on="i2", func_name_suffix="", tile_size=None,
+                                             fuse_Ricci=False, enable_fused_RK_update=False):
+    if includes is None:
+        includes = []
+    func_name = "Ricci_and_rhs_eval" + func_name_suffix
+    fuse_Ricci = bool(autotune.tuned_options(func_name).get("fuse_Ricci", fuse_Ricci))
+
+    if not fuse_Ricci:
+        add_Ricci_eval_to_Cfunction_dict(includes=list(includes), rel_path_to_Cparams=rel_path_to_Cparams,
+                                         enable_rfm_precompute=enable_rfm_precompute,
+                                         enable_golden_kernels=enable_golden_kernels, enable_SIMD=enable_SIMD,
+                                         OMP_pragma_on=OMP_pragma_on, func_name_suffix=func_name_suffix,
+                                         tile_size=tile_size)
+    add_rhs_eval_to_Cfunction_dict(includes=list(includes), rel_path_to_Cparams=rel_path_to_Cparams,
+                                   enable_rfm_precompute=enable_rfm_precompute,
+                                   enable_golden_kernels=enable_golden_kernels, enable_SIMD=enable_SIMD,
+                                   LapseCondition=LapseCondition, ShiftCondition=ShiftCondition,
+                                   enable_KreissOliger_dissipation=enable_KreissOliger_dissipation,
+                                   enable_stress_energy_source_terms=enable_stress_energy_source_terms,
+                                   leave_Ricci_symbolic=not fuse_Ricci, OMP_pragma_on=OMP_pragma_on,
+                                   func_name_suffix=func_name_suffix, tile_size=tile_size,
+                                   enable_fused_RK_update=enable_fused_RK_update)
+
+    rhs_gfs_or_RK_update = "RK_update" if enable_fused_RK_update else "rhs_gfs"
+    rfmstruct_or_xx = "rfmstruct" if enable_rfm_precompute else "xx"
+    params = "const paramstruct *restrict params, "
+    if enable_rfm_precompute:
+        params += "const rfm_struct *restrict rfmstruct, "
+    else:
+        params += "REAL *restrict xx[3], "
+    params += "REAL *restrict auxevol_gfs, const REAL *restrict in_gfs, "
+    params += "const MoL_fused_RK_update_struct *restrict RK_update" if enable_fused_RK_update else "REAL *restrict rhs_gfs"
+    body = ""
+    if not fuse_Ricci:
+        body += "  Ricci_eval" + func_name_suffix + "(params, " + rfmstruct_or_xx + ", in_gfs, auxevol_gfs);\n"
+    body += "  rhs_eval" + func_name_suffix + "(params, " + rfmstruct_or_xx + ", auxevol_gfs, in_gfs, " + rhs_gfs_or_RK_update + ");\n"
+    add_to_Cfunction_dict(
+        includes=includes + (["NRPy_function_prototypes.h"] if "NRPy_function_prototypes.h" not in includes else []),
+        desc="Evaluate the BSSN RHSs, " + ("with the 3-Ricci tensor evaluated inline (fused)" if fuse_Ricci else
+                                           "after evaluating the 3-Ricci tensor into RbarDD gridfunctions (split)"),
+        name=func_name, params=params,
+        body=body,
+        rel_path_to_Cparams=rel_path_to_Cparams, enableCparameters=False)
+    return pickle_NRPy_env()
+
+
 # Generate symbolic expressions for BSSN Hamiltonian & momentum constraints
 def BSSN_constraints__generate_symbolic_expressions(enable_stress_energy_source_terms=False, leave_Ricci_symbolic=True,
                                                     output_H_only=False):
@@ -508,9 +699,14 @@ def BSSN_constraints__generate_symbolic_expressions(enable_stress_energy_source_
 def add_BSSN_constraints_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.join("."),
                                            enable_rfm_precompute=True, enable_golden_kernels=False, enable_SIMD=True,
                                            enable_stress_energy_source_terms=False, leave_Ricci_symbolic=True,
-                                           output_H_only=False, OMP_pragma_on="i2", func_name_suffix=""):
+                                           output_H_only=False, OMP_pragma_on="i2", func_name_suffix="",
+                                           tile_size=None):
     if includes is None:
         includes = []
+    # Codegen options tuned for this kernel & CPU (see autotune.py) take precedence
+    func_name = "BSSN_constraints" + func_name_suffix
+    enable_SIMD, OMP_pragma_on, tile_size, tuned_outCparams = \
+        autotune.apply_tuned_options(func_name, enable_SIMD, OMP_pragma_on, tile_size)
     if enable_SIMD:
         includes += [os.path.join("SIMD", "SIMD_intrinsics.h")]
     enable_FD_functions = bool(par.parval_from_str("finite_difference::enable_FD_functions"))
@@ -519,7 +715,6 @@ def add_BSSN_constraints_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os
 
     # Set up the C function for the BSSN constraints
     desc = "Evaluate the BSSN constraints"
-    func_name = "BSSN_constraints" + func_name_suffix
     params = "const paramstruct *restrict params, "
     if enable_rfm_precompute:
         params += "const rfm_struct *restrict rfmstruct, "
@@ -542,7 +737,7 @@ def add_BSSN_constraints_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os
         enableCparameters=False
 
     FD_outCparams = "outCverbose=False,enable_SIMD=" + str(enable_SIMD)
-    FD_outCparams += ",GoldenKernelsEnable=" + str(enable_golden_kernels)
+    FD_outCparams += ",GoldenKernelsEnable=" + str(enable_golden_kernels) + tuned_outCparams
     FDorder = par.parval_from_str("finite_difference::FD_CENTDERIVS_ORDER")
     starttime = print_msg_with_timing("BSSN constraints (FD order="+str(FDorder)+")", msg="Ccodegen", startstop="start")
     body = fin.FD_outputC("returnstring", BSSN_constraints_SymbExpressions,
@@ -555,7 +750,8 @@ def add_BSSN_constraints_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os
         name=func_name, params=params,
         preloop=preloop,
         body=body,
-        loopopts=get_loopopts("InteriorPoints", enable_SIMD, enable_rfm_precompute, OMP_pragma_on),
+        loopopts=get_loopopts("InteriorPoints", enable_SIMD, enable_rfm_precompute, OMP_pragma_on,
+                              tile_size=tile_size),
         rel_path_to_Cparams=rel_path_to_Cparams, enableCparameters=enableCparameters)
     return pickle_NRPy_env()
 
@@ -752,11 +948,9 @@ def add_psi4_tetrad_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path
     return pickle_NRPy_env()
 
 
-def add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.join("."),
-                                                         maximum_l=8):
-    starttime = print_msg_with_timing("Spin-weight s=-2 Spherical Harmonics", msg="Ccodegen", startstop="start")
-
-    # Set up the C function for computing the spin-weight -2 spherical harmonic at theta,phi: Y_{s=-2, l,m}(theta,phi)
+# C function SpinWeight_minus2_SphHarmonics(l,m, th,ph, &reY,&imY): a switch over all
+#   l=0..maximum_l, m=-l..l, with the C code for each Y_{s=-2, l,m}(th,ph) generated by outputC().
+def SpinWeight_minus2_SphHarmonics_switch_Ccode(maximum_l):
     prefunc = r"""// Compute at a single point (th,ph) the spin-weight -2 spherical harmonic Y_{s=-2, l,m}(th,ph)
 // Manual "inline void" of this function results in compilation error with clang.
 void SpinWeight_minus2_SphHarmonics(const int l, const int m, const REAL th, const REAL ph,
@@ -773,7 +967,7 @@ void SpinWeight_minus2_SphHarmonics(const int l, const int m, const REAL th, con
         for m in range(-l, l + 1):
             prefunc += "    case " + str(m) + ":\n"
             prefunc += "      {\n"
-            Y_m2_lm = SWm2SH.Y(-2, l, m, SWm2SH.th, SWm2SH.ph)
+            Y_m2_lm = SWm2SH.Y_cached(-2, l, m)
             prefunc += outputC([sp.re(Y_m2_lm), sp.im(Y_m2_lm)], ["*reYlmswm2_l_m", "*imYlmswm2_l_m"],
                             "returnstring", outCparams)
             prefunc += "      }\n"
@@ -786,12 +980,159 @@ void SpinWeight_minus2_SphHarmonics(const int l, const int m, const REAL th, con
   fprintf(stderr, "       You chose l=%d and m=%d, which is out of these bounds.\n",l,m);
   exit(1);
 }
+"""
+    return prefunc
+
+
+# enable_SWSH_table=True: Instead of evaluating Y_{s=-2, l,m}(th,ph) for every (l,m) at every
+#   angular point, every extraction radius, and every output step, tabulate
+#   Re/Im Y_{s=-2, l,m}(th_i1,ph_i2) (premultiplied by the integration weight
+#   sin(th)*dxx1*dxx2) once per angular grid, for all modes l=2..maximum_l.
+#   Each decomposition is then a dense matrix-vector product of this table with
+#   psi4(th_i1,ph_i2), in a single OpenMP-parallel pass over all modes.
+# psi4_output_format="text": At every call, open, append one line to, and close
+#   outpsi4_l%d_m%d-r%.2f.txt for every (l,m) mode and extraction radius.
+# psi4_output_format="binary": Keep one file, outpsi4_swm2_modes-r%.2f.bin, open per
+#   extraction radius. Each call adds one fixed-size record (time, followed by
+#   psi4_{l,m} as (re,im) pairs in double precision for all modes l=2..maximum_l,
+#   ordered by mode index l*l+l+m-4) to an in-memory buffer, which is written to
+#   file every psi4_output_flush_interval records, and at exit. The file begins
+#   with a 32-byte header; diagnostics_generic/read_psi4_swm2_modes.py reads it
+#   via np.memmap.
+# enable_SWSH_recurrence=True: Instead of a switch over all (l,m) with a block of
+#   C code per mode, compute Y_{s=-2, l,m}(theta,phi) at any l,m via a recurrence
+#   relation (see SpinWeight_minus2_SphHarmonics.SpinWeight_SphHarmonics_recurrence_Ccode()),
+#   so that generating and compiling the C code are cheap for any maximum_l.
+def add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(includes=None, rel_path_to_Cparams=os.path.join("."),
+                                                         maximum_l=8, enable_SWSH_table=False,
+                                                         psi4_output_format="text", psi4_output_flush_interval=64,
+                                                         enable_SWSH_recurrence=False):
+    starttime = print_msg_with_timing("Spin-weight s=-2 Spherical Harmonics", msg="Ccodegen", startstop="start")
+    if psi4_output_format not in ("text", "binary"):
+        print("Error: psi4_output_format = " + str(psi4_output_format) + " unsupported. Choose \"text\" or \"binary\".")
+        sys.exit(1)
 
+    # Set up the C function for computing the spin-weight -2 spherical harmonic at theta,phi: Y_{s=-2, l,m}(theta,phi)
+    if enable_SWSH_recurrence:
+        prefunc = SWm2SH.SpinWeight_SphHarmonics_recurrence_Ccode(s=-2, name="SpinWeight_minus2_SphHarmonics")
+    else:
+        prefunc = SpinWeight_minus2_SphHarmonics_switch_Ccode(maximum_l)
+    prefunc += r"""
+#define SWM2_NUM_MODES (("""+str(maximum_l)+r"""+1)*("""+str(maximum_l)+r"""+1) - 4) // Modes l=2..L_MAX, m=-l..l; mode index = l*l + l + m - 4
+"""
+    if psi4_output_format == "text":
+        prefunc += r"""
+// Output psi4_{l,m} for all modes at this time and extraction radius, one text file per mode.
+static void lowlevel_output_psi4_swm2_modes(const REAL curr_time, const REAL R_ext,
+                                            const REAL *restrict psi4r_l_m, const REAL *restrict psi4i_l_m) {
+  for(int l=2;l<="""+str(maximum_l)+r""";l++) {  // The maximum l here is set in Python.
+    for(int m=-l;m<=l;m++) {
+      const int mode = l*l + l + m - 4;
+      char filename[100];
+      sprintf(filename,"outpsi4_l%d_m%d-r%.2f.txt",l,m, (double)R_ext);
+      // If you love "+"'s in filenames by all means enable this (ugh):
+      //if(m>=0) sprintf(filename,"outpsi4_l%d_m+%d-r%.2f.txt",l,m, (double)R_ext);
+      FILE *outpsi4_l_m;
+      // 0 = n*dt when n=0 is exactly represented in double/long double precision,
+      //          so no worries about the result being ~1e-16 in double/ld precision
+      if(curr_time==0) outpsi4_l_m = fopen(filename, "w");
+      else             outpsi4_l_m = fopen(filename, "a");
+      fprintf(outpsi4_l_m,"%e %.15e %.15e\n", (double)(curr_time),
+              (double)psi4r_l_m[mode],(double)psi4i_l_m[mode]);
+      fclose(outpsi4_l_m);
+    }
+  }
+}
+"""
+    else:
+        prefunc += r"""
+// Binary psi4_{l,m} output: one open file per extraction radius, "outpsi4_swm2_modes-r%.2f.bin".
+//   Header (32 bytes): char magic[8] = "NRPYSWM2", then int32 version, l_min, l_max, num_modes,
+//                      bytes_per_record, reserved.
+//   Records: double time, then {double re, double im} for each mode index l*l+l+m-4.
+// Records are buffered in memory and written every SWM2_FLUSH_INTERVAL records, and at exit.
+#define SWM2_FLUSH_INTERVAL """+str(int(psi4_output_flush_interval))+r"""
+#define SWM2_DOUBLES_PER_RECORD (1 + 2*SWM2_NUM_MODES)
+typedef struct {
+  REAL R_ext;
+  FILE *file;
+  int num_buffered_records;
+  double buffer[SWM2_FLUSH_INTERVAL*SWM2_DOUBLES_PER_RECORD];
+} swm2_output_stream;
+static swm2_output_stream *swm2_streams = NULL;
+static int num_swm2_streams = 0;
+
+static void lowlevel_flush_swm2_output_streams(void) {
+  for(int which=0;which<num_swm2_streams;which++) {
+    swm2_output_stream *stream = &swm2_streams[which];
+    if(stream->num_buffered_records > 0) {
+      fwrite(stream->buffer, sizeof(double)*SWM2_DOUBLES_PER_RECORD, stream->num_buffered_records, stream->file);
+      stream->num_buffered_records = 0;
+    }
+    fflush(stream->file);
+  }
+}
+
+// Open (truncating if curr_time==0, appending otherwise) the file for extraction radius R_ext,
+//   writing the header if the file is empty.
+static void lowlevel_open_swm2_output_stream(swm2_output_stream *stream, const REAL curr_time, const REAL R_ext) {
+  char filename[100];
+  sprintf(filename,"outpsi4_swm2_modes-r%.2f.bin", (double)R_ext);
+  // 0 = n*dt when n=0 is exactly represented in double/long double precision,
+  //          so no worries about the result being ~1e-16 in double/ld precision
+  stream->file = fopen(filename, curr_time==0 ? "wb" : "ab");
+  if(stream->file == NULL) {
+    fprintf(stderr, "ERROR: could not open %s for writing.\n", filename);
+    exit(1);
+  }
+  stream->R_ext = R_ext;
+  stream->num_buffered_records = 0;
+  fseek(stream->file, 0, SEEK_END);
+  if(ftell(stream->file) == 0) {
+    const char magic[8] = {'N','R','P','Y','S','W','M','2'};
+    const int32_t header[6] = { 1, 2, """+str(maximum_l)+r""", SWM2_NUM_MODES, (int32_t)(sizeof(double)*SWM2_DOUBLES_PER_RECORD), 0 };
+    fwrite(magic, sizeof(char), 8, stream->file);
+    fwrite(header, sizeof(int32_t), 6, stream->file);
+  }
+}
+
+// Buffer psi4_{l,m} for all modes at this time and extraction radius.
+static void lowlevel_output_psi4_swm2_modes(const REAL curr_time, const REAL R_ext,
+                                            const REAL *restrict psi4r_l_m, const REAL *restrict psi4i_l_m) {
+  swm2_output_stream *stream = NULL;
+  for(int which=0;which<num_swm2_streams;which++) if(swm2_streams[which].R_ext == R_ext) stream = &swm2_streams[which];
+  if(stream == NULL) {
+    if(num_swm2_streams == 0) atexit(lowlevel_flush_swm2_output_streams);
+    swm2_streams = (swm2_output_stream *)realloc(swm2_streams, sizeof(swm2_output_stream)*(num_swm2_streams+1));
+    stream = &swm2_streams[num_swm2_streams++];
+    lowlevel_open_swm2_output_stream(stream, curr_time, R_ext);
+  } else if(curr_time == 0) {
+    // A new run at t=0 overwrites the previous one, as with text output.
+    fclose(stream->file);
+    lowlevel_open_swm2_output_stream(stream, curr_time, R_ext);
+  }
+
+  double *restrict record = &stream->buffer[stream->num_buffered_records*SWM2_DOUBLES_PER_RECORD];
+  record[0] = (double)curr_time;
+  for(int mode=0;mode<SWM2_NUM_MODES;mode++) {
+    record[1 + 2*mode    ] = (double)psi4r_l_m[mode];
+    record[1 + 2*mode + 1] = (double)psi4i_l_m[mode];
+  }
+  stream->num_buffered_records++;
+  if(stream->num_buffered_records == SWM2_FLUSH_INTERVAL) {
+    fwrite(stream->buffer, sizeof(double)*SWM2_DOUBLES_PER_RECORD, SWM2_FLUSH_INTERVAL, stream->file);
+    stream->num_buffered_records = 0;
+  }
+}
+"""
+    if not enable_SWSH_table:
+        prefunc += r"""
 void lowlevel_decompose_psi4_into_swm2_modes(const int Nxx_plus_2NGHOSTS1,const int Nxx_plus_2NGHOSTS2,
                                              const REAL dxx1, const REAL dxx2,
                                              const REAL curr_time, const REAL R_ext,
                                              const REAL *restrict th_array, const REAL *restrict sinth_array, const REAL *restrict ph_array,
                                              const REAL *restrict psi4r_at_R_ext, const REAL *restrict psi4i_at_R_ext) {
+  REAL psi4r_l_m_array[SWM2_NUM_MODES], psi4i_l_m_array[SWM2_NUM_MODES];
   for(int l=2;l<="""+str(maximum_l)+r""";l++) {  // The maximum l here is set in Python.
     for(int m=-l;m<=l;m++) {
       // Parallelize the integration loop:
@@ -816,21 +1157,82 @@ void lowlevel_decompose_psi4_into_swm2_modes(const int Nxx_plus_2NGHOSTS1,const
           psi4i_l_m += (b*c - a*d) * dxx2  * sinth*dxx1;
         }
       }
-      // Step 4: Output the result of the integration to file.
-      char filename[100];
-      sprintf(filename,"outpsi4_l%d_m%d-r%.2f.txt",l,m, (double)R_ext);
-      // If you love "+"'s in filenames by all means enable this (ugh):
-      //if(m>=0) sprintf(filename,"outpsi4_l%d_m+%d-r%.2f.txt",l,m, (double)R_ext);
-      FILE *outpsi4_l_m;
-      // 0 = n*dt when n=0 is exactly represented in double/long double precision,
-      //          so no worries about the result being ~1e-16 in double/ld precision
-      if(curr_time==0) outpsi4_l_m = fopen(filename, "w");
-      else             outpsi4_l_m = fopen(filename, "a");
-      fprintf(outpsi4_l_m,"%e %.15e %.15e\n", (double)(curr_time),
-              (double)psi4r_l_m,(double)psi4i_l_m);
-      fclose(outpsi4_l_m);
+      const int mode = l*l + l + m - 4;
+      psi4r_l_m_array[mode] = psi4r_l_m;
+      psi4i_l_m_array[mode] = psi4i_l_m;
+    }
+  }
+  // Step 4: Output the result of the integration to file.
+  lowlevel_output_psi4_swm2_modes(curr_time, R_ext, psi4r_l_m_array, psi4i_l_m_array);
+}
+"""
+    else:
+        prefunc += r"""
+// Table of Y_{s=-2, l,m}(th_i1,ph_i2) * sin(th_i1)*dxx1*dxx2, for all modes (l>=2) of the most recently
+//   used angular grid. Row "mode" (see below) of the real (imaginary) part starts at
+//   swm2_table_re[mode*Npts] (swm2_table_im[mode*Npts]), and is laid out like psi4r_at_R_ext[].
+static REAL *swm2_table_re = NULL, *swm2_table_im = NULL;
+static int  swm2_table_N1 = -1, swm2_table_N2 = -1;
+static REAL swm2_table_key[4]; // dxx1, dxx2, th_array[0], ph_array[0]
+
+// (Re)build the table if the angular grid differs from the one it was built for.
+static void lowlevel_build_swm2_table(const int N1, const int N2, const REAL dxx1, const REAL dxx2,
+                                      const REAL *restrict th_array, const REAL *restrict sinth_array, const REAL *restrict ph_array) {
+  if(swm2_table_re != NULL && N1 == swm2_table_N1 && N2 == swm2_table_N2 &&
+     dxx1 == swm2_table_key[0] && dxx2 == swm2_table_key[1] && th_array[0] == swm2_table_key[2] && ph_array[0] == swm2_table_key[3]) return;
+  const int Npts = N1*N2;
+  free(swm2_table_re); free(swm2_table_im);
+  swm2_table_re = (REAL *)malloc(sizeof(REAL)*SWM2_NUM_MODES*Npts);
+  swm2_table_im = (REAL *)malloc(sizeof(REAL)*SWM2_NUM_MODES*Npts);
+#pragma omp parallel for
+  for(int i1=0;i1<N1;i1++) {
+    const REAL weight = sinth_array[i1]*dxx1*dxx2;
+    for(int i2=0;i2<N2;i2++) {
+      const int idx2d = i1*N2+i2;
+      for(int l=2;l<="""+str(maximum_l)+r""";l++) for(int m=-l;m<=l;m++) {
+          REAL ReY_sm2_l_m,ImY_sm2_l_m;
+          SpinWeight_minus2_SphHarmonics(l,m, th_array[i1],ph_array[i2],  &ReY_sm2_l_m,&ImY_sm2_l_m);
+          const int mode = l*l + l + m - 4;
+          swm2_table_re[mode*Npts + idx2d] = ReY_sm2_l_m * weight;
+          swm2_table_im[mode*Npts + idx2d] = ImY_sm2_l_m * weight;
+        }
     }
   }
+  swm2_table_N1 = N1;  swm2_table_N2 = N2;
+  swm2_table_key[0] = dxx1;  swm2_table_key[1] = dxx2;  swm2_table_key[2] = th_array[0];  swm2_table_key[3] = ph_array[0];
+}
+
+void lowlevel_decompose_psi4_into_swm2_modes(const int Nxx_plus_2NGHOSTS1,const int Nxx_plus_2NGHOSTS2,
+                                             const REAL dxx1, const REAL dxx2,
+                                             const REAL curr_time, const REAL R_ext,
+                                             const REAL *restrict th_array, const REAL *restrict sinth_array, const REAL *restrict ph_array,
+                                             const REAL *restrict psi4r_at_R_ext, const REAL *restrict psi4i_at_R_ext) {
+  const int N1 = Nxx_plus_2NGHOSTS1-2*NGHOSTS;
+  const int N2 = Nxx_plus_2NGHOSTS2-2*NGHOSTS;
+  const int Npts = N1*N2;
+  lowlevel_build_swm2_table(N1,N2, dxx1,dxx2, th_array,sinth_array,ph_array);
+
+  // Dense matrix-vector product of the table with psi4 = a + i b: each mode is a pair of dot products
+  //   psi4r_l_m = sum (a*c + b*d) * weight,  psi4i_l_m = sum (b*c - a*d) * weight,  with Y = c + i d.
+  REAL psi4r_l_m[SWM2_NUM_MODES], psi4i_l_m[SWM2_NUM_MODES];
+#pragma omp parallel for
+  for(int mode=0;mode<SWM2_NUM_MODES;mode++) {
+    const REAL *restrict c = &swm2_table_re[mode*Npts];
+    const REAL *restrict d = &swm2_table_im[mode*Npts];
+    REAL sumr = 0.0, sumi = 0.0;
+#pragma omp simd reduction(+:sumr,sumi)
+    for(int idx2d=0;idx2d<Npts;idx2d++) {
+      const REAL a = psi4r_at_R_ext[idx2d];
+      const REAL b = psi4i_at_R_ext[idx2d];
+      sumr += a*c[idx2d] + b*d[idx2d];
+      sumi += b*c[idx2d] - a*d[idx2d];
+    }
+    psi4r_l_m[mode] = sumr;
+    psi4i_l_m[mode] = sumi;
+  }
+
+  // Output the result of the integration to file.
+  lowlevel_output_psi4_swm2_modes(curr_time, R_ext, psi4r_l_m, psi4i_l_m);
 }
 """
 
@@ -12,6 +12,7 @@ import NRPy_param_funcs as par  # NRPy+: Parameter interface
 import grid as gri  # NRPy+: Functions having to do with numerical grids
 import indexedexp as ixp  # NRPy+: Symbolic indexed expression (e.g., tensors, vectors, etc.) support
 import reference_metric as rfm  # NRPy+: Reference metric support
+from parallel_symbolic import map_components  # NRPy+: Evaluate independent symbolic components in parallel
 
 # Step 1.a: Set the coordinate system for the numerical grid
 #  DO NOT SET IN STANDALONE PYTHON MODULE
@@ -385,45 +386,51 @@ def RicciBar__gammabarDD_dHatD__DGammaUDD__DGammaU():
         RbarDD = ixp.register_gridfunctions_for_single_rank2("AUXEVOL", "RbarDD", "sym01")
         return
 
-    # Step 7.d: Summing the terms and defining \bar{R}_{ij}
+    # Step 7.d: Summing the terms and defining \bar{R}_{ij}; each component RbarDD[i][j]
+    #           is independent of the others, and is evaluated in parallel if
+    #           parallel_symbolic.nprocs > 1 (see _RbarDD_component() below).
+    prereqs = {"gammabarUU": gammabarUU, "gammabarDD_dHatDD": gammabarDD_dHatDD, "gammabarDD": gammabarDD,
+               "LambarU_dHatD": LambarU_dHatD, "DGammaU": DGammaU, "DGammaDDD": DGammaDDD, "DGammaUDD": DGammaUDD}
+    indices = [(i, j) for i in range(DIM) for j in range(DIM)]
+    RbarDD = ixp.zerorank2()
+    for (i, j), expr in zip(indices, map_components(_RbarDD_component, prereqs, indices)):
+        RbarDD[i][j] = expr
+
+
+def _RbarDD_component(prereqs, i, j):
+    gammabarUU, gammabarDD_dHatDD, gammabarDD = prereqs["gammabarUU"], prereqs["gammabarDD_dHatDD"], prereqs["gammabarDD"]
+    LambarU_dHatD, DGammaU = prereqs["LambarU_dHatD"], prereqs["DGammaU"]
+    DGammaDDD, DGammaUDD = prereqs["DGammaDDD"], prereqs["DGammaUDD"]
+    DIM = 3
+    RbarDDij = sp.sympify(0)
     # Step 7.d.i: Add the first term to RbarDD:
     #         Rbar_{ij} += - \frac{1}{2} \bar{\gamma}^{k l} \hat{D}_{k} \hat{D}_{l} \bar{\gamma}_{i j}
-    RbarDD = ixp.zerorank2()
-    RbarDDpiece = ixp.zerorank2()
-    for i in range(DIM):
-        for j in range(DIM):
-            for k in range(DIM):
-                for l in range(DIM):
-                    RbarDD[i][j] += -sp.Rational(1, 2) * gammabarUU[k][l] * gammabarDD_dHatDD[i][j][l][k]
-                    RbarDDpiece[i][j] += -sp.Rational(1, 2) * gammabarUU[k][l] * gammabarDD_dHatDD[i][j][l][k]
+    for k in range(DIM):
+        for l in range(DIM):
+            RbarDDij += -sp.Rational(1, 2) * gammabarUU[k][l] * gammabarDD_dHatDD[i][j][l][k]
 
     # Step 7.d.ii: Add the second term to RbarDD:
     #         Rbar_{ij} += (1/2) * (gammabar_{ki} Lambar^k_{;\hat{j}} + gammabar_{kj} Lambar^k_{;\hat{i}})
-    for i in range(DIM):
-        for j in range(DIM):
-            for k in range(DIM):
-                RbarDD[i][j] += sp.Rational(1, 2) * (gammabarDD[k][i] * LambarU_dHatD[k][j] +
-                                                     gammabarDD[k][j] * LambarU_dHatD[k][i])
+    for k in range(DIM):
+        RbarDDij += sp.Rational(1, 2) * (gammabarDD[k][i] * LambarU_dHatD[k][j] +
+                                         gammabarDD[k][j] * LambarU_dHatD[k][i])
 
     # Step 7.d.iii: Add the remaining term to RbarDD:
     #      Rbar_{ij} += \Delta^{k} \Delta_{(i j) k} = 1/2 \Delta^{k} (\Delta_{i j k} + \Delta_{j i k})
-    for i in range(DIM):
-        for j in range(DIM):
-            for k in range(DIM):
-                RbarDD[i][j] += sp.Rational(1, 2) * DGammaU[k] * (DGammaDDD[i][j][k] + DGammaDDD[j][i][k])
+    for k in range(DIM):
+        RbarDDij += sp.Rational(1, 2) * DGammaU[k] * (DGammaDDD[i][j][k] + DGammaDDD[j][i][k])
 
     # Step 7.d.iv: Add the final term to RbarDD:
     #      Rbar_{ij} += \bar{\gamma}^{k l} (\Delta^{m}_{k i} \Delta_{j m l}
     #                   + \Delta^{m}_{k j} \Delta_{i m l}
     #                   + \Delta^{m}_{i k} \Delta_{m j l})
-    for i in range(DIM):
-        for j in range(DIM):
-            for k in range(DIM):
-                for l in range(DIM):
-                    for m in range(DIM):
-                        RbarDD[i][j] += gammabarUU[k][l] * (DGammaUDD[m][k][i] * DGammaDDD[j][m][l] +
-                                                            DGammaUDD[m][k][j] * DGammaDDD[i][m][l] +
-                                                            DGammaUDD[m][i][k] * DGammaDDD[m][j][l])
+    for k in range(DIM):
+        for l in range(DIM):
+            for m in range(DIM):
+                RbarDDij += gammabarUU[k][l] * (DGammaUDD[m][k][i] * DGammaDDD[j][m][l] +
+                                                DGammaUDD[m][k][j] * DGammaDDD[i][m][l] +
+                                                DGammaUDD[m][i][k] * DGammaDDD[m][j][l])
+    return RbarDDij
 
 
 # Step 8: The unrescaled shift vector betaU spatial derivatives:
@@ -24,8 +24,15 @@ _unused = par.Cparameters("int", __name__, "outer_bc_type", "EXTRAPOLATION_OUTER
 
 
 # First register basic C data structures/macros inside NRPy_basic_defines.h
-def NRPy_basic_defines_CurviBC_data_structures():
-    return r"""
+#   enable_SoA_bcstruct=True adds structure-of-arrays boundary point lists to bc_struct:
+#   flat arrays of the 3D grid indices idx_offset0..3 used by extrapolation outer BCs, and
+#   of the inner boundary points' dstpt, srcpt, and parities. apply_bcs_inner_only() and
+#   apply_bcs_outerextrap_and_inner() then loop over gridfunctions outside and boundary
+#   points inside, streaming through these arrays (see below). The same enable_SoA_bcstruct
+#   must be passed to CurviBoundaryConditions_register_NRPy_basic_defines() and
+#   CurviBoundaryConditions_register_C_functions().
+def NRPy_basic_defines_CurviBC_data_structures(enable_SoA_bcstruct=False):
+    Nbd_str = r"""
 // NRPy+ Curvilinear Boundary Conditions: Core data structures
 // Documented in: Tutorial-Start_to_Finish-Curvilinear_BCs.ipynb
 
@@ -63,8 +70,19 @@ typedef struct __bc_struct__ {
   //                                                             boundary point
   bc_info_struct bc_info;  // stores number of inner and outer boundary points, needed for setting loop
   //                          bounds and parallelizing over as many boundary points as possible.
-} bc_struct;
 """
+    if enable_SoA_bcstruct:
+        Nbd_str += r"""  // Structure-of-arrays boundary point lists, set in bcstruct_set_up() from the arrays above:
+  int *restrict pure_outer_idx_offset[4][NGHOSTS*3]; // pure_outer_idx_offset[n][dirn + (3*which_gz)][idx2d] =
+  //                                                    IDX3S(i0+n*FACEX0,i1+n*FACEX1,i2+n*FACEX2)
+  int *restrict inner_dstpt;  // inner_dstpt[pt] = inner_bc_array[pt].dstpt
+  int *restrict inner_srcpt;  // inner_srcpt[pt] = inner_bc_array[pt].srcpt
+  int8_t *restrict inner_parity;  // inner_parity[num_inner_boundary_points*parity_type + pt] =
+  //                                 inner_bc_array[pt].parity[parity_type]
+"""
+    Nbd_str += r"""} bc_struct;
+"""
+    return Nbd_str
 
 
 # Set unit-vector dot products (=parity) for each of the 10 parity condition types
@@ -474,7 +492,7 @@ def Cfunction__set_parity_for_inner_boundary_single_pt():
 
 # bcstruct_set_up():
 #      This function is documented in desc= and body= fields below.
-def add_to_Cfunction_dict_bcstruct_set_up(rel_path_to_Cparams=os.path.join(".")):
+def add_to_Cfunction_dict_bcstruct_set_up(rel_path_to_Cparams=os.path.join("."), enable_SoA_bcstruct=False):
     includes = [os.path.join(rel_path_to_Cparams, "NRPy_basic_defines.h"),
                 os.path.join(rel_path_to_Cparams, "NRPy_function_prototypes.h")]
     prefunc  = Cfunction__EigenCoord_set_x0x1x2_inbounds__i0i1i2_inbounds_single_pt()
@@ -537,6 +555,11 @@ Step 2: Set up outer boundary structs bcstruct->outer_bc_array[which_gz][face][i
     regardless of whether the point is an outer or inner point. However
     the struct is set only at outer boundary points. This is slightly
     wasteful, but only in memory, not in CPU.
+"""
+    if enable_SoA_bcstruct:
+        desc += r"""Step 3: Copy the above into structure-of-arrays boundary point lists:
+  bcstruct->pure_outer_idx_offset[n][dirn + (3*which_gz)][idx2d] = IDX3S(i0+n*FACEX0,i1+n*FACEX1,i2+n*FACEX2),
+  for n=0,1,2,3, and bcstruct->inner_dstpt[], inner_srcpt[], inner_parity[].
 """
     c_type = "void"
     name = "bcstruct_set_up"
@@ -712,6 +735,37 @@ Step 2: Set up outer boundary structs bcstruct->outer_bc_array[which_gz][face][i
       }
       bcstruct->bc_info.num_pure_outer_boundary_points[which_gz][dirn] = idx2d;
     }
+"""
+    if enable_SoA_bcstruct:
+        body += r"""
+  ////////////////////////////////////////
+  // STEP 3: SET UP STRUCTURE-OF-ARRAYS BOUNDARY POINT LISTS
+  for(int which_gz=0;which_gz<NGHOSTS;which_gz++) for(int dirn=0;dirn<3;dirn++) {
+      const int num_pts = bcstruct->bc_info.num_pure_outer_boundary_points[which_gz][dirn];
+      for(int n=0;n<4;n++) {
+        bcstruct->pure_outer_idx_offset[n][dirn + (3*which_gz)] = (int *restrict)malloc(sizeof(int)*num_pts);
+      }
+      for(int idx2d=0;idx2d<num_pts;idx2d++) {
+        const outerpt_bc_struct *restrict outerpt = &bcstruct->pure_outer_bc_array[dirn + (3*which_gz)][idx2d];
+        for(int n=0;n<4;n++) {
+          bcstruct->pure_outer_idx_offset[n][dirn + (3*which_gz)][idx2d] =
+            IDX3S(outerpt->i0+n*outerpt->FACEX0, outerpt->i1+n*outerpt->FACEX1, outerpt->i2+n*outerpt->FACEX2);
+        }
+      }
+    }
+  {
+    const int num_inner = bcstruct->bc_info.num_inner_boundary_points;
+    bcstruct->inner_dstpt  = (int *restrict)malloc(sizeof(int)*num_inner);
+    bcstruct->inner_srcpt  = (int *restrict)malloc(sizeof(int)*num_inner);
+    bcstruct->inner_parity = (int8_t *restrict)malloc(sizeof(int8_t)*10*num_inner);
+    for(int pt=0;pt<num_inner;pt++) {
+      bcstruct->inner_dstpt[pt] = bcstruct->inner_bc_array[pt].dstpt;
+      bcstruct->inner_srcpt[pt] = bcstruct->inner_bc_array[pt].srcpt;
+      for(int parity=0;parity<10;parity++) {
+        bcstruct->inner_parity[num_inner*parity + pt] = bcstruct->inner_bc_array[pt].parity[parity];
+      }
+    }
+  }
 """
     add_to_Cfunction_dict(
         includes=includes,
@@ -722,10 +776,38 @@ Step 2: Set up outer boundary structs bcstruct->outer_bc_array[which_gz][face][i
         rel_path_to_Cparams=rel_path_to_Cparams)
 
 
+# bcstruct_free():
+#      Free all arrays allocated by bcstruct_set_up(). Call it wherever
+#      bcstruct is torn down, e.g., at the end of main() or before the
+#      grid is set up again. The same enable_SoA_bcstruct must be passed
+#      as to add_to_Cfunction_dict_bcstruct_set_up().
+def add_to_Cfunction_dict_bcstruct_free(rel_path_to_Cparams=os.path.join("."), enable_SoA_bcstruct=False):
+    includes = [os.path.join(rel_path_to_Cparams, "NRPy_basic_defines.h")]
+    desc = "Free all memory allocated by bcstruct_set_up() within bcstruct."
+    c_type = "void"
+    name = "bcstruct_free"
+    params = "bc_struct *restrict bcstruct"
+    body = r"""  free(bcstruct->inner_bc_array);
+  for(int ng=0;ng<NGHOSTS*3;ng++) free(bcstruct->pure_outer_bc_array[ng]);
+"""
+    if enable_SoA_bcstruct:
+        body += r"""  for(int n=0;n<4;n++) for(int ng=0;ng<NGHOSTS*3;ng++) free(bcstruct->pure_outer_idx_offset[n][ng]);
+  free(bcstruct->inner_dstpt);
+  free(bcstruct->inner_srcpt);
+  free(bcstruct->inner_parity);
+"""
+    add_to_Cfunction_dict(
+        includes=includes,
+        desc=desc,
+        c_type=c_type, name=name, params=params,
+        body=body,
+        enableCparameters=False)
+
+
 ###############################
 ## apply_bcs_inner_only(): Apply inner boundary conditions.
 ##  Function is documented below in desc= and body=.
-def add_to_Cfunction_dict_apply_bcs_inner_only(rel_path_to_Cparams=os.path.join(".")):
+def add_to_Cfunction_dict_apply_bcs_inner_only(rel_path_to_Cparams=os.path.join("."), enable_SoA_bcstruct=False):
     includes = [os.path.join(rel_path_to_Cparams, "NRPy_basic_defines.h")]
     desc = r"""
 Apply BCs to inner boundary points only,
@@ -752,6 +834,30 @@ boundary points ("inner maps to outer").
       gfs[IDX4ptS(which_gf, dstpt)] = bcstruct->inner_bc_array[pt].parity[evol_gf_parity[which_gf]] * gfs[IDX4ptS(which_gf, srcpt)];
     } // END for(int pt=0;pt<num_inner_pts;pt++)
   } // END for(int which_gf=0;which_gf<NUM_EVOL_GFS;which_gf++)
+"""
+    if enable_SoA_bcstruct:
+        body = r"""
+  // Unpack bc_info from bcstruct
+  const bc_info_struct *bc_info = &bcstruct->bc_info;
+  const int num_inner = bc_info->num_inner_boundary_points;
+  const int *restrict dstpt = bcstruct->inner_dstpt;
+  const int *restrict srcpt = bcstruct->inner_srcpt;
+
+  // Gridfunction-outer, point-inner loop over the structure-of-arrays boundary point lists. Inner boundary
+  //   points map only to the grid interior or to pure outer boundary points, so the points are independent.
+  //   Each thread updates the same range of points in each gridfunction, so no barrier is needed between
+  //   gridfunctions.
+#pragma omp parallel
+  {
+    for(int which_gf=0;which_gf<NUM_EVOL_GFS;which_gf++) {
+      REAL *restrict gf = &gfs[IDX4ptS(which_gf, 0)];
+      const int8_t *restrict parity = &bcstruct->inner_parity[num_inner*evol_gf_parity[which_gf]];
+#pragma omp for simd schedule(static) nowait
+      for(int pt=0;pt<num_inner;pt++) {
+        gf[dstpt[pt]] = parity[pt] * gf[srcpt[pt]];
+      } // END for(int pt=0;pt<num_inner;pt++)
+    } // END for(int which_gf=0;which_gf<NUM_EVOL_GFS;which_gf++)
+  }
 """
     add_to_Cfunction_dict(
         includes=includes,
@@ -764,7 +870,7 @@ boundary points ("inner maps to outer").
 ###############################
 ## apply_bcs_outerextrap_and_inner(): Apply extrapolation outer boundary conditions.
 ##  Function is documented below in desc= and body=.
-def add_to_Cfunction_dict_apply_bcs_outerextrap_and_inner(rel_path_to_Cparams=os.path.join(".")):
+def add_to_Cfunction_dict_apply_bcs_outerextrap_and_inner(rel_path_to_Cparams=os.path.join("."), enable_SoA_bcstruct=False):
     includes = [os.path.join(rel_path_to_Cparams, "NRPy_basic_defines.h"),
                 os.path.join(rel_path_to_Cparams, "NRPy_function_prototypes.h")]
     desc = r"""
@@ -828,7 +934,38 @@ As derived in nrpytutorial's Tutorial-Start_to_Finish-Curvilinear_BCs.ipynb,
         }
       }
   }
-
+"""
+    if enable_SoA_bcstruct:
+        body = body.split("#pragma omp parallel\n")[0] + r"""#pragma omp parallel
+  {
+    for(int which_gz=0;which_gz<NGHOSTS;which_gz++) for(int dirn=0;dirn<3;dirn++) {
+        const int num_pts = bc_info->num_pure_outer_boundary_points[which_gz][dirn];
+        // Don't synchronize threads if there are no boundary points to fill.
+        if(num_pts > 0) {
+          const int *restrict idx_offset0 = bcstruct->pure_outer_idx_offset[0][dirn + (3*which_gz)];
+          const int *restrict idx_offset1 = bcstruct->pure_outer_idx_offset[1][dirn + (3*which_gz)];
+          const int *restrict idx_offset2 = bcstruct->pure_outer_idx_offset[2][dirn + (3*which_gz)];
+          const int *restrict idx_offset3 = bcstruct->pure_outer_idx_offset[3][dirn + (3*which_gz)];
+          // Gridfunction-outer, point-inner loop over the structure-of-arrays boundary point lists.
+          //   Points on a given ghost zone layer and direction depend only on points set before,
+          //   so a barrier is needed only after all gridfunctions have been updated.
+          for(int which_gf=0;which_gf<NUM_EVOL_GFS;which_gf++) {
+            REAL *restrict gf = &gfs[IDX4ptS(which_gf, 0)];
+#pragma omp for simd schedule(static) nowait
+            for(int idx2d=0;idx2d<num_pts;idx2d++) {
+              // *** Apply 2nd-order polynomial extrapolation BCs to all outer boundary points. ***
+              gf[idx_offset0[idx2d]] =
+                +3.0*gf[idx_offset1[idx2d]]
+                -3.0*gf[idx_offset2[idx2d]]
+                +1.0*gf[idx_offset3[idx2d]];
+            }
+          }
+#pragma omp barrier
+        }
+      }
+  }
+"""
+    body += r"""
   ///////////////////////////////////////////////////////
   // STEP 2 of 2: Apply BCs to inner boundary points.
   //              These map to either the grid interior
@@ -1146,9 +1283,9 @@ def add_to_Cfunction_dict_apply_bcs_outerradiation_and_inner(rel_path_to_Cparams
 
 
 # Only call this after ALL gridfunctions have been registered!
-def CurviBoundaryConditions_register_NRPy_basic_defines(verbose=True):
+def CurviBoundaryConditions_register_NRPy_basic_defines(verbose=True, enable_SoA_bcstruct=False):
     # Then set up the dictionary entry for CurviBC in NRPy_basic_defines
-    Nbd_str  = NRPy_basic_defines_CurviBC_data_structures()
+    Nbd_str  = NRPy_basic_defines_CurviBC_data_structures(enable_SoA_bcstruct=enable_SoA_bcstruct)
     Nbd_str += NRPy_basic_defines_set_gridfunction_defines_with_parity_types(verbose=verbose)
     outC_NRPy_basic_defines_h_dict["CurviBoundaryConditions"] = Nbd_str
 
@@ -1158,9 +1295,14 @@ def CurviBoundaryConditions_register_NRPy_basic_defines(verbose=True):
 
 
 def CurviBoundaryConditions_register_C_functions(rel_path_to_Cparams=os.path.join("./"),
-                                                 radiation_BC_FD_order=4):
-    add_to_Cfunction_dict_bcstruct_set_up(rel_path_to_Cparams=rel_path_to_Cparams)
+                                                 radiation_BC_FD_order=4, enable_SoA_bcstruct=False):
+    add_to_Cfunction_dict_bcstruct_set_up(rel_path_to_Cparams=rel_path_to_Cparams,
+                                          enable_SoA_bcstruct=enable_SoA_bcstruct)
+    add_to_Cfunction_dict_bcstruct_free(rel_path_to_Cparams=rel_path_to_Cparams,
+                                        enable_SoA_bcstruct=enable_SoA_bcstruct)
     add_to_Cfunction_dict_apply_bcs_outerradiation_and_inner(rel_path_to_Cparams=rel_path_to_Cparams,
                                                              radiation_BC_FD_order=radiation_BC_FD_order)
-    add_to_Cfunction_dict_apply_bcs_inner_only(rel_path_to_Cparams=rel_path_to_Cparams)
-    add_to_Cfunction_dict_apply_bcs_outerextrap_and_inner(rel_path_to_Cparams=rel_path_to_Cparams)
+    add_to_Cfunction_dict_apply_bcs_inner_only(rel_path_to_Cparams=rel_path_to_Cparams,
+                                               enable_SoA_bcstruct=enable_SoA_bcstruct)
+    add_to_Cfunction_dict_apply_bcs_outerextrap_and_inner(rel_path_to_Cparams=rel_path_to_Cparams,
+                                                          enable_SoA_bcstruct=enable_SoA_bcstruct)
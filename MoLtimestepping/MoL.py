@@ -10,8 +10,8 @@
 
 import NRPy_param_funcs as par  # NRPy+: Parameter interface
 import sympy as sp  # Import SymPy, a computer algebra system written entirely in Python
-import os, sys      # Standard Python modules for multiplatform OS-level functions
-from MoLtimestepping.RK_Butcher_Table_Dictionary import Butcher_dict
+import os, re, sys  # Standard Python modules for multiplatform OS-level functions
+from MoLtimestepping.RK_Butcher_Table_Dictionary import Butcher_dict, LowStorage_dict, LS_y_n, LS_k, LS_dt, Butcher_table_from_LowStorage
 from outputC import add_to_Cfunction_dict, indent_Ccode, outC_NRPy_basic_defines_h_dict, outputC, superfast_uniq  # NRPy+: Basic C code output functionality
 
 _n_0 = par.Cparameters("int", __name__, "n_0", 0)
@@ -72,7 +72,15 @@ def generate_gridfunction_names(MoL_method="RK4"):
     # Diagnostic output gridfunctions diagnostic_output_gfs & diagnostic_output_gfs2.
     diagnostic_gridfunctions2_point_to = ""
 
-    if diagonal(MoL_method) and "RK3" in MoL_method:
+    if MoL_method in LowStorage_dict:
+        # Low-storage methods update y_n in place; besides k_gfs (the RHS output),
+        #   they need only one more set of gridfunctions, regardless of the number of stages.
+        non_y_n_gridfunctions_list.append("k_gfs")
+        for register in LowStorage_dict[MoL_method][1]:
+            non_y_n_gridfunctions_list.append(str(register) + "_gfs")
+        diagnostic_gridfunctions_point_to = "k_gfs"
+        diagnostic_gridfunctions2_point_to = str(LowStorage_dict[MoL_method][1][0]) + "_gfs"
+    elif diagonal(MoL_method) and "RK3" in MoL_method:
         non_y_n_gridfunctions_list.append("k1_or_y_nplus_a21_k1_or_y_nplus1_running_total_gfs")
         non_y_n_gridfunctions_list.append("k2_or_y_nplus_a32_k2_gfs")
         diagnostic_gridfunctions_point_to = "k1_or_y_nplus_a21_k1_or_y_nplus1_running_total_gfs"
@@ -153,9 +161,15 @@ def add_to_Cfunction_dict_MoL_malloc(MoL_method, which_gfs):
 # single_RK_substep_input_symbolic() performs necessary replacements to
 #   define C code for a single RK substep
 #   (e.g., computing k_1 and then updating the outer boundaries)
+# enable_fused_RK_update=True: Instead of storing the RHS in RHS_output_str and then updating
+#   the RK_lhs_list gridfunctions in a separate sweep over all gridfunctions & gridpoints,
+#   pass the update to the RHS kernels as a MoL_fused_RK_update_struct (in place of
+#   RK_OUTPUT_GFS), so they write it directly from the stencil loop; see
+#   fused_RK_update_Ccode(). RHS_output_str then stands for the RHS itself in RK_rhs_list,
+#   each element of which must be a sum of gridfunctions plus a multiple of RHS_output_str.
 def single_RK_substep_input_symbolic(comment_block, substep_time_offset_dt, RHS_str, RHS_input_str, RHS_output_str, RK_lhs_list, RK_rhs_list,
                                      post_RHS_list, post_RHS_output_list, enable_SIMD=False,
-                                     gf_aliases="", post_post_RHS_string=""):
+                                     gf_aliases="", post_post_RHS_string="", enable_fused_RK_update=False):
     return_str = comment_block + "\n"
     substep_time_offset_str = "{:.17e}".format(float(substep_time_offset_dt))
     return_str += "griddata->params.time = time_start + " + substep_time_offset_str + " * griddata->params.dt;\n"
@@ -169,46 +183,70 @@ def single_RK_substep_input_symbolic(comment_block, substep_time_offset_dt, RHS_
     return_str += "{\n" + indent_Ccode(gf_aliases, "  ")
     indent = "  "
 
-    # Part 1: RHS evaluation
-    return_str += indent_Ccode(str(RHS_str).replace("RK_INPUT_GFS",  str(RHS_input_str).replace("gfsL", "gfs")).
-                               replace("RK_OUTPUT_GFS", str(RHS_output_str).replace("gfsL", "gfs")) + "\n", indent=indent)
-
-    # Part 2: RK update
-    if enable_SIMD:
-        return_str += "#pragma omp parallel for\n"
-        return_str += indent + "for(int i=0;i<Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2*NUM_EVOL_GFS;i+=SIMD_width) {\n"
-    else:
-        return_str += indent + "LOOP_ALL_GFS_GPS(i) {\n"
-
-    var_type = "REAL_SIMD_ARRAY" if enable_SIMD else "REAL"
-    RK_lhs_str_list = [indent + "const REAL_SIMD_ARRAY __RHS_exp_" + str(i) if enable_SIMD else indent + str(el).replace("gfsL", "gfs[i]") for i, el in enumerate(RK_lhs_list)]
-
-    read_list = [read for el in RK_rhs_list for read in list(sp.ordered(el.free_symbols))]
-    read_list_unique = superfast_uniq(read_list)
-
-    for el in read_list_unique:
-        if str(el) != "params->dt":
-            if enable_SIMD:
-                simd_el = str(el).replace("gfsL", "gfs[i]")
-                return_str += "{}  const {} {} = ReadSIMD(&{});\n".format(indent, var_type, str(el), simd_el)
-            else:
-                return_str += "{}  const {} {} = {};\n".format(indent, var_type, str(el),
-                                                               str(el).replace("gfsL", "gfs[i]"))
-
-    if enable_SIMD:
-        return_str += "{}  const REAL_SIMD_ARRAY DT = ConstSIMD(params->dt);\n".format(indent)
-
-    pre_indent = "2"
-    kernel = outputC(RK_rhs_list, RK_lhs_str_list, filename="returnstring",
-                     params="includebraces=False,preindent="+pre_indent+",outCverbose=False,enable_SIMD="+str(enable_SIMD))
-    if enable_SIMD:
-        return_str += kernel.replace("params->dt", "DT")
-        for i, el in enumerate(RK_lhs_list):
-            return_str += "  WriteSIMD(&" + str(el).replace("gfsL", "gfs[i]") + ", __RHS_exp_" + str(i) + ");\n"
+    if enable_fused_RK_update:
+        # Parts 1 & 2: RHS evaluation, fused with the RK update
+        if RHS_input_str in RK_lhs_list:
+            print("ERROR: enable_fused_RK_update=True: the RHS input " + str(RHS_input_str) +
+                  " cannot be updated in the same substep, as it is read with finite-difference stencils.")
+            sys.exit(1)
+        dt = sp.Symbol("params->dt", real=True)
+        return_str += indent + "MoL_fused_RK_update_struct RK_update;\n"
+        return_str += indent + "RK_update.num_out = " + str(len(RK_lhs_list)) + ";\n"
+        for j, (lhs, rhs) in enumerate(zip(RK_lhs_list, RK_rhs_list)):
+            dt_coeff = sp.expand(rhs).coeff(RHS_output_str)
+            inputs = sp.expand(rhs - dt_coeff*RHS_output_str)
+            inputs = list(sp.ordered(inputs.args)) if inputs.is_Add else ([inputs] if inputs != 0 else [])
+            if len(inputs) > 2 or any(not inp.is_Symbol for inp in inputs) or (dt_coeff/dt).free_symbols:
+                print("ERROR: enable_fused_RK_update=True: cannot fuse the RK update " + str(lhs) + " = " + str(rhs))
+                sys.exit(1)
+            return_str += indent + "RK_update.out[" + str(j) + "] = " + str(lhs).replace("gfsL", "gfs") + ";\n"
+            return_str += indent + "RK_update.num_in[" + str(j) + "] = " + str(len(inputs)) + ";\n"
+            for m, inp in enumerate(inputs):
+                return_str += indent + "RK_update.in[" + str(j) + "][" + str(m) + "] = " + str(inp).replace("gfsL", "gfs") + ";\n"
+            return_str += indent + "RK_update.dt_coeff[" + str(j) + "] = " + "{:.17e}".format(float(dt_coeff/dt)) + " * params->dt;\n"
+        return_str += indent_Ccode(str(RHS_str).replace("RK_INPUT_GFS", str(RHS_input_str).replace("gfsL", "gfs")).
+                                   replace("RK_OUTPUT_GFS", "&RK_update") + "\n", indent=indent)
     else:
-        return_str += kernel
+        # Part 1: RHS evaluation
+        return_str += indent_Ccode(str(RHS_str).replace("RK_INPUT_GFS",  str(RHS_input_str).replace("gfsL", "gfs")).
+                                   replace("RK_OUTPUT_GFS", str(RHS_output_str).replace("gfsL", "gfs")) + "\n", indent=indent)
+
+        # Part 2: RK update
+        if enable_SIMD:
+            return_str += "#pragma omp parallel for\n"
+            return_str += indent + "for(int i=0;i<Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2*NUM_EVOL_GFS;i+=SIMD_width) {\n"
+        else:
+            return_str += indent + "LOOP_ALL_GFS_GPS(i) {\n"
+
+        var_type = "REAL_SIMD_ARRAY" if enable_SIMD else "REAL"
+        RK_lhs_str_list = [indent + "const REAL_SIMD_ARRAY __RHS_exp_" + str(i) if enable_SIMD else indent + str(el).replace("gfsL", "gfs[i]") for i, el in enumerate(RK_lhs_list)]
+
+        read_list = [read for el in RK_rhs_list for read in list(sp.ordered(el.free_symbols))]
+        read_list_unique = superfast_uniq(read_list)
+
+        for el in read_list_unique:
+            if str(el) != "params->dt":
+                if enable_SIMD:
+                    simd_el = str(el).replace("gfsL", "gfs[i]")
+                    return_str += "{}  const {} {} = ReadSIMD(&{});\n".format(indent, var_type, str(el), simd_el)
+                else:
+                    return_str += "{}  const {} {} = {};\n".format(indent, var_type, str(el),
+                                                                   str(el).replace("gfsL", "gfs[i]"))
+
+        if enable_SIMD:
+            return_str += "{}  const REAL_SIMD_ARRAY DT = ConstSIMD(params->dt);\n".format(indent)
+
+        pre_indent = "2"
+        kernel = outputC(RK_rhs_list, RK_lhs_str_list, filename="returnstring",
+                         params="includebraces=False,preindent="+pre_indent+",outCverbose=False,enable_SIMD="+str(enable_SIMD))
+        if enable_SIMD:
+            return_str += kernel.replace("params->dt", "DT")
+            for i, el in enumerate(RK_lhs_list):
+                return_str += "  WriteSIMD(&" + str(el).replace("gfsL", "gfs[i]") + ", __RHS_exp_" + str(i) + ");\n"
+        else:
+            return_str += kernel
 
-    return_str += indent + "}\n"
+        return_str += indent + "}\n"
 
     # Part 3: Call post-RHS functions
     for post_RHS, post_RHS_output in zip(post_RHS_list, post_RHS_output_list):
@@ -247,9 +285,16 @@ def single_RK_substep_input_symbolic(comment_block, substep_time_offset_dt, RHS_
 # k_even    = dt*f(t_n + dt, y_n + k_odd)
 # y_nplus1 += 1/3*k_even
 ########################################################################################################################
+# enable_fused_RK_update=True: RHS kernels called in RHS_string write the RK update directly
+#   (see fused_RK_update_Ccode()), saving a full sweep over all gridfunctions per substep.
+#   Fusing is safe only if the RHS input is not overwritten within a substep, as is the
+#   case for diagonal Butcher tables using k_odd & k_even (e.g., RK4). Fused RHS kernels
+#   update only the points where they evaluate the RHS (e.g., grid interior), so
+#   post_RHS_string must fill all other points (e.g., all ghost zones, via boundary conditions).
 def add_to_Cfunction_dict_MoL_step_forward_in_time(MoL_method,
                                                    RHS_string = "", post_RHS_string = "", post_post_RHS_string="",
-                                                   enable_rfm=False, enable_curviBCs=False, enable_SIMD=False):
+                                                   enable_rfm=False, enable_curviBCs=False, enable_SIMD=False,
+                                                   enable_fused_RK_update=False):
     includes = ["NRPy_basic_defines.h", "NRPy_function_prototypes.h"]
     if enable_SIMD:
         includes += [os.path.join("SIMD", "SIMD_intrinsics.h")]
@@ -285,12 +330,47 @@ REAL *restrict """ + y_n_gridfunctions + " = "+gf_prefix + y_n_gridfunctions + "
         gf_aliases += "const int Nxx_plus_2NGHOSTS" + i + " = griddata->params.Nxx_plus_2NGHOSTS" + i + ";\n"
 
     # Implement Method of Lines (MoL) Timestepping
-    Butcher = Butcher_dict[MoL_method][0]  # Get the desired Butcher table from the dictionary
+    if MoL_method in LowStorage_dict:  # Low-storage methods are not in Butcher_dict; see RK_Butcher_Table_Dictionary.py
+        Butcher = Butcher_table_from_LowStorage(LowStorage_dict[MoL_method][0])
+    else:
+        Butcher = Butcher_dict[MoL_method][0]  # Get the desired Butcher table from the dictionary
     num_steps = len(Butcher)-1  # Specify the number of required steps to update solution
 
     dt = sp.Symbol("params->dt", real=True)
 
-    if diagonal(MoL_method) and "RK3" in MoL_method:
+    if enable_fused_RK_update and (MoL_method in LowStorage_dict or not diagonal(MoL_method) or
+                                   "RK3" in MoL_method or MoL_method == 'Euler'):
+        print("ERROR: enable_fused_RK_update=True requires a diagonal Butcher table using k_odd & k_even (e.g., RK4);")
+        print("       the RHS input of " + MoL_method + " is overwritten within a substep.")
+        sys.exit(1)
+
+    if MoL_method in LowStorage_dict:
+        # Low-storage methods: see RK_Butcher_Table_Dictionary.py for the format of LowStorage_dict.
+        #  Each substep evaluates the RHS into k_gfs, then updates y_n (in place) and at most one
+        #  more set of gridfunctions in a single sweep, and applies post-RHS to the next RHS input.
+        substeps = LowStorage_dict[MoL_method][0]
+        k_gfs = sp.Symbol("k_gfsL", real=True)
+        to_gfsL = {register: sp.Symbol(str(register) + "_gfsL", real=True)
+                   for register in LowStorage_dict[MoL_method][1] + [LS_y_n]}
+        to_gfsL[LS_k] = k_gfs
+        to_gfsL[LS_dt] = dt
+        for s, (RHS_input, updates) in enumerate(substeps):
+            if s == num_steps - 1:  # If on final step:
+                post_RHS_output = to_gfsL[LS_y_n]
+            else:  # If on anything but the final step:
+                post_RHS_output = to_gfsL[substeps[s + 1][0]]
+            body += single_RK_substep_input_symbolic(
+                comment_block="// -={ START k" + str(s + 1) + " substep }=-",
+                substep_time_offset_dt=Butcher[s][0],
+                RHS_str=RHS_string,
+                RHS_input_str=to_gfsL[RHS_input], RHS_output_str=k_gfs,
+                RK_lhs_list=[to_gfsL[register] for register, _expr in updates],
+                RK_rhs_list=[expr.xreplace(to_gfsL) for _register, expr in updates],
+                post_RHS_list=[post_RHS_string],
+                post_RHS_output_list=[post_RHS_output],
+                enable_SIMD=enable_SIMD, gf_aliases=gf_aliases,
+                post_post_RHS_string=post_post_RHS_string) + "// -={ END k" + str(s + 1) + " substep }=-\n\n"
+    elif diagonal(MoL_method) and "RK3" in MoL_method:
         # Diagonal RK3 only!!!
         #  In a diagonal RK3 method, only 3 gridfunctions need be defined. Below implements this approach.
         y_n_gfs = sp.Symbol("y_n_gfsL", real=True)
@@ -465,7 +545,8 @@ REAL *restrict """ + y_n_gridfunctions + " = "+gf_prefix + y_n_gridfunctions + "
                         post_RHS_list=[post_RHS_string],
                         post_RHS_output_list=[post_RHS_output],
                         enable_SIMD=enable_SIMD, gf_aliases=gf_aliases,
-                        post_post_RHS_string=post_post_RHS_string) + "// -={ END k" + str(s + 1) + " substep }=-\n\n"
+                        post_post_RHS_string=post_post_RHS_string,
+                        enable_fused_RK_update=enable_fused_RK_update) + "// -={ END k" + str(s + 1) + " substep }=-\n\n"
 
     body += """
 // To minimize roundoff error (from adding dt to params.time lots of times),
@@ -518,8 +599,88 @@ def add_to_Cfunction_dict_MoL_free_memory(MoL_method, which_gfs):
         rel_path_to_Cparams=os.path.join("."))
 
 
+# fused_RK_update_Ccode() converts the C code of an RHS kernel (e.g., as output by
+#   FD_outputC(), with or without SIMD) that writes the RHS to rhs_gfs into one that
+#   writes the RK update described by a MoL_fused_RK_update_struct *restrict RK_update
+#   (which replaces rhs_gfs in the kernel's parameters): at each point, for each of the
+#   RK_update->num_out sets of output gridfunctions,
+#     out[idx] = (sum of RK_update->num_in inputs at idx) + dt_coeff*rhs.
+def fused_RK_update_Ccode(Ccode, rhs_gfs="rhs_gfs"):
+    r"""
+    Convert the writes to rhs_gfs in an RHS kernel into fused RK updates.
+
+    >>> print(fused_RK_update_Ccode("rhs_gfs[IDX4S(UUGF, i0,i1,i2)] = -vv;\n"
+    ...                             "WriteSIMD(&rhs_gfs[IDX4S(VVGF, i0,i1,i2)], __RHS_exp_1);"))
+    MoL_FUSED_RK_UPDATE(RK_update, IDX4S(UUGF, i0,i1,i2), -vv);
+    MoL_FUSED_RK_UPDATE_SIMD(RK_update, IDX4S(VVGF, i0,i1,i2), __RHS_exp_1);
+    >>> fused_RK_update_Ccode("const REAL rhs = rhs_gfs[0];")
+    Traceback (most recent call last):
+    ...
+    SystemExit: 1
+
+    With enable_fused_RK_update=True, each RK4 substep passes its RK update to the RHS kernel:
+
+    >>> from outputC import outC_function_dict
+    >>> RHS_string = "rhs_eval(params, RK_INPUT_GFS, RK_OUTPUT_GFS);"
+    >>> add_to_Cfunction_dict_MoL_step_forward_in_time("RK4", RHS_string=RHS_string,
+    ...                                                post_RHS_string="apply_bcs(params, RK_OUTPUT_GFS);",
+    ...                                                enable_fused_RK_update=True)
+    >>> body = outC_function_dict["MoL_step_forward_in_time"]
+    >>> for k in ["k1", "k4"]:
+    ...     substep = body[body.index("START " + k + " substep"):body.index("END " + k + " substep")]
+    ...     print("\n".join(line.strip() for line in substep.splitlines() if "RK_update" in line or "apply_bcs" in line))
+    MoL_fused_RK_update_struct RK_update;
+    RK_update.num_out = 2;
+    RK_update.out[0] = y_nplus1_running_total_gfs;
+    RK_update.num_in[0] = 0;
+    RK_update.dt_coeff[0] = 1.66666666666666657e-01 * params->dt;
+    RK_update.out[1] = k_odd_gfs;
+    RK_update.num_in[1] = 1;
+    RK_update.in[1][0] = y_n_gfs;
+    RK_update.dt_coeff[1] = 5.00000000000000000e-01 * params->dt;
+    rhs_eval(params, y_n_gfs, &RK_update);
+    apply_bcs(params, k_odd_gfs);
+    MoL_fused_RK_update_struct RK_update;
+    RK_update.num_out = 1;
+    RK_update.out[0] = y_n_gfs;
+    RK_update.num_in[0] = 2;
+    RK_update.in[0][0] = y_n_gfs;
+    RK_update.in[0][1] = y_nplus1_running_total_gfs;
+    RK_update.dt_coeff[0] = 1.66666666666666657e-01 * params->dt;
+    rhs_eval(params, k_odd_gfs, &RK_update);
+    apply_bcs(params, y_n_gfs);
+
+    Low-storage, RK3, Euler, and non-diagonal methods overwrite the RHS input within a substep:
+
+    >>> for MoL_method in ["RK4(3)5[2N]", "RK3 Ralston", "Euler", "DP5"]:  # doctest: +ELLIPSIS
+    ...     try:
+    ...         add_to_Cfunction_dict_MoL_step_forward_in_time(MoL_method, RHS_string=RHS_string,
+    ...                                                        enable_fused_RK_update=True)
+    ...     except SystemExit:
+    ...         pass
+    ERROR: enable_fused_RK_update=True requires a diagonal Butcher table using k_odd & k_even (e.g., RK4);
+           the RHS input of RK4(3)5[2N] is overwritten within a substep.
+    ERROR: ...
+           the RHS input of RK3 Ralston is overwritten within a substep.
+    ERROR: ...
+           the RHS input of Euler is overwritten within a substep.
+    ERROR: ...
+           the RHS input of DP5 is overwritten within a substep.
+    """
+    Ccode = re.sub(r"WriteSIMD\(&" + rhs_gfs + r"\[(IDX4S\([^)]*\))\], *(.*)\);",
+                   r"MoL_FUSED_RK_UPDATE_SIMD(RK_update, \1, \2);", Ccode)
+    Ccode = re.sub(r"\b" + rhs_gfs + r"\[(IDX4S\([^)]*\))\] *= *(.*);",
+                   r"MoL_FUSED_RK_UPDATE(RK_update, \1, \2);", Ccode)
+    if re.search(r"\b" + rhs_gfs + r"\b", Ccode):
+        print("ERROR: fused_RK_update_Ccode(): could not convert all writes to " + rhs_gfs + ".")
+        sys.exit(1)
+    return Ccode
+
+
 # Register MoL_gridfunctions_struct in NRPy_basic_defines
-def NRPy_basic_defines_MoL_timestepping_struct(MoL_method="RK4"):
+# enable_fused_RK_update=True: Also register MoL_fused_RK_update_struct and the
+#   MoL_FUSED_RK_UPDATE*() macros used by fused RHS kernels (see fused_RK_update_Ccode()).
+def NRPy_basic_defines_MoL_timestepping_struct(MoL_method="RK4", enable_fused_RK_update=False):
     y_n_gridfunctions, non_y_n_gridfunctions_list, _diagnostic_gridfunctions_point_to, \
         _diagnostic_gridfunctions2_point_to = generate_gridfunction_names(MoL_method=MoL_method)
     # Step 3.b: Create MoL_timestepping struct:
@@ -533,6 +694,35 @@ def NRPy_basic_defines_MoL_timestepping_struct(MoL_method="RK4"):
     Nbd += "} MoL_gridfunctions_struct;\n"
     Nbd += """#define LOOP_ALL_GFS_GPS(ii) _Pragma("omp parallel for") \\
   for(int (ii)=0;(ii)<Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2*NUM_EVOL_GFS;(ii)++)\n"""
+    if enable_fused_RK_update:
+        Nbd += r"""
+// Fused RK update: RHS kernels write, for j < num_out, at each point idx where they evaluate rhs:
+//   out[j][idx] = in[j][0][idx] + ... + in[j][num_in[j]-1][idx] + dt_coeff[j]*rhs
+// out[j] may coincide with in[j][m] (e.g., a running total), but not with the kernel's input gridfunctions.
+typedef struct __MoL_fused_RK_update_struct__ {
+  int num_out;
+  int num_in[2];
+  REAL *out[2];
+  const REAL *in[2][2];
+  REAL dt_coeff[2];
+} MoL_fused_RK_update_struct;
+#define MoL_FUSED_RK_UPDATE(RK_update, idx, rhs) do {                    \
+    const REAL __rhs = (rhs);                                            \
+    for(int __j=0;__j<(RK_update)->num_out;__j++) {                      \
+      REAL __sum = (RK_update)->dt_coeff[__j]*__rhs;                     \
+      for(int __m=0;__m<(RK_update)->num_in[__j];__m++) __sum += (RK_update)->in[__j][__m][(idx)]; \
+      (RK_update)->out[__j][(idx)] = __sum;                              \
+    }                                                                    \
+  } while(0)
+#define MoL_FUSED_RK_UPDATE_SIMD(RK_update, idx, rhs) do {               \
+    const REAL_SIMD_ARRAY __rhs = (rhs);                                 \
+    for(int __j=0;__j<(RK_update)->num_out;__j++) {                      \
+      REAL_SIMD_ARRAY __sum = MulSIMD(ConstSIMD((RK_update)->dt_coeff[__j]), __rhs); \
+      for(int __m=0;__m<(RK_update)->num_in[__j];__m++) __sum = AddSIMD(__sum, ReadSIMD(&(RK_update)->in[__j][__m][(idx)])); \
+      WriteSIMD(&(RK_update)->out[__j][(idx)], __sum);                   \
+    }                                                                    \
+  } while(0)
+"""
 
     outC_NRPy_basic_defines_h_dict["MoL"] = Nbd
 
@@ -547,11 +737,11 @@ def NRPy_basic_defines_MoL_timestepping_struct(MoL_method="RK4"):
 def register_C_functions_and_NRPy_basic_defines(MoL_method = "RK4",
             RHS_string =  "rhs_eval(Nxx,Nxx_plus_2NGHOSTS,dxx, RK_INPUT_GFS, RK_OUTPUT_GFS);",
             post_RHS_string = "apply_bcs(Nxx,Nxx_plus_2NGHOSTS, RK_OUTPUT_GFS);", post_post_RHS_string = "",
-            enable_rfm=False, enable_curviBCs=False, enable_SIMD=False):
+            enable_rfm=False, enable_curviBCs=False, enable_SIMD=False, enable_fused_RK_update=False):
     for which_gfs in ["y_n_gfs", "non_y_n_gfs"]:
         add_to_Cfunction_dict_MoL_malloc(MoL_method, which_gfs)
         add_to_Cfunction_dict_MoL_free_memory(MoL_method, which_gfs)
     add_to_Cfunction_dict_MoL_step_forward_in_time(MoL_method, RHS_string, post_RHS_string, post_post_RHS_string,
                                                    enable_rfm=enable_rfm, enable_curviBCs=enable_curviBCs,
-                                                   enable_SIMD=enable_SIMD)
-    NRPy_basic_defines_MoL_timestepping_struct(MoL_method=MoL_method)
+                                                   enable_SIMD=enable_SIMD, enable_fused_RK_update=enable_fused_RK_update)
+    NRPy_basic_defines_MoL_timestepping_struct(MoL_method=MoL_method, enable_fused_RK_update=enable_fused_RK_update)
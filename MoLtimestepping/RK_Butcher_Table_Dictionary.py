@@ -317,3 +317,133 @@ pythonButcher[0] = [1]
 Butcher_dict['AB']=(
 pythonButcher
 , order)
+
+# Step 5: Low-storage Runge-Kutta methods
+
+# Low-storage RK methods update the solution y_n *in place*, needing (in addition to y_n and
+#   the gridfunctions k storing the RHS) only one more set of gridfunctions, regardless of the
+#   number of stages. Each method is stored in LowStorage_dict as
+#   LowStorage_dict[key] = (substeps, registers, order), where registers is the list of
+#   additional sets of gridfunctions (as sp.Symbols) and each substep is a tuple
+#   (RHS input, [(register, expression), ...]): first k = f(RHS input), then all listed
+#   registers are updated *simultaneously* (expressions use the values from before the
+#   update). Expressions are linear in y_n, the registers, and dt*k. After the final
+#   substep, y_n holds the solution at t_{n+1}. The equivalent Butcher table of each method
+#   is given by Butcher_table_from_LowStorage() (Step 5.c). Low-storage methods are not
+#   added to Butcher_dict, which holds only the methods in Steps 1-4.
+LowStorage_dict = {}
+LS_y_n, LS_k, LS_dt = sp.symbols("y_n k dt", real=True)
+
+# Step 5.a: Williamson (1980) 2N-storage methods:
+#   dy = A_i dy + dt f(y_n);  y_n = y_n + B_i dy  (A_1 = 0)
+def LowStorage_2N_substeps(A, B):
+    dy = sp.Symbol("dy", real=True)
+    substeps = []
+    for A_i, B_i in zip(A, B):
+        dy_new = A_i*dy + LS_dt*LS_k
+        substeps.append((LS_y_n, [(dy, dy_new), (LS_y_n, LS_y_n + B_i*dy_new)]))
+    return substeps, [dy]
+
+# Step 5.b: Kennedy, Carpenter & Lewis (2000) 2R-storage methods, with Butcher tables
+#   satisfying a_{ij} = b_j for j < i-1:
+#   next_y_input = y_n + a_{i+1,i} dt f(next_y_input);  y_n = y_n + b_i dt f(next_y_input),
+#   where a_sub = [a_21, a_32, ...].
+def LowStorage_2R_substeps(a_sub, b):
+    next_y_input = sp.Symbol("next_y_input", real=True)
+    substeps = []
+    for i, b_i in enumerate(b):
+        updates = []
+        if i < len(b) - 1:
+            updates.append((next_y_input, LS_y_n + a_sub[i]*LS_dt*LS_k))
+        updates.append((LS_y_n, LS_y_n + b_i*LS_dt*LS_k))
+        substeps.append((LS_y_n if i == 0 else next_y_input, updates))
+    return substeps, [next_y_input]
+
+# Step 5.c: Compute the Butcher table of a low-storage method, by tracking each register
+#   as a linear combination of y_n and dt*k_1, dt*k_2, ...
+def Butcher_table_from_LowStorage(substeps):
+    """
+    Returns the Butcher table of the low-storage method with the given substeps, in the
+    format of Butcher_dict. Each method in LowStorage_dict satisfies the order conditions
+    (checked here through fourth order) up to its stated order:
+
+    >>> def order_of_Butcher_table(Butcher, tol=1e-10):
+    ...     s = len(Butcher) - 1
+    ...     A = sp.Matrix(s, s, lambda i, j: Butcher[i][j+1] if j < i else 0)
+    ...     b = sp.Matrix([Butcher[s][1:]])
+    ...     c = sp.Matrix([row[0] for row in Butcher[:s]])
+    ...     c2, Ac = c.multiply_elementwise(c), A*c
+    ...     conditions = [[sum(b) - 1], [(b*c)[0] - sp.Rational(1, 2)],
+    ...                   [(b*c2)[0] - sp.Rational(1, 3), (b*Ac)[0] - sp.Rational(1, 6)],
+    ...                   [(b*c2.multiply_elementwise(c))[0] - sp.Rational(1, 4),
+    ...                    (b*c.multiply_elementwise(Ac))[0] - sp.Rational(1, 8),
+    ...                    (b*A*c2)[0] - sp.Rational(1, 12), (b*A*Ac)[0] - sp.Rational(1, 24)]]
+    ...     order = 0
+    ...     while order < len(conditions) and all(abs(float(cond)) < tol for cond in conditions[order]):
+    ...         order += 1
+    ...     return order
+    >>> for key, (substeps, registers, order) in sorted(LowStorage_dict.items()):
+    ...     print(key, order, order_of_Butcher_table(Butcher_table_from_LowStorage(substeps)))
+    RK3[2N] 3 3
+    RK4(3)5[2N] 4 4
+    RK4(3)5[2R+]C 4 4
+    SSPRK(10,4)[2S*] 4 4
+    """
+    num_stages = len(substeps)
+    y_n0 = sp.Symbol("y_n0", real=True)
+    dtk = sp.symbols("dtk1:" + str(num_stages + 1), real=True)
+    values = {LS_y_n: y_n0}
+    Butcher = []
+    for s, (RHS_input, updates) in enumerate(substeps):
+        stage = sp.expand(values[RHS_input])
+        a_row = [stage.coeff(dtk[j]) for j in range(s)]
+        Butcher.append([sum(a_row, sp.sympify(0))] + a_row)
+        new_values = {}
+        for register, expr in updates:
+            new_values[register] = sp.expand(expr.subs(LS_dt*LS_k, dtk[s]).subs(values))
+        values.update(new_values)
+    Butcher.append([""] + [sp.expand(values[LS_y_n]).coeff(dtk[j]) for j in range(num_stages)])
+    return Butcher
+
+# Step 5.d: Carpenter & Kennedy (1994) fourth-order, five-stage 2N-storage method
+LowStorage_dict['RK4(3)5[2N]'] = LowStorage_2N_substeps(
+    [sp.sympify(0), sp.Rational(-567301805773, 1357537059087), sp.Rational(-2404267990393, 2016746695238),
+     sp.Rational(-3550918686646, 2091501179385), sp.Rational(-1275806237668, 842570457699)],
+    [sp.Rational(1432997174477, 9575080441755), sp.Rational(5161836677717, 13612068292357),
+     sp.Rational(1720146321549, 2090206949498), sp.Rational(3134564353537, 4481467310338),
+     sp.Rational(2277821191437, 14882151754819)]) + (4,)
+
+# Step 5.e: Williamson (1980) third-order, three-stage 2N-storage method
+LowStorage_dict['RK3[2N]'] = LowStorage_2N_substeps(
+    [sp.sympify(0), sp.Rational(-5, 9), sp.Rational(-153, 128)],
+    [sp.Rational(1, 3), sp.Rational(15, 16), sp.Rational(8, 15)]) + (3,)
+
+# Step 5.f: Kennedy, Carpenter & Lewis (2000) fourth-order, five-stage 2R-storage method RK4(3)5[2R+]C
+LowStorage_dict['RK4(3)5[2R+]C'] = LowStorage_2R_substeps(
+    [sp.Rational(970286171893, 4311952581923), sp.Rational(6584761158862, 12103376702013),
+     sp.Rational(2251764453980, 15575788980749), sp.Rational(26877169314380, 34165994151039)],
+    [sp.Rational(1153189308089, 22510343858157), sp.Rational(1772645290293, 4653164025191),
+     sp.Rational(-1672844663538, 4480602732383), sp.Rational(2114624349019, 3568978502595),
+     sp.Rational(5198255086312, 14908931495163)]) + (4,)
+
+# Step 5.g: Ketcheson (2008) ten-stage, fourth-order strong stability preserving method
+#   SSPRK(10,4), in its two-register (2S*) form; register q2 keeps a copy of y_n until
+#   stage 5. Unlike SSPRK(5,4) (which needs 3 registers plus k), SSPRK(10,4) has an
+#   effective SSP coefficient of 0.6, and only rational coefficients.
+def _SSPRK104_substeps():
+    q2 = sp.Symbol("q2", real=True)
+    substeps = []
+    for s in range(10):
+        y_n_plus_dtk_6 = LS_y_n + LS_dt*LS_k/6
+        if s == 0:
+            updates = [(q2, LS_y_n), (LS_y_n, y_n_plus_dtk_6)]
+        elif s == 4:
+            q2_new = q2/25 + sp.Rational(9, 25)*y_n_plus_dtk_6
+            updates = [(q2, q2_new), (LS_y_n, 15*q2_new - 5*y_n_plus_dtk_6)]
+        elif s == 9:
+            updates = [(LS_y_n, q2 + sp.Rational(3, 5)*LS_y_n + LS_dt*LS_k/10)]
+        else:
+            updates = [(LS_y_n, y_n_plus_dtk_6)]
+        substeps.append((LS_y_n, updates))
+    return substeps, [q2]
+LowStorage_dict['SSPRK(10,4)[2S*]'] = _SSPRK104_substeps() + (4,)
@@ -0,0 +1,183 @@
+# NRPy_cache.py: Persistent, content-addressed on-disk cache for
+#                expensive NRPy+ codegen steps, e.g., the CSE and
+#                C code emission performed within outputC().
+#
+# Each cache entry is a single pickle file, stored at
+#    cache_dir/<namespace>/<key[:2]>/<key>.pkl
+# where key is a SHA-256 hash of everything that determines the
+# cached value (see cache_key()). Entries are evicted in
+# least-recently-used order once the total size of the cache
+# exceeds max_size_bytes; a cache hit refreshes the entry's mtime.
+# The directory is scanned once per process; after that, store()
+# keeps a running size estimate, and only rescans when it
+# overflows.
+#
+# The cache is disabled by default: nothing is read from or written
+# to disk unless it is enabled explicitly. Cache keys must capture
+# all state that affects a cached value; if some input is missed, a
+# stale entry is returned silently. So when changing codegen modules
+# in ways a key may not reflect (e.g., new module-level globals),
+# call NRPy_cache.clear() or point NRPY_CACHE_DIR elsewhere.
+#
+# Switches (may be set at runtime, or via environment variables):
+#   NRPy_cache.enable         (env: NRPY_CACHE=1 enables; default disabled)
+#   NRPy_cache.cache_dir      (env: NRPY_CACHE_DIR)
+#   NRPy_cache.max_size_bytes (env: NRPY_CACHE_MAX_MB)
+# Call NRPy_cache.clear() to remove all entries.
+
+import os, sys, hashlib, pickle, shutil  # Standard Python: multiplatform OS funcs, hashing, serialization
+
+# Bump this whenever the layout of cached values changes.
+CACHE_FORMAT_VERSION = 1
+
+enable = os.environ.get("NRPY_CACHE", "0") in ("1", "True", "true")
+cache_dir = os.environ.get("NRPY_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nrpy"))
+max_size_bytes = int(float(os.environ.get("NRPY_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+
+# Once the cache outgrows max_size_bytes, evict down to this fraction of it,
+#   so that eviction is not repeated on each subsequent store().
+evict_to_fraction = 0.75
+
+_source_hash_dict = {}
+# Running estimate of the total size of the cache, in bytes (None: not yet scanned).
+_size_estimate_bytes = None
+
+
+def cache_key(*items):
+    """ Return a stable SHA-256 hex digest of items (strings, or anything with a deterministic repr()).
+
+    >>> cache_key("a", ["b", "c"]) == cache_key("a", ["b", "c"])
+    True
+    >>> cache_key("a", ["b", "c"]) == cache_key("a", ["bc"])
+    False
+    """
+    hasher = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode("utf-8"))
+    for item in items:
+        string = item if isinstance(item, str) else repr(item)
+        # Prefix each item by its length, so that item boundaries are part of the hash.
+        hasher.update((str(len(string)) + ":").encode("utf-8"))
+        hasher.update(string.encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def source_hash(*modules):
+    """ Hash of the source files of the given (imported) modules. Including this in a
+        cache key ensures cached results are invalidated whenever the code generating
+        them changes. """
+    hashes = []
+    for module in modules:
+        filename = getattr(module, "__file__", None)
+        if filename is None:
+            hashes.append(module.__name__)
+            continue
+        if filename not in _source_hash_dict:
+            with open(filename, "rb") as file:
+                _source_hash_dict[filename] = hashlib.sha256(file.read()).hexdigest()
+        hashes.append(_source_hash_dict[filename])
+    return cache_key(*hashes)
+
+
+def _entry_path(namespace, key):
+    return os.path.join(cache_dir, namespace, key[:2], key + ".pkl")
+
+
+def load(namespace, key):
+    """ Return the value stored under (namespace, key), or None on a cache miss.
+
+    >>> import tempfile, NRPy_cache
+    >>> cache_dir_orig, NRPy_cache.cache_dir = NRPy_cache.cache_dir, tempfile.mkdtemp()
+    >>> enable_orig, NRPy_cache.enable = NRPy_cache.enable, True
+    >>> load("doctest", cache_key("x")) is None
+    True
+    >>> store("doctest", cache_key("x"), "const double x = 1.0;")
+    >>> load("doctest", cache_key("x"))
+    'const double x = 1.0;'
+    >>> clear()
+    >>> load("doctest", cache_key("x")) is None
+    True
+    >>> NRPy_cache.cache_dir, NRPy_cache.enable = cache_dir_orig, enable_orig
+    """
+    if not enable:
+        return None
+    path = _entry_path(namespace, key)
+    try:
+        with open(path, "rb") as file:
+            value = pickle.load(file)
+        # Cache hit: mark this entry as most recently used.
+        os.utime(path, None)
+        return value
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def store(namespace, key, value):
+    """ Store value under (namespace, key). Failures to write are not fatal; the
+        cache is then simply bypassed. """
+    if not enable:
+        return
+    path = _entry_path(namespace, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first and rename, so that concurrent
+        #   NRPy+ processes (e.g., multiprocessing codegen) never see a partial entry.
+        tmppath = path + ".tmp" + str(os.getpid())
+        with open(tmppath, "wb") as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmppath, path)
+        entry_size = os.path.getsize(path)
+    except OSError as err:
+        print("NRPy_cache warning: could not write cache entry " + path + ": " + str(err), file=sys.stderr)
+        return
+    # Track the cache size with a running estimate, so that the cache directory is
+    #   scanned only once per process, and again only when the estimate exceeds
+    #   max_size_bytes. Eviction then trims to evict_to_fraction*max_size_bytes.
+    global _size_estimate_bytes
+    if _size_estimate_bytes is None:
+        _size_estimate_bytes = _scan()[1]
+    else:
+        _size_estimate_bytes += entry_size
+    if _size_estimate_bytes > max_size_bytes:
+        evict(int(evict_to_fraction * max_size_bytes))
+
+
+# Return a list of (mtime, size, path) for all cache entries, and their total size.
+def _scan():
+    entries = []
+    total_size = 0
+    for root, _dirs, files in os.walk(cache_dir):
+        for filename in files:
+            if not filename.endswith(".pkl"):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                filestat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((filestat.st_mtime, filestat.st_size, path))
+            total_size += filestat.st_size
+    return entries, total_size
+
+
+def evict(max_bytes):
+    """ Delete least-recently-used entries until the cache occupies at most max_bytes. """
+    global _size_estimate_bytes
+    entries, total_size = _scan()
+    if total_size > max_bytes:
+        for _mtime, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            if total_size <= max_bytes:
+                break
+    _size_estimate_bytes = total_size
+
+
+def clear(namespace=None):
+    """ Remove all cache entries (in namespace, if specified). """
+    path = cache_dir if namespace is None else os.path.join(cache_dir, namespace)
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    global _size_estimate_bytes
+    _size_estimate_bytes = None
@@ -9,7 +9,7 @@
 
 import sympy as sp                   # Import SymPy
 import sys                           # Standard Python: OS-independent system functions
-from collections import namedtuple   # Standard Python: Enable namedtuple data type
+from collections import namedtuple, Counter  # Standard Python: Enable namedtuple data type; counting dict
 import re
 import textwrap
 
@@ -24,6 +24,61 @@ glb_Cparam = namedtuple('glb_Cparam', 'type module parname defaultval')
 
 veryverbose = False
 
+# Set profile_lookups = True to count parameter lookups per calling
+#   function; see print_lookup_profile().
+profile_lookups = False
+lookup_counts = Counter()
+
+
+# The lists above remain the canonical parameter registry (they are e.g.,
+#   pickled & replaced wholesale by pickling.py). Lookups go through the
+#   dict-based index below, which maps (module, parname) -> [list indices]
+#   and parname -> [list indices]. The index is validated on every lookup
+#   against the identity and length of the list it was built from: if the
+#   list was replaced it is rebuilt, and if elements were appended it is
+#   extended incrementally.
+class _param_index:
+    def __init__(self):
+        self.lst = None
+        self.length = 0
+        self.by_modname = {}
+        self.by_parname = {}
+
+    def sync(self, lst):
+        if lst is not self.lst or len(lst) < self.length:
+            self.lst = lst
+            self.length = 0
+            self.by_modname = {}
+            self.by_parname = {}
+        for idx in range(self.length, len(lst)):
+            param = lst[idx]
+            self.by_modname.setdefault((param.module, param.parname), []).append(idx)
+            self.by_parname.setdefault(param.parname, []).append(idx)
+        self.length = len(lst)
+        return self
+
+
+_params_index = _param_index()
+_Cparams_index = _param_index()
+
+
+def _record_lookup():
+    # Attribute this lookup to the first calling frame outside this module.
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__") == __name__:
+        frame = frame.f_back
+    if frame is None:
+        lookup_counts["<unknown>"] += 1
+    else:
+        lookup_counts[frame.f_globals.get("__name__", "?") + "." + frame.f_code.co_name] += 1
+
+
+def print_lookup_profile(num_callers=20):
+    total = sum(lookup_counts.values())
+    print("NRPy_param_funcs: " + str(total) + " parameter lookups; top callers:")
+    for caller, count in lookup_counts.most_common(num_callers):
+        print("%10d  %s" % (count, caller))
+
 
 def initialize_param(param):
     if get_params_idx(param) == -1:
@@ -48,18 +103,19 @@ def initialize_Cparam(param):
 #    return the list index of `params` that matches `input`.
 # On error returns -1
 def get_params_idx(param, Cparam=False):
-    # inspired by: https://stackoverflow.com/questions/2917372/how-to-search-a-list-of-tuples-in-python:
+    if profile_lookups:
+        _record_lookup()
     if Cparam==False:
-        lst = [i for i, v in enumerate(glb_params_list)
-               if (param.type == "ignoretype" or param.type == v[0]) and param.module == v[1] and param.parname == v[2]]
+        candidates = _params_index.sync(glb_params_list).by_modname.get((param.module, param.parname), [])
+        lst = [i for i in candidates if param.type == "ignoretype" or param.type == glb_params_list[i][0]]
     else:
-        lst = [i for i, v in enumerate(glb_Cparams_list) if param.parname == v[2]]
+        lst = _Cparams_index.sync(glb_Cparams_list).by_parname.get(param.parname, [])
     if lst == []:
         return -1  # No match found => error out!
     if len(lst) > 1:
         print("Error: Found multiple parameters matching " + str(param))
         sys.exit(1)
-    return lst.pop()  # pop() returns the index
+    return lst[0]
 
 
 def get_params_value(param):
@@ -79,18 +135,20 @@ def idx_from_str(varname,modname=""):
         modname=splitstring[0]
         varname=splitstring[1]
 
-    # inspired by: https://stackoverflow.com/questions/2917372/how-to-search-a-list-of-tuples-in-python:
+    if profile_lookups:
+        _record_lookup()
+    index = _params_index.sync(glb_params_list)
     if modname == "":
-        lst = [i for i, v in enumerate(glb_params_list) if v[2] == varname]
+        lst = index.by_parname.get(varname, [])
     else:
-        lst = [i for i, v in enumerate(glb_params_list) if (v[1] == modname and v[2] == varname)]
+        lst = index.by_modname.get((modname, varname), [])
     if lst == []:
         print("Error: Could not find a parameter matching \""+varname+"\" in \n",wrapper.fill(str(glb_params_list)))
         sys.exit(1)
     if len(lst) > 1:
         print("Error: Found more than one parameter named \""+varname+"\". Use get_params_value() instead.")
         sys.exit(1)
-    return lst.pop()
+    return lst[0]
 
 
 def parval_from_str(string):
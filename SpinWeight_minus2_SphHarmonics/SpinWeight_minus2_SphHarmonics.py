@@ -16,8 +16,9 @@
 
 # Step 1: Initialize needed Python/NRPy+ modules
 from outputC import outputC       # NRPy+: Core C code output module
+import NRPy_cache                 # NRPy+: Persistent on-disk cache for codegen results
 import sympy as sp                # SymPy: The Python computer algebra package upon which NRPy+ depends
-import os                         # Python built-in: Multiplatform operating system functions
+import os, sys                    # Python built-in: Multiplatform operating system functions
 
 # Step 2: Defining the Goldberg function
 
@@ -45,7 +46,106 @@ def Y(s, l, m, th, ph, GenerateMathematicaCode=False):
                 4 * sp.pi * sp.factorial(l + s) * sp.factorial(l - s))) * sp.sin(th / 2) ** (2 * l) * Sum)
 
 
-def SpinWeight_minus2_SphHarmonics(maximum_l=8,filename=os.path.join("SpinWeight_minus2_SphHarmonics","SpinWeight_minus2_SphHarmonics.h")):
+# Step 2.c: Y() calls sp.simplify(), which dominates the cost of generating
+#           C code for the spin-weighted spherical harmonics (the CSE and C
+#           code emission of each mode are already cached by outputC()).
+#           Y_cached(s,l,m) returns Y(s,l,m,th,ph) in terms of the th,ph
+#           declared above, memoized in memory and in the NRPy_cache
+#           on-disk cache (namespace "SpinWeight_SphHarmonics").
+Y_cached_dict = {}
+def Y_cached(s, l, m):
+    if (s, l, m) in Y_cached_dict:
+        return Y_cached_dict[(s, l, m)]
+    expr = None
+    if NRPy_cache.enable:
+        key = NRPy_cache.cache_key("Y", s, l, m, sp.__version__, NRPy_cache.source_hash(sys.modules[__name__]))
+        expr = NRPy_cache.load("SpinWeight_SphHarmonics", key)
+    if expr is None:
+        expr = Y(s, l, m, th, ph)
+        if NRPy_cache.enable:
+            NRPy_cache.store("SpinWeight_SphHarmonics", key, expr)
+    Y_cached_dict[(s, l, m)] = expr
+    return expr
+
+
+# Step 2.d: C code for Y_{s, l,m}(th,ph) at arbitrary l,m (chosen at runtime),
+#           with no per-mode code, so its size and compile time are
+#           independent of the maximum l. This uses
+#             Y_{s, l,m}(th,ph) = sqrt((2l+1)/(4 pi)) d^l_{m,-s}(th) e^{i m ph},
+#           which agrees with the Goldberg formula in Y() above, where the
+#           Wigner d-function is written in terms of the Jacobi polynomial
+#           P_k^{(a,b)}(cos th), which is evaluated via its three-term
+#           recurrence relation in k (see, e.g., Wikipedia's article on
+#           the Wigner D-matrix).
+#           Returns the C function
+#             void name(const int l, const int m, const REAL th, const REAL ph,
+#                       REAL *reYlmswm2_l_m, REAL *imYlmswm2_l_m)
+#           which sets Y_{s, l,m}(th,ph) = 0 for l < |s|, like Y() does.
+def SpinWeight_SphHarmonics_recurrence_Ccode(s=-2, name="SpinWeight_minus2_SphHarmonics"):
+    return r"""// Compute at a single point (th,ph) the spin-weight s="""+str(s)+r""" spherical harmonic Y_{s, l,m}(th,ph)
+//   = sqrt((2l+1)/(4 pi)) d^l_{m,-s}(th) e^{i m ph}, via the Jacobi polynomial recurrence relation.
+void """+name+r"""(const int l, const int m, const REAL th, const REAL ph,
+     REAL *reYlmswm2_l_m, REAL *imYlmswm2_l_m) {
+  if(l<0 || m<-l || m>+l) {
+    fprintf(stderr, "ERROR: """+name+r""" is defined only for l>=0 and m=[-l,+l].\n");
+    fprintf(stderr, "       You chose l=%d and m=%d, which is out of these bounds.\n",l,m);
+    exit(1);
+  }
+  if(l < """+str(abs(s))+r""") {
+    *reYlmswm2_l_m = 0.0;
+    *imYlmswm2_l_m = 0.0;
+    return;
+  }
+  // Wigner d^l_{mp,mm}(th) = (-1)^lambda sqrt(binomial(2l-k,k+a)/binomial(k+b,b))
+  //                          * sin(th/2)^a cos(th/2)^b P_k^{(a,b)}(cos(th)),
+  //   where k = min(l+mm, l-mm, l+mp, l-mp), and a,b,lambda >= 0 depend on which is smallest:
+  const int mp = m, mm = """+str(-s)+r""";
+  int k = l+mm, a = mp-mm, lambda = mp-mm;
+  if(l-mm < k) { k = l-mm; a = mm-mp; lambda = 0;     }
+  if(l+mp < k) { k = l+mp; a = mm-mp; lambda = 0;     }
+  if(l-mp < k) { k = l-mp; a = mp-mm; lambda = mp-mm; }
+  const int b = 2*l - 2*k - a;
+
+  // P_k^{(a,b)}(x), from P_0 = 1 and P_1 = (a+1) + (a+b+2)(x-1)/2, via
+  //   2n(n+a+b)(2n+a+b-2) P_n = (2n+a+b-1)[(2n+a+b)(2n+a+b-2) x + a^2-b^2] P_{n-1}
+  //                             - 2(n+a-1)(n+b-1)(2n+a+b) P_{n-2}
+  const REAL x = cos(th);
+  REAL P_nm1 = 0.0, P_n = 1.0;
+  if(k >= 1) {
+    P_nm1 = P_n;
+    P_n = (a+1) + 0.5*(a+b+2)*(x-1.0);
+  }
+  for(int n=2;n<=k;n++) {
+    const int c = 2*n + a + b;
+    const REAL P_np1 = ((c-1)*((REAL)(c*(c-2))*x + (REAL)(a*a - b*b))*P_n - 2.0*(n+a-1)*(n+b-1)*c*P_nm1)
+      / (2.0*n*(n+a+b)*(c-2));
+    P_nm1 = P_n;
+    P_n = P_np1;
+  }
+
+  // binomial(n,r) = prod_{i=1}^{r} (n-r+i)/i
+  REAL binomial_ratio = 1.0;
+  for(int i=1;i<=k+a;i++) binomial_ratio *= (REAL)(2*l-2*k-a+i) / (REAL)i;
+  for(int i=1;i<=b;i++)   binomial_ratio *= (REAL)i / (REAL)(k+i);
+
+  const REAL wigner_d = ((lambda % 2 == 0) ? 1.0 : -1.0) * sqrt(binomial_ratio)
+    * pow(sin(0.5*th), a) * pow(cos(0.5*th), b) * P_n;
+  const REAL norm_wigner_d = sqrt((2*l+1) / (4.0*M_PI)) * wigner_d;
+  *reYlmswm2_l_m = norm_wigner_d * cos(m*ph);
+  *imYlmswm2_l_m = norm_wigner_d * sin(m*ph);
+}
+"""
+
+
+def SpinWeight_minus2_SphHarmonics(maximum_l=8,filename=os.path.join("SpinWeight_minus2_SphHarmonics","SpinWeight_minus2_SphHarmonics.h"),
+                                   enable_SWSH_recurrence=False):
+
+    # enable_SWSH_recurrence=True: output instead the l-independent C function of Step 2.d,
+    #                              valid for all l>=0 (maximum_l is then ignored).
+    if enable_SWSH_recurrence:
+        with open(filename, "w") as file:
+            file.write(SpinWeight_SphHarmonics_recurrence_Ccode(s=-2, name="SpinWeight_minus2_SphHarmonics"))
+        return
 
     # Step 3: (DISABLED FOR NOW; PASSES TEST).
     #         Code Validation against Mathematica notebook:
@@ -82,7 +182,7 @@ if(l<0 || l>"""+str(maximum_l)+""" || m<-l || m>+l) {
             file.write("        switch(m) {\n")
             for m in range(-l,l+1):
                 file.write("            case "+str(m)+":\n")
-                Y_m2_lm = Y(-2, l, m, th, ph)
+                Y_m2_lm = Y_cached(-2, l, m)
                 Cstring = outputC([sp.re(Y_m2_lm),sp.im(Y_m2_lm)],["*reYlmswm2_l_m","*imYlmswm2_l_m"],
                                   "returnstring",outCparams)
                 file.write(Cstring)
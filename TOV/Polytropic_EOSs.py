@@ -581,6 +581,75 @@ def polytropic_index_from_P(eos, P_in):
     return polytropic_index
 
 
+# Function     : polytropic_index_from_rhob_array(), polytropic_index_from_P_array()
+# Author(s)    : Leo Werneck and Zach Etienne
+# Description  : Array-native versions of polytropic_index_from_rhob() and
+#                polytropic_index_from_P(). rho_poly_tab and P_poly_tab are
+#                in increasing order, so the number of table entries strictly
+#                less than the input, i.e., the polytropic index, is found by
+#                a binary search (np.searchsorted) for every input at once.
+# Dependencies : none
+#
+# Input(s)     : eos              - named tuple; see polytropic_index_from_rhob()
+#                rho_in/P_in      - scalar or array of values of rho/P for which
+#                                   we compute the polytropic index
+#
+# Output(s)    : integer array of polytropic indices, with the shape of the input
+
+def polytropic_index_from_rhob_array(eos, rho_in):
+    rho_in = np.asarray(rho_in, dtype=float)
+    if eos.neos==1:
+        return np.zeros(rho_in.shape, dtype=int)
+    return np.searchsorted(np.asarray(eos.rho_poly_tab[:eos.neos-1], dtype=float), rho_in, side="left")
+
+def polytropic_index_from_P_array(eos, P_in):
+    P_in = np.asarray(P_in, dtype=float)
+    if eos.neos==1:
+        return np.zeros(P_in.shape, dtype=int)
+    return np.searchsorted(np.asarray(eos.P_poly_tab[:eos.neos-1], dtype=float), P_in, side="left")
+
+
+# Function     : Polytrope_EOS__compute_P_cold_from_rhob_array(),
+#                Polytrope_EOS__compute_rhob_from_P_cold_array(),
+#                Polytrope_EOS__compute_eps_cold_from_rhob_array(),
+#                Polytrope_EOS__compute_rhob_and_eps_cold_from_P_cold_array()
+# Author(s)    : Leo Werneck
+# Description  : Array-native versions of the scalar functions of the same
+#                names (without the _array suffix), which they match
+#                elementwise. The per-piece constants K_j, Gamma_j and C_j
+#                are gathered using the polytropic index arrays computed above.
+# Dependencies : polytropic_index_from_rhob_array(), polytropic_index_from_P_array()
+#
+# Inputs       : eos              - named tuple; see Polytrope_EOS__compute_P_cold_from_rhob()
+#                rho_baryon/P     - scalar or array of values of rho_b/P_cold
+#
+# Outputs      : arrays of P_cold, rho_b, and/or eps_cold, with the shape of the input
+
+def Polytrope_EOS__compute_P_cold_from_rhob_array(eos, rho_baryon):
+    rho_baryon = np.asarray(rho_baryon, dtype=float)
+    j = polytropic_index_from_rhob_array(eos, rho_baryon)
+    return np.asarray(eos.K_poly_tab, dtype=float)[j]*rho_baryon**np.asarray(eos.Gamma_poly_tab, dtype=float)[j]
+
+def Polytrope_EOS__compute_rhob_from_P_cold_array(eos, P):
+    P = np.asarray(P, dtype=float)
+    j = polytropic_index_from_P_array(eos, P)
+    return (P/np.asarray(eos.K_poly_tab, dtype=float)[j])**(1.0/np.asarray(eos.Gamma_poly_tab, dtype=float)[j])
+
+def Polytrope_EOS__compute_eps_cold_from_rhob_array(eos, rho_baryon):
+    rho_baryon = np.asarray(rho_baryon, dtype=float)
+    j      = polytropic_index_from_rhob_array(eos, rho_baryon)
+    Gamma  = np.asarray(eos.Gamma_poly_tab, dtype=float)[j]
+    P_cold = np.asarray(eos.K_poly_tab, dtype=float)[j]*rho_baryon**Gamma
+    # As in the scalar version, eps_cold = 0 wherever rho_b = 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eps_cold = np.asarray(eos.eps_integ_const_tab, dtype=float)[j] + P_cold/(rho_baryon*(Gamma - 1.0))
+    return np.where(rho_baryon == 0.0, 0.0, eps_cold)
+
+def Polytrope_EOS__compute_rhob_and_eps_cold_from_P_cold_array(eos, P):
+    rho_b = Polytrope_EOS__compute_rhob_from_P_cold_array(eos, P)
+    return rho_b, Polytrope_EOS__compute_eps_cold_from_rhob_array(eos, rho_b)
+
+
 # Function     : generate_IllinoisGRMHD_EOS_parameter_file()
 # Author(s)    : Leo Werneck and Zach Etienne
 # Description  : This function computes P_cold for a polytropic EOS
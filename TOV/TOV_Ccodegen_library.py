@@ -8,10 +8,22 @@ import sympy as sp                  # SymPy: The Python computer algebra package
 import NRPy_param_funcs as par      # NRPy+: Parameter interface
 import indexedexp as ixp            # NRPy+: Symbolic indexed expression (e.g., tensors, vectors, etc.) support
 import reference_metric as rfm      # NRPy+: Reference metric support
+import sys                          # Standard Python module for multiplatform OS-level functions
 
 
-def ID_persist_str():
-    return r"""
+# Radii agreeing to within this relative tolerance share one entry in the radial profile
+#   cache set by TOV_cache_radial_profiles() (see add_to_Cfunction_dict_TOV_cache_radial_profiles()).
+radial_cache_rtol = 1e-13
+
+
+# enable_interp_precompute=True: TOV_read_data_file_set_ID_persist() also precomputes the
+#   barycentric weights of every interpolation stencil, and a lookup table for the
+#   interpolation index; TOV_interpolate_1D() then needs neither bisection nor
+#   O(interp_stencil_size^2) Lagrange basis evaluations, and looks up radii cached by
+#   TOV_cache_radial_profiles() first. All three functions, and ID_persist_str(), must
+#   be called with the same enable_interp_precompute.
+def ID_persist_str(enable_interp_precompute=False):
+    ID_persist = r"""
   REAL Rbar;      // rbar corresponding to the outermost radius at which density is nonzero
   int Rbar_idx;   // Index (line of data file) corresponding to Rbar
   int interp_stencil_size;  // Lagrange polynomial interpolation stencil size
@@ -26,9 +38,21 @@ def ID_persist_str():
   REAL *restrict exp4phi_arr;  // Metric quantity
   REAL *restrict rbar_arr;  // Rbar coordinate
 """
+    if enable_interp_precompute:
+        ID_persist += r"""  // Set by TOV_read_data_file_set_ID_persist():
+  REAL *restrict bary_weights; // Barycentric weights of the stencil starting at idxmin: bary_weights[idxmin*interp_stencil_size + i]
+  int num_idx_guess;           // Number of entries in idx_guess[]
+  REAL log_rbar_min, inv_dlog_rbar; // idx_guess[] is uniformly spaced in log(rbar), starting at log(rbar_arr[0])
+  int *restrict idx_guess;     // idx_guess[b]: largest index with rbar_arr[idx] <= exp(log_rbar_min + b/inv_dlog_rbar)
+  // Set by TOV_cache_radial_profiles() (num_cached_radii = 0 if not called):
+  int num_cached_radii;        // Number of (sorted) radii in cached_rbar[]
+  REAL *restrict cached_rbar;  // Radii at which TOV_interpolate_1D() outputs are cached
+  REAL *restrict cached_profiles; // rho,rho_baryon,P,M,expnu,exp4phi at cached_rbar[i]: cached_profiles[6*i + (0..5)]
+"""
+    return ID_persist
 
 # TOV_read_data_file_set_ID_persist(): Read TOV data file and store data to the ID_persist struct
-def add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist(interp_stencil_size=12):
+def add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist(interp_stencil_size=12, enable_interp_precompute=False):
     includes = ["NRPy_basic_defines.h"]
     desc = "Returns the number of lines in a TOV data file."
     c_type = "void"
@@ -37,7 +61,7 @@ def add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist(interp_stencil_size=
     body = r"""
   char filename[100];
   snprintf(filename, 100, input_filename);
-  FILE *TOV_solution_datafile = fopen(filename, "r");
+  FILE *TOV_solution_datafile = fopen(filename, "rb");
   if(TOV_solution_datafile == NULL) {
     fprintf(stderr,"ERROR: could not open TOV solution data file %s\n",filename);
     exit(1);
@@ -48,83 +72,205 @@ def add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist(interp_stencil_size=
   //   order interpolant.
   ID_persist->interp_stencil_size = """+str(interp_stencil_size)+r""";
 
+  // Binary data files, written by TOV_Solver(output_format="binary"), start with the 8-byte magic
+  //   string "NRPyTOV\0", followed by a header (see TOV/TOV_Solver.py) and the data columns,
+  //   each of which is read with a single fread(). Any other file is parsed as a text data file.
+  char magic[8];
+  const int is_binary_datafile = (fread(magic, 1, 8, TOV_solution_datafile) == 8 && memcmp(magic, "NRPyTOV", 8) == 0);
   int numlines_in_file = 0;
-  {
-    char * line = NULL;
-
-    size_t len = 0;
-    ssize_t read;
-    while ((read = getline(&line, &len, TOV_solution_datafile)) != -1) {
-      numlines_in_file++;
+  if(is_binary_datafile) {
+    int32_t version = 0, num_columns;
+    int64_t numlines, Rbar_idx;
+    double Rbar;
+    char column_names[16][16]; // At most 16 columns (TOV_BINARY_MAX_COLUMNS in TOV/tov_interp.h)
+    if(fread(&version, sizeof(int32_t), 1, TOV_solution_datafile) != 1 || version != 1) {
+      fprintf(stderr,"Error: TOV data file %s has unsupported version (or byte order) %d.\n",filename,version);
+      exit(1);
+    }
+    if(fread(&num_columns, sizeof(int32_t), 1, TOV_solution_datafile) != 1 ||
+       num_columns < 1 || num_columns > 16 ||
+       fread(&numlines,    sizeof(int64_t), 1, TOV_solution_datafile) != 1 ||
+       fread(&Rbar_idx,    sizeof(int64_t), 1, TOV_solution_datafile) != 1 ||
+       fread(&Rbar,        sizeof(double),  1, TOV_solution_datafile) != 1 ||
+       fread(column_names, 16, num_columns, TOV_solution_datafile) != (size_t)num_columns) {
+      fprintf(stderr,"Error reading header of %s\n", filename); exit(1);
+    }
+    // numlines_in_file, and all indices into the data arrays, are ints.
+    if(numlines < 1 || numlines > INT32_MAX) {
+      fprintf(stderr,"Error: TOV data file %s has %lld lines; only 1 to %d are supported.\n",
+              filename,(long long)numlines,(int)INT32_MAX);
+      exit(1);
+    }
+    numlines_in_file = (int)numlines;
+    ID_persist->numlines_in_file = numlines_in_file;
+
+    // The columns are stored contiguously, in the order given by column_names. Read each column
+    //   needed here directly into its own array (converting if REAL is not double), so that, as
+    //   for text data files, every ID_persist->*_arr is a separately malloc'd array.
+    const char *names[8] = { "r_Schw", "rho", "rho_baryon", "P", "M", "expnu", "exp4phi", "rbar" };
+    REAL **arrs[8] = { (REAL **)&ID_persist->r_Schw_arr, (REAL **)&ID_persist->rho_arr, (REAL **)&ID_persist->rho_baryon_arr,
+                       (REAL **)&ID_persist->P_arr, (REAL **)&ID_persist->M_arr, (REAL **)&ID_persist->expnu_arr,
+                       (REAL **)&ID_persist->exp4phi_arr, (REAL **)&ID_persist->rbar_arr };
+    for(int which=0;which<8;which++) *arrs[which] = NULL;
+    double *column = (sizeof(REAL) == sizeof(double)) ? NULL : (double *)malloc(sizeof(double)*numlines_in_file);
+    for(int col=0;col<num_columns;col++) {
+      int which = 0;
+      while(which < 8 && strncmp(column_names[col], names[which], 16) != 0) which++;
+      if(which == 8 || *arrs[which] != NULL) {
+        // Skip columns not needed here.
+        if(fseek(TOV_solution_datafile, sizeof(double)*numlines_in_file, SEEK_CUR) != 0) {
+          fprintf(stderr,"Error reading %s\n", filename); exit(1);
+        }
+        continue;
+      }
+      *arrs[which] = (REAL *)malloc(sizeof(REAL)*numlines_in_file);
+      double *dest = (sizeof(REAL) == sizeof(double)) ? (double *)*arrs[which] : column;
+      if(fread(dest, sizeof(double), numlines_in_file, TOV_solution_datafile) != (size_t)numlines_in_file) {
+        fprintf(stderr,"Error reading %s\n", filename); exit(1);
+      }
+      if(sizeof(REAL) != sizeof(double)) {
+        for(int i=0;i<numlines_in_file;i++) (*arrs[which])[i] = (REAL)column[i];
+      }
     }
+    free(column);
+    fclose(TOV_solution_datafile);
+    for(int which=0;which<8;which++) {
+      if(*arrs[which] == NULL) {
+        fprintf(stderr,"Error: column %s not found in TOV data file %s.\n",names[which],filename); exit(1);
+      }
+    }
+
+    // Rbar and Rbar_idx are stored in the header.
+    ID_persist->Rbar     = (REAL)Rbar;
+    ID_persist->Rbar_idx = (int)Rbar_idx;
+  } else {
     rewind(TOV_solution_datafile);
+    {
+      char * line = NULL;
 
-    free(line);
-  }
-  ID_persist->numlines_in_file = numlines_in_file;
+      size_t len = 0;
+      ssize_t read;
+      while ((read = getline(&line, &len, TOV_solution_datafile)) != -1) {
+        numlines_in_file++;
+      }
+      rewind(TOV_solution_datafile);
 
-  // Now that numlines_in_file is set, we can now allocate memory for all arrays.
-  {
-    ID_persist->r_Schw_arr     = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->rho_arr        = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->rho_baryon_arr = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->P_arr          = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->M_arr          = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->expnu_arr      = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->exp4phi_arr    = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-    ID_persist->rbar_arr       = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
-  }
+      free(line);
+    }
+    ID_persist->numlines_in_file = numlines_in_file;
+
+    // Now that numlines_in_file is set, we can now allocate memory for all arrays.
+    {
+      ID_persist->r_Schw_arr     = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->rho_arr        = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->rho_baryon_arr = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->P_arr          = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->M_arr          = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->expnu_arr      = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->exp4phi_arr    = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+      ID_persist->rbar_arr       = (REAL *restrict)malloc(sizeof(REAL)*numlines_in_file);
+    }
 
-  {
-    char * line = NULL;
-
-    size_t len = 0;
-    ssize_t read;
-
-    int which_line = 0;
-    while ((read = getline(&line, &len, TOV_solution_datafile)) != -1) {
-      // Define the line delimiters (i.e., the stuff that goes between the data on a given
-      //     line of data.  Here, we define both spaces " " and tabs "\t" as data delimiters.
-      const char delimiters[] = " \t";
-
-      // Now we define "token", a pointer to the first column of data
-      char *token;
-
-      // Each successive time we call strtok(NULL,blah), we read in a new column of data from
-      //     the originally defined character array, as pointed to by token.
-
-      token=strtok(line, delimiters); if(token==NULL) { fprintf(stderr, "Error reading %s\n", filename); exit(1); }
-      ID_persist->r_Schw_arr[which_line]     = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->rho_arr[which_line]        = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->rho_baryon_arr[which_line] = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->P_arr[which_line]          = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->M_arr[which_line]          = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->expnu_arr[which_line]      = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->exp4phi_arr[which_line]    = strtod(token, NULL); token = strtok( NULL, delimiters );
-      ID_persist->rbar_arr[which_line]       = strtod(token, NULL);
-
-      which_line++;
+    {
+      char * line = NULL;
+
+      size_t len = 0;
+      ssize_t read;
+
+      int which_line = 0;
+      while ((read = getline(&line, &len, TOV_solution_datafile)) != -1) {
+        // Define the line delimiters (i.e., the stuff that goes between the data on a given
+        //     line of data.  Here, we define both spaces " " and tabs "\t" as data delimiters.
+        const char delimiters[] = " \t";
+
+        // Now we define "token", a pointer to the first column of data
+        char *token;
+
+        // Each successive time we call strtok(NULL,blah), we read in a new column of data from
+        //     the originally defined character array, as pointed to by token.
+
+        token=strtok(line, delimiters); if(token==NULL) { fprintf(stderr, "Error reading %s\n", filename); exit(1); }
+        ID_persist->r_Schw_arr[which_line]     = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->rho_arr[which_line]        = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->rho_baryon_arr[which_line] = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->P_arr[which_line]          = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->M_arr[which_line]          = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->expnu_arr[which_line]      = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->exp4phi_arr[which_line]    = strtod(token, NULL); token = strtok( NULL, delimiters );
+        ID_persist->rbar_arr[which_line]       = strtod(token, NULL);
+
+        which_line++;
+      }
+      free(line);
+
+      fclose(TOV_solution_datafile);
     }
-    free(line);
 
-    fclose(TOV_solution_datafile);
+    {
+      // Finally set Rbar and Rbar_idx
+      ID_persist->Rbar     = -100.0;
+      ID_persist->Rbar_idx = -100;
+      for(int i=1;i<numlines_in_file;i++) {
+        if(ID_persist->rho_arr[i-1] > 0  &&  ID_persist->rho_arr[i] == 0) {
+          ID_persist->Rbar = ID_persist->rbar_arr[i-1];
+          ID_persist->Rbar_idx = i-1;
+        }
+      }
+    }
   }
-
+  if(ID_persist->Rbar < 0) {
+    fprintf(stderr,"Error: could not find rbar=Rbar (i.e., the surface of the star) from data file.\n");
+    exit(1);
+  }
+"""
+    if enable_interp_precompute:
+        body += r"""
+  // Precompute the barycentric weights w_i = 1/prod_{j!=i} (rbar_i - rbar_j) of every interpolation
+  //   stencil {idxmin, ..., idxmin+interp_stencil_size-1}, so that TOV_interpolate_1D() can evaluate
+  //   the Lagrange basis in O(interp_stencil_size) operations.
   {
-    // Finally set Rbar and Rbar_idx
-    ID_persist->Rbar     = -100.0;
-    ID_persist->Rbar_idx = -100;
-    for(int i=1;i<numlines_in_file;i++) {
-      if(ID_persist->rho_arr[i-1] > 0  &&  ID_persist->rho_arr[i] == 0) {
-        ID_persist->Rbar = ID_persist->rbar_arr[i-1];
-        ID_persist->Rbar_idx = i-1;
+    const int interp_stencil_size = ID_persist->interp_stencil_size;
+    const int num_stencils = numlines_in_file - interp_stencil_size + 1;
+    const REAL *restrict rbar_arr = ID_persist->rbar_arr;
+    ID_persist->bary_weights = (REAL *restrict)malloc(sizeof(REAL)*num_stencils*interp_stencil_size);
+#pragma omp parallel for
+    for(int idxmin=0;idxmin<num_stencils;idxmin++) {
+      for(int i=0;i<interp_stencil_size;i++) {
+        REAL denom = 1.0;
+        for(int j=0;j<interp_stencil_size;j++) {
+          if(j != i) denom *= rbar_arr[idxmin+i] - rbar_arr[idxmin+j];
+        }
+        ID_persist->bary_weights[idxmin*interp_stencil_size + i] = 1.0/denom;
       }
     }
-    if(ID_persist->Rbar < 0) {
-      fprintf(stderr,"Error: could not find rbar=Rbar (i.e., the surface of the star) from data file.\n");
+  }
+
+  // Set up the idx_guess[] lookup table, which maps rbar directly to a nearby index of rbar_arr[].
+  //   Data files from TOV_Solver() are sampled with adaptive steps inside the star and logarithmically
+  //   outside, so the table is uniformly spaced in log(rbar).
+  {
+    const REAL *restrict rbar_arr = ID_persist->rbar_arr;
+    if(rbar_arr[0] <= 0) {
+      fprintf(stderr,"Error: interpolation index lookup table requires rbar > 0 at all radii in %s.\n",filename);
       exit(1);
     }
+    const int num_idx_guess = numlines_in_file;
+    ID_persist->num_idx_guess = num_idx_guess;
+    ID_persist->log_rbar_min  = log(rbar_arr[0]);
+    ID_persist->inv_dlog_rbar = (REAL)(num_idx_guess-1) / (log(rbar_arr[numlines_in_file-1]) - ID_persist->log_rbar_min);
+    ID_persist->idx_guess = (int *restrict)malloc(sizeof(int)*num_idx_guess);
+    int idx = 0;
+    for(int b=0;b<num_idx_guess;b++) {
+      const REAL rbar_b = exp(ID_persist->log_rbar_min + b/ID_persist->inv_dlog_rbar);
+      while(idx < numlines_in_file-1 && rbar_arr[idx+1] <= rbar_b) idx++;
+      ID_persist->idx_guess[b] = idx;
+    }
   }
+
+  // No radial profiles are cached until TOV_cache_radial_profiles() is called.
+  ID_persist->num_cached_radii = 0;
+  ID_persist->cached_rbar      = NULL;
+  ID_persist->cached_profiles  = NULL;
 """
     add_to_Cfunction_dict(
         includes=includes,
@@ -134,7 +280,7 @@ def add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist(interp_stencil_size=
         enableCparameters=False)
 
 # TOV_interpolate_1D(): Interpolate TOV data to any desired distance from the center of the star
-def add_to_Cfunction_dict_TOV_interpolate_1D():
+def add_to_Cfunction_dict_TOV_interpolate_1D(enable_interp_precompute=False):
     includes=["NRPy_basic_defines.h"]
     prefunc = r"""
 // Find interpolation index using Bisection root-finding algorithm:
@@ -167,6 +313,58 @@ static inline int bisection_idx_finder(const REAL rrbar, const int numlines_in_f
   fprintf(stderr,"INTERPOLATION BRACKETING ERROR: DID NOT CONVERGE.\n");
   exit(1);
 }
+"""
+    if enable_interp_precompute:
+        prefunc += r"""
+// Find interpolation index (the same index as bisection_idx_finder()) using the idx_guess[]
+//   lookup table: rbar_arr[idx_guess[b]] <= rrbar < rbar_arr[idx_guess[b+1]+1] for rrbar in
+//   table entry b, leaving a bisection over only a few indices (if any).
+static inline int lookup_table_idx_finder(const REAL rrbar, const ID_persist_struct *ID_persist) {
+  const int numlines_in_file = ID_persist->numlines_in_file;
+  const int num_idx_guess    = ID_persist->num_idx_guess;
+  const REAL *restrict rbar_arr = ID_persist->rbar_arr;
+  if((rrbar-rbar_arr[0])*(rrbar-rbar_arr[numlines_in_file-1]) >= 0) {
+    fprintf(stderr,"INTERPOLATION BRACKETING ERROR %e | %e %e\n",rrbar,rrbar-rbar_arr[0],rrbar-rbar_arr[numlines_in_file-1]);
+    exit(1);
+  }
+  const int b = MIN(MAX((int)((log(rrbar) - ID_persist->log_rbar_min)*ID_persist->inv_dlog_rbar), 0), num_idx_guess-1);
+  int x1 = ID_persist->idx_guess[b];
+  int x2 = b+1 < num_idx_guess ? MIN(ID_persist->idx_guess[b+1]+1, numlines_in_file-1) : numlines_in_file-1;
+  // Guard against roundoff error in b:
+  while(x1 > 0 && rbar_arr[x1] > rrbar) x1--;
+  while(x2 < numlines_in_file-1 && rbar_arr[x2] <= rrbar) x2++;
+  // Now rbar_arr[x1] <= rrbar < rbar_arr[x2]:
+  while(x2-x1 > 1) {
+    const int x_midpoint = (x1+x2)/2;
+    if(rbar_arr[x_midpoint] <= rrbar) x1 = x_midpoint;
+    else                              x2 = x_midpoint;
+  }
+  // If rbar_arr[x1] is closer to rrbar than rbar_arr[x2] then return x1:
+  if(fabs(rrbar-rbar_arr[x1]) < fabs(rrbar-rbar_arr[x2])) return x1;
+  // Otherwise return x2:
+  return x2;
+}
+
+// Return the index of the radius in ID_persist->cached_rbar[] that agrees with rrbar to within
+//   the cache tolerance, and lies on the same side of the stellar surface; -1 if there is none.
+static inline int cached_radius_idx(const REAL rrbar, const ID_persist_struct *ID_persist) {
+  const int num_cached_radii = ID_persist->num_cached_radii;
+  const REAL *restrict cached_rbar = ID_persist->cached_rbar;
+  if(num_cached_radii == 0) return -1;
+  // Find the nearest cached radius by bisection:
+  int x1 = 0;
+  int x2 = num_cached_radii-1;
+  while(x2-x1 > 1) {
+    const int x_midpoint = (x1+x2)/2;
+    if(cached_rbar[x_midpoint] <= rrbar) x1 = x_midpoint;
+    else                                 x2 = x_midpoint;
+  }
+  const int idx = fabs(rrbar-cached_rbar[x1]) < fabs(rrbar-cached_rbar[x2]) ? x1 : x2;
+  const REAL Rbar = ID_persist->Rbar;
+  if(fabs(rrbar-cached_rbar[idx]) <= """ + str(radial_cache_rtol) + r"""*cached_rbar[idx] &&
+     (rrbar < Rbar) == (cached_rbar[idx] < Rbar) && (rrbar > Rbar) == (cached_rbar[idx] > Rbar)) return idx;
+  return -1;
+}
 """
     desc = """Read a TOV solution from data file and perform
 1D interpolation of the solution to a desired radius.
@@ -195,10 +393,33 @@ Author: Zachariah B. Etienne
 
   // For this case, we know that for all functions, f(r) = f(-r)
   if(rrbar < 0) rrbar = -rrbar;
+"""
+    if enable_interp_precompute:
+        body += r"""
+  // If the profile at this radius has been cached by TOV_cache_radial_profiles(), we are done:
+  {
+    const int cache_idx = cached_radius_idx(rrbar,ID_persist);
+    if(cache_idx >= 0) {
+      const REAL *restrict profile = &ID_persist->cached_profiles[6*cache_idx];
+      *rho        = profile[0];
+      *rho_baryon = profile[1];
+      *P          = profile[2];
+      *M          = profile[3];
+      *expnu      = profile[4];
+      *exp4phi    = profile[5];
+      return;
+    }
+  }
 
+  // First find the central interpolation stencil index:
+  int idx = lookup_table_idx_finder(rrbar,ID_persist);
+"""
+    else:
+        body += r"""
   // First find the central interpolation stencil index:
   int idx = bisection_idx_finder(rrbar,numlines_in_file,rbar_arr);
-
+"""
+    body += r"""
 
   int idxmin = MAX(0,idx-interp_stencil_size/2-1);
 
@@ -209,10 +430,37 @@ Author: Zachariah B. Etienne
     idxmin = MIN(idxmin,Rbar_idx - interp_stencil_size + 1);
   } else {
     idxmin = MAX(idxmin,Rbar_idx+1);
-    idxmin = MIN(idxmin,numlines_in_file - interp_stencil_size + 1);
+    idxmin = MIN(idxmin,numlines_in_file - interp_stencil_size);
   }
   // Now perform the Lagrange polynomial interpolation:
-
+"""
+    if enable_interp_precompute:
+        body += r"""
+  // First set the interpolation coefficients, l_i(r) = (w_i/(r-r_i)) / sum_j (w_j/(r-r_j)),
+  //   from the precomputed barycentric weights w_i:
+  const REAL *restrict bary_weights = &ID_persist->bary_weights[idxmin*interp_stencil_size];
+  REAL l_i_of_r[interp_stencil_size];
+  {
+    REAL sum = 0.0;
+    int exact_idx = -1;
+    for(int i=0;i<interp_stencil_size;i++) {
+      const REAL rrbar_minus_rbar_i = rrbar - rbar_arr[idxmin+i];
+      if(rrbar_minus_rbar_i == 0) exact_idx = i;
+      l_i_of_r[i] = bary_weights[i] / rrbar_minus_rbar_i;
+      sum += l_i_of_r[i];
+    }
+    if(exact_idx >= 0) {
+      // rrbar coincides with a sample point:
+      for(int i=0;i<interp_stencil_size;i++) l_i_of_r[i] = 0.0;
+      l_i_of_r[exact_idx] = 1.0;
+    } else {
+      const REAL inv_sum = 1.0 / sum;
+      for(int i=0;i<interp_stencil_size;i++) l_i_of_r[i] *= inv_sum;
+    }
+  }
+"""
+    else:
+        body += r"""
   // First set the interpolation coefficients:
   REAL rbar_sample[interp_stencil_size];
   for(int i=idxmin;i<idxmin+interp_stencil_size;i++) {
@@ -232,7 +480,8 @@ Author: Zachariah B. Etienne
     }
     l_i_of_r[i] = numer/denom;
   }
-
+"""
+    body += r"""
   // Then perform the interpolation:
   *rho = 0.0;
   *rho_baryon = 0.0;
@@ -270,6 +519,74 @@ Author: Zachariah B. Etienne
         enableCparameters=False)
 
 
+# TOV_cache_radial_profiles(): Cache TOV_interpolate_1D() outputs at all radii of a grid on which
+#   rbar depends on xx0 only (e.g., Spherical-like coordinates centered on the star), so that
+#   setting up initial data costs only one interpolation per radial grid index. Requires
+#   enable_interp_precompute=True (see ID_persist_str()). TOV_interpolate_1D() looks up
+#   radii in the cache to within the relative tolerance radial_cache_rtol (e.g., radii of
+#   grid points at different angles, which differ by roundoff), and interpolates directly
+#   at all other radii (e.g., if the grid is offset from the star's center).
+def add_to_Cfunction_dict_TOV_cache_radial_profiles():
+    xx1_or_xx2 = {rfm.xx[1], rfm.xx[2]}
+    if rfm.xxSph[0].free_symbols & xx1_or_xx2:
+        print("Error: TOV_cache_radial_profiles() requires a CoordSystem in which rbar depends on xx0 only; "
+              "CoordSystem = " + par.parval_from_str("reference_metric::CoordSystem") + " is not supported.")
+        sys.exit(1)
+    includes = ["NRPy_basic_defines.h", "NRPy_function_prototypes.h"]
+    prefunc = r"""
+static int compare_REALs(const void *a, const void *b) {
+  const REAL l = *(const REAL *)a, r = *(const REAL *)b;
+  return (l > r) - (l < r);
+}
+"""
+    desc = """Cache TOV_interpolate_1D() outputs at the (unique) radii of all points on the grid,
+in ID_persist->cached_rbar[] and ID_persist->cached_profiles[]."""
+    c_type = "void"
+    name = "TOV_cache_radial_profiles"
+    params = "const paramstruct *restrict params, REAL *restrict xx[3], ID_persist_struct *restrict ID_persist"
+    body = r"""
+  const int Nxx_plus_2NGHOSTS0 = params->Nxx_plus_2NGHOSTS0;
+
+  // In this CoordSystem rbar depends on xx0 only; sample it along a single line of constant (xx1,xx2).
+  REAL *restrict radii = (REAL *restrict)malloc(sizeof(REAL)*Nxx_plus_2NGHOSTS0);
+  for(int i0=0;i0<Nxx_plus_2NGHOSTS0;i0++) {
+    REAL xCart[3];  xx_to_Cart(params, xx, i0,NGHOSTS,NGHOSTS, xCart);
+    radii[i0] = sqrt(xCart[0]*xCart[0] + xCart[1]*xCart[1] + xCart[2]*xCart[2]);
+  }
+
+  // Sort the radii, and remove those agreeing to within the cache tolerance (e.g., radii of
+  //   inner ghost zones, which mirror radii of the grid interior).
+  qsort(radii, Nxx_plus_2NGHOSTS0, sizeof(REAL), compare_REALs);
+  int num_cached_radii = 0;
+  for(int i=0;i<Nxx_plus_2NGHOSTS0;i++) {
+    if(num_cached_radii == 0 || radii[i] - radii[num_cached_radii-1] > """ + str(radial_cache_rtol) + r"""*radii[num_cached_radii-1]) {
+      radii[num_cached_radii++] = radii[i];
+    }
+  }
+
+  // Interpolate the TOV solution to each radius (with the cache disabled while doing so).
+  free(ID_persist->cached_rbar);
+  free(ID_persist->cached_profiles);
+  ID_persist->num_cached_radii = 0;
+  REAL *restrict cached_profiles = (REAL *restrict)malloc(sizeof(REAL)*6*num_cached_radii);
+#pragma omp parallel for
+  for(int i=0;i<num_cached_radii;i++) {
+    REAL *restrict profile = &cached_profiles[6*i];
+    TOV_interpolate_1D(radii[i],ID_persist, &profile[0],&profile[1],&profile[2],&profile[3],&profile[4],&profile[5]);
+  }
+  ID_persist->cached_rbar      = radii;
+  ID_persist->cached_profiles  = cached_profiles;
+  ID_persist->num_cached_radii = num_cached_radii;
+"""
+    add_to_Cfunction_dict(
+        includes=includes,
+        prefunc=prefunc,
+        desc=desc,
+        c_type=c_type, name=name, params=params,
+        body=body,
+        enableCparameters=False)
+
+
 def ADM_quantities_ito_TOV_soln(rbar, theta, expnu, exp4phi):
     # in TOV ID, betaU=BU=KDD=0
     alpha = sp.sqrt(expnu)
@@ -26,6 +26,10 @@
 # Column 5: e^{nu(r)}, g_{tt}(r)
 # Column 6: e^{4 phi(r)}, conformal factor g_{rr}(r)
 # Column 7: rbar(r), Isotropic radius
+#
+# With output_format = "binary", the same columns are instead written to a self-describing
+#   binary file (see write_TOV_solution_file() below), which C codes can read with one
+#   fread() per column (or mmap()) rather than parsing ~10^2-10^6 lines of text.
 
 # rbar refers to the isotropic radius, and
 # R_Schw refers to the Schwarzschild radius
@@ -36,7 +40,77 @@ import scipy.integrate as si        # SciPy: Python module for mathematics, scie
 import math, sys                    # Standard Python modules for math; multiplatform OS-level functions
 import TOV.Polytropic_EOSs as ppeos # NRPy+: Piecewise polytrope equation of state support
 
-# Step 2: The TOV equations
+# Step 2: TOV solution data file I/O
+# Binary TOV solution file layout (native byte order; all offsets 8-byte aligned):
+#   char    magic[8]        = "NRPyTOV" (NUL-terminated); a byte-swapped version field means foreign endianness
+#   int32   version         = 1
+#   int32   num_columns     = 8
+#   int64   numlines        number of radial points
+#   int64   Rbar_idx        index of the last interior point (rho > 0), or -100 if the profile has no surface
+#   double  Rbar            isotropic radius of the star, rbar[Rbar_idx], or -100
+#   char    column_names[num_columns][16]: "r_Schw", "rho", "rho_baryon", "P", "M", "expnu", "exp4phi", "rbar"
+#   double  data[num_columns][numlines]: each column stored contiguously, in the order of column_names
+TOV_binary_magic        = b"NRPyTOV\0"
+TOV_binary_version      = 1
+TOV_binary_column_names = ["r_Schw", "rho", "rho_baryon", "P", "M", "expnu", "exp4phi", "rbar"]
+TOV_binary_header_dtype = np.dtype([("magic", "S8"), ("version", "=i4"),
+                                    ("num_columns", "=i4"), ("numlines", "=i8"), ("Rbar_idx", "=i8"),
+                                    ("Rbar", "=f8"), ("column_names", "S16", (len(TOV_binary_column_names),))])
+
+# Rbar is the isotropic radius at the last point with rho > 0 before the profile drops to rho = 0,
+#   as found by TOV_read_data_file_set_ID_persist() when reading text files.
+def find_Rbar_and_Rbar_idx(rho, rbar):
+    Rbar, Rbar_idx = -100.0, -100
+    surface = np.nonzero((rho[:-1] > 0) & (rho[1:] == 0))[0]
+    if len(surface) > 0:
+        Rbar_idx = int(surface[-1])
+        Rbar     = float(rbar[Rbar_idx])
+    return Rbar, Rbar_idx
+
+# columns: list of the 8 arrays r_Schw, rho, rho_baryon, P, M, expnu, exp4phi, rbar
+def write_TOV_solution_file(outfile, columns, output_format="text"):
+    if output_format == "text":
+        # Special thanks to Leonardo Werneck for pointing out this issue with zip()
+        if sys.version_info[0] < 3:
+            np.savetxt(outfile, zip(*columns), fmt="%.15e")
+        else:
+            np.savetxt(outfile, list(zip(*columns)), fmt="%.15e")
+        return
+    data = np.array(columns, dtype=np.float64)
+    header = np.zeros(1, dtype=TOV_binary_header_dtype)
+    header["magic"]        = TOV_binary_magic
+    header["version"]      = TOV_binary_version
+    header["num_columns"]  = len(TOV_binary_column_names)
+    header["numlines"]     = data.shape[1]
+    header["Rbar"], header["Rbar_idx"] = find_Rbar_and_Rbar_idx(data[1], data[7])
+    header["column_names"] = [name.encode() for name in TOV_binary_column_names]
+    with open(outfile, "wb") as file:
+        file.write(header.tobytes())
+        file.write(np.ascontiguousarray(data).tobytes())
+
+# Returns a dict mapping column names to arrays, plus "Rbar" and "Rbar_idx"; the columns of
+#   binary files are memory-mapped rather than read.
+def read_TOV_solution_file(infile):
+    with open(infile, "rb") as file:
+        is_binary = file.read(len(TOV_binary_magic)) == TOV_binary_magic
+    if not is_binary:
+        data = np.loadtxt(infile, unpack=True)
+        Rbar, Rbar_idx = find_Rbar_and_Rbar_idx(data[1], data[7])
+        names = TOV_binary_column_names
+    else:
+        header = np.fromfile(infile, dtype=TOV_binary_header_dtype, count=1)[0]
+        if header["version"] != TOV_binary_version:
+            print("read_TOV_solution_file() error: "+infile+" has unsupported version (or byte order) "+str(header["version"]))
+            sys.exit(1)
+        names = [name.decode() for name in header["column_names"]]
+        data  = np.memmap(infile, dtype=np.float64, mode="r", offset=TOV_binary_header_dtype.itemsize,
+                          shape=(int(header["num_columns"]), int(header["numlines"])))
+        Rbar, Rbar_idx = float(header["Rbar"]), int(header["Rbar_idx"])
+    solution = dict(zip(names, data))
+    solution["Rbar"], solution["Rbar_idx"] = Rbar, Rbar_idx
+    return solution
+
+# Step 3: The TOV equations
 def TOV_Solver(eos,
                outfile = "outputTOVpolytrope.txt",
                rho_baryon_central = 0.129285,
@@ -44,7 +118,12 @@ def TOV_Solver(eos,
                return_M_RSchw_and_Riso = False,
                accuracy = "medium",
                integrator_type = "default",
-               no_output_File = False):
+               no_output_File = False,
+               output_format = "text"):
+
+    if output_format not in ("text", "binary"):
+        print("TOV_Solver() error: output_format = "+str(output_format)+" unsupported; choose \"text\" or \"binary\".")
+        sys.exit(1)
 
     def TOV_rhs(r_Schw, y) :
     # In \tilde units
@@ -172,32 +251,21 @@ def TOV_Solver(eos,
         #   then copies the data over... over and over... super inefficient.
         r_SchwArr_np     = np.array(r_SchwArr)
         PArr_np          = np.array(PArr)
-        rho_baryonArr_np = np.array(PArr) # This is just to initialize the array
-        for j in range(len(PArr_np)):
-            # Compute rho_b from P
-            rho_baryonArr_np[j] = ppeos.Polytrope_EOS__compute_rhob_from_P_cold(eos,PArr_np[j])
+        # Compute rho_b and eps_cold from P, over the whole profile at once
+        rho_baryonArr_np, eps_coldArr_np = ppeos.Polytrope_EOS__compute_rhob_and_eps_cold_from_P_cold_array(eos,PArr_np)
 
         mArr_np               = np.array(mArr)
         rbarArr_np            = np.array(rbarArr)
         confFactor_exp4phi_np = (r_SchwArr_np/rbarArr_np)**2
 
         # Compute the *total* mass-energy density (as opposed to the *baryonic* mass density)
-        rhoArr_np = []
-        for i in range(len(PArr)):
-            rho_baryon, eps_cold = ppeos.Polytrope_EOS__compute_rhob_and_eps_cold_from_P_cold(eos,PArr[i])
-            rho = (1.0 + eps_cold ) * rho_baryon
-            rhoArr_np.append(rho)
+        rhoArr_np = (1.0 + eps_coldArr_np) * rho_baryonArr_np
 
         if verbose:
             print(len(r_SchwArr_np),len(rhoArr_np),len(rho_baryonArr_np),len(PArr_np),len(mArr_np),len(exp2phiArr_np))
 
-        # Special thanks to Leonardo Werneck for pointing out this issue with zip()
-        if sys.version_info[0] < 3:
-            np.savetxt(outfile, zip(r_SchwArr_np,rhoArr_np,rho_baryonArr_np,PArr_np,mArr_np,exp2phiArr_np,confFactor_exp4phi_np,rbarArr_np),
-                       fmt="%.15e")
-        else:
-            np.savetxt(outfile, list(zip(r_SchwArr_np,rhoArr_np,rho_baryonArr_np,PArr_np,mArr_np,exp2phiArr_np,confFactor_exp4phi_np,rbarArr_np)),
-                       fmt="%.15e")
+        write_TOV_solution_file(outfile, [r_SchwArr_np,rhoArr_np,rho_baryonArr_np,PArr_np,mArr_np,
+                                          exp2phiArr_np,confFactor_exp4phi_np,rbarArr_np], output_format)
 
         return M, R_Schw, R_iso
 
@@ -8,12 +8,51 @@
 #include "stdlib.h"
 #include "math.h"
 #include "string.h"
+#include "stdint.h"
 
 #define REAL double
 
 //#define STANDALONE_UNIT_TEST
 
+// Binary TOV data files, written by TOV_Solver(output_format="binary") (see TOV/TOV_Solver.py for
+//   the layout), start with the 8-byte magic string "NRPyTOV\0". If in1Dpolytrope is a binary data
+//   file, read_TOV_binary_header() reads its header (leaving the file at the start of the data
+//   columns) and returns 1; otherwise it rewinds the file and returns 0.
+#define TOV_BINARY_MAX_COLUMNS 16
+typedef struct {
+  int32_t version, num_columns;
+  int64_t numlines, Rbar_idx;
+  double Rbar;
+  char column_names[TOV_BINARY_MAX_COLUMNS][16];
+} TOV_binary_header;
+
+int read_TOV_binary_header(FILE *in1Dpolytrope, TOV_binary_header *header) {
+  char magic[8];
+  if(fread(magic, 1, 8, in1Dpolytrope) != 8 || memcmp(magic, "NRPyTOV", 8) != 0) {
+    rewind(in1Dpolytrope);
+    return 0;
+  }
+  if(fread(&header->version,     sizeof(int32_t), 1, in1Dpolytrope) != 1 || header->version != 1 ||
+     fread(&header->num_columns, sizeof(int32_t), 1, in1Dpolytrope) != 1 ||
+     header->num_columns < 1 || header->num_columns > TOV_BINARY_MAX_COLUMNS ||
+     fread(&header->numlines,    sizeof(int64_t), 1, in1Dpolytrope) != 1 ||
+     header->numlines < 1 || header->numlines > INT32_MAX || // numlines_in_file is an int
+     fread(&header->Rbar_idx,    sizeof(int64_t), 1, in1Dpolytrope) != 1 ||
+     fread(&header->Rbar,        sizeof(double),  1, in1Dpolytrope) != 1 ||
+     fread(header->column_names, 16, header->num_columns, in1Dpolytrope) != (size_t)header->num_columns) {
+    fprintf(stderr,"ERROR: unsupported or corrupt binary TOV data file header.\n");
+    exit(1);
+  }
+  return 1;
+}
+
 int count_num_lines_in_file(FILE *in1Dpolytrope) {
+  TOV_binary_header header;
+  if(read_TOV_binary_header(in1Dpolytrope, &header)) {
+    rewind(in1Dpolytrope);
+    return header.numlines;
+  }
+
   int numlines_in_file = 0;
   char * line = NULL;
 
@@ -30,6 +69,27 @@ int count_num_lines_in_file(FILE *in1Dpolytrope) {
 
 int read_datafile__set_arrays(FILE *in1Dpolytrope, REAL *restrict r_Schw_arr,REAL *restrict rho_arr,REAL *restrict rho_baryon_arr,REAL *restrict P_arr,
                               REAL *restrict M_arr,REAL *restrict expnu_arr,REAL *restrict exp4phi_arr,REAL *restrict rbar_arr) {
+  TOV_binary_header header;
+  if(read_TOV_binary_header(in1Dpolytrope, &header)) {
+    // Binary data file: the columns are stored contiguously (as doubles, so that REAL must be double),
+    //   in the order given by header.column_names; read each directly into the matching array.
+    const char *names[8] = { "r_Schw", "rho", "rho_baryon", "P", "M", "expnu", "exp4phi", "rbar" };
+    REAL *arrs[8] = { r_Schw_arr, rho_arr, rho_baryon_arr, P_arr, M_arr, expnu_arr, exp4phi_arr, rbar_arr };
+    int num_found = 0;
+    for(int col=0;col<header.num_columns;col++) {
+      REAL *arr = NULL;
+      for(int which=0;which<8;which++) if(strncmp(header.column_names[col], names[which], 16) == 0) arr = arrs[which];
+      if(arr == NULL) {
+        // Skip columns not needed here.
+        if(fseek(in1Dpolytrope, sizeof(double)*header.numlines, SEEK_CUR) != 0) return 1;
+      } else if(fread(arr, sizeof(double), header.numlines, in1Dpolytrope) != (size_t)header.numlines) {
+        return 1;
+      }
+      if(arr != NULL) num_found++;
+    }
+    return num_found == 8 ? 0 : 1;
+  }
+
   char * line = NULL;
 
   size_t len = 0;
@@ -55,7 +55,7 @@ add_test WeylScal4NRPy/tests/test_WeylScal4NRPy.py
 # TODO: add your tests here
 echo "Starting doctest unit tests!"
 failed_unittest=0
-for file in expr_tree.py indexedexp.py loop.py functional.py finite_difference_helpers.py assert_equal.py sugar.py SIMD.py; do
+for file in expr_tree.py indexedexp.py loop.py functional.py finite_difference_helpers.py assert_equal.py sugar.py SIMD.py outputC.py NRPy_cache.py parallel_codegen.py kernel_profile.py autotune.py parallel_symbolic.py diagnostics_generic/read_psi4_swm2_modes.py MoLtimestepping/RK_Butcher_Table_Dictionary.py MoLtimestepping/MoL.py; do
     echo Running doctest on file: $file
     $PYTHONEXEC -m doctest $file
     if [ $? == 1 ]
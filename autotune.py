@@ -0,0 +1,494 @@
+# autotune.py: Select, per C kernel and per CPU, the codegen options
+#              (outputC/FD_outputC parameters, the OpenMP loop layout
+#              and loop tiling) that yield the fastest compiled code, and apply
+#              them automatically in later codegen runs.
+#
+# Tuning: autotune() generates variants of a registered C function
+#   (e.g., Ricci_eval() from BSSN_Ccodegen_library), one per combination
+#   of knob values. Each variant is generated in a fresh Python process,
+#   compiled with cmdline_helper.new_C_compile() together with a main()
+#   that calls the kernel on a synthetic grid of smooth data, and timed.
+#   Variants whose output differs from that of the default options by
+#   more than a relative tolerance are rejected. By default the knobs
+#   are searched greedily, one knob at a time (see greedy_search());
+#   strategy="exhaustive" tries every combination.
+#
+# Profiles: the best options are stored in profiles_file, keyed by CPU
+#   model and by kernel (C function name, CoordSystem, and FD order; see
+#   profile_key()). Codegen functions that support tuning (currently
+#   add_{rhs_eval,Ricci_eval,BSSN_constraints}_to_Cfunction_dict() in
+#   BSSN/BSSN_Ccodegen_library.py) call tuned_options() and apply what
+#   they find. Tuned options never enable SIMD if the caller disabled it,
+#   as SIMD kernels need headers and rfm precomputation set up by the caller.
+#
+# Switches (may be set at runtime, or via environment variable):
+#   autotune.enable           (env: NRPY_AUTOTUNE=1 applies stored profiles; default disabled)
+# Stored profiles are ignored unless enabled, so that by default the same
+#   NRPy+ tree generates the same C code on every machine.
+#
+# Usage (see also benchmarks/autotune_BSSN_kernels.py):
+#   import autotune
+#   import BSSN.BSSN_Ccodegen_library as BCL
+#   task = autotune.autotune_task(BCL.add_Ricci_eval_to_Cfunction_dict, dict(includes=["NRPy_basic_defines.h"]),
+#                                 "Ricci_eval", "Ricci_eval(&params, RFMSTRUCT_OR_XX, in_gfs, auxevol_gfs);",
+#                                 {"reference_metric::CoordSystem": "Spherical",
+#                                  "finite_difference::FD_CENTDERIVS_ORDER": 4})
+#   autotune.autotune(task)
+
+import os, sys, json, time, shutil, inspect, importlib, itertools, platform, subprocess, tempfile  # Standard Python modules
+from collections import namedtuple            # Standard Python: Enable namedtuple data type
+import NRPy_cache                             # NRPy+: Persistent on-disk cache; profiles are stored alongside
+import NRPy_param_funcs as par                # NRPy+: Parameter interface
+
+enable = os.environ.get("NRPY_AUTOTUNE", "0") in ("1", "True", "true")
+
+profiles_file = os.path.join(NRPy_cache.cache_dir, "autotune_profiles.json")
+
+# Candidate values of each knob; the first value is the default, i.e., what
+#   the codegen functions use when no profile exists.
+knobs = {"enable_SIMD": [True, False],
+         "SIMD_find_more_FMAsFMSs": ["True", "False"],
+         "SIMD_find_more_subs": ["False", "True"],
+         "CSE_preprocess": ["False", "True"],
+         "CSE_sorting": ["canonical", "none"],
+         "OMP_pragma_on": ["i2", "i1", "i0"],
+         "tile_size": [None, [0, 4, 4], [0, 8, 8], [0, 16, 16]]}
+
+# Knobs passed to FD_outputC() via its params string; see outputC.parse_outCparams_string().
+outCparams_knobs = ("CSE_sorting", "CSE_preprocess", "SIMD_find_more_subs", "SIMD_find_more_FMAsFMSs")
+
+# Options forced for a given C function name, regardless of profiles; set
+#   by the variant-generating processes spawned by autotune().
+override_options = {}
+
+# func: codegen function registering the C function (must be importable
+#   from its module, i.e., defined at module level); kwargs: dict of
+#   keyword arguments passed to func; func_name: name of the registered
+#   C function; Ccall: C statement calling it, in which RFMSTRUCT_OR_XX is
+#   replaced by &rfmstruct or xx, and the gridfunction arrays in_gfs,
+#   auxevol_gfs, aux_gfs, rhs_gfs are available; parvals: dict of NRPy+
+#   parameter values (e.g., {"reference_metric::CoordSystem": "Spherical"});
+#   outputs: list of the gridfunction arrays compared between variants
+#   (default: all four).
+autotune_task = namedtuple("autotune_task", "func kwargs func_name Ccall parvals outputs")
+autotune_task.__new__.__defaults__ = (None, None)
+
+all_outputs = ("in_gfs", "rhs_gfs", "auxevol_gfs", "aux_gfs")
+
+# One timed variant: options, time per kernel call in seconds (None if
+#   generation, compilation or execution failed, or output was wrong), and
+#   maximum relative difference from the output of the default options.
+variant_result = namedtuple("variant_result", "options time_per_call relerr")
+
+
+def cpu_id():
+    try:
+        with open("/proc/cpuinfo", "r") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def profile_key(func_name, CoordSystem=None, FDorder=None):
+    """ Kernels are tuned separately for each coordinate system and finite-difference order.
+
+    >>> profile_key("Ricci_eval", "Spherical", 4)
+    'Ricci_eval[Spherical,FD4]'
+    """
+    if CoordSystem is None:
+        CoordSystem = par.parval_from_str("reference_metric::CoordSystem")
+    if FDorder is None:
+        FDorder = par.parval_from_str("finite_difference::FD_CENTDERIVS_ORDER")
+    return func_name + "[" + str(CoordSystem) + ",FD" + str(FDorder) + "]"
+
+
+def read_profiles(filename=None):
+    filename = profiles_file if filename is None else filename
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_profiles(profiles, filename=None):
+    filename = profiles_file if filename is None else filename
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        with open(filename, "w") as file:
+            json.dump(profiles, file, indent=1, sort_keys=True)
+        # The file's mtime may not change within its resolution; forget the parsed copy.
+        _profiles_memo.pop(filename, None)
+    except OSError as err:
+        print("autotune warning: could not write profiles file " + filename + ": " + str(err))
+
+
+# Profiles files parsed by tuned_options(), as filename -> ((mtime, size), profiles);
+#   a file is parsed again only once its mtime or size changes.
+_profiles_memo = {}
+
+
+def _memoized_profiles(filename):
+    try:
+        filestat = os.stat(filename)
+        stamp = (filestat.st_mtime_ns, filestat.st_size)
+    except OSError:
+        stamp = None
+    memo = _profiles_memo.get(filename)
+    if memo is None or memo[0] != stamp:
+        memo = (stamp, read_profiles(filename) if stamp is not None else {})
+        _profiles_memo[filename] = memo
+    return memo[1]
+
+
+def tuned_options(func_name, filename=None):
+    """ Options to use when generating C function func_name: those in override_options
+        if set, else those stored for this CPU & kernel in the profiles file, else {}.
+
+    >>> import os, tempfile
+    >>> import reference_metric, finite_difference
+    >>> import autotune
+    >>> enable_orig, autotune.enable = autotune.enable, True
+    >>> filename = os.path.join(tempfile.mkdtemp(), "profiles.json")
+    >>> write_profiles({cpu_id(): {profile_key("Ricci_eval", "Spherical", 4): {"options": {"CSE_sorting": "none"}}}}, filename)
+    >>> par.set_parval_from_str("reference_metric::CoordSystem", "Spherical")
+    >>> par.set_parval_from_str("finite_difference::FD_CENTDERIVS_ORDER", 4)
+    >>> tuned_options("Ricci_eval", filename), tuned_options("rhs_eval", filename)
+    ({'CSE_sorting': 'none'}, {})
+    >>> override_options["Ricci_eval"] = {"OMP_pragma_on": "i1"}
+    >>> tuned_options("Ricci_eval", filename)
+    {'OMP_pragma_on': 'i1'}
+    >>> del override_options["Ricci_eval"]
+    >>> autotune.enable = enable_orig
+    """
+    if func_name in override_options:
+        return dict(override_options[func_name])
+    if not enable:
+        return {}
+    filename = profiles_file if filename is None else filename
+    entry = _memoized_profiles(filename).get(cpu_id(), {}).get(profile_key(func_name), {})
+    return dict(entry.get("options", {}))
+
+
+def apply_tuned_options(func_name, enable_SIMD, OMP_pragma_on, tile_size):
+    """ Returns (enable_SIMD, OMP_pragma_on, tile_size, string to append to the FD_outputC()
+        params string) for C function func_name, given the caller's values.
+
+    >>> override_options["rhs_eval"] = {"enable_SIMD": True, "CSE_sorting": "none", "OMP_pragma_on": "i1"}
+    >>> apply_tuned_options("rhs_eval", False, "i2", [0, 8, 8])
+    (False, 'i1', [0, 8, 8], ',CSE_sorting=none')
+    >>> del override_options["rhs_eval"]
+    """
+    tuned = tuned_options(func_name)
+    enable_SIMD = enable_SIMD and bool(tuned.get("enable_SIMD", True))
+    OMP_pragma_on = tuned.get("OMP_pragma_on", OMP_pragma_on)
+    tile_size = tuned.get("tile_size", tile_size)
+    outCparams = ""
+    for knob in outCparams_knobs:
+        if knob in tuned:
+            outCparams += "," + knob + "=" + str(tuned[knob])
+    return enable_SIMD, OMP_pragma_on, tile_size, outCparams
+
+
+def normalize_options(options, knobs_dict):
+    """ SIMD_* knobs have no effect when SIMD is disabled, nor OMP_pragma_on when loops are
+        tiled; reset them to their defaults, so that equivalent variants are only generated
+        & timed once.
+
+    >>> normalize_options({"enable_SIMD": False, "SIMD_find_more_subs": "True", "CSE_sorting": "none"}, knobs)
+    {'enable_SIMD': False, 'SIMD_find_more_subs': 'False', 'CSE_sorting': 'none'}
+    >>> normalize_options({"OMP_pragma_on": "i1", "tile_size": [0, 8, 8]}, knobs)
+    {'OMP_pragma_on': 'i2', 'tile_size': [0, 8, 8]}
+    """
+    options = dict(options)
+    if not options.get("enable_SIMD", True):
+        for knob in options:
+            if knob.startswith("SIMD_") and knob in knobs_dict:
+                options[knob] = knobs_dict[knob][0]
+    if options.get("tile_size") and "OMP_pragma_on" in options and "OMP_pragma_on" in knobs_dict:
+        options["OMP_pragma_on"] = knobs_dict["OMP_pragma_on"][0]
+    return options
+
+
+def greedy_search(knobs_dict, evaluate, min_improvement=0.0):
+    """ Coordinate descent over knobs_dict, starting from the defaults (first values):
+        for each knob in turn, try each of its values with all other knobs fixed, and
+        keep the fastest; repeat until a full pass yields no improvement of at least
+        the fraction min_improvement. evaluate(options) returns a time, or None for
+        invalid variants, and is called at most once per distinct (normalized) variant.
+        Returns (best options, best time, {variant as JSON string: time}).
+
+    >>> cost = {(0, "x"): 5.0, (1, "x"): 3.0, (2, "x"): 4.0, (0, "y"): 6.0, (1, "y"): 2.0, (2, "y"): None}
+    >>> calls = []
+    >>> def evaluate(options):
+    ...     calls.append((options["a"], options["b"]))
+    ...     return cost[calls[-1]]
+    >>> best, best_time, evaluated = greedy_search({"a": [0, 1, 2], "b": ["x", "y"]}, evaluate)
+    >>> best, best_time, calls
+    ({'a': 1, 'b': 'y'}, 2.0, [(0, 'x'), (1, 'x'), (2, 'x'), (1, 'y'), (0, 'y'), (2, 'y')])
+    """
+    evaluated = {}
+
+    def cached_evaluate(options):
+        options = normalize_options(options, knobs_dict)
+        key = json.dumps(options, sort_keys=True)
+        if key not in evaluated:
+            evaluated[key] = evaluate(options)
+        return evaluated[key]
+
+    best = {knob: values[0] for knob, values in knobs_dict.items()}
+    best_time = cached_evaluate(best)
+    if best_time is None:
+        return best, None, evaluated
+    improved = True
+    while improved:
+        improved = False
+        for knob, values in knobs_dict.items():
+            for value in values:
+                if value == best[knob]:
+                    continue
+                trial = dict(best)
+                trial[knob] = value
+                trial_time = cached_evaluate(trial)
+                if trial_time is not None and trial_time < best_time * (1.0 - min_improvement):
+                    best, best_time, improved = trial, trial_time, True
+    return best, best_time, evaluated
+
+
+def exhaustive_search(knobs_dict, evaluate):
+    evaluated = {}
+    best, best_time = None, None
+    for values in itertools.product(*knobs_dict.values()):
+        options = dict(zip(knobs_dict.keys(), values))
+        options = normalize_options(options, knobs_dict)
+        key = json.dumps(options, sort_keys=True)
+        if key in evaluated:
+            continue
+        evaluated[key] = evaluate(options)
+        if evaluated[key] is not None and (best_time is None or evaluated[key] < best_time):
+            best, best_time = options, evaluated[key]
+    return best, best_time, evaluated
+
+
+# main() of the micro-benchmark driver: sets up a grid of N^3 interior points,
+#   fills all gridfunctions with smooth data, calls the kernel once to warm up,
+#   then ncalls times, and prints the fastest time per call. The gridfunction
+#   arrays in outputs are then written to autotune_output.bin, for validation.
+def _driver_main_body(Ccall, enable_rfm_precompute, outputs=all_outputs):
+    body = r"""  paramstruct params;
+  set_Cparameters_to_default(&params);
+  const int N = atoi(argv[1]), ncalls = atoi(argv[2]);
+  const int Nxx[3] = { N, N, N };
+  REAL *xx[3];
+  set_Nxx_dxx_invdx_params__and__xx(0, Nxx, &params, xx);
+  const int Ntot = params.Nxx_plus_2NGHOSTS0*params.Nxx_plus_2NGHOSTS1*params.Nxx_plus_2NGHOSTS2;
+"""
+    if enable_rfm_precompute:
+        body += r"""  rfm_struct rfmstruct;
+  rfm_precompute_rfmstruct_malloc(&params, &rfmstruct);
+  rfm_precompute_rfmstruct_define(&params, xx, &rfmstruct);
+"""
+    body += r"""  // Add one element to each array, so that none has zero size.
+  REAL *in_gfs      = (REAL *)malloc(sizeof(REAL)*(NUM_EVOL_GFS*Ntot + 1));
+  REAL *rhs_gfs     = (REAL *)calloc(NUM_EVOL_GFS*Ntot + 1, sizeof(REAL));
+  REAL *auxevol_gfs = (REAL *)malloc(sizeof(REAL)*(NUM_AUXEVOL_GFS*Ntot + 1));
+  REAL *aux_gfs     = (REAL *)calloc(NUM_AUX_GFS*Ntot + 1, sizeof(REAL));
+  for(int i=0;i<NUM_EVOL_GFS*Ntot + 1;i++)    in_gfs[i]      = 1.0 + 0.1*sin(0.0137*i);
+  for(int i=0;i<NUM_AUXEVOL_GFS*Ntot + 1;i++) auxevol_gfs[i] = 0.1*cos(0.0071*i);
+
+  """ + Ccall + r"""
+  REAL min_time = 1e300;
+  for(int n=0;n<ncalls;n++) {
+    struct timespec t0, t1;
+    clock_gettime(CLOCK_MONOTONIC, &t0);
+    """ + Ccall + r"""
+    clock_gettime(CLOCK_MONOTONIC, &t1);
+    const REAL time = (t1.tv_sec - t0.tv_sec) + 1e-9*(t1.tv_nsec - t0.tv_nsec);
+    if(time < min_time) min_time = time;
+  }
+  printf("%.9e\n", min_time);
+
+  FILE *file = fopen("autotune_output.bin", "wb");
+"""
+    num_gfs = {"in_gfs": "NUM_EVOL_GFS", "rhs_gfs": "NUM_EVOL_GFS", "auxevol_gfs": "NUM_AUXEVOL_GFS",
+               "aux_gfs": "NUM_AUX_GFS"}
+    for gfs in outputs:
+        body += "  fwrite(" + gfs + ", sizeof(REAL), " + num_gfs[gfs] + "*Ntot + 1, file);\n"
+    body += r"""  fclose(file);
+  return 0;
+"""
+    return body.replace("RFMSTRUCT_OR_XX", "&rfmstruct" if enable_rfm_precompute else "xx")
+
+
+# Runs in a fresh Python process (see _generate_and_run()): generate the C code of
+#   one variant, plus all needed infrastructure and the driver main(), into
+#   spec["Ccodesrootdir"], and compile it into the executable autotune_driver.
+def _build_variant(spec_filename):
+    import outputC as outC
+    import grid as gri
+    import finite_difference as fin
+    import reference_metric as rfm
+    import cmdline_helper as cmd
+
+    with open(spec_filename, "r") as file:
+        spec = json.load(file)
+    Ccodesrootdir = spec["Ccodesrootdir"]
+    func = getattr(importlib.import_module(spec["module"]), spec["func"])
+    kwargs = spec["kwargs"]
+    for parname, value in spec["parvals"].items():
+        par.set_parval_from_str(parname, value)
+
+    # Reference metric precomputation is on by default in the codegen functions that support tuning.
+    enable_rfm_precompute = kwargs.get("enable_rfm_precompute",
+                                       inspect.signature(func).parameters["enable_rfm_precompute"].default
+                                       if "enable_rfm_precompute" in inspect.signature(func).parameters else False)
+    if enable_rfm_precompute:
+        os.makedirs(os.path.join(Ccodesrootdir, "rfm_files"), exist_ok=True)
+        par.set_parval_from_str("reference_metric::rfm_precompute_Ccode_outdir", os.path.join(Ccodesrootdir, "rfm_files"))
+        par.set_parval_from_str("reference_metric::enable_rfm_precompute", "True")
+        par.set_parval_from_str("reference_metric::rfm_precompute_to_Cfunctions_and_NRPy_basic_defines", "True")
+    rfm.reference_metric()
+
+    override_options[spec["func_name"]] = spec["options"]
+    func(**kwargs)
+    enable_SIMD = bool(kwargs.get("enable_SIMD", True)) and bool(spec["options"].get("enable_SIMD", True))
+
+    rfm.register_C_functions(enable_rfm_precompute=enable_rfm_precompute, use_unit_wavespeed_for_find_timestep=True)
+    rfm.register_NRPy_basic_defines(enable_rfm_precompute=enable_rfm_precompute)
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="autotune micro-benchmark driver for " + spec["func_name"] + "()",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=_driver_main_body(spec["Ccall"], enable_rfm_precompute, spec["outputs"]), enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=enable_SIMD)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=enable_SIMD)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    os.makedirs(os.path.join(Ccodesrootdir, "SIMD"), exist_ok=True)
+    shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), "SIMD", "SIMD_intrinsics.h"),
+                os.path.join(Ccodesrootdir, "SIMD"))
+    cmd.new_C_compile(Ccodesrootdir, "autotune_driver", compiler_opt_option=spec["compiler_opt_option"])
+
+
+# Generate, compile and run one variant in Ccodesrootdir. Returns (time per call,
+#   flattened output arrays), or (None, None) on failure; the output of the
+#   generating process is kept in Ccodesrootdir/autotune_build.log.
+def _generate_and_run(task, options, Ccodesrootdir, N, ncalls, compiler_opt_option):
+    import numpy as np
+    os.makedirs(Ccodesrootdir, exist_ok=True)
+    spec = {"Ccodesrootdir": Ccodesrootdir, "module": task.func.__module__, "func": task.func.__name__,
+            "kwargs": task.kwargs if task.kwargs is not None else {}, "func_name": task.func_name,
+            "Ccall": task.Ccall, "parvals": task.parvals if task.parvals is not None else {},
+            "outputs": list(task.outputs) if task.outputs is not None else list(all_outputs),
+            "options": options, "compiler_opt_option": compiler_opt_option}
+    spec_filename = os.path.join(Ccodesrootdir, "autotune_spec.json")
+    with open(spec_filename, "w") as file:
+        json.dump(spec, file, indent=1)
+    nrpy_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(Ccodesrootdir, "autotune_build.log"), "w") as log:
+        retval = subprocess.call([sys.executable, "-c", "import sys; sys.path.insert(0, sys.argv[1]); import autotune; "
+                                                        "autotune._build_variant(sys.argv[2])", nrpy_dir, spec_filename],
+                                 stdout=log, stderr=subprocess.STDOUT)
+    executable = os.path.join(Ccodesrootdir, "autotune_driver")
+    if retval != 0 or not os.path.isfile(executable):
+        return None, None
+    try:
+        output = subprocess.check_output([executable, str(N), str(ncalls)], cwd=Ccodesrootdir)
+        time_per_call = float(output.decode().split()[-1])
+    except (subprocess.CalledProcessError, ValueError, IndexError):
+        return None, None
+    return time_per_call, np.fromfile(os.path.join(Ccodesrootdir, "autotune_output.bin"))
+
+
+def print_report(task, knobs_dict, results, best, best_time, baseline_time):
+    print("autotune: " + task.func_name + "(), " + str(len(results)) + " variants on " + cpu_id() + ":")
+    print("  %-13s %-12s %s" % ("time/call", "max relerr", "options (differing from defaults)"))
+    for result in sorted(results, key=lambda res: (res.time_per_call is None, res.time_per_call)):
+        changed = ",".join(knob + "=" + str(value) for knob, value in sorted(result.options.items())
+                           if value != knobs_dict[knob][0])
+        time_str = "%.4e s" % result.time_per_call if result.time_per_call is not None else "FAILED"
+        relerr_str = "%.1e" % result.relerr if result.relerr is not None else "-"
+        print("  %-13s %-12s %s" % (time_str, relerr_str, changed if changed else "(defaults)"))
+    print("autotune: best options for " + task.func_name + "(): " + json.dumps(best, sort_keys=True) +
+          "; speedup over defaults: " + str(round(baseline_time / best_time, 3)))
+
+
+# Tune task (an autotune_task) over the given knobs (default: all of autotune.knobs),
+#   on a grid of N^3 interior points (rounded up to a multiple of the largest
+#   SIMD width, 8), timing the fastest of ncalls calls of each variant.
+#   Variants whose output differs from that of the defaults by more than a
+#   relative tolerance rtol are rejected; a variant replaces the current best
+#   (in the greedy search) only if it is faster by at least min_improvement.
+#   The best options are stored in the profiles file, unless write_profile=False.
+# Returns (best options, list of variant_result).
+def autotune(task, knobs_dict=None, N=32, ncalls=10, strategy="greedy", min_improvement=0.02, rtol=1e-8,
+             compiler_opt_option="fast", workdir=None, write_profile=True, filename=None, verbose=True):
+    import numpy as np
+    if knobs_dict is None:
+        knobs_dict = knobs
+    if strategy not in ("greedy", "exhaustive"):
+        print("autotune error: strategy must be greedy or exhaustive; got " + str(strategy))
+        sys.exit(1)
+    if task.kwargs is not None and task.kwargs.get("enable_SIMD", True) is False:
+        knobs_dict = {knob: values for knob, values in knobs_dict.items()
+                      if knob != "enable_SIMD" and not knob.startswith("SIMD_")}
+    N = -(-N // 8) * 8
+    keep_workdir = workdir is not None
+    if workdir is None:
+        workdir = tempfile.mkdtemp(prefix="autotune_" + task.func_name + "_")
+
+    results = []
+    baseline = {}
+
+    def evaluate(options):
+        starttime = time.time()
+        time_per_call, output = _generate_and_run(task, options, os.path.join(workdir, "variant" + str(len(results))),
+                                                  N, ncalls, compiler_opt_option)
+        relerr = None
+        if time_per_call is not None:
+            if "output" not in baseline:
+                baseline["output"] = output
+            if output.shape != baseline["output"].shape:
+                time_per_call = None
+            else:
+                relerr = float(np.max(np.abs(output - baseline["output"])) /
+                               max(np.max(np.abs(baseline["output"])), 1e-300))
+                if not relerr <= rtol:
+                    time_per_call = None
+        results.append(variant_result(options, time_per_call, relerr))
+        if verbose:
+            print("autotune: " + task.func_name + "() " + json.dumps(options, sort_keys=True) + ": " +
+                  ("%.4e s/call" % time_per_call if time_per_call is not None else "REJECTED") +
+                  " (" + str(round(time.time() - starttime, 1)) + "s to generate, compile & run)")
+        return time_per_call
+
+    if strategy == "greedy":
+        best, best_time, _evaluated = greedy_search(knobs_dict, evaluate, min_improvement=min_improvement)
+    else:
+        best, best_time, _evaluated = exhaustive_search(knobs_dict, evaluate)
+    if not keep_workdir:
+        shutil.rmtree(workdir)
+
+    baseline_time = results[0].time_per_call if results else None
+    if best_time is None or baseline_time is None:
+        print("autotune warning: the kernel with default options failed to generate, compile or run; "
+              "no profile written for " + task.func_name + "().")
+        return None, results
+    print_report(task, knobs_dict, results, best, best_time, baseline_time)
+    if write_profile:
+        parvals = task.parvals if task.parvals is not None else {}
+        key = profile_key(task.func_name, parvals.get("reference_metric::CoordSystem"),
+                          parvals.get("finite_difference::FD_CENTDERIVS_ORDER"))
+        profiles = read_profiles(filename)
+        profiles.setdefault(cpu_id(), {})[key] = {"options": best, "time_per_call": best_time,
+                                                  "baseline_time_per_call": baseline_time, "N": N,
+                                                  "OMP_NUM_THREADS": os.environ.get("OMP_NUM_THREADS", "default")}
+        write_profiles(profiles, filename)
+    return best, results
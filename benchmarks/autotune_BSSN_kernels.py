@@ -0,0 +1,48 @@
+# autotune_BSSN_kernels.py: Tune the codegen options of the BSSN kernels Ricci_eval(),
+#   rhs_eval() and BSSN_constraints(), as generated by BSSN_Ccodegen_library, on this
+#   CPU (see autotune.py). The best options found are stored in the autotune profiles
+#   file, so that later calls to BSSN_Ccodegen_library.add_*_to_Cfunction_dict() for
+#   the same CoordSystem and FD order use them automatically (when run with
+#   NRPY_AUTOTUNE=1).
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/autotune_BSSN_kernels.py [CoordSystem, default Spherical] [FD order, default 4]
+#                                              [kernels, default Ricci_eval,rhs_eval] [N, default 32] [calls, default 10]
+# Every variant is generated in a new Python process; variants of the CSE options
+#   are not found in the NRPy_cache on the first run, and each takes as long to
+#   generate as the kernel itself (minutes for rhs_eval() at high FD order).
+
+# Step 0: Add NRPy's directory to the path
+import os, sys
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import autotune                             # NRPy+: Tune per-kernel codegen options against compiled runtime
+import BSSN.BSSN_Ccodegen_library as BCL    # NRPy+: BSSN C codegen library
+
+CoordSystem = sys.argv[1] if len(sys.argv) > 1 else "Spherical"
+FDorder = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+kernels = sys.argv[3].split(",") if len(sys.argv) > 3 else ["Ricci_eval", "rhs_eval"]
+N = int(sys.argv[4]) if len(sys.argv) > 4 else 32
+ncalls = int(sys.argv[5]) if len(sys.argv) > 5 else 10
+
+parvals = {"reference_metric::CoordSystem": CoordSystem, "finite_difference::FD_CENTDERIVS_ORDER": FDorder}
+includes = ["NRPy_basic_defines.h", "NRPy_function_prototypes.h"]
+tasks = {"Ricci_eval": autotune.autotune_task(BCL.add_Ricci_eval_to_Cfunction_dict, dict(includes=includes),
+                                              "Ricci_eval", "Ricci_eval(&params, RFMSTRUCT_OR_XX, in_gfs, auxevol_gfs);",
+                                              parvals),
+         "rhs_eval": autotune.autotune_task(BCL.add_rhs_eval_to_Cfunction_dict,
+                                            dict(includes=includes, enable_KreissOliger_dissipation=True),
+                                            "rhs_eval", "rhs_eval(&params, RFMSTRUCT_OR_XX, auxevol_gfs, in_gfs, rhs_gfs);",
+                                            parvals),
+         "BSSN_constraints": autotune.autotune_task(BCL.add_BSSN_constraints_to_Cfunction_dict, dict(includes=includes),
+                                                    "BSSN_constraints",
+                                                    "BSSN_constraints(&params, RFMSTRUCT_OR_XX, in_gfs, auxevol_gfs, aux_gfs);",
+                                                    parvals)}
+
+print("Tuning %s in %s coordinates, FD order %d, on %d^3 grids (OMP_NUM_THREADS=%s)" %
+      (", ".join(kernels), CoordSystem, FDorder, N, os.environ.get("OMP_NUM_THREADS", "default")))
+for kernel in kernels:
+    autotune.autotune(tasks[kernel], N=N, ncalls=ncalls)
+print("Profiles written to " + autotune.profiles_file)
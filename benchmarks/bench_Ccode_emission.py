@@ -0,0 +1,106 @@
+# bench_Ccode_emission.py: Measure the time and peak memory spent *emitting*
+#   the BSSN RHS C kernel, i.e., everything in FD_outputC() apart from the
+#   CSE itself:
+#   1) ccode_postproc(): one regex pass per C math function plus one for
+#      Rationals (the original implementation, reproduced below) versus
+#      the single compiled-regex pass in outputC.py;
+#   2) assembling the kernel by repeated str += versus appending chunks
+#      and joining once;
+#   3) FD_outputC() end-to-end with a warm outputC cache (so that the CSE
+#      is not repeated), returning a string versus streaming into a
+#      file-like sink.
+#   Peak memory is measured with tracemalloc.
+#
+# Usage (from the NRPy+ root directory):
+#   NRPY_CACHE=1 python benchmarks/bench_Ccode_emission.py [FD order, default 8] [CoordSystem, default Cartesian]
+# The first run performs the CSE and fills the NRPy_cache; it takes several minutes.
+# Without NRPY_CACHE=1 (the cache is disabled by default), 3) is skipped.
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, io, re, time, tracemalloc
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import NRPy_param_funcs as par   # NRPy+: Parameter interface
+import reference_metric as rfm   # NRPy+: Reference metric support
+import finite_difference as fin  # NRPy+: Finite difference C code generation module
+import outputC as outC           # NRPy+: Core C code output module
+import NRPy_cache                # NRPy+: Persistent on-disk cache for codegen results
+import BSSN.BSSN_Ccodegen_library as BCL
+
+FDorder = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+CoordSystem = sys.argv[2] if len(sys.argv) > 2 else "Cartesian"
+reps = 5
+
+par.set_parval_from_str("reference_metric::CoordSystem", CoordSystem)
+par.set_parval_from_str("finite_difference::FD_CENTDERIVS_ORDER", FDorder)
+rfm.reference_metric()
+
+betaU, BSSN_RHSs_SymbExpressions = \
+    BCL.BSSN_RHSs__generate_symbolic_expressions(enable_KreissOliger_dissipation=True)
+
+
+def legacy_ccode_postproc(string):
+    # ccode_postproc() as originally implemented, for PRECISION == "double".
+    for func in ['pow', 'sqrt', 'cbrt', 'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'exp', 'log', 'fabs', 'fmin',
+                 'fmax']:
+        string = re.sub(func + r'\(', func + "(", string)
+    return re.sub(r'([0-9.]+)L/([0-9.]+)L', '(\\1 / \\2)', string)
+
+
+def measure(func):
+    # Return (best wall time over reps, peak traced memory of one call).
+    best = 1e300
+    for _rep in range(reps):
+        starttime = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - starttime)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def FD_outputC_to(sink):
+    return fin.FD_outputC(sink, BSSN_RHSs_SymbExpressions, params="outCverbose=False,enable_SIMD=False",
+                          upwindcontrolvec=betaU)
+
+
+starttime = time.time()
+kernel = FD_outputC_to("returnstring")
+print("Generated BSSN RHS kernel (" + CoordSystem + ", FD order " + str(FDorder) + ", outputC cache " +
+      ("enabled" if NRPy_cache.enable else "disabled") + ") in " + str(round(time.time() - starttime, 1)) + "s: " +
+      str(len(kernel)) + " bytes, " + str(kernel.count("\n")) + " lines")
+lines = [line + "\n" for line in kernel.splitlines()]
+# Rationals as emitted by SymPy, before ccode_postproc():
+raw_lines = [re.sub(r'\(([0-9.]+) / ([0-9.]+)\)', '\\1L/\\2L', line) for line in lines]
+assert [legacy_ccode_postproc(line) for line in raw_lines] == [outC.ccode_postproc(line) for line in raw_lines]
+
+
+def concat_lines():
+    outstring = ""
+    for line in lines:
+        outstring += line
+    return outstring
+
+
+def join_lines():
+    outstring = []
+    for line in lines:
+        outstring.append(line)
+    return "".join(outstring)
+
+
+results = [("ccode_postproc, per line (legacy: 15 passes)", measure(lambda: [legacy_ccode_postproc(l) for l in raw_lines])),
+           ("ccode_postproc, per line (single pass)", measure(lambda: [outC.ccode_postproc(l) for l in raw_lines])),
+           ("assemble kernel: str +=", measure(concat_lines)),
+           ("assemble kernel: chunks + one join", measure(join_lines))]
+if NRPy_cache.enable:
+    results += [("FD_outputC -> returnstring (warm cache)", measure(lambda: FD_outputC_to("returnstring"))),
+                ("FD_outputC -> io.StringIO sink (warm cache)", measure(lambda: FD_outputC_to(io.StringIO())))]
+
+print("%-48s %10s %12s" % ("benchmark", "best time", "peak memory"))
+for name, (best, peak) in results:
+    print("%-48s %9.4fs %9.2f MiB" % (name, best, peak / 1024.0**2))
@@ -0,0 +1,130 @@
+# bench_CurviBCs.py: Time the curvilinear boundary condition functions apply_bcs_outerextrap_and_inner()
+#   and apply_bcs_inner_only(), as generated by CurviBoundaryConditions with
+#     enable_SoA_bcstruct=False: loop over boundary points, reading each point's outerpt_bc_struct
+#                                (or innerpt_bc_struct), then over gridfunctions;
+#     enable_SoA_bcstruct=True:  loop over gridfunctions, then over boundary points, streaming through
+#                                flat arrays of the 3D indices (and parities) of all boundary points,
+#   across grid sizes and numbers of evolved gridfunctions NUM_EVOL_GFS (e.g., 24 for BSSN). The
+#   gridfunctions are registered as scalars. The gridfunction data after applying BCs are checked
+#   to be identical in both modes.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_CurviBCs.py [CoordSystem, default SinhSpherical]
+#                                       [grid sizes Nxx0,Nxx1,Nxx2 separated by spaces, default "128,64,2 64,32,32 128,64,64"]
+#                                       [NUM_EVOL_GFS values, default 8,24] [number of calls, default 20]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+driver_main_body = r"""  paramstruct params;
+  set_Cparameters_to_default(&params);
+  const int Nxx[3] = { atoi(argv[1]), atoi(argv[2]), atoi(argv[3]) };
+  const int num_calls = atoi(argv[4]);
+  REAL *xx[3];
+  set_Nxx_dxx_invdx_params__and__xx(0, Nxx, &params, xx);
+  const int Nxx_plus_2NGHOSTS0 = params.Nxx_plus_2NGHOSTS0;
+  const int Nxx_plus_2NGHOSTS1 = params.Nxx_plus_2NGHOSTS1;
+  const int Nxx_plus_2NGHOSTS2 = params.Nxx_plus_2NGHOSTS2;
+  const int Ntot = Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2;
+
+  bc_struct bcstruct;
+  bcstruct_set_up(&params, xx, &bcstruct);
+  int num_outer = 0;
+  for(int which_gz=0;which_gz<NGHOSTS;which_gz++) for(int dirn=0;dirn<3;dirn++) {
+      num_outer += bcstruct.bc_info.num_pure_outer_boundary_points[which_gz][dirn];
+    }
+
+  REAL *restrict gfs = (REAL *restrict)malloc(sizeof(REAL)*NUM_EVOL_GFS*Ntot);
+  for(int i=0;i<NUM_EVOL_GFS*Ntot;i++) gfs[i] = sin(1e-3*i);
+
+  struct timespec t0, t1, t2;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  for(int call=0;call<num_calls;call++) apply_bcs_outerextrap_and_inner(&params, &bcstruct, gfs);
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+  for(int call=0;call<num_calls;call++) apply_bcs_inner_only(&params, &bcstruct, gfs);
+  clock_gettime(CLOCK_MONOTONIC, &t2);
+
+  REAL checksum = 0.0;
+  for(int i=0;i<NUM_EVOL_GFS*Ntot;i++) checksum += gfs[i]*(1 + i%7);
+  printf("%d %d %.9e %.9e %.17e\n", num_outer, bcstruct.bc_info.num_inner_boundary_points,
+         ((t1.tv_sec-t0.tv_sec) + 1e-9*(t1.tv_nsec-t0.tv_nsec))/num_calls,
+         ((t2.tv_sec-t1.tv_sec) + 1e-9*(t2.tv_nsec-t1.tv_nsec))/num_calls, checksum);
+  bcstruct_free(&bcstruct);
+  free(gfs);
+  for(int i=0;i<3;i++) free(xx[i]);
+  return 0;
+"""
+
+
+# Runs in a fresh Python process: generate and compile the C code for one mode into Ccodesrootdir.
+def build(Ccodesrootdir, CoordSystem, num_evol_gfs, enable_SoA_bcstruct):
+    import outputC as outC                      # NRPy+: Core C code output module
+    import NRPy_param_funcs as par              # NRPy+: Parameter interface
+    import grid as gri                          # NRPy+: Functions having to do with numerical grids
+    import finite_difference as fin             # NRPy+: Finite difference C code generation module
+    import reference_metric as rfm              # NRPy+: Reference metric support
+    import cmdline_helper as cmd                # NRPy+: Multi-platform Python command-line interface
+    import CurviBoundaryConditions.CurviBoundaryConditions as CBC  # NRPy+: Curvilinear boundary conditions
+
+    par.set_parval_from_str("reference_metric::CoordSystem", CoordSystem)
+    rfm.reference_metric()
+    gri.register_gridfunctions("EVOL", ["gf" + chr(ord("A") + i // 26) + chr(ord("A") + i % 26) for i in range(num_evol_gfs)])
+    rfm.add_to_Cfunc_dict_set_Nxx_dxx_invdx_params__and__xx()
+    rfm.add_to_Cfunc_dict_xx_to_Cart()
+    rfm.register_NRPy_basic_defines()
+    CBC.CurviBoundaryConditions_register_C_functions(enable_SoA_bcstruct=enable_SoA_bcstruct)
+    CBC.CurviBoundaryConditions_register_NRPy_basic_defines(verbose=False, enable_SoA_bcstruct=enable_SoA_bcstruct)
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="Curvilinear boundary conditions benchmark driver",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=driver_main_body, enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    cmd.new_C_compile(Ccodesrootdir, "CurviBCs_driver", compiler_opt_option="fast")
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--build":
+    build(sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5] == "True")
+    sys.exit(0)
+
+CoordSystem = sys.argv[1] if len(sys.argv) > 1 else "SinhSpherical"
+grid_sizes = [size.split(",") for size in (sys.argv[2] if len(sys.argv) > 2 else "128,64,2 64,32,32 128,64,64").split()]
+num_evol_gfs_list = sys.argv[3].split(",") if len(sys.argv) > 3 else ["8", "24"]
+num_calls = sys.argv[4] if len(sys.argv) > 4 else "20"
+
+print("Curvilinear BCs in %s coordinates, average of %s calls (OMP_NUM_THREADS=%s)" %
+      (CoordSystem, num_calls, os.environ.get("OMP_NUM_THREADS", "default")))
+print("%-13s %6s %17s %20s %22s %20s" % ("grid", "NGFS", "outer/inner pts", "enable_SoA_bcstruct",
+                                         "outerextrap_and_inner", "inner_only"))
+workdir = tempfile.mkdtemp(prefix="bench_CurviBCs")
+for num_evol_gfs in num_evol_gfs_list:
+    for enable_SoA_bcstruct in (False, True):
+        Ccodesrootdir = os.path.join(workdir, "NGFS" + num_evol_gfs + "SoA" + str(enable_SoA_bcstruct))
+        os.makedirs(Ccodesrootdir)
+        with open(os.path.join(Ccodesrootdir, "build.log"), "w") as log:
+            subprocess.check_call([sys.executable, os.path.abspath(__file__), "--build", Ccodesrootdir, CoordSystem,
+                                   num_evol_gfs, str(enable_SoA_bcstruct)], stdout=log, stderr=subprocess.STDOUT)
+    for Nxx in grid_sizes:
+        results = {}
+        for enable_SoA_bcstruct in (False, True):
+            Ccodesrootdir = os.path.join(workdir, "NGFS" + num_evol_gfs + "SoA" + str(enable_SoA_bcstruct))
+            results[enable_SoA_bcstruct] = subprocess.check_output([os.path.join(Ccodesrootdir, "CurviBCs_driver")] +
+                                                                   Nxx + [num_calls]).decode().split()
+            num_outer, num_inner, time_outer_and_inner, time_inner = results[enable_SoA_bcstruct][:4]
+            print("%-13s %6s %17s %20s %19.3f ms %17.3f ms" %
+                  ("x".join(Nxx), num_evol_gfs, num_outer + "/" + num_inner, enable_SoA_bcstruct,
+                   1e3 * float(time_outer_and_inner), 1e3 * float(time_inner)))
+        print("%-13s %6s %17s %20s %21.2fx %19.2fx   (identical gridfunction data: %s)" %
+              ("", "", "", "speedup", float(results[False][2]) / float(results[True][2]),
+               float(results[False][3]) / float(results[True][3]), results[False][4] == results[True][4]))
+shutil.rmtree(workdir)
@@ -0,0 +1,64 @@
+# bench_FD_stencil_table.py: Measure the codegen time spent computing
+#   finite-difference coefficients for every derivative operator
+#   appearing in the BSSN RHSs, with and without the process-wide
+#   FD stencil table in finite_difference.py.
+#
+# Usage (from the NRPy+ root directory):
+#   python benchmarks/bench_FD_stencil_table.py [FD order, default 8] [CoordSystem, default Spherical]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, time
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import NRPy_param_funcs as par   # NRPy+: Parameter interface
+import reference_metric as rfm   # NRPy+: Reference metric support
+import finite_difference as fin  # NRPy+: Finite difference C code generation module
+from finite_difference_helpers import generate_list_of_deriv_vars_from_lhrh_sympyexpr_list, FDparams
+from finite_difference_helpers import extract_from_list_of_deriv_vars__base_gfs_and_deriv_ops_lists
+import BSSN.BSSN_Ccodegen_library as BCL
+
+FDorder = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+CoordSystem = sys.argv[2] if len(sys.argv) > 2 else "Spherical"
+
+par.set_parval_from_str("reference_metric::CoordSystem", CoordSystem)
+par.set_parval_from_str("finite_difference::FD_CENTDERIVS_ORDER", FDorder)
+rfm.reference_metric()
+
+_betaU, BSSN_RHSs_SymbExpressions = \
+    BCL.BSSN_RHSs__generate_symbolic_expressions(enable_KreissOliger_dissipation=True)
+FDparams.upwindcontrolvec = _betaU
+list_of_deriv_vars = generate_list_of_deriv_vars_from_lhrh_sympyexpr_list(BSSN_RHSs_SymbExpressions, FDparams)
+_basegfs, list_of_deriv_operators = \
+    extract_from_list_of_deriv_vars__base_gfs_and_deriv_ops_lists(list_of_deriv_vars)
+
+
+def time_all_operators(clear_table_per_operator=False):
+    starttime = time.time()
+    for deriv_operator in list_of_deriv_operators:
+        if clear_table_per_operator:
+            fin.FD_stencil_table.clear()
+        fin.compute_fdcoeffs_fdstencl(deriv_operator)
+    return time.time() - starttime
+
+
+# 1) No memoization: every operator inverts its own FD matrix (the original behavior).
+fin.FD_stencil_table_file_loaded = True
+t_nomemo = time_all_operators(clear_table_per_operator=True)
+# 2) Process-wide memoization, starting from an empty table.
+fin.FD_stencil_table.clear()
+t_cold = time_all_operators()
+# 3) Memoization seeded from the precomputed on-disk table.
+fin.FD_stencil_table.clear()
+starttime = time.time()
+fin.read_FD_stencil_table()
+t_load = time.time() - starttime
+t_warm = time_all_operators()
+
+print("BSSN RHSs, " + CoordSystem + " coords, FD order " + str(FDorder) + ": " +
+      str(len(list_of_deriv_operators)) + " derivative operators")
+print("  no stencil table             : %8.4f s" % t_nomemo)
+print("  stencil table, empty at start: %8.4f s" % t_cold)
+print("  stencil table, read from disk: %8.4f s (+ %.4f s to read the table)" % (t_warm, t_load))
+print("  codegen time saved           : %8.4f s" % (t_nomemo - t_warm - t_load))
@@ -0,0 +1,165 @@
+# bench_MoL_low_storage.py: Compare the memory footprint, memory traffic, and timings of
+#   MoL_step_forward_in_time(), as generated by MoLtimestepping/MoL.py, for existing methods
+#   (diagonal RK3 with 2 extra sets of gridfunctions; diagonal tables with y_nplus1_running_total,
+#   k_odd & k_even; non-diagonal tables with next_y_input & k1..k_s) and the low-storage methods of
+#   LowStorage_dict (2N, 2R, 2S*: k plus one extra set of gridfunctions, for any number of stages).
+#   The RHS is y_gf' = -lambda_gf y_gf at every point (lambda_gf = 1 + gf/NUM_EVOL_GFS), so the
+#   RHS itself streams one read and one write of NUM_EVOL_GFS gridfunctions per evaluation, as in
+#   e.g. BSSN; no boundary conditions are applied. Reported are:
+#     * the number of NUM_EVOL_GFS-sized sets of gridfunctions (including y_n) and their size;
+#     * gridfunction reads+writes per step in the RK update loops (counted in the generated code),
+#       and in the RHS evaluations (2 per evaluation), in units of NUM_EVOL_GFS*Ntot doubles;
+#     * time per step, time spent in the RK update loops per step (total minus the RHS evaluations,
+#       timed separately), and the resulting bandwidth (bytes read+written per step / time per
+#       step, not counting write-allocate traffic);
+#     * the error at t=2 vs. the exact solution with dt=0.2 and dt=0.1, and the observed order.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_MoL_low_storage.py [Nxx0,Nxx1,Nxx2, default 64,64,64] [NUM_EVOL_GFS, default 24]
+#                                              [number of steps, default 10] [MoL methods, default: all below]
+
+# Step 0: Add NRPy's directory to the path
+import os, re, sys, math, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+default_MoL_methods = ["SSPRK3", "RK4", "DP5", "RK3[2N]", "RK4(3)5[2N]", "RK4(3)5[2R+]C", "SSPRK(10,4)[2S*]"]
+
+driver_main_body = r"""  griddata_struct griddata;
+  set_Cparameters_to_default(&griddata.params);
+  const int Nxx[3] = { atoi(argv[1]), atoi(argv[2]), atoi(argv[3]) };
+  const int num_steps = atoi(argv[5]);
+  const int num_RHS_evals_per_step = atoi(argv[6]);
+  set_Nxx_dxx_invdx_params__and__xx(0, Nxx, &griddata.params, griddata.xx);
+  griddata.params.dt = strtod(argv[4], NULL);
+  const int Ntot = griddata.params.Nxx_plus_2NGHOSTS0*griddata.params.Nxx_plus_2NGHOSTS1*griddata.params.Nxx_plus_2NGHOSTS2;
+
+  MoL_malloc_y_n_gfs(&griddata.params, &griddata.gridfuncs);
+  MoL_malloc_non_y_n_gfs(&griddata.params, &griddata.gridfuncs);
+  // First touch all gridfunctions, so page faults are not timed.
+  for(int i=0;i<NUM_EVOL_GFS*Ntot;i++) griddata.gridfuncs.y_n_gfs[i] = 1.0;
+  rhs_eval(&griddata.params, griddata.gridfuncs.y_n_gfs, griddata.gridfuncs.diagnostic_output_gfs);
+  rhs_eval(&griddata.params, griddata.gridfuncs.y_n_gfs, griddata.gridfuncs.diagnostic_output_gfs2);
+  MoL_step_forward_in_time(&griddata);
+  for(int i=0;i<NUM_EVOL_GFS*Ntot;i++) griddata.gridfuncs.y_n_gfs[i] = 1.0;
+  griddata.params.time = 0.0;
+  griddata.params.n = 0;
+
+  struct timespec t0, t1, t2;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  for(int step=0;step<num_steps;step++) MoL_step_forward_in_time(&griddata);
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+  for(int eval=0;eval<num_steps*num_RHS_evals_per_step;eval++) {
+    rhs_eval(&griddata.params, griddata.gridfuncs.y_n_gfs, griddata.gridfuncs.diagnostic_output_gfs);
+  }
+  clock_gettime(CLOCK_MONOTONIC, &t2);
+
+  REAL max_relerr = 0.0;
+  for(int gf=0;gf<NUM_EVOL_GFS;gf++) {
+    const REAL exact = exp(-(1.0 + (REAL)gf/NUM_EVOL_GFS)*griddata.params.time);
+    const REAL relerr = fabs(griddata.gridfuncs.y_n_gfs[gf*Ntot + Ntot/2]/exact - 1.0);
+    if(relerr > max_relerr) max_relerr = relerr;
+  }
+  printf("%d %.9e %.9e %.17e %.17e\n", Ntot, ((t1.tv_sec-t0.tv_sec) + 1e-9*(t1.tv_nsec-t0.tv_nsec))/num_steps,
+         ((t2.tv_sec-t1.tv_sec) + 1e-9*(t2.tv_nsec-t1.tv_nsec))/num_steps, griddata.params.time, max_relerr);
+  return 0;
+"""
+
+rhs_eval_body = r"""const int Ntot = Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2;
+for(int gf=0;gf<NUM_EVOL_GFS;gf++) {
+  const REAL lambda = 1.0 + (REAL)gf/NUM_EVOL_GFS;
+#pragma omp parallel for
+  for(int i=0;i<Ntot;i++) rhs_gfs[gf*Ntot + i] = -lambda*in_gfs[gf*Ntot + i];
+}
+"""
+
+
+# Runs in a fresh Python process: generate and compile the C code for one MoL method into Ccodesrootdir,
+#   and write the numbers of gridfunction sets, RHS evaluations, and update-loop reads/writes per step.
+def build(Ccodesrootdir, MoL_method, num_evol_gfs):
+    import outputC as outC                      # NRPy+: Core C code output module
+    import NRPy_param_funcs as par              # NRPy+: Parameter interface
+    import grid as gri                          # NRPy+: Functions having to do with numerical grids
+    import finite_difference as fin             # NRPy+: Finite difference C code generation module
+    import reference_metric as rfm              # NRPy+: Reference metric support
+    import cmdline_helper as cmd                # NRPy+: Multi-platform Python command-line interface
+    import MoLtimestepping.MoL as MoL           # NRPy+: Method of Lines timestepping
+
+    par.set_parval_from_str("reference_metric::CoordSystem", "Cartesian")
+    rfm.reference_metric()
+    gri.register_gridfunctions("EVOL", ["gf" + chr(ord("A") + i // 26) + chr(ord("A") + i % 26) for i in range(num_evol_gfs)])
+    rfm.add_to_Cfunc_dict_set_Nxx_dxx_invdx_params__and__xx()
+    rfm.register_NRPy_basic_defines()
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h"],
+        desc="RHS of y_gf' = -lambda_gf y_gf",
+        c_type="void", name="rhs_eval",
+        params="const paramstruct *restrict params, const REAL *restrict in_gfs, REAL *restrict rhs_gfs",
+        body=rhs_eval_body, rel_path_to_Cparams=os.path.join("."))
+    MoL.register_C_functions_and_NRPy_basic_defines(MoL_method=MoL_method,
+                                                    RHS_string="rhs_eval(params, RK_INPUT_GFS, RK_OUTPUT_GFS);",
+                                                    post_RHS_string="")
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="MoL timestepping benchmark driver",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=driver_main_body, enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    cmd.new_C_compile(Ccodesrootdir, "MoL_driver", compiler_opt_option="fast")
+
+    _y_n, non_y_n_gridfunctions_list, _diag, _diag2 = MoL.generate_gridfunction_names(MoL_method)
+    step_forward = outC.outC_function_dict["MoL_step_forward_in_time"]
+    update_reads = len(re.findall(r"const REAL \w+_gfsL = \w+_gfs\[i\];", step_forward))
+    update_writes = len(re.findall(r"\w+_gfs\[i\] = ", step_forward))
+    num_sets = 1 + len([gfs for gfs in non_y_n_gridfunctions_list if gfs != "auxevol_gfs"])  # including y_n_gfs
+    with open(os.path.join(Ccodesrootdir, "counts.txt"), "w") as file:
+        file.write("%d %d %d %d\n" % (num_sets, step_forward.count("rhs_eval("),
+                                      update_reads, update_writes))
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--build":
+    build(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    sys.exit(0)
+
+Nxx = sys.argv[1].split(",") if len(sys.argv) > 1 else ["64", "64", "64"]
+num_evol_gfs = sys.argv[2] if len(sys.argv) > 2 else "24"
+num_steps = sys.argv[3] if len(sys.argv) > 3 else "10"
+MoL_methods = sys.argv[4:] if len(sys.argv) > 4 else default_MoL_methods
+
+print("MoL timestepping on a %s grid, NUM_EVOL_GFS=%s, average of %s steps (OMP_NUM_THREADS=%s)" %
+      ("x".join(Nxx), num_evol_gfs, num_steps, os.environ.get("OMP_NUM_THREADS", "default")))
+print("Traffic in units of one set of NUM_EVOL_GFS gridfunctions; bandwidth excludes write-allocate traffic.")
+print("%-18s %5s %12s %6s %16s %12s %12s %12s %10s %22s %6s" %
+      ("MoL method", "sets", "memory", "RHSs", "traffic upd+RHS", "time/step", "update/step", "RHS/eval", "GB/s",
+       "err dt=0.2 / dt=0.1", "order"))
+workdir = tempfile.mkdtemp(prefix="bench_MoL_low_storage")
+for i, MoL_method in enumerate(MoL_methods):
+    Ccodesrootdir = os.path.join(workdir, "method" + str(i))
+    os.makedirs(Ccodesrootdir)
+    with open(os.path.join(Ccodesrootdir, "build.log"), "w") as log:
+        subprocess.check_call([sys.executable, os.path.abspath(__file__), "--build", Ccodesrootdir, MoL_method,
+                               num_evol_gfs], stdout=log, stderr=subprocess.STDOUT)
+    with open(os.path.join(Ccodesrootdir, "counts.txt")) as file:
+        num_sets, num_RHS_evals, update_reads, update_writes = [int(count) for count in file.read().split()]
+    driver = os.path.join(Ccodesrootdir, "MoL_driver")
+    output = subprocess.check_output([driver] + Nxx + ["0.01", num_steps, str(num_RHS_evals)]).decode().split()
+    set_bytes = 8 * int(num_evol_gfs) * int(output[0])
+    time_per_step, RHS_time_per_step = float(output[1]), float(output[2])
+    errors = []
+    for dt, steps in (("0.2", "10"), ("0.1", "20")):
+        errors.append(float(subprocess.check_output([driver, "8", "8", "8", dt, steps, "0"]).decode().split()[4]))
+    traffic = update_reads + update_writes + 2 * num_RHS_evals
+    print("%-18s %5d %9.1f MB %6d %10d+%-5d %10.2f ms %10.2f ms %10.2f ms %10.2f %11.2e / %.2e %6.2f" %
+          (MoL_method, num_sets, num_sets * set_bytes / 1e6, num_RHS_evals, update_reads + update_writes,
+           2 * num_RHS_evals, 1e3 * time_per_step, 1e3 * (time_per_step - RHS_time_per_step),
+           1e3 * RHS_time_per_step / num_RHS_evals, traffic * set_bytes / time_per_step / 1e9,
+           errors[0], errors[1], math.log2(errors[0] / errors[1])))
+shutil.rmtree(workdir)
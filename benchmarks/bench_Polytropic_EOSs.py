@@ -0,0 +1,57 @@
+# bench_Polytropic_EOSs.py: Compare the scalar piecewise-polytrope EOS
+#   functions in TOV/Polytropic_EOSs.py, called in a Python loop (as
+#   TOV_Solver used to do when constructing its output profile), with
+#   their array-native (np.searchsorted-based) counterparts.
+#
+# Usage (from the NRPy+ root directory):
+#   python benchmarks/bench_Polytropic_EOSs.py [number of points, default 1000000]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, time
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import numpy as np                    # NumPy: A numerical methods module for Python
+import TOV.Polytropic_EOSs as ppeos   # NRPy+: Piecewise polytrope equation of state support
+
+npoints = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+eoss = [("single polytrope", ppeos.set_up_EOS_parameters__complete_set_of_input_variables(1, [], [2.0], 1.0)),
+        ("APR4 (neos=7)", ppeos.set_up_EOS_parameters__Read_et_al_input_variables("APR4"))]
+
+print("%-18s %-40s %10s %10s %8s %10s" % ("EOS", "function", "loop", "array", "speedup", "max relerr"))
+for eosname, eos in eoss:
+    # Span every piece of the EOS, and include the stellar exterior (P = rho_b = 0).
+    rhob = np.logspace(-12, 1, npoints)
+    rhob[0] = 0.0
+    P = ppeos.Polytrope_EOS__compute_P_cold_from_rhob_array(eos, rhob)
+
+    def loop_rhob_and_eps_cold_from_P_cold():
+        rho_b = np.zeros(npoints)
+        eps_cold = np.zeros(npoints)
+        for i in range(npoints):
+            rho_b[i], eps_cold[i] = ppeos.Polytrope_EOS__compute_rhob_and_eps_cold_from_P_cold(eos, P[i])
+        return rho_b, eps_cold
+
+    def loop_P_cold_from_rhob():
+        P_cold = np.zeros(npoints)
+        for i in range(npoints):
+            P_cold[i] = ppeos.Polytrope_EOS__compute_P_cold_from_rhob(eos, rhob[i])
+        return P_cold
+
+    benchmarks = [("rhob_and_eps_cold_from_P_cold", loop_rhob_and_eps_cold_from_P_cold,
+                   lambda: ppeos.Polytrope_EOS__compute_rhob_and_eps_cold_from_P_cold_array(eos, P)),
+                  ("P_cold_from_rhob", loop_P_cold_from_rhob,
+                   lambda: ppeos.Polytrope_EOS__compute_P_cold_from_rhob_array(eos, rhob))]
+    for funcname, loopfunc, arrayfunc in benchmarks:
+        starttime = time.time()
+        loop_result = np.array(loopfunc())
+        t_loop = time.time() - starttime
+        starttime = time.time()
+        array_result = np.array(arrayfunc())
+        t_array = time.time() - starttime
+        nonzero = loop_result != 0.0
+        relerr = np.max(np.abs(array_result[nonzero] - loop_result[nonzero]) / np.abs(loop_result[nonzero]))
+        print("%-18s %-40s %9.3fs %9.4fs %7.0fx %10.1e" % (eosname, funcname, t_loop, t_array,
+                                                           t_loop / max(t_array, 1e-12), relerr))
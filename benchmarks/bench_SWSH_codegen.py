@@ -0,0 +1,114 @@
+# bench_SWSH_codegen.py: Time generating and compiling the C function
+#   SpinWeight_minus2_SphHarmonics(l,m, th,ph, &reY,&imY), as emitted by
+#   BSSN_Ccodegen_library.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict():
+#   1) per-mode switch, generated with an empty NRPy_cache (cold; runs sp.simplify()
+#      and the CSE for every mode),
+#   2) per-mode switch, generated again in a new Python process (warm NRPy_cache),
+#   3) recurrence relation (enable_SWSH_recurrence=True).
+#   Both C functions are then evaluated at the same points for all l<=maximum_l,
+#   and the recurrence-based result is also compared, for l up to
+#   maximum_l_recurrence, with the Goldberg formula evaluated in mpmath with 50 digits.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler):
+#   python benchmarks/bench_SWSH_codegen.py [maximum_l, default 8] [maximum_l_recurrence, default 24]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, shutil, subprocess, tempfile, time
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import numpy as np    # NumPy: A numerical methods module for Python
+import mpmath         # mpmath: Arbitrary-precision arithmetic, used here for reference values
+
+maximum_l = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+maximum_l_recurrence = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+CC = os.environ.get("CC", "gcc")
+workdir = tempfile.mkdtemp(prefix="bench_SWSH_codegen")
+
+# Generate the C function in a fresh Python process (so that nothing is memoized in memory).
+generate_py = r"""
+import sys
+sys.path.append(sys.argv[1])
+import outputC as outC
+import BSSN.BSSN_Ccodegen_library as BCL
+BCL.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(maximum_l=int(sys.argv[2]), enable_SWSH_recurrence=(sys.argv[3] == "True"))
+prefunc = [el for el in outC.outC_function_master_list
+           if el.name == "driver__spherlikegrids__psi4_spinweightm2_decomposition"][-1].prefunc
+with open(sys.argv[4], "w") as file:
+    file.write(prefunc[:prefunc.index("#define SWM2_NUM_MODES")])
+"""
+main_c = r"""
+int main(int argc, char **argv) {
+  const int maximum_l = atoi(argv[1]);
+  const REAL ths[3] = {0.01, 1.1, 3.0}, phs[3] = {-2.5, 0.3, 1.7};
+  for(int l=0;l<=maximum_l;l++) for(int m=-l;m<=l;m++) for(int i=0;i<3;i++) {
+        REAL reY, imY;
+        SpinWeight_minus2_SphHarmonics(l,m, ths[i],phs[i], &reY,&imY);
+        printf("%d %d %.17e %.17e %.17e %.17e\n", l,m, ths[i],phs[i], reY,imY);
+      }
+  return 0;
+}
+"""
+
+
+def generate_and_compile(label, enable_SWSH_recurrence, env):
+    filename = os.path.join(workdir, label + ".c")
+    starttime = time.time()
+    subprocess.check_call([sys.executable, "-c", generate_py, nrpy_dir_path, str(maximum_l),
+                           str(enable_SWSH_recurrence), filename], env=env, stdout=subprocess.DEVNULL)
+    t_generate = time.time() - starttime
+    with open(filename) as file:
+        Ccode = file.read()
+    with open(filename, "w") as file:
+        file.write("#include <stdio.h>\n#include <stdlib.h>\n#include <math.h>\n#define REAL double\n" + Ccode + main_c)
+    starttime = time.time()
+    subprocess.check_call([CC, "-O2", label + ".c", "-o", label, "-lm"], cwd=workdir)
+    t_compile = time.time() - starttime
+    return t_generate, t_compile, len(Ccode)
+
+
+env = dict(os.environ, NRPY_CACHE_DIR=os.path.join(workdir, "nrpy_cache"), NRPY_CACHE="1")
+results = [("switch, cold cache", generate_and_compile("switch", False, env)),
+           ("switch, warm cache", generate_and_compile("switch", False, env)),
+           ("recurrence", generate_and_compile("recurrence", True, env))]
+
+
+def run(label, lmax):
+    output = subprocess.check_output([os.path.join(workdir, label), str(lmax)]).decode()
+    return np.array([[float(x) for x in line.split()] for line in output.splitlines()])
+
+
+switch = run("switch", maximum_l)
+recurrence = run("recurrence", maximum_l)
+maxdiff_switch = np.max(np.abs(switch[:, 4:] - recurrence[:, 4:]))
+
+
+def goldberg_mpmath(s, l, m, th, ph):
+    # Y() in SpinWeight_minus2_SphHarmonics.py, in 50-digit arithmetic.
+    if l < abs(s):
+        return mpmath.mpc(0)
+    th, ph = mpmath.mpf(th), mpmath.mpf(ph)
+    total = mpmath.mpf(0)
+    for r in range(l - s + 1):
+        if 0 <= r + s - m <= l + s:
+            total += (mpmath.binomial(l - s, r) * mpmath.binomial(l + s, r + s - m) * (-1)**(l - r - s) *
+                      mpmath.cot(th / 2)**(2 * r + s - m))
+    return ((-1)**m * mpmath.sqrt(mpmath.factorial(l + m) * mpmath.factorial(l - m) * (2 * l + 1) /
+                                  (4 * mpmath.pi * mpmath.factorial(l + s) * mpmath.factorial(l - s))) *
+            mpmath.sin(th / 2)**(2 * l) * total * mpmath.expjpi(m * ph / mpmath.pi))
+
+
+mpmath.mp.dps = 50
+maxdiff_mpmath = 0.0
+for l, m, th, ph, reY, imY in run("recurrence", maximum_l_recurrence):
+    exact = goldberg_mpmath(-2, int(l), int(m), th, ph)
+    maxdiff_mpmath = max(maxdiff_mpmath, float(abs(exact - mpmath.mpc(reY, imY))))
+shutil.rmtree(workdir)
+
+print("SpinWeight_minus2_SphHarmonics(), maximum_l=%d:" % maximum_l)
+print("%-22s %12s %12s %12s" % ("", "generate", "compile", "C code size"))
+for label, (t_generate, t_compile, size) in results:
+    print("%-22s %11.2fs %11.2fs %10d B" % (label, t_generate, t_compile, size))
+print("max |switch - recurrence|, l<=%d: %.1e" % (maximum_l, maxdiff_switch))
+print("max |recurrence - Goldberg formula (mpmath)|, l<=%d: %.1e" % (maximum_l_recurrence, maxdiff_mpmath))
@@ -0,0 +1,152 @@
+# bench_TOV_interpolation.py: Time the setup of TOV initial data, i.e., TOV_ID_function() (which
+#   interpolates the TOV solution with TOV_interpolate_1D()) at every point of a
+#   Nxx0 x Nxx1 x Nxx2 grid, as generated by TOV_Ccodegen_library with
+#     enable_interp_precompute=False: bisection search and O(interp_stencil_size^2) Lagrange
+#                                     basis evaluation at every grid point;
+#     enable_interp_precompute=True:  barycentric weights and interpolation index lookup table
+#                                     precomputed when reading the data file, plus the radial
+#                                     profile cache set by TOV_cache_radial_profiles() (if rbar
+#                                     depends on xx0 only in this CoordSystem).
+#   The TOV solution is computed by TOV_Solver(), at the given accuracy; reading the data
+#   file (including all precomputation) and caching the radial profiles are timed separately.
+#   The initial data from both modes are compared at every grid point.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_TOV_interpolation.py [CoordSystem, default SinhSpherical]
+#                                                [Nxx0,Nxx1,Nxx2, default 256,128,64]
+#                                                [TOV_Solver accuracy, default high] [interp_stencil_size, default 12]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+# Data written per grid point, for comparison between modes.
+output_fields = ["alpha", "gammaSphorCartDD00", "gammaSphorCartDD11", "T4SphorCartUU00", "T4SphorCartUU11"]
+
+
+def driver_main_body(enable_radial_cache):
+    body = r"""  paramstruct params;
+  set_Cparameters_to_default(&params);
+  const int Nxx[3] = { atoi(argv[2]), atoi(argv[3]), atoi(argv[4]) };
+  REAL *xx[3];
+  set_Nxx_dxx_invdx_params__and__xx(0, Nxx, &params, xx);
+  const int Nxx_plus_2NGHOSTS0 = params.Nxx_plus_2NGHOSTS0;
+  const int Nxx_plus_2NGHOSTS1 = params.Nxx_plus_2NGHOSTS1;
+  const int Nxx_plus_2NGHOSTS2 = params.Nxx_plus_2NGHOSTS2;
+  const int Ntot = Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2;
+  REAL *output = (REAL *)malloc(sizeof(REAL)*""" + str(len(output_fields)) + r"""*Ntot);
+
+  struct timespec t0, t1, t2, t3;
+  ID_persist_struct ID_persist;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  TOV_read_data_file_set_ID_persist(argv[1], &ID_persist);
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+"""
+    if enable_radial_cache:
+        body += "  TOV_cache_radial_profiles(&params, xx, &ID_persist);\n"
+    body += r"""  clock_gettime(CLOCK_MONOTONIC, &t2);
+  LOOP_OMP("omp parallel for", i0,0,Nxx_plus_2NGHOSTS0, i1,0,Nxx_plus_2NGHOSTS1, i2,0,Nxx_plus_2NGHOSTS2) {
+    REAL xCart[3];  xx_to_Cart(&params, xx, i0,i1,i2, xCart);
+    initial_data_struct initial_data;
+    TOV_ID_function(&params, xCart, &ID_persist, &initial_data);
+    const int idx3 = IDX3S(i0,i1,i2);
+"""
+    for i, field in enumerate(output_fields):
+        body += "    output[" + str(len(output_fields)) + "*idx3 + " + str(i) + "] = initial_data." + field + ";\n"
+    body += r"""  }
+  clock_gettime(CLOCK_MONOTONIC, &t3);
+  printf("%.9e %.9e %.9e\n", (t1.tv_sec-t0.tv_sec) + 1e-9*(t1.tv_nsec-t0.tv_nsec),
+         (t2.tv_sec-t1.tv_sec) + 1e-9*(t2.tv_nsec-t1.tv_nsec), (t3.tv_sec-t2.tv_sec) + 1e-9*(t3.tv_nsec-t2.tv_nsec));
+
+  FILE *file = fopen("TOV_ID_output.bin", "wb");
+  fwrite(output, sizeof(REAL), """ + str(len(output_fields)) + r"""*Ntot, file);
+  fclose(file);
+  return 0;
+"""
+    return body
+
+
+# Runs in a fresh Python process: generate and compile the C code for one mode into Ccodesrootdir.
+def build(Ccodesrootdir, CoordSystem, enable_interp_precompute, interp_stencil_size):
+    import outputC as outC                      # NRPy+: Core C code output module
+    import NRPy_param_funcs as par              # NRPy+: Parameter interface
+    import grid as gri                          # NRPy+: Functions having to do with numerical grids
+    import finite_difference as fin             # NRPy+: Finite difference C code generation module
+    import reference_metric as rfm              # NRPy+: Reference metric support
+    import cmdline_helper as cmd                # NRPy+: Multi-platform Python command-line interface
+    import BSSN.ADM_Initial_Data_Reader__BSSN_Converter as IDread  # NRPy+: ADM initial data reader
+    import TOV.TOV_Ccodegen_library as TOVCL    # NRPy+: TOV C codegen library
+
+    par.set_parval_from_str("reference_metric::CoordSystem", CoordSystem)
+    rfm.reference_metric()
+    TOVCL.add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist(interp_stencil_size=interp_stencil_size,
+                                                                   enable_interp_precompute=enable_interp_precompute)
+    TOVCL.add_to_Cfunction_dict_TOV_interpolate_1D(enable_interp_precompute=enable_interp_precompute)
+    TOVCL.add_to_Cfunction_dict_TOV_ID_function()
+    enable_radial_cache = enable_interp_precompute and not rfm.xxSph[0].free_symbols & {rfm.xx[1], rfm.xx[2]}
+    if enable_radial_cache:
+        TOVCL.add_to_Cfunction_dict_TOV_cache_radial_profiles()
+    rfm.register_C_functions(use_unit_wavespeed_for_find_timestep=True)
+    rfm.register_NRPy_basic_defines()
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="TOV initial data setup benchmark driver",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=driver_main_body(enable_radial_cache), enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+    IDread.register_NRPy_basic_defines(ID_persist_struct_contents_str=
+                                       TOVCL.ID_persist_str(enable_interp_precompute=enable_interp_precompute),
+                                       include_T4UU=True)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    cmd.new_C_compile(Ccodesrootdir, "TOV_ID_driver", compiler_opt_option="fast")
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--build":
+    build(sys.argv[2], sys.argv[3], sys.argv[4] == "True", int(sys.argv[5]))
+    sys.exit(0)
+
+import numpy as np
+import TOV.TOV_Solver as TOV                    # NRPy+: Tolman-Oppenheimer-Volkoff solver
+import TOV.Polytropic_EOSs as ppeos             # NRPy+: Piecewise polytrope equation of state support
+
+CoordSystem = sys.argv[1] if len(sys.argv) > 1 else "SinhSpherical"
+Nxx = sys.argv[2].split(",") if len(sys.argv) > 2 else ["256", "128", "64"]
+accuracy = sys.argv[3] if len(sys.argv) > 3 else "high"
+interp_stencil_size = sys.argv[4] if len(sys.argv) > 4 else "12"
+
+workdir = tempfile.mkdtemp(prefix="bench_TOV_interpolation")
+TOV_datafile = os.path.join(workdir, "TOVdata.txt")
+eos = ppeos.set_up_EOS_parameters__complete_set_of_input_variables(1, [], [2.0], 1.0)
+TOV.TOV_Solver(eos, outfile=TOV_datafile, rho_baryon_central=0.129285, verbose=False, accuracy=accuracy)
+with open(TOV_datafile) as file:
+    numlines = sum(1 for _ in file)
+
+print("TOV initial data setup in %s coordinates on a %s grid; %d-line TOV data file (accuracy=%s), "
+      "interp_stencil_size=%s (OMP_NUM_THREADS=%s)" % (CoordSystem, "x".join(Nxx), numlines, accuracy,
+                                                      interp_stencil_size, os.environ.get("OMP_NUM_THREADS", "default")))
+print("%-26s %14s %14s %14s" % ("enable_interp_precompute", "read file", "radial cache", "ID setup"))
+outputs = {}
+for enable_interp_precompute in (False, True):
+    Ccodesrootdir = os.path.join(workdir, "precompute" + str(enable_interp_precompute))
+    os.makedirs(Ccodesrootdir)
+    with open(os.path.join(Ccodesrootdir, "build.log"), "w") as log:
+        subprocess.check_call([sys.executable, os.path.abspath(__file__), "--build", Ccodesrootdir, CoordSystem,
+                               str(enable_interp_precompute), interp_stencil_size], stdout=log, stderr=subprocess.STDOUT)
+    times = subprocess.check_output([os.path.join(Ccodesrootdir, "TOV_ID_driver"), TOV_datafile] + Nxx,
+                                    cwd=Ccodesrootdir).decode().split()
+    print("%-26s %12.4f s %12.4f s %12.4f s" % (enable_interp_precompute, float(times[0]), float(times[1]), float(times[2])))
+    outputs[enable_interp_precompute] = np.fromfile(os.path.join(Ccodesrootdir, "TOV_ID_output.bin"))
+shutil.rmtree(workdir)
+
+relerr = np.abs(outputs[True] - outputs[False]) / np.maximum(np.abs(outputs[False]), 1e-300)
+relerr[outputs[False] == outputs[True]] = 0.0
+print("max relative difference between the initial data of both modes (%s): %.1e" %
+      (", ".join(output_fields), np.max(relerr)))
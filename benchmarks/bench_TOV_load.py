@@ -0,0 +1,147 @@
+# bench_TOV_load.py: Time loading a TOV solution data file with TOV_read_data_file_set_ID_persist()
+#   (as generated by TOV_Ccodegen_library), from the text data file format (one line of 8
+#   "%.15e" columns per radius, counted and then parsed with getline()/strtok()/strtod()) and
+#   from the binary format (header + contiguous float64 columns, read with a single fread()),
+#   both written by TOV.TOV_Solver.write_TOV_solution_file(). To mimic a very high resolution
+#   TOV solution, the profile from TOV_Solver(accuracy="medium") is upsampled to the given number
+#   of rows, separately inside and outside the star (so the stellar surface is preserved).
+#   Loading with read_TOV_solution_file() in Python (np.loadtxt() vs. np.memmap()) is also timed,
+#   and the data loaded in C from both formats are compared.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_TOV_load.py [number of rows, default 1000000] [repetitions, default 3]
+# Files are read right after being written, so load times are for files in the OS page cache.
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, time, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+
+def driver_main_body():
+    return r"""  struct timespec t0, t1;
+  ID_persist_struct ID_persist;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  TOV_read_data_file_set_ID_persist(argv[1], &ID_persist);
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+  printf("%.9e %d %d %.17e\n", (t1.tv_sec-t0.tv_sec) + 1e-9*(t1.tv_nsec-t0.tv_nsec),
+         ID_persist.numlines_in_file, ID_persist.Rbar_idx, ID_persist.Rbar);
+
+  if(argc > 2) {
+    const int n = ID_persist.numlines_in_file;
+    FILE *file = fopen(argv[2], "wb");
+    fwrite(ID_persist.r_Schw_arr,     sizeof(REAL), n, file);
+    fwrite(ID_persist.rho_arr,        sizeof(REAL), n, file);
+    fwrite(ID_persist.rho_baryon_arr, sizeof(REAL), n, file);
+    fwrite(ID_persist.P_arr,          sizeof(REAL), n, file);
+    fwrite(ID_persist.M_arr,          sizeof(REAL), n, file);
+    fwrite(ID_persist.expnu_arr,      sizeof(REAL), n, file);
+    fwrite(ID_persist.exp4phi_arr,    sizeof(REAL), n, file);
+    fwrite(ID_persist.rbar_arr,       sizeof(REAL), n, file);
+    fclose(file);
+  }
+  return 0;
+"""
+
+
+# Runs in a fresh Python process: generate and compile the C driver into Ccodesrootdir.
+def build(Ccodesrootdir):
+    import outputC as outC                      # NRPy+: Core C code output module
+    import NRPy_param_funcs as par              # NRPy+: Parameter interface
+    import grid as gri                          # NRPy+: Functions having to do with numerical grids
+    import finite_difference as fin             # NRPy+: Finite difference C code generation module
+    import reference_metric as rfm              # NRPy+: Reference metric support
+    import cmdline_helper as cmd                # NRPy+: Multi-platform Python command-line interface
+    import BSSN.ADM_Initial_Data_Reader__BSSN_Converter as IDread  # NRPy+: ADM initial data reader
+    import TOV.TOV_Ccodegen_library as TOVCL    # NRPy+: TOV C codegen library
+
+    par.set_parval_from_str("reference_metric::CoordSystem", "Spherical")
+    rfm.reference_metric()
+    TOVCL.add_to_Cfunction_dict_TOV_read_data_file_set_ID_persist()
+    rfm.register_C_functions(use_unit_wavespeed_for_find_timestep=True)
+    rfm.register_NRPy_basic_defines()
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="TOV data file load benchmark driver",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=driver_main_body(), enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+    IDread.register_NRPy_basic_defines(ID_persist_struct_contents_str=TOVCL.ID_persist_str(), include_T4UU=True)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    cmd.new_C_compile(Ccodesrootdir, "TOV_load_driver", compiler_opt_option="fast")
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--build":
+    build(sys.argv[2])
+    sys.exit(0)
+
+import numpy as np
+import TOV.TOV_Solver as TOV                    # NRPy+: Tolman-Oppenheimer-Volkoff solver
+import TOV.Polytropic_EOSs as ppeos             # NRPy+: Piecewise polytrope equation of state support
+
+numrows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+workdir = tempfile.mkdtemp(prefix="bench_TOV_load")
+Ccodesrootdir = os.path.join(workdir, "C")
+os.makedirs(Ccodesrootdir)
+with open(os.path.join(Ccodesrootdir, "build.log"), "w") as log:
+    subprocess.check_call([sys.executable, os.path.abspath(__file__), "--build", Ccodesrootdir],
+                          stdout=log, stderr=subprocess.STDOUT)
+
+# Upsample the TOV_Solver() profile to numrows rows, linearly in the (fractional) row index,
+#   separately for the interior (rho > 0) and exterior rows.
+eos = ppeos.set_up_EOS_parameters__complete_set_of_input_variables(1, [], [2.0], 1.0)
+medium_datafile = os.path.join(workdir, "TOVdata_medium.bin")
+TOV.TOV_Solver(eos, outfile=medium_datafile, rho_baryon_central=0.129285, verbose=False,
+               accuracy="medium", output_format="binary")
+solution = TOV.read_TOV_solution_file(medium_datafile)
+data = np.array([solution[name] for name in TOV.TOV_binary_column_names])
+Rbar_idx = solution["Rbar_idx"]
+num_interior = int(round(numrows * (Rbar_idx + 1) / data.shape[1]))
+columns = []
+for segment, num in ((data[:, :Rbar_idx + 1], num_interior), (data[:, Rbar_idx + 1:], numrows - num_interior)):
+    frac_idx = np.linspace(0, segment.shape[1] - 1, num)
+    columns.append([np.interp(frac_idx, np.arange(segment.shape[1]), column) for column in segment])
+columns = list(np.concatenate(columns, axis=1))
+
+print("Loading a %d-row TOV solution data file (upsampled from %d rows), best of %d" %
+      (numrows, data.shape[1], repetitions))
+print("%-8s %12s %14s %34s %24s" % ("format", "file size", "write (Py)", "TOV_read_data_file_set_ID_persist",
+                                     "read_TOV_solution_file"))
+loaded = {}
+for output_format in ("text", "binary"):
+    datafile = os.path.join(workdir, "TOVdata." + ("txt" if output_format == "text" else "bin"))
+    start = time.time()
+    TOV.write_TOV_solution_file(datafile, columns, output_format)
+    write_time = time.time() - start
+
+    C_times = []
+    for rep in range(repetitions):
+        outfile = [os.path.join(workdir, output_format + "_loaded.bin")] if rep == 0 else []
+        output = subprocess.check_output([os.path.join(Ccodesrootdir, "TOV_load_driver"), datafile] + outfile).decode().split()
+        C_times.append(float(output[0]))
+        if rep == 0:
+            loaded[output_format] = (np.fromfile(outfile[0]), int(output[1]), int(output[2]), float(output[3]))
+    Py_times = []
+    for rep in range(repetitions):
+        start = time.time()
+        Py_solution = TOV.read_TOV_solution_file(datafile)
+        _touch = sum(np.sum(Py_solution[name]) for name in TOV.TOV_binary_column_names)  # touch all data
+        Py_times.append(time.time() - start)
+    print("%-8s %9.1f MB %12.3f s %32.4f s %22.4f s" % (output_format, os.path.getsize(datafile) / 1e6, write_time,
+                                                        min(C_times), min(Py_times)))
+shutil.rmtree(workdir)
+
+text, binary = loaded["text"], loaded["binary"]
+relerr = np.abs(binary[0] - text[0]) / np.maximum(np.abs(text[0]), 1e-300)
+relerr[binary[0] == text[0]] = 0.0
+print("numlines_in_file, Rbar_idx, Rbar: text %d, %d, %.15e; binary %d, %d, %.15e" % (text[1:] + binary[1:]))
+print("max relative difference between the TOV data loaded from both formats: %.1e" % np.max(relerr))
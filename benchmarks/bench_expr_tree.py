@@ -0,0 +1,131 @@
+# bench_expr_tree.py: Microbenchmarks comparing the iterative, explicit-stack
+#   ExprTree in expr_tree.py against the original recursive implementation
+#   (reproduced below as RecursiveExprTree), on the inputs that
+#   cse_preprocess() and expr_convert_to_SIMD_intrins() see in practice:
+#   the BSSN RHSs and the GRMHD fluxes & source terms. Also verifies that
+#   both implementations yield identical results.
+#
+# Usage (from the NRPy+ root directory):
+#   python benchmarks/bench_expr_tree.py [number of repetitions, default 1]
+# Note: the full suite takes ~20 minutes per repetition; GRMHD SIMD conversion dominates.
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, time
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import NRPy_param_funcs as par   # NRPy+: Parameter interface
+import reference_metric as rfm   # NRPy+: Reference metric support
+import expr_tree, cse_helpers, SIMD
+import BSSN.BSSN_Ccodegen_library as BCL
+import GRMHD.equations as GRMHD
+
+
+class RecursiveExprTree:
+    """ The original recursive ExprTree implementation (build/preorder/postorder/reconstruct only). """
+
+    def __init__(self, expr):
+        self.root = self.Node(expr, None)
+        self.build(self.root)
+
+    def build(self, node, clear=True):
+        if clear:
+            del node.children[:]
+        for arg in node.expr.args:
+            subtree = self.Node(arg, node.expr.func)
+            node.children.append(subtree)
+            self.build(subtree)
+
+    def preorder(self, node=None):
+        if node is None:
+            node = self.root
+        yield node
+        for child in node.children:
+            for subtree in self.preorder(child):
+                yield subtree
+
+    def postorder(self, node=None):
+        if node is None:
+            node = self.root
+        for child in node.children:
+            for subtree in self.postorder(child):
+                yield subtree
+        yield node
+
+    def reconstruct(self, evaluate=False):
+        for subtree in self.postorder():
+            if subtree.children:
+                expr_list = [node.expr for node in subtree.children]
+                try:
+                    subtree.expr = subtree.expr.func(*expr_list, evaluate=evaluate)
+                except TypeError:
+                    subtree.expr = subtree.expr.func(*expr_list)
+        return self.root.expr
+
+    class Node:
+        def __init__(self, expr, func):
+            self.expr = expr
+            self.func = func
+            self.children = []
+
+
+def use_ExprTree(cls):
+    cse_helpers.ExprTree = cls
+    SIMD.ExprTree = cls
+
+
+def best_time(func, reps):
+    best = float("inf")
+    result = None
+    for _ in range(reps):
+        starttime = time.time()
+        result = func()
+        best = min(best, time.time() - starttime)
+    return best, result
+
+
+def traverse_and_reconstruct(cls, exprs):
+    results = []
+    for expr in exprs:
+        tree = cls(expr)
+        for _subtree in tree.preorder():
+            pass
+        for _subtree in tree.postorder():
+            pass
+        results.append(tree.reconstruct())
+    return results
+
+
+def SIMD_convert(exprs, map_sym_to_rat):
+    return [SIMD.expr_convert_to_SIMD_intrins(expr, map_sym_to_rat, "", True) for expr in exprs]
+
+
+reps = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+
+par.set_parval_from_str("reference_metric::CoordSystem", "Cartesian")
+rfm.reference_metric()
+_betaU, BSSN_RHSs_SymbExpressions = BCL.BSSN_RHSs__generate_symbolic_expressions(enable_KreissOliger_dissipation=True)
+GRMHD.generate_everything_for_UnitTesting()
+inputs = {"BSSN RHSs": [lhrh.rhs for lhrh in BSSN_RHSs_SymbExpressions],
+          "GRMHD": GRMHD.tau_tilde_fluxU + GRMHD.S_tilde_source_termD + [GRMHD.s_source_term] +
+                   [GRMHD.S_tilde_fluxUD[i][j] for i in range(3) for j in range(3)]}
+
+print("%-10s %-40s %12s %12s %8s" % ("input", "benchmark", "recursive", "iterative", "speedup"))
+for name, exprs in inputs.items():
+    benchmarks = [("build+preorder+postorder+reconstruct", lambda cls: traverse_and_reconstruct(cls, exprs)),
+                  ("cse_preprocess", lambda cls: cse_helpers.cse_preprocess(exprs, declare=True, negative=True))]
+    for bench_name, bench in benchmarks:
+        use_ExprTree(RecursiveExprTree)
+        t_old, result_old = best_time(lambda: bench(RecursiveExprTree), reps)
+        use_ExprTree(expr_tree.ExprTree)
+        t_new, result_new = best_time(lambda: bench(expr_tree.ExprTree), reps)
+        assert result_old == result_new, "ExprTree implementations disagree on " + name + ", " + bench_name
+        print("%-10s %-40s %11.3fs %11.3fs %7.2fx" % (name, bench_name, t_old, t_new, t_old / t_new))
+    preprocessed, map_sym_to_rat = cse_helpers.cse_preprocess(exprs, declare=True, negative=True)
+    use_ExprTree(RecursiveExprTree)
+    t_old, result_old = best_time(lambda: SIMD_convert(preprocessed, map_sym_to_rat), reps)
+    use_ExprTree(expr_tree.ExprTree)
+    t_new, result_new = best_time(lambda: SIMD_convert(preprocessed, map_sym_to_rat), reps)
+    assert result_old == result_new, "ExprTree implementations disagree on " + name + ", SIMD conversion"
+    print("%-10s %-40s %11.3fs %11.3fs %7.2fx" % (name, "expr_convert_to_SIMD_intrins", t_old, t_new, t_old / t_new))
@@ -0,0 +1,94 @@
+# bench_find_timestep.py: Time the CFL timestep function find_timestep(), as generated by
+#   reference_metric.add_to_Cfunction_dict__find_timestep(), with
+#     enable_separable_dsmin=False: OpenMP reduction(min:dsmin) over all interior points of the
+#                                   3D grid, evaluating ds_dirn0,1,2 at every point;
+#     enable_separable_dsmin=True:  minima of the per-coordinate factors of ds_dirn0,1,2 over the
+#                                   1D xx arrays (if the CoordSystem allows it; otherwise both
+#                                   modes generate the same code).
+#   find_timestep() is called the given number of times (e.g., once per regrid), and the
+#   timesteps found in both modes are compared.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_find_timestep.py [CoordSystem, default SinhSpherical]
+#                                            [Nxx0,Nxx1,Nxx2, default 256,256,256] [number of calls, default 10]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+driver_main_body = r"""  paramstruct params;
+  set_Cparameters_to_default(&params);
+  const int Nxx[3] = { atoi(argv[1]), atoi(argv[2]), atoi(argv[3]) };
+  const int num_calls = atoi(argv[4]);
+  REAL *xx[3];
+  set_Nxx_dxx_invdx_params__and__xx(0, Nxx, &params, xx);
+
+  REAL dt = 0.0;
+  struct timespec start, end;
+  clock_gettime(CLOCK_MONOTONIC, &start);
+  for(int call=0;call<num_calls;call++) dt = find_timestep(&params, xx, 0.5);
+  clock_gettime(CLOCK_MONOTONIC, &end);
+  printf("%.9e %.17e\n", ((end.tv_sec-start.tv_sec) + 1e-9*(end.tv_nsec-start.tv_nsec))/num_calls, dt);
+  return 0;
+"""
+
+
+# Runs in a fresh Python process: generate and compile the C code for one mode into Ccodesrootdir.
+def build(Ccodesrootdir, CoordSystem, enable_separable_dsmin):
+    import outputC as outC                      # NRPy+: Core C code output module
+    import NRPy_param_funcs as par              # NRPy+: Parameter interface
+    import grid as gri                          # NRPy+: Functions having to do with numerical grids
+    import finite_difference as fin             # NRPy+: Finite difference C code generation module
+    import reference_metric as rfm              # NRPy+: Reference metric support
+    import cmdline_helper as cmd                # NRPy+: Multi-platform Python command-line interface
+
+    par.set_parval_from_str("reference_metric::CoordSystem", CoordSystem)
+    rfm.reference_metric()
+    rfm.add_to_Cfunction_dict__find_timestep(use_unit_wavespeed=True, enable_separable_dsmin=enable_separable_dsmin)
+    rfm.add_to_Cfunc_dict_set_Nxx_dxx_invdx_params__and__xx()
+    rfm.register_NRPy_basic_defines()
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="find_timestep() benchmark driver",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=driver_main_body, enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    cmd.new_C_compile(Ccodesrootdir, "find_timestep_driver", compiler_opt_option="fast")
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--build":
+    build(sys.argv[2], sys.argv[3], sys.argv[4] == "True")
+    sys.exit(0)
+
+CoordSystem = sys.argv[1] if len(sys.argv) > 1 else "SinhSpherical"
+Nxx = sys.argv[2].split(",") if len(sys.argv) > 2 else ["256", "256", "256"]
+num_calls = sys.argv[3] if len(sys.argv) > 3 else "10"
+
+print("find_timestep() in %s coordinates on a %s grid, average of %s calls (OMP_NUM_THREADS=%s)" %
+      (CoordSystem, "x".join(Nxx), num_calls, os.environ.get("OMP_NUM_THREADS", "default")))
+print("%-24s %16s %26s" % ("enable_separable_dsmin", "time per call", "dt (CFL_FACTOR=0.5)"))
+workdir = tempfile.mkdtemp(prefix="bench_find_timestep")
+results = {}
+for enable_separable_dsmin in (False, True):
+    Ccodesrootdir = os.path.join(workdir, "separable" + str(enable_separable_dsmin))
+    os.makedirs(Ccodesrootdir)
+    with open(os.path.join(Ccodesrootdir, "build.log"), "w") as log:
+        subprocess.check_call([sys.executable, os.path.abspath(__file__), "--build", Ccodesrootdir, CoordSystem,
+                               str(enable_separable_dsmin)], stdout=log, stderr=subprocess.STDOUT)
+    output = subprocess.check_output([os.path.join(Ccodesrootdir, "find_timestep_driver")] + Nxx + [num_calls]).decode().split()
+    results[enable_separable_dsmin] = [float(value) for value in output]
+    print("%-24s %14.6f s %26.17e" % (enable_separable_dsmin, results[enable_separable_dsmin][0],
+                                      results[enable_separable_dsmin][1]))
+shutil.rmtree(workdir)
+
+print("speedup: %.1fx; relative difference in dt: %.1e" %
+      (results[False][0] / results[True][0], abs(results[True][1] / results[False][1] - 1.0)))
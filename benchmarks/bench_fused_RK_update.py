@@ -0,0 +1,154 @@
+# bench_fused_RK_update.py: Time MoL_step_forward_in_time() for the BSSN equations, as generated by
+#   MoLtimestepping/MoL.py (for a diagonal Butcher table with k_odd & k_even, e.g., RK4) with
+#     enable_fused_RK_update=False: rhs_eval() writes the RHSs to k_odd_gfs/k_even_gfs, then a separate
+#                                   sweep over all gridfunctions & gridpoints updates the running
+#                                   total and computes the next RHS input y_n + a*dt*k;
+#     enable_fused_RK_update=True:  rhs_eval() (BSSN_Ccodegen_library, enable_fused_RK_update=True)
+#                                   writes the running total and y_n + a*dt*rhs directly from its
+#                                   stencil loop.
+#   Boundary conditions (outer extrapolation) are applied after each substep in both modes. The
+#   gridfunction reads+writes per step outside of the RHS stencil reads (the RHS output or RK
+#   update, plus the separate update sweep) are counted in the generated code, in units of one set
+#   of NUM_EVOL_GFS gridfunctions, and the evolved data after all steps are compared between modes
+#   (they differ by roundoff: the RK update is computed in a different order).
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_fused_RK_update.py [Nxx0,Nxx1,Nxx2, default 64,64,64] [number of steps, default 4]
+#                                              [MoL method, default RK4] [FD order, default 4]
+
+# Step 0: Add NRPy's directory to the path
+import os, re, sys, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+driver_main_body = r"""  griddata_struct griddata;
+  set_Cparameters_to_default(&griddata.params);
+  const int Nxx[3] = { atoi(argv[1]), atoi(argv[2]), atoi(argv[3]) };
+  const int num_steps = atoi(argv[4]);
+  set_Nxx_dxx_invdx_params__and__xx(0, Nxx, &griddata.params, griddata.xx);
+  bcstruct_set_up(&griddata.params, griddata.xx, &griddata.bcstruct);
+  griddata.params.dt = 0.25*griddata.params.dxx0;
+  const int Nxx_plus_2NGHOSTS0 = griddata.params.Nxx_plus_2NGHOSTS0;
+  const int Nxx_plus_2NGHOSTS1 = griddata.params.Nxx_plus_2NGHOSTS1;
+  const int Nxx_plus_2NGHOSTS2 = griddata.params.Nxx_plus_2NGHOSTS2;
+  const int Ntot = Nxx_plus_2NGHOSTS0*Nxx_plus_2NGHOSTS1*Nxx_plus_2NGHOSTS2;
+
+  MoL_malloc_y_n_gfs(&griddata.params, &griddata.gridfuncs);
+  MoL_malloc_non_y_n_gfs(&griddata.params, &griddata.gridfuncs);
+  // Small smooth perturbations of flat space, in all BSSN gridfunctions. All temporary
+  //   gridfunctions are also touched here, so page faults are not timed.
+  REAL *restrict y_n_gfs = griddata.gridfuncs.y_n_gfs;
+  for(int gf=0;gf<NUM_EVOL_GFS;gf++) LOOP_REGION(0,Nxx_plus_2NGHOSTS0, 0,Nxx_plus_2NGHOSTS1, 0,Nxx_plus_2NGHOSTS2) {
+    const REAL x = griddata.xx[0][i0], y = griddata.xx[1][i1], z = griddata.xx[2][i2];
+    y_n_gfs[IDX4S(gf, i0,i1,i2)] = 1e-3*sin(0.3*x + 0.2*y*(gf+1) - 0.1*z + gf);
+  }
+  LOOP_REGION(0,Nxx_plus_2NGHOSTS0, 0,Nxx_plus_2NGHOSTS1, 0,Nxx_plus_2NGHOSTS2) {
+    y_n_gfs[IDX4S(ALPHAGF, i0,i1,i2)] += 1.0;
+    y_n_gfs[IDX4S(CFGF, i0,i1,i2)] += 1.0;
+  }
+  for(int i=0;i<NUM_EVOL_GFS*Ntot;i++) {
+    griddata.gridfuncs.y_nplus1_running_total_gfs[i] = griddata.gridfuncs.k_odd_gfs[i] = griddata.gridfuncs.k_even_gfs[i] = 0.0;
+  }
+  for(int i=0;i<NUM_AUXEVOL_GFS*Ntot;i++) griddata.gridfuncs.auxevol_gfs[i] = 0.0;
+
+  struct timespec t0, t1;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  for(int step=0;step<num_steps;step++) MoL_step_forward_in_time(&griddata);
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+  printf("%.9e\n", ((t1.tv_sec-t0.tv_sec) + 1e-9*(t1.tv_nsec-t0.tv_nsec))/num_steps);
+
+  FILE *file = fopen("y_n_gfs.bin", "wb");
+  fwrite(y_n_gfs, sizeof(REAL), NUM_EVOL_GFS*Ntot, file);
+  fclose(file);
+  return 0;
+"""
+
+
+# Runs in a fresh Python process: generate and compile the C code for one mode into Ccodesrootdir,
+#   and write the gridfunction reads+writes per step, outside of the RHS stencil reads.
+def build(Ccodesrootdir, MoL_method, FD_order, enable_fused_RK_update):
+    import outputC as outC                      # NRPy+: Core C code output module
+    import NRPy_param_funcs as par              # NRPy+: Parameter interface
+    import grid as gri                          # NRPy+: Functions having to do with numerical grids
+    import finite_difference as fin             # NRPy+: Finite difference C code generation module
+    import reference_metric as rfm              # NRPy+: Reference metric support
+    import cmdline_helper as cmd                # NRPy+: Multi-platform Python command-line interface
+    import CurviBoundaryConditions.CurviBoundaryConditions as CBC  # NRPy+: Curvilinear boundary conditions
+    import MoLtimestepping.MoL as MoL           # NRPy+: Method of Lines timestepping
+    import BSSN.BSSN_Ccodegen_library as BCL    # NRPy+: BSSN C codegen library
+
+    par.set_parval_from_str("reference_metric::CoordSystem", "Cartesian")
+    par.set_parval_from_str("finite_difference::FD_CENTDERIVS_ORDER", FD_order)
+    rfm.reference_metric()
+    BCL.add_rhs_eval_to_Cfunction_dict(includes=["NRPy_basic_defines.h"], enable_rfm_precompute=False, enable_SIMD=False,
+                                       enable_KreissOliger_dissipation=True,
+                                       enable_fused_RK_update=enable_fused_RK_update)
+    rfm.add_to_Cfunc_dict_set_Nxx_dxx_invdx_params__and__xx()
+    rfm.register_NRPy_basic_defines()
+    CBC.CurviBoundaryConditions_register_C_functions()
+    CBC.CurviBoundaryConditions_register_NRPy_basic_defines(verbose=False)
+    MoL.register_C_functions_and_NRPy_basic_defines(
+        MoL_method=MoL_method,
+        RHS_string="rhs_eval(params, xx, auxevol_gfs, RK_INPUT_GFS, RK_OUTPUT_GFS);",
+        post_RHS_string="apply_bcs_outerextrap_and_inner(params, bcstruct, RK_OUTPUT_GFS);",
+        enable_curviBCs=True, enable_fused_RK_update=enable_fused_RK_update)
+    outC.add_to_Cfunction_dict(
+        includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+        desc="Fused RK update benchmark driver",
+        c_type="int", name="main", params="int argc, const char *argv[]",
+        body=driver_main_body, enableCparameters=False)
+
+    outC.outputC_register_C_functions_and_NRPy_basic_defines()
+    outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+    par.register_NRPy_basic_defines()
+    gri.register_C_functions_and_NRPy_basic_defines()
+    fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+    outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+    outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+    cmd.new_C_compile(Ccodesrootdir, "fused_RK_update_driver", compiler_opt_option="fast")
+
+    # RHS output writes (unfused) or RK update reads+writes (fused), plus the separate update sweeps
+    step_forward = outC.outC_function_dict["MoL_step_forward_in_time"]
+    traffic = len(re.findall(r"const REAL \w+_gfsL = \w+_gfs\[i\];", step_forward))
+    traffic += len(re.findall(r"\w+_gfs\[i\] = ", step_forward))
+    traffic += len(re.findall(r"RK_update\.(in\[\d\]\[\d\]|out\[\d\]) = ", step_forward))
+    if not enable_fused_RK_update:
+        traffic += step_forward.count("rhs_eval(")
+    with open(os.path.join(Ccodesrootdir, "traffic.txt"), "w") as file:
+        file.write(str(traffic) + "\n")
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--build":
+    build(sys.argv[2], sys.argv[3], int(sys.argv[4]), sys.argv[5] == "True")
+    sys.exit(0)
+
+import numpy as np
+
+Nxx = sys.argv[1].split(",") if len(sys.argv) > 1 else ["64", "64", "64"]
+num_steps = sys.argv[2] if len(sys.argv) > 2 else "4"
+MoL_method = sys.argv[3] if len(sys.argv) > 3 else "RK4"
+FD_order = sys.argv[4] if len(sys.argv) > 4 else "4"
+
+print("BSSN MoL_step_forward_in_time() (%s, FD order %s) on a %s Cartesian grid, average of %s steps (OMP_NUM_THREADS=%s)" %
+      (MoL_method, FD_order, "x".join(Nxx), num_steps, os.environ.get("OMP_NUM_THREADS", "default")))
+print("%-24s %36s %14s" % ("enable_fused_RK_update", "non-stencil gf traffic/step (sets)", "time/step"))
+workdir = tempfile.mkdtemp(prefix="bench_fused_RK_update")
+results = {}
+for enable_fused_RK_update in (False, True):
+    Ccodesrootdir = os.path.join(workdir, "fused" + str(enable_fused_RK_update))
+    os.makedirs(Ccodesrootdir)
+    with open(os.path.join(Ccodesrootdir, "build.log"), "w") as log:
+        subprocess.check_call([sys.executable, os.path.abspath(__file__), "--build", Ccodesrootdir, MoL_method, FD_order,
+                               str(enable_fused_RK_update)], stdout=log, stderr=subprocess.STDOUT)
+    with open(os.path.join(Ccodesrootdir, "traffic.txt")) as file:
+        traffic = int(file.read())
+    time_per_step = float(subprocess.check_output([os.path.join(Ccodesrootdir, "fused_RK_update_driver")] +
+                                                  Nxx + [num_steps], cwd=Ccodesrootdir).decode())
+    results[enable_fused_RK_update] = (time_per_step, np.fromfile(os.path.join(Ccodesrootdir, "y_n_gfs.bin")))
+    print("%-24s %36d %11.2f ms" % (enable_fused_RK_update, traffic, 1e3 * time_per_step))
+shutil.rmtree(workdir)
+
+unfused, fused = results[False][1], results[True][1]
+print("speedup: %.2fx; max |difference| in evolved gridfunctions, relative to their max |value|: %.1e" %
+      (results[False][0] / results[True][0], np.max(np.abs(fused - unfused)) / np.max(np.abs(unfused))))
@@ -0,0 +1,63 @@
+# bench_fused_Ricci_rhs_eval.py: Compare the two modes of Ricci_and_rhs_eval(), as generated by
+#   BSSN_Ccodegen_library.add_Ricci_and_rhs_eval_to_Cfunction_dict():
+#     split (fuse_Ricci=False): Ricci_eval() writes the six RbarDD gridfunctions, which
+#                               rhs_eval() then reads back;
+#     fused (fuse_Ricci=True):  rhs_eval() evaluates the 3-Ricci tensor inline.
+#   Both are generated, compiled and timed on an N^3 grid by autotune.autotune(), which
+#   also checks that both yield the same BSSN RHSs. For each mode, the minimum memory
+#   traffic per call (every gridfunction read or written by each kernel streamed once
+#   through memory) is computed from the kernel profiles (see kernel_profile.py) and
+#   from the gridfunction writes in the generated C code. The faster mode is stored in
+#   the autotune profiles file, so that later builds for this CoordSystem and FD order
+#   use it automatically (when run with NRPY_AUTOTUNE=1).
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_fused_Ricci_rhs_eval.py [FD order, default 4] [N, default 64] [calls, default 5]
+#                                                   [CoordSystem, default Spherical]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, re, shutil, tempfile
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+# Kernel profiles are recorded by the code-generating processes spawned by autotune.
+os.environ["NRPY_KERNEL_PROFILE"] = "1"
+import autotune                             # NRPy+: Tune per-kernel codegen options against compiled runtime
+import kernel_profile                       # NRPy+: Operation-count and memory-access profiles of C kernels
+import BSSN.BSSN_Ccodegen_library as BCL    # NRPy+: BSSN C codegen library
+
+FDorder = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+N = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+ncalls = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+CoordSystem = sys.argv[4] if len(sys.argv) > 4 else "Spherical"
+
+parvals = {"reference_metric::CoordSystem": CoordSystem, "finite_difference::FD_CENTDERIVS_ORDER": FDorder}
+task = autotune.autotune_task(BCL.add_Ricci_and_rhs_eval_to_Cfunction_dict,
+                              dict(includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h"],
+                                   enable_KreissOliger_dissipation=True),
+                              "Ricci_and_rhs_eval",
+                              "Ricci_and_rhs_eval(&params, RFMSTRUCT_OR_XX, auxevol_gfs, in_gfs, rhs_gfs);",
+                              parvals, outputs=["rhs_gfs"])
+
+print("Ricci_and_rhs_eval(), split vs. fused, in %s coordinates, FD order %d, on %d^3 grids (OMP_NUM_THREADS=%s)" %
+      (CoordSystem, FDorder, N, os.environ.get("OMP_NUM_THREADS", "default")))
+workdir = tempfile.mkdtemp(prefix="bench_fused_Ricci_rhs_eval")
+best, results = autotune.autotune(task, knobs_dict={"fuse_Ricci": [False, True]}, N=N, ncalls=ncalls,
+                                  strategy="exhaustive", workdir=workdir, verbose=False)
+N = -(-N // 8) * 8  # as rounded by autotune()
+
+print("%-7s %-22s %14s %14s %16s" % ("mode", "kernels", "gfs read", "gfs written", "min. traffic/call"))
+for which, result in enumerate(results):
+    variant_dir = os.path.join(workdir, "variant" + str(which))
+    profiles = kernel_profile.read_json(os.path.join(variant_dir, "kernel_profiles.json"))
+    kernels = ["Ricci_eval", "rhs_eval"] if not result.options["fuse_Ricci"] else ["rhs_eval"]
+    gfs_read = sum(profiles[kernel]["num_gridfunctions_read"] for kernel in kernels)
+    gfs_written = 0
+    for kernel in kernels:
+        with open(os.path.join(variant_dir, kernel + ".c")) as file:
+            gfs_written += len(set(re.findall(r"_gfs\[IDX4S\((\w+), ?i0, ?i1, ?i2\)\](?:\s*=|, )", file.read())))
+    traffic_MiB = (gfs_read + gfs_written) * 8.0 * N**3 / 1024.0**2
+    print("%-7s %-22s %14d %14d %12.1f MiB" % ("fused" if result.options["fuse_Ricci"] else "split", "+".join(kernels),
+                                               gfs_read, gfs_written, traffic_MiB))
+shutil.rmtree(workdir)
@@ -0,0 +1,88 @@
+# bench_parallel_symbolic_BSSN_RHSs.py: Time the symbolic derivation of the BSSN RHSs
+#   (BSSN_Ccodegen_library.BSSN_RHSs__generate_symbolic_expressions(), including the
+#   reference metric), serially and with the independent components (the simplified
+#   reference-metric derivatives ghatDDdD and the 3-Ricci components RbarDD) evaluated
+#   in 2, 4, ... worker processes (see parallel_symbolic.py). Each derivation runs in a
+#   fresh Python process; the resulting expressions are checked to be identical to those
+#   of the serial derivation.
+#
+# Usage (from the NRPy+ root directory):
+#   python benchmarks/bench_parallel_symbolic_BSSN_RHSs.py [CoordSystem, default SinhSpherical]
+#                                                          [process counts, default 1,2,4]
+#                                                          [enable_rfm_precompute, default False]
+# Speedups are bounded by the number of CPU cores, and by the fraction of the derivation
+#   spent on the independent components (printed by the serial run).
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, time, pickle, subprocess, tempfile, shutil
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+sys.setrecursionlimit(100000)  # for pickling deeply nested expressions
+
+
+def derive(CoordSystem, enable_rfm_precompute, outfile):
+    import NRPy_param_funcs as par             # NRPy+: Parameter interface
+    import reference_metric as rfm             # NRPy+: Reference metric support
+    import BSSN.BSSN_quantities as Bq          # NRPy+: Computes useful BSSN quantities
+    import parallel_symbolic                   # NRPy+: Evaluate independent symbolic components in parallel
+
+    # Time spent in the independent components, summed over all calls.
+    component_time = [0.0]
+    map_components = parallel_symbolic.map_components
+    def timed_map_components(func, prereqs, indices, nprocs_override=None):
+        start = time.time()
+        results = map_components(func, prereqs, indices, nprocs_override)
+        component_time[0] += time.time() - start
+        return results
+    rfm.map_components = Bq.map_components = timed_map_components
+
+    par.set_parval_from_str("reference_metric::CoordSystem", CoordSystem)
+    if enable_rfm_precompute:
+        rfm_files_dir = os.path.join(os.path.dirname(outfile), "rfm_files")
+        os.makedirs(rfm_files_dir, exist_ok=True)
+        par.set_parval_from_str("reference_metric::rfm_precompute_Ccode_outdir", rfm_files_dir)
+        par.set_parval_from_str("reference_metric::enable_rfm_precompute", "True")
+        par.set_parval_from_str("reference_metric::rfm_precompute_to_Cfunctions_and_NRPy_basic_defines", "True")
+    import BSSN.BSSN_Ccodegen_library as BCL   # NRPy+: BSSN C codegen library
+    start = time.time()
+    rfm.reference_metric()
+    _betaU, exprs = BCL.BSSN_RHSs__generate_symbolic_expressions(leave_Ricci_symbolic=False,
+                                                                 enable_KreissOliger_dissipation=True)
+    wall_time = time.time() - start
+    with open(outfile, "wb") as file:
+        pickle.dump({"wall_time": wall_time, "component_time": component_time[0],
+                     "exprs": [(expr.lhs, expr.rhs) for expr in exprs]}, file)
+
+
+if len(sys.argv) > 1 and sys.argv[1] == "--derive":
+    derive(sys.argv[2], sys.argv[3] == "True", sys.argv[4])
+    sys.exit(0)
+
+CoordSystem = sys.argv[1] if len(sys.argv) > 1 else "SinhSpherical"
+process_counts = [int(n) for n in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 2, 4]
+enable_rfm_precompute = sys.argv[3] if len(sys.argv) > 3 else "False"
+if 1 not in process_counts:
+    process_counts.insert(0, 1)
+
+print("Symbolic BSSN RHSs in %s coordinates (enable_rfm_precompute=%s), on %d CPU core(s)" %
+      (CoordSystem, enable_rfm_precompute, os.cpu_count() or 1))
+workdir = tempfile.mkdtemp(prefix="bench_parallel_symbolic")
+results = {}
+for nprocs in process_counts:
+    outfile = os.path.join(workdir, "nprocs" + str(nprocs) + ".pkl")
+    env = dict(os.environ, NRPY_SYMBOLIC_NPROCS=str(nprocs))
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--derive", CoordSystem, enable_rfm_precompute, outfile],
+                   env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(outfile, "rb") as file:
+        results[nprocs] = pickle.load(file)
+shutil.rmtree(workdir)
+
+serial = results[1]
+print("%8s %12s %20s %10s %10s" % ("nprocs", "wall time", "in components (%)", "speedup", "identical"))
+for nprocs in process_counts:
+    result = results[nprocs]
+    print("%8d %10.2f s %12.2f s (%3.0f%%) %10.2f %10s" %
+          (nprocs, result["wall_time"], result["component_time"],
+           100.0 * result["component_time"] / result["wall_time"],
+           serial["wall_time"] / result["wall_time"], result["exprs"] == serial["exprs"]))
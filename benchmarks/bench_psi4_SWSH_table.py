@@ -0,0 +1,80 @@
+# bench_psi4_SWSH_table.py: Time lowlevel_decompose_psi4_into_swm2_modes(), as
+#   generated by BSSN_Ccodegen_library.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(),
+#   with Y_{s=-2, l,m} evaluated at every point (enable_SWSH_table=False) versus
+#   tabulated once per angular grid (enable_SWSH_table=True). Both versions
+#   decompose the same synthetic psi4 data, and their mode outputs are compared.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_psi4_SWSH_table.py [maximum_l, default 8] [N_theta, default 64] [N_phi, default 128] [steps, default 100]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, glob, shutil, subprocess, tempfile
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import numpy as np                          # NumPy: A numerical methods module for Python
+import outputC as outC                      # NRPy+: Core C code output module
+import BSSN.BSSN_Ccodegen_library as BCL    # NRPy+: BSSN C codegen library
+
+maximum_l = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+N1 = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+N2 = int(sys.argv[3]) if len(sys.argv) > 3 else 128
+nsteps = int(sys.argv[4]) if len(sys.argv) > 4 else 100
+CC = os.environ.get("CC", "gcc")
+
+main_c = r"""
+#include <time.h>
+int main(int argc, char **argv) {
+  const int N1 = atoi(argv[1]), N2 = atoi(argv[2]), nsteps = atoi(argv[3]);
+  const REAL dxx1 = M_PI/N1, dxx2 = 2*M_PI/N2;
+  REAL *th = malloc(sizeof(REAL)*N1), *sinth = malloc(sizeof(REAL)*N1), *ph = malloc(sizeof(REAL)*N2);
+  REAL *psi4r = malloc(sizeof(REAL)*N1*N2), *psi4i = malloc(sizeof(REAL)*N1*N2);
+  for(int i1=0;i1<N1;i1++) { th[i1] = (i1+0.5)*dxx1; sinth[i1] = sin(th[i1]); }
+  for(int i2=0;i2<N2;i2++) ph[i2] = (i2+0.5)*dxx2 - M_PI;
+  double elapsed = 0.0;
+  for(int n=0;n<nsteps;n++) {
+    for(int i1=0;i1<N1;i1++) for(int i2=0;i2<N2;i2++) {
+      psi4r[i1*N2+i2] = cos(2*ph[i2] + 0.1*n)*sinth[i1]*sinth[i1] + 0.3*sin(3*th[i1])*cos(ph[i2]);
+      psi4i[i1*N2+i2] = sin(2*ph[i2] - 0.2*n)*sinth[i1] + 0.1*cos(th[i1]);
+    }
+    struct timespec t0, t1;
+    clock_gettime(CLOCK_MONOTONIC, &t0);
+    lowlevel_decompose_psi4_into_swm2_modes(N1+2*NGHOSTS, N2+2*NGHOSTS, dxx1, dxx2, (REAL)n, 10.0,
+                                            th, sinth, ph, psi4r, psi4i);
+    clock_gettime(CLOCK_MONOTONIC, &t1);
+    elapsed += (t1.tv_sec - t0.tv_sec) + 1e-9*(t1.tv_nsec - t0.tv_nsec);
+  }
+  printf("%.6e\n", elapsed/nsteps);
+  return 0;
+}
+"""
+
+workdir = tempfile.mkdtemp(prefix="bench_psi4_SWSH_table")
+timings = {}
+for enable_SWSH_table in [False, True]:
+    label = "table" if enable_SWSH_table else "pointwise"
+    BCL.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(maximum_l=maximum_l, enable_SWSH_table=enable_SWSH_table)
+    prefunc = [el for el in outC.outC_function_master_list
+               if el.name == "driver__spherlikegrids__psi4_spinweightm2_decomposition"][-1].prefunc
+    rundir = os.path.join(workdir, label)
+    os.makedirs(rundir)
+    with open(os.path.join(rundir, "bench.c"), "w") as file:
+        file.write("#include <stdio.h>\n#include <stdlib.h>\n#include <math.h>\n#define REAL double\n#define NGHOSTS 2\n")
+        file.write(prefunc + main_c)
+    subprocess.check_call([CC, "-O2", "-fopenmp", "bench.c", "-o", "bench", "-lm"], cwd=rundir)
+    output = subprocess.check_output([os.path.join(rundir, "bench"), str(N1), str(N2), str(nsteps)], cwd=rundir)
+    timings[label] = float(output.decode().strip())
+
+maxdiff = 0.0
+for filename in glob.glob(os.path.join(workdir, "pointwise", "outpsi4_l*.txt")):
+    pointwise = np.loadtxt(filename)
+    table = np.loadtxt(filename.replace("pointwise", "table"))
+    maxdiff = max(maxdiff, np.max(np.abs(pointwise - table)))
+shutil.rmtree(workdir)
+
+print("maximum_l=%d, %dx%d angular points, %d steps (OMP_NUM_THREADS=%s):" %
+      (maximum_l, N1, N2, nsteps, os.environ.get("OMP_NUM_THREADS", "default")))
+print("  pointwise Y_{-2,lm}: %.3e s per decomposition" % timings["pointwise"])
+print("  tabulated Y_{-2,lm}: %.3e s per decomposition (table built during step 0)" % timings["table"])
+print("  speedup: %.1fx; max |difference| in psi4_lm: %.1e" % (timings["pointwise"] / timings["table"], maxdiff))
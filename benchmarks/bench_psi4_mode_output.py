@@ -0,0 +1,92 @@
+# bench_psi4_mode_output.py: Time lowlevel_decompose_psi4_into_swm2_modes(), as
+#   generated by BSSN_Ccodegen_library.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(),
+#   with psi4_output_format="text" (open/append/close one file per (l,m,R_ext) at
+#   every call) versus psi4_output_format="binary" (one open, buffered file per R_ext).
+#   The tabulated Y_{s=-2, l,m} (enable_SWSH_table=True) and a small angular grid are
+#   used, so that output dominates. The binary output is read back with
+#   diagnostics_generic/read_psi4_swm2_modes.py and compared with the text output.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_psi4_mode_output.py [maximum_l, default 8] [number of R_ext, default 4] [steps, default 1000]
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, glob, re, shutil, subprocess, tempfile
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import numpy as np                          # NumPy: A numerical methods module for Python
+import outputC as outC                      # NRPy+: Core C code output module
+import BSSN.BSSN_Ccodegen_library as BCL    # NRPy+: BSSN C codegen library
+from diagnostics_generic.read_psi4_swm2_modes import read_psi4_swm2_modes, swm2_mode_index
+
+maximum_l = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+num_R_ext = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+nsteps = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+N1, N2 = 16, 32
+CC = os.environ.get("CC", "gcc")
+
+main_c = r"""
+#include <time.h>
+int main(int argc, char **argv) {
+  const int N1 = atoi(argv[1]), N2 = atoi(argv[2]), num_R_ext = atoi(argv[3]), nsteps = atoi(argv[4]);
+  const REAL dxx1 = M_PI/N1, dxx2 = 2*M_PI/N2;
+  REAL *th = malloc(sizeof(REAL)*N1), *sinth = malloc(sizeof(REAL)*N1), *ph = malloc(sizeof(REAL)*N2);
+  REAL *psi4r = malloc(sizeof(REAL)*N1*N2), *psi4i = malloc(sizeof(REAL)*N1*N2);
+  for(int i1=0;i1<N1;i1++) { th[i1] = (i1+0.5)*dxx1; sinth[i1] = sin(th[i1]); }
+  for(int i2=0;i2<N2;i2++) ph[i2] = (i2+0.5)*dxx2 - M_PI;
+  struct timespec t0, t1;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  for(int n=0;n<nsteps;n++) {
+    for(int r=0;r<num_R_ext;r++) {
+      for(int i1=0;i1<N1;i1++) for(int i2=0;i2<N2;i2++) {
+        psi4r[i1*N2+i2] = (cos(2*ph[i2] + 0.1*n)*sinth[i1]*sinth[i1] + 0.3*sin(3*th[i1])*cos(ph[i2])) / (r+1);
+        psi4i[i1*N2+i2] = (sin(2*ph[i2] - 0.2*n)*sinth[i1] + 0.1*cos(th[i1])) / (r+1);
+      }
+      lowlevel_decompose_psi4_into_swm2_modes(N1+2*NGHOSTS, N2+2*NGHOSTS, dxx1, dxx2, 0.25*n, 10.0*(r+1),
+                                              th, sinth, ph, psi4r, psi4i);
+    }
+  }
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+  printf("%.6e\n", (t1.tv_sec - t0.tv_sec) + 1e-9*(t1.tv_nsec - t0.tv_nsec));
+  return 0;
+}
+"""
+
+workdir = tempfile.mkdtemp(prefix="bench_psi4_mode_output")
+timings = {}
+for psi4_output_format in ["text", "binary"]:
+    BCL.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict(maximum_l=maximum_l, enable_SWSH_table=True,
+                                                             psi4_output_format=psi4_output_format)
+    prefunc = [el for el in outC.outC_function_master_list
+               if el.name == "driver__spherlikegrids__psi4_spinweightm2_decomposition"][-1].prefunc
+    rundir = os.path.join(workdir, psi4_output_format)
+    os.makedirs(rundir)
+    with open(os.path.join(rundir, "bench.c"), "w") as file:
+        file.write("#include <stdio.h>\n#include <stdlib.h>\n#include <stdint.h>\n#include <math.h>\n"
+                   "#define REAL double\n#define NGHOSTS 2\n")
+        file.write(prefunc + main_c)
+    subprocess.check_call([CC, "-O2", "-fopenmp", "bench.c", "-o", "bench", "-lm"], cwd=rundir)
+    output = subprocess.check_output([os.path.join(rundir, "bench"), str(N1), str(N2), str(num_R_ext), str(nsteps)],
+                                     cwd=rundir)
+    timings[psi4_output_format] = float(output.decode().strip())
+
+# Text output has %e (7 significant digits) times and %.15e mode values.
+maxdiff = 0.0
+num_text_files = 0
+for filename in glob.glob(os.path.join(workdir, "text", "outpsi4_l*.txt")):
+    l, m, R_ext = re.search(r"outpsi4_l(\d+)_m(-?\d+)-r(.*)\.txt", filename).groups()
+    text = np.loadtxt(filename)
+    modes = read_psi4_swm2_modes(os.path.join(workdir, "binary", "outpsi4_swm2_modes-r" + R_ext + ".bin"))
+    psi4 = modes.psi4[:, swm2_mode_index(int(l), int(m))]
+    assert np.allclose(text[:, 0], modes.time, rtol=1e-6)
+    maxdiff = max(maxdiff, np.max(np.abs(text[:, 1] - psi4.real)), np.max(np.abs(text[:, 2] - psi4.imag)))
+    num_text_files += 1
+binary_bytes = sum(os.path.getsize(f) for f in glob.glob(os.path.join(workdir, "binary", "*.bin")))
+text_bytes = sum(os.path.getsize(f) for f in glob.glob(os.path.join(workdir, "text", "*.txt")))
+shutil.rmtree(workdir)
+
+print("maximum_l=%d, %d extraction radii, %d steps, %dx%d angular points:" % (maximum_l, num_R_ext, nsteps, N1, N2))
+print("  text output:   %.3e s total, %d files, %.2f MiB" % (timings["text"], num_text_files, text_bytes / 1024.0**2))
+print("  binary output: %.3e s total, %d files, %.2f MiB" % (timings["binary"], num_R_ext, binary_bytes / 1024.0**2))
+print("  speedup: %.1fx; max |difference| in psi4_lm: %.1e" % (timings["text"] / timings["binary"], maxdiff))
@@ -0,0 +1,122 @@
+# bench_rhs_eval_shards.py: Compile time and runtime of the BSSN rhs_eval() kernel,
+#   as generated by BSSN_Ccodegen_library.add_rhs_eval_to_Cfunction_dict(), split into
+#   num_shards translation units (num_shards=1: the usual monolithic kernel).
+#   For each shard count, the C code is generated in a fresh Python process, each .c
+#   file is compiled (one at a time) with -O2 -march=native -fopenmp, and rhs_eval()
+#   is run on a Cartesian grid of smooth synthetic data. Reported are the total compile
+#   time, the longest single-file compile time (the build time with make -j num_shards,
+#   given enough cores), the time per rhs_eval() call, and the maximum relative
+#   difference of the RHSs from those of the monolithic kernel.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_rhs_eval_shards.py [FD order, default 8] [shard counts, default 1,2,4] [N, default 64] [calls, default 5]
+# The first run performs the CSE of each shard and fills the NRPy_cache; at FD order 8 this
+#   takes several minutes per shard count.
+
+# Step 0: Add NRPy's directory to the path
+import os, sys, shutil, subprocess, tempfile, time
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import numpy as np    # NumPy: A numerical methods module for Python
+
+FDorder = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+list_of_num_shards = [int(n) for n in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1, 2, 4]
+N = int(sys.argv[3]) if len(sys.argv) > 3 else 64
+ncalls = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+CC = os.environ.get("CC", "gcc")
+CFLAGS = ["-O2", "-march=native", "-fopenmp", "-std=gnu99", "-w"]
+
+# Generate, in directory sys.argv[2], all C files for rhs_eval() with sys.argv[3] shards,
+#   plus a main() that times it. Run in a fresh Python process for each shard count.
+generate_py = r"""
+import os, sys
+sys.path.append(sys.argv[1])
+Ccodesrootdir, num_shards, FDorder = sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+import outputC as outC
+import NRPy_param_funcs as par
+import grid as gri
+import finite_difference as fin
+import reference_metric as rfm
+import BSSN.BSSN_Ccodegen_library as BCL
+
+par.set_parval_from_str("reference_metric::CoordSystem", "Cartesian")
+par.set_parval_from_str("finite_difference::FD_CENTDERIVS_ORDER", FDorder)
+rfm.reference_metric()
+BCL.add_rhs_eval_to_Cfunction_dict(includes=["NRPy_basic_defines.h"], enable_rfm_precompute=False, enable_SIMD=False,
+                                   enable_KreissOliger_dissipation=True, num_shards=num_shards)
+outC.add_to_Cfunction_dict(
+    includes=["NRPy_basic_defines.h", "NRPy_function_prototypes.h", "time.h"],
+    c_type="int", name="main", params="int argc, const char *argv[]",
+    body=r'''  paramstruct params;
+  set_Cparameters_to_default(&params);
+  const int N = atoi(argv[1]), ncalls = atoi(argv[2]);
+  params.Nxx0 = params.Nxx1 = params.Nxx2 = N;
+  params.Nxx_plus_2NGHOSTS0 = params.Nxx_plus_2NGHOSTS1 = params.Nxx_plus_2NGHOSTS2 = N + 2*NGHOSTS;
+  params.dxx0 = params.dxx1 = params.dxx2 = 1.0/N;
+  params.invdx0 = params.invdx1 = params.invdx2 = N;
+  const int Ntot = params.Nxx_plus_2NGHOSTS0*params.Nxx_plus_2NGHOSTS1*params.Nxx_plus_2NGHOSTS2;
+  REAL *xx[3];
+  for(int d=0;d<3;d++) {
+    xx[d] = (REAL *)malloc(sizeof(REAL)*(N + 2*NGHOSTS));
+    for(int i=0;i<N + 2*NGHOSTS;i++) xx[d][i] = (i - NGHOSTS + 0.5)/N;
+  }
+  REAL *in_gfs = (REAL *)malloc(sizeof(REAL)*NUM_EVOL_GFS*Ntot);
+  REAL *rhs_gfs = (REAL *)calloc(NUM_EVOL_GFS*Ntot, sizeof(REAL));
+  REAL *auxevol_gfs = (REAL *)malloc(sizeof(REAL)*NUM_AUXEVOL_GFS*Ntot);
+  for(int i=0;i<NUM_EVOL_GFS*Ntot;i++)    in_gfs[i]      = 1.0 + 0.1*sin(0.0137*i);
+  for(int i=0;i<NUM_AUXEVOL_GFS*Ntot;i++) auxevol_gfs[i] = 0.1*cos(0.0071*i);
+  struct timespec t0, t1;
+  clock_gettime(CLOCK_MONOTONIC, &t0);
+  for(int n=0;n<ncalls;n++) rhs_eval(&params, xx, auxevol_gfs, in_gfs, rhs_gfs);
+  clock_gettime(CLOCK_MONOTONIC, &t1);
+  printf("%.6e\n", ((t1.tv_sec - t0.tv_sec) + 1e-9*(t1.tv_nsec - t0.tv_nsec))/ncalls);
+  FILE *file = fopen("rhs_gfs.bin", "wb");
+  fwrite(rhs_gfs, sizeof(REAL), NUM_EVOL_GFS*Ntot, file);
+  fclose(file);
+  return 0;
+''', enableCparameters=False)
+
+outC.outputC_register_C_functions_and_NRPy_basic_defines()
+outC.NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(Ccodesrootdir)
+par.register_NRPy_basic_defines()
+gri.register_C_functions_and_NRPy_basic_defines()
+fin.register_C_functions_and_NRPy_basic_defines(NGHOSTS_account_for_onezone_upwind=True, enable_SIMD=False)
+outC.construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False)
+outC.construct_NRPy_function_prototypes_h(Ccodesrootdir)
+for name, Cfunc in outC.outC_function_dict.items():
+    with open(os.path.join(Ccodesrootdir, name + ".c"), "w") as file:
+        file.write(Cfunc)
+"""
+
+workdir = tempfile.mkdtemp(prefix="bench_rhs_eval_shards")
+results = []
+reference_rhs = None
+for num_shards in list_of_num_shards:
+    Ccodesrootdir = os.path.join(workdir, "shards" + str(num_shards))
+    os.makedirs(Ccodesrootdir)
+    subprocess.check_call([sys.executable, "-c", generate_py, nrpy_dir_path, Ccodesrootdir, str(num_shards),
+                           str(FDorder)], stdout=subprocess.DEVNULL)
+    compile_times = {}
+    for c_file in sorted(f for f in os.listdir(Ccodesrootdir) if f.endswith(".c")):
+        starttime = time.time()
+        subprocess.check_call([CC] + CFLAGS + ["-c", c_file, "-o", c_file.replace(".c", ".o")], cwd=Ccodesrootdir)
+        compile_times[c_file] = time.time() - starttime
+    objects = [f for f in os.listdir(Ccodesrootdir) if f.endswith(".o")]
+    subprocess.check_call([CC, "-fopenmp"] + objects + ["-o", "bench", "-lm"], cwd=Ccodesrootdir)
+    output = subprocess.check_output([os.path.join(Ccodesrootdir, "bench"), str(N), str(ncalls)], cwd=Ccodesrootdir)
+    rhs = np.fromfile(os.path.join(Ccodesrootdir, "rhs_gfs.bin"))
+    if reference_rhs is None:
+        reference_rhs = rhs
+    relerr = np.max(np.abs(rhs - reference_rhs)) / np.max(np.abs(reference_rhs))
+    rhs_eval_compile_times = [t for c_file, t in compile_times.items() if c_file.startswith("rhs_eval")]
+    results.append((num_shards, sum(rhs_eval_compile_times), max(rhs_eval_compile_times),
+                    float(output.decode().strip()), relerr))
+shutil.rmtree(workdir)
+
+print("BSSN rhs_eval(), FD order %d, %d^3 Cartesian grid, %d calls (OMP_NUM_THREADS=%s):" %
+      (FDorder, N, ncalls, os.environ.get("OMP_NUM_THREADS", "default")))
+print("%7s %16s %16s %16s %12s" % ("shards", "compile (total)", "compile (max)", "rhs_eval() time", "max relerr"))
+for num_shards, t_total, t_max, t_run, relerr in results:
+    print("%7d %15.1fs %15.1fs %15.4fs %12.1e" % (num_shards, t_total, t_max, t_run, relerr))
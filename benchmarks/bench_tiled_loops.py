@@ -0,0 +1,46 @@
+# bench_tiled_loops.py: Time the BSSN kernels Ricci_eval() and rhs_eval(), as generated by
+#   BSSN_Ccodegen_library, for a range of loop tile shapes (tile_size=[T0,T1,T2], i.e.,
+#   T0 x T1 x T2 points per tile; T=0: no blocking in that direction; see loop.simple_loop()).
+#   Each variant is generated, compiled and run on an N^3 grid by autotune.autotune(),
+#   which also checks that all variants yield the same gridfunction data. Nothing is
+#   written to the autotune profiles file.
+#
+# Usage (from the NRPy+ root directory; requires a C compiler with OpenMP support):
+#   python benchmarks/bench_tiled_loops.py [FD order, default 8] [kernels, default Ricci_eval,rhs_eval]
+#                                          [N, default 128] [calls, default 5] [CoordSystem, default Cartesian]
+# Tile shapes are listed in tile_sizes below; with SIMD enabled (the default), T0 must be
+#   0, SIMD_width, or a multiple of 8 (the largest SIMD_width); see loop.simple_loop().
+
+# Step 0: Add NRPy's directory to the path
+import os, sys
+nrpy_dir_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+if nrpy_dir_path not in sys.path:
+    sys.path.append(nrpy_dir_path)
+
+import autotune                             # NRPy+: Tune per-kernel codegen options against compiled runtime
+import BSSN.BSSN_Ccodegen_library as BCL    # NRPy+: BSSN C codegen library
+
+FDorder = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+kernels = sys.argv[2].split(",") if len(sys.argv) > 2 else ["Ricci_eval", "rhs_eval"]
+N = int(sys.argv[3]) if len(sys.argv) > 3 else 128
+ncalls = int(sys.argv[4]) if len(sys.argv) > 4 else 5
+CoordSystem = sys.argv[5] if len(sys.argv) > 5 else "Cartesian"
+
+tile_sizes = [None, [0, 2, 2], [0, 4, 4], [0, 8, 8], [0, 16, 16], [0, 32, 32], [0, 4, 16], [0, 16, 4],
+              [32, 8, 8], [64, 16, 16]]
+
+parvals = {"reference_metric::CoordSystem": CoordSystem, "finite_difference::FD_CENTDERIVS_ORDER": FDorder}
+includes = ["NRPy_basic_defines.h", "NRPy_function_prototypes.h"]
+tasks = {"Ricci_eval": autotune.autotune_task(BCL.add_Ricci_eval_to_Cfunction_dict, dict(includes=includes),
+                                              "Ricci_eval", "Ricci_eval(&params, RFMSTRUCT_OR_XX, in_gfs, auxevol_gfs);",
+                                              parvals),
+         "rhs_eval": autotune.autotune_task(BCL.add_rhs_eval_to_Cfunction_dict,
+                                            dict(includes=includes, enable_KreissOliger_dissipation=True),
+                                            "rhs_eval", "rhs_eval(&params, RFMSTRUCT_OR_XX, auxevol_gfs, in_gfs, rhs_gfs);",
+                                            parvals)}
+
+print("Loop tiling of %s in %s coordinates, FD order %d, on %d^3 grids (OMP_NUM_THREADS=%s)" %
+      (", ".join(kernels), CoordSystem, FDorder, N, os.environ.get("OMP_NUM_THREADS", "default")))
+for kernel in kernels:
+    autotune.autotune(tasks[kernel], knobs_dict={"tile_size": tile_sizes}, N=N, ncalls=ncalls,
+                      strategy="exhaustive", write_profile=False, verbose=False)
@@ -0,0 +1,92 @@
+# Read the binary psi4_{l,m} output files outpsi4_swm2_modes-r%.2f.bin, as written
+#   by lowlevel_output_psi4_swm2_modes() when
+#   BSSN.BSSN_Ccodegen_library.add_SpinWeight_minus2_SphHarmonics_to_Cfunction_dict()
+#   is called with psi4_output_format="binary".
+#
+# File layout (native byte order):
+#   Header (32 bytes): char magic[8] = "NRPYSWM2", then int32 version, l_min, l_max,
+#                      num_modes, bytes_per_record, reserved.
+#   Records: double time, then {double re, double im} for each mode, ordered
+#            by mode index l*l + l + m - l_min*l_min (see swm2_mode_index()).
+#
+# Records are mapped directly from the file with np.memmap; nothing is copied
+#   until a slice of them is used.
+
+from collections import namedtuple
+import sys
+import numpy as np
+
+swm2_version = 1
+swm2_header_dtype = np.dtype([("magic", "S8"), ("version", "i4"), ("l_min", "i4"), ("l_max", "i4"),
+                              ("num_modes", "i4"), ("bytes_per_record", "i4"), ("reserved", "i4")])
+
+# time[i]: time of record i; psi4[i, mode]: complex psi4_{l,m} at time[i]
+psi4_swm2_modes = namedtuple("psi4_swm2_modes", "l_min l_max time psi4")
+
+
+def swm2_mode_index(l, m, l_min=2):
+    """
+    Column of psi4_swm2_modes.psi4 holding mode (l,m).
+
+    >>> swm2_mode_index(2, -2), swm2_mode_index(2, 2), swm2_mode_index(3, -3), swm2_mode_index(8, 8)
+    (0, 4, 5, 76)
+    """
+    return l*l + l + m - l_min*l_min
+
+
+def swm2_record_dtype(num_modes):
+    return np.dtype([("time", "f8"), ("psi4", "c16", (num_modes,))])
+
+
+def read_psi4_swm2_modes(filename):
+    """
+    Map the records of a binary psi4_{l,m} output file; a partially written
+    final record (e.g., if the run was interrupted) is ignored.
+
+    >>> import os, tempfile
+    >>> filename = os.path.join(tempfile.mkdtemp(), "outpsi4_swm2_modes-r10.00.bin")
+    >>> l_max = 3
+    >>> num_modes = (l_max + 1)**2 - 4
+    >>> header = np.array([(b"NRPYSWM2", 1, 2, l_max, num_modes, 8*(1 + 2*num_modes), 0)], dtype=swm2_header_dtype)
+    >>> records = np.zeros(3, dtype=swm2_record_dtype(num_modes))
+    >>> records["time"] = [0.0, 0.5, 1.0]
+    >>> records["psi4"][:, swm2_mode_index(2, 2)] = [1+2j, 3+4j, 5+6j]
+    >>> with open(filename, "wb") as file:
+    ...     _ = file.write(header.tobytes() + records.tobytes() + b"partial")
+    >>> modes = read_psi4_swm2_modes(filename)
+    >>> modes.l_min, modes.l_max, modes.psi4.shape
+    (2, 3, (3, 12))
+    >>> print(modes.time)
+    [0.  0.5 1. ]
+    >>> print(modes.psi4[:, swm2_mode_index(2, 2)])
+    [1.+2.j 3.+4.j 5.+6.j]
+    >>> header["version"] = 2
+    >>> with open(filename, "wb") as file:
+    ...     _ = file.write(header.tobytes() + records.tobytes())
+    >>> read_psi4_swm2_modes(filename)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    ValueError: ... has unsupported version (or byte order) 2; expected 1.
+    """
+    header = np.fromfile(filename, dtype=swm2_header_dtype, count=1)
+    if len(header) != 1 or header["magic"][0] != b"NRPYSWM2":
+        print("Error: " + filename + " is not a binary psi4_{l,m} output file.")
+        sys.exit(1)
+    header = header[0]
+    if header["version"] != swm2_version:
+        raise ValueError(filename + " has unsupported version (or byte order) " + str(header["version"]) +
+                         "; expected " + str(swm2_version) + ".")
+    record_dtype = swm2_record_dtype(int(header["num_modes"]))
+    if record_dtype.itemsize != header["bytes_per_record"]:
+        print("Error: " + filename + " has " + str(header["bytes_per_record"]) + "-byte records; expected " +
+              str(record_dtype.itemsize) + ".")
+        sys.exit(1)
+    with open(filename, "rb") as file:
+        file.seek(0, 2)
+        num_records = (file.tell() - swm2_header_dtype.itemsize) // record_dtype.itemsize
+    if num_records == 0:
+        records = np.zeros(0, dtype=record_dtype)
+    else:
+        records = np.memmap(filename, dtype=record_dtype, mode="r", offset=swm2_header_dtype.itemsize,
+                            shape=(num_records,))
+    return psi4_swm2_modes(int(header["l_min"]), int(header["l_max"]), records["time"], records["psi4"])
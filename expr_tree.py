@@ -55,10 +55,19 @@ class ExprTree:
         """
         if clear:
             del node.children[:]
-        for arg in node.expr.args:
-            subtree = self.Node(arg, node.expr.func)
-            node.append(subtree)
-            self.build(subtree)
+        # Iterative (explicit stack) construction, so that deeply nested
+        #   expressions never approach the Python recursion limit.
+        Node = self.Node
+        stack = [node]
+        while stack:
+            parent = stack.pop()
+            expr = parent.expr
+            func = expr.func
+            for arg in expr.args:
+                subtree = Node(arg, func)
+                parent.children.append(subtree)
+                if arg.args:
+                    stack.append(subtree)
 
     def preorder(self, node=None):
         """Generate iterator for preorder traversal.
@@ -76,10 +85,14 @@ class ExprTree:
         """
         if node is None:
             node = self.root
-        yield node
-        for child in node.children:
-            for subtree in self.preorder(child):
-                yield subtree
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            yield node
+            # Children are read only after the node has been yielded, so
+            #   (as before) the client may modify or rebuild the subtree
+            #   rooted at the yielded node before it is traversed.
+            stack.extend(reversed(node.children))
 
     def postorder(self, node=None):
         """Generate iterator for postorder traversal.
@@ -97,15 +110,26 @@ class ExprTree:
         """
         if node is None:
             node = self.root
-        for child in node.children:
-            for subtree in self.postorder(child):
-                yield subtree
-        yield node
+        stack = [(node, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded or not node.children:
+                yield node
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
 
     def reconstruct(self, evaluate=False):
         """
         Reconstruct root expression from expression tree.
 
+        With evaluate=False, only subtrees that were modified since they
+        were built are reconstructed: a node is re-instantiated only if one
+        of its children no longer holds the identical expression object
+        found in the node's own arguments. Untouched subtrees keep their
+        original SymPy expressions as-is. With evaluate=True, every subtree
+        is reconstructed (and therefore re-evaluated).
+
         :arg:    evaluate root expression (default: False)
         :return: root expression
 
@@ -115,14 +139,24 @@ class ExprTree:
         >>> tree.root.children[0].expr = sin(a + b)
         >>> tree.reconstruct()
         sin(a + b)**2
+        >>> tree = ExprTree(cos(a + b)**2)
+        >>> tree.root.children[0].children[0].children[1].expr = a
+        >>> tree.reconstruct(evaluate=True)
+        cos(2*a)**2
         """
-        for subtree in self.postorder():
-            if subtree.children:
-                expr_list = [node.expr for node in subtree.children]
-                try:
-                    subtree.expr = subtree.expr.func(*expr_list, evaluate=evaluate)
-                except TypeError as e:
-                    subtree.expr = subtree.expr.func(*expr_list)
+        # Flat postorder array of all interior nodes; children precede parents.
+        for subtree in [node for node in self.postorder() if node.children]:
+            expr = subtree.expr
+            args = expr.args
+            children = subtree.children
+            if not evaluate and len(args) == len(children) and \
+                    all(child.expr is arg for child, arg in zip(children, args)):
+                continue  # Clean subtree: nothing below this node has changed.
+            expr_list = [node.expr for node in children]
+            try:
+                subtree.expr = expr.func(*expr_list, evaluate=evaluate)
+            except TypeError as e:
+                subtree.expr = expr.func(*expr_list)
 
         return self.root.expr
 
@@ -137,8 +171,8 @@ class ExprTree:
         >>> from sympy import cos, sin
         >>> tree = ExprTree(cos(a + b)**2)
         >>> for node in tree.find(a + b):
-        >>>    print(node)
-        a+b
+        ...    print(node)
+        a + b
         """
         if isinstance(find, (list, tuple, set, frozenset)):
             for match in find:
@@ -164,8 +198,9 @@ class ExprTree:
         >>> from sympy import cos, sin
         >>> tree = ExprTree(cos(a + b)**2)
         >>> tree.replace(a + b, a*a + b)
+        ExprTree(cos(a + b)**2)
         >>> tree.reconstruct()
-        sin(a**2 + b)**2
+        cos(a**2 + b)**2
         """
         if isinstance(find, (list, set, tuple)):
             for (match, new) in zip(find, replace):
@@ -193,6 +228,8 @@ class ExprTree:
     class Node:
         """Expression Tree Node"""
 
+        __slots__ = ('expr', 'func', 'children')
+
         def __init__(self, expr, func):
             self.expr = expr
             self.func = func
@@ -202,11 +239,13 @@ class ExprTree:
             self.children.append(node)
 
         def find(self, find):
-            if self.expr == find.expr:
-                yield self
-            else:
-                for child in self.children:
-                    yield from child.find(find)
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if node.expr == find.expr:
+                    yield node
+                else:
+                    stack.extend(reversed(node.children))
 
         def update(self, node):
             self.expr = node.expr
@@ -9,7 +9,7 @@
 # Author: Zachariah B. Etienne
 #         zachetie **at** gmail **dot* com
 
-from outputC import parse_outCparams_string, outC_function_dict, outC_function_prototype_dict, outC_NRPy_basic_defines_h_dict, outC_function_master_list  # NRPy+: Core C code output module
+from outputC import parse_outCparams_string, output_Ccode, outC_function_dict, outC_function_prototype_dict, outC_NRPy_basic_defines_h_dict, outC_function_master_list, construct_pending_Cfunctions  # NRPy+: Core C code output module
 import NRPy_param_funcs as par   # NRPy+: parameter interface
 import sympy as sp               # SymPy: The Python computer algebra package upon which NRPy+ depends
 import grid as gri               # NRPy+: Functions having to do with numerical grids
@@ -85,12 +85,9 @@ def FD_outputC(filename, sympyexpr_list, params="", upwindcontrolvec="",idxs=Non
     # Next, check each base gridfunction to determine whether
     #     it is indeed registered as a gridfunction.
     #     If not, exit with error.
+    gfs_map = gri.glb_gridfcs_map()
     for basegf in list_of_base_gridfunction_names_in_derivs:
-        is_gf = False
-        for gf in gri.glb_gridfcs_list:
-            if basegf == str(gf.name):
-                is_gf = True
-        if not is_gf:
+        if basegf not in gfs_map:
             print("Error: Attempting to take the derivative of "+basegf+", which is not a registered gridfunction.")
             print("       Make sure your gridfunction name does not have any underscores in it!")
 
@@ -129,30 +126,19 @@ def FD_outputC(filename, sympyexpr_list, params="", upwindcontrolvec="",idxs=Non
     read_from_memory_Ccode = read_gfs_from_memory(list_of_base_gridfunction_names_in_derivs, fdstencl, sympyexpr_list, FDparams, idxs)
 
     # Step 5: construct C code.
-    Coutput = ""
+    #         Coutput is a list of C code chunks, passed as-is to the output sink.
+    Coutput = []
     if outCparams.includebraces == "True":
-        Coutput = outCparams.preindent + "{\n"
-    Coutput = construct_Ccode(sympyexpr_list, list_of_deriv_vars,
-                           list_of_base_gridfunction_names_in_derivs, list_of_deriv_operators,
-                           fdcoeffs, fdstencl, read_from_memory_Ccode, FDparams, Coutput)
+        Coutput.append(outCparams.preindent + "{\n")
+    construct_Ccode(sympyexpr_list, list_of_deriv_vars,
+                    list_of_base_gridfunction_names_in_derivs, list_of_deriv_operators,
+                    fdcoeffs, fdstencl, read_from_memory_Ccode, FDparams, Coutput)
     if outCparams.includebraces == "True":
-        Coutput += outCparams.preindent+"}"
+        Coutput.append(outCparams.preindent+"}")
 
-    # Step 6: Output the C code in desired format: stdout, string, or file.
-    if filename == "stdout":
-        print(Coutput)
-    elif filename == "returnstring":
-        return Coutput
-    else:
-        # Output to the file specified by outCfilename
-        with open(filename, outCparams.outCfileaccess) as file:
-            file.write(Coutput)
-        successstr = ""
-        if outCparams.outCfileaccess == "a":
-            successstr = "Appended "
-        elif outCparams.outCfileaccess == "w":
-            successstr = "Wrote "
-        print(successstr + "to file \"" + filename + "\"")
+    # Step 6: Output the C code to the desired sink: stdout, string,
+    #         file-like object, list of chunks, or file.
+    return output_Ccode(Coutput, filename, outCparams.outCfileaccess)
 
 ################
 # TO BE DEPRECATED:
@@ -173,6 +159,7 @@ def output_finite_difference_functions_h(path=os.path.join(".")):
         file.write("#define _UNUSED   " + UNUSED   + "\n")
         file.write("#define _NOINLINE " + NOINLINE + "\n")
 
+        construct_pending_Cfunctions()
         for key, item in outC_function_dict.items():
             if "__FD_OPERATOR_FUNC__" in item:
                 file.write(item.replace("const REAL_SIMD_ARRAY _NegativeOne_ =",
@@ -303,6 +290,84 @@ def setup_FD_matrix__return_inverse(STENCILWIDTH, UPDOWNWIND_stencil_shift):
     return M**(-1)
 
 
+#######################################################
+#  FINITE-DIFFERENCE STENCIL TABLE
+#
+#  Inverting the exact SymPy matrix above is by far the most
+#  expensive part of compute_fdcoeffs_fdstencl(), yet the result
+#  depends only on the stencil width, the up/downwind shift, and
+#  the matrix row (i.e., the derivative type) -- not on the
+#  derivative direction or the gridfunction. So we store, for each
+#  (STENCILWIDTH, UPDOWNWIND_stencil_shift, matrixrow), the column
+#  matrixrow! * Minv[:, matrixrow] in a process-wide table.
+#
+#  The table is seeded from finite_difference_stencil_table.json,
+#  which covers centered FD orders 2-12 with all upwinded,
+#  downwinded, full-up/downwinded, and Kreiss-Oliger variants.
+#  Any other stencil is computed once on first use and added to
+#  the table at runtime; call write_FD_stencil_table() to extend
+#  the on-disk table.
+FD_stencil_table = {}
+FD_stencil_table_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "finite_difference_stencil_table.json")
+FD_stencil_table_file_loaded = False
+
+
+def read_FD_stencil_table(filename=FD_stencil_table_file):
+    import json
+    try:
+        with open(filename, "r") as file:
+            table = json.load(file)
+    except (OSError, ValueError):
+        return
+    for key, column in table.items():
+        STENCILWIDTH, UPDOWNWIND_stencil_shift, matrixrow = [int(x) for x in key.split(",")]
+        FD_stencil_table[(STENCILWIDTH, UPDOWNWIND_stencil_shift, matrixrow)] = [sp.Rational(x) for x in column]
+
+
+def write_FD_stencil_table(filename=FD_stencil_table_file):
+    import json
+    table = {}
+    for key in sorted(FD_stencil_table):
+        table[",".join(str(x) for x in key)] = [str(x) for x in FD_stencil_table[key]]
+    # One stencil per line, so that extending the table yields readable diffs.
+    with open(filename, "w") as file:
+        file.write("{\n" + ",\n".join(json.dumps(key) + ": " + json.dumps(column)
+                                       for key, column in table.items()) + "\n}\n")
+
+
+def FD_stencil_column(STENCILWIDTH, UPDOWNWIND_stencil_shift, matrixrow):
+    """ Return matrixrow! * Minv[:, matrixrow], i.e., the 1D finite-difference coefficients
+        for the stencil points i - (STENCILWIDTH-1)/2 + UPDOWNWIND_stencil_shift, i = 0..STENCILWIDTH-1.
+
+    >>> FD_stencil_column(5, 0, 1)
+    [1/12, -2/3, 0, 2/3, -1/12]
+    >>> FD_stencil_column(5, 0, 2)
+    [-1/12, 4/3, -5/2, 4/3, -1/12]
+    """
+    global FD_stencil_table_file_loaded
+    if not FD_stencil_table_file_loaded:
+        read_FD_stencil_table()
+        FD_stencil_table_file_loaded = True
+    key = (STENCILWIDTH, UPDOWNWIND_stencil_shift, matrixrow)
+    if key not in FD_stencil_table:
+        Minv = setup_FD_matrix__return_inverse(STENCILWIDTH, UPDOWNWIND_stencil_shift)
+        FD_stencil_table[key] = [sp.factorial(matrixrow)*Minv[(i, matrixrow)] for i in range(STENCILWIDTH)]
+    return FD_stencil_table[key]
+
+
+# Populate the FD stencil table for centered FD orders FDORDERmin..FDORDERmax,
+#   including all up/downwinded stencils and Kreiss-Oliger stencils
+#   of order FD_CENTDERIVS_ORDER + KO_ORDER__CENTDERIVS_PLUS.
+def generate_FD_stencil_table(FDORDERmin=2, FDORDERmax=12, KO_ORDER__CENTDERIVS_PLUS=2):
+    for FDORDER in range(FDORDERmin, FDORDERmax+1, 2):
+        STENCILWIDTH = FDORDER + 1
+        for shift in sorted({0, 1, -1, int(FDORDER/2), -int(FDORDER/2)}):
+            FD_stencil_column(STENCILWIDTH, shift, 1)
+        FD_stencil_column(STENCILWIDTH, 0, 2)
+        KOSTENCILWIDTH = FDORDER + KO_ORDER__CENTDERIVS_PLUS + 1
+        FD_stencil_column(KOSTENCILWIDTH, 0, KOSTENCILWIDTH - 1)
+
+
 def compute_fdcoeffs_fdstencl(derivstring, FDORDER=-1):
     # Step 0: Set finite differencing order, stencil size, and up/downwinding
     if FDORDER == -1:
@@ -323,9 +388,6 @@ def compute_fdcoeffs_fdstencl(derivstring, FDORDER=-1):
     elif "dfulldnD" in derivstring:
         UPDOWNWIND_stencil_shift = -int(FDORDER/2)
 
-    # Step 1: Set up FD matrix and return the inverse, as documented above.
-    Minv = setup_FD_matrix__return_inverse(STENCILWIDTH, UPDOWNWIND_stencil_shift)
-
     # Step 2:
     #     Based on the input derivative string,
     #     pick out the relevant row of the matrix
@@ -355,7 +417,11 @@ def compute_fdcoeffs_fdstencl(derivstring, FDORDER=-1):
         # Up/downwinded and first derivs are all of "FirstDeriv" type
         pass
 
-    # Step 3:
+    # Step 3: Look up (or compute & store) the column of the inverted FD matrix
+    #         corresponding to this derivative type, as documented above.
+    Minvcolumn = FD_stencil_column(STENCILWIDTH, UPDOWNWIND_stencil_shift, matrixrow)
+
+    # Step 4:
     #     Set finite difference coefficients
     #     and stencil points corresponding to
     #     each finite difference coefficient.
@@ -365,7 +431,7 @@ def compute_fdcoeffs_fdstencl(derivstring, FDORDER=-1):
         for i in range(STENCILWIDTH):
             idx4 = [0, 0, 0, 0]
             # First compute finite difference coefficient.
-            fdcoeff = sp.factorial(matrixrow)*Minv[(i, matrixrow)]
+            fdcoeff = Minvcolumn[i]
             # Do not store fdcoeff or fdstencil if
             # finite difference coefficient is zero.
             if fdcoeff != 0:
@@ -389,8 +455,7 @@ def compute_fdcoeffs_fdstencl(derivstring, FDORDER=-1):
                 idx4 = [0, 0, 0, 0]
 
                 # First compute finite difference coefficient.
-                fdcoeff = (sp.factorial(matrixrow)*Minv[(i, matrixrow)]) * \
-                          (sp.factorial(matrixrow)*Minv[(j, matrixrow)])
+                fdcoeff = Minvcolumn[i] * Minvcolumn[j]
 
                 # Do not store fdcoeff or fdstencil if
                 # finite difference coefficient is zero.
@@ -11,6 +11,7 @@
 from outputC import superfast_uniq, outputC, outC_function_dict, add_to_Cfunction_dict  # NRPy+: Core C code output module
 from suffixes import getsuffix
 import NRPy_param_funcs as par      # NRPy+: parameter interface
+import kernel_profile               # NRPy+: Operation-count and register-pressure profiles of generated C code
 import sympy as sp                  # SymPy: The Python computer algebra package upon which NRPy+ depends
 import grid as gri                  # NRPy+: Functions having to do with numerical grids
 import sys                          # Standard Python module for multiplatform OS-level functions
@@ -492,6 +493,16 @@ def read_gfs_from_memory(list_of_base_gridfunction_names_in_derivs, fdstencl, sy
     # Step 4e: Create the full C code string
     #      for reading from memory:
 
+    # Step 4e.i: Record the points read from memory, for each gridfunction,
+    #      in the kernel profile (see kernel_profile.py)
+    if kernel_profile.enable:
+        points_read = {}
+        for gfidx in range(len(sorted_list_of_points_read_from_memory)):
+            if len(sorted_list_of_points_read_from_memory[gfidx]) > 0:
+                points_read[gri.glb_gridfcs_list[gfidx].name] = \
+                    [[int(i) for i in pt.split(',')[:FDparams.DIM]] for pt in sorted_list_of_points_read_from_memory[gfidx]]
+        kernel_profile.add_pending(kernel_profile.gridfunction_reads_profile(points_read))
+
     read_from_memory_Ccode = ""
     count = 0
     if idxs is None:
@@ -627,14 +638,16 @@ def add_FD_func_to_outC_function_dict(list_of_deriv_vars,
         # If the function already exists in the outC_function_dict, then do not add it; move to the next op.
         if func_prefix + "f_" + str(op) not in outC_function_dict:
             p = "preindent=1,enable_SIMD="+FDparams.enable_SIMD+",outCverbose=False,CSE_preprocess=True,includebraces=False"
-            outFDstr = outputC(rhs_expr, "retval", "returnstring", params=p)
-            outFDstr = outFDstr.replace("retval = ", "return ")
-            add_to_Cfunction_dict(desc=" * (__FD_OPERATOR_FUNC__) Finite difference operator for "+str(op).replace("dDD", "second derivative: ").
-                                  replace("dD", "first derivative: ").replace("dKOD", "Kreiss-Oliger derivative: ").
-                                  replace("dupD", "upwinded derivative: ").replace("ddnD", "downwinded derivative: ") + " direction. In Cartesian coordinates, directions 0,1,2 correspond to x,y,z directions, respectively.",
-                                  c_type="static " + c_type + " _NOINLINE _UNUSED",
-                                  name=func_prefix+"f_" + str(op), enableCparameters=False,
-                                  params=outfunc_params, preloop="", body=outFDstr)
+            # Keep this function's kernel profile apart from that of the kernel calling it.
+            with kernel_profile.separate_pending_profiles():
+                outFDstr = outputC(rhs_expr, "retval", "returnstring", params=p)
+                outFDstr = outFDstr.replace("retval = ", "return ")
+                add_to_Cfunction_dict(desc=" * (__FD_OPERATOR_FUNC__) Finite difference operator for "+str(op).replace("dDD", "second derivative: ").
+                                      replace("dD", "first derivative: ").replace("dKOD", "Kreiss-Oliger derivative: ").
+                                      replace("dupD", "upwinded derivative: ").replace("ddnD", "downwinded derivative: ") + " direction. In Cartesian coordinates, directions 0,1,2 correspond to x,y,z directions, respectively.",
+                                      c_type="static " + c_type + " _NOINLINE _UNUSED",
+                                      name=func_prefix+"f_" + str(op), enableCparameters=False,
+                                      params=outfunc_params, preloop="", body=outFDstr)
     return FDfunccall_list
 
 def construct_Ccode(sympyexpr_list, list_of_deriv_vars,
@@ -658,8 +671,9 @@ def construct_Ccode(sympyexpr_list, list_of_deriv_vars,
     # :param fdstencl:
     # :param read_from_memory_Ccode:
     # :param FDparams:
-    # :param Coutput: The start of the Coutput string; this function's output will be pasted to a copy of Coutput
-    # :return: Returns a C code string
+    # :param Coutput: The start of the Coutput string; this function's output will be pasted to a copy of Coutput.
+    #                 If Coutput is a list, C code chunks are instead appended to it (see outputC.output_Ccode())
+    # :return: Returns a C code string, or Coutput itself if Coutput is a list
     # >>> from outputC import lhrh
     # >>> import indexedexp as ixp
     # >>> import NRPy_param_funcs as par
@@ -727,15 +741,20 @@ def construct_Ccode(sympyexpr_list, list_of_deriv_vars,
 
     def indent_Ccode(Ccode):
         Ccodesplit = Ccode.splitlines()
-        outstring = ""
+        outstring = []
         for i in range(len(Ccodesplit)):
             if Ccodesplit[i] != "":
                 if Ccodesplit[i].lstrip().startswith("#"):
                     # Remove all indentation from preprocessor statements (lines that start with "#")
-                    outstring += Ccodesplit[i].lstrip() + '\n'
+                    outstring.append(Ccodesplit[i].lstrip() + '\n')
                 else:
-                    outstring += FDparams.fullindent + Ccodesplit[i] + '\n'
-        return outstring.rstrip(" ")  # make sure to remove trailing whitespace!
+                    outstring.append(FDparams.fullindent + Ccodesplit[i] + '\n')
+        return "".join(outstring).rstrip(" ")  # make sure to remove trailing whitespace!
+
+    # Build the C code as a list of chunks, joined once at the end.
+    return_chunks = isinstance(Coutput, list)
+    if not return_chunks:
+        Coutput = [Coutput]
 
     # Step 5.a.i: Read gridfunctions from memory at needed pts.
     # *** No need to do anything here; already set in
@@ -813,44 +832,44 @@ def construct_Ccode(sympyexpr_list, list_of_deriv_vars,
         NRPy_FD__Number_of_Steps += 1
 
     if len(read_from_memory_Ccode) > 0:
-        Coutput += indent_Ccode("/*\n * NRPy+ Finite Difference Code Generation, Step "
-                                + str(NRPy_FD_StepNumber) + " of " + str(NRPy_FD__Number_of_Steps) +
-                                ": Read from main memory and compute finite difference stencils:\n */\n")
+        Coutput.append(indent_Ccode("/*\n * NRPy+ Finite Difference Code Generation, Step "
+                                    + str(NRPy_FD_StepNumber) + " of " + str(NRPy_FD__Number_of_Steps) +
+                                    ": Read from main memory and compute finite difference stencils:\n */\n"))
         NRPy_FD_StepNumber = NRPy_FD_StepNumber + 1
         if FDparams.enable_FD_functions:
             # Compute finite differences using function calls (instead of inlined calculations)
-            Coutput += indent_Ccode(read_from_memory_Ccode)
+            Coutput.append(indent_Ccode(read_from_memory_Ccode))
             for funccall in funccall_list:
-                Coutput += indent_Ccode(funccall)
+                Coutput.append(indent_Ccode(funccall))
             if FDparams.upwindcontrolvec != "":
                 # Compute finite differences using inlined calculations
                 params = FDparams.outCparams
                 # We choose the CSE temporary variable prefix "FDpart1" for the finite difference coefficients:
                 params += ",CSE_varprefix=FDPart1,includebraces=False,CSE_preprocess=True,SIMD_find_more_subs=True"
-                Coutput += indent_Ccode(outputC(FDexprs, FDlhsvarnames, "returnstring", params=params))
+                Coutput.append(indent_Ccode(outputC(FDexprs, FDlhsvarnames, "returnstring", params=params)))
 
         else:
             # Compute finite differences using inlined calculations
             params = FDparams.outCparams.replace("preindent=1", "preindent=0")  # Remove an unnecessary indentation
             # We choose the CSE temporary variable prefix "FDpart1" for the finite difference coefficients:
             params += ",CSE_varprefix=FDPart1,includebraces=False,CSE_preprocess=True,SIMD_find_more_subs=True"
-            Coutput += indent_Ccode(outputC(FDexprs, FDlhsvarnames, "returnstring",params=params,
-                                            prestring=read_from_memory_Ccode))
+            Coutput.append(indent_Ccode(outputC(FDexprs, FDlhsvarnames, "returnstring",params=params,
+                                                prestring=read_from_memory_Ccode)))
 
     # Step 5.b.ii: Implement control-vector upwinding algorithm.
     if FDparams.upwindcontrolvec != "":
         if len(upwind_directions) > 0:
-            Coutput += indent_Ccode("/*\n * NRPy+ Finite Difference Code Generation, Step "
-                                    + str(NRPy_FD_StepNumber) + " of " + str(NRPy_FD__Number_of_Steps) +
-                                    ": Implement upwinding algorithm:\n */\n")
+            Coutput.append(indent_Ccode("/*\n * NRPy+ Finite Difference Code Generation, Step "
+                                        + str(NRPy_FD_StepNumber) + " of " + str(NRPy_FD__Number_of_Steps) +
+                                        ": Implement upwinding algorithm:\n */\n"))
             NRPy_FD_StepNumber = NRPy_FD_StepNumber + 1
             if FDparams.enable_SIMD == "True":
                 for n in ["0", "1"]:
-                    Coutput += indent_Ccode("const double tmp_upwind_Integer_"+n+" = "+n+".000000000000000000000000000000000;\n")
-                    Coutput += indent_Ccode("const REAL_SIMD_ARRAY upwind_Integer_"+n+" = ConstSIMD(tmp_upwind_Integer_"+n+");\n")
+                    Coutput.append(indent_Ccode("const double tmp_upwind_Integer_"+n+" = "+n+".000000000000000000000000000000000;\n"))
+                    Coutput.append(indent_Ccode("const REAL_SIMD_ARRAY upwind_Integer_"+n+" = ConstSIMD(tmp_upwind_Integer_"+n+");\n"))
             for dirn in upwind_directions:
-                Coutput += indent_Ccode(type__var("UpWind" + str(dirn), FDparams) +
-                                        " = UPWIND_ALG(UpwindControlVectorU" + str(dirn) + ");\n")
+                Coutput.append(indent_Ccode(type__var("UpWind" + str(dirn), FDparams) +
+                                            " = UPWIND_ALG(UpwindControlVectorU" + str(dirn) + ");\n"))
         upwindU = [sp.sympify(0) for i in range(FDparams.DIM)]
         for dirn in upwind_directions:
             upwindU[dirn] = sp.sympify("UpWind" + str(dirn))
@@ -866,14 +885,14 @@ def construct_Ccode(sympyexpr_list, list_of_deriv_vars,
         # For convenience, we require type__var() above to
         # prefix up/downwinded variables with "UpwindAlgInput".
         # Here we do not wish to have this prefix.
-        Coutput += indent_Ccode(outputC(upwind_expr_list, var_list,
-                                        "returnstring", params=FDparams.outCparams + ",CSE_varprefix=FDPart2,includebraces=False"))
+        Coutput.append(indent_Ccode(outputC(upwind_expr_list, var_list,
+                                            "returnstring", params=FDparams.outCparams + ",CSE_varprefix=FDPart2,includebraces=False")))
 
     # Step 5.c.i: Add input RHS & LHS expressions from
     #             sympyexpr_list[]
-    Coutput += indent_Ccode("/*\n * NRPy+ Finite Difference Code Generation, Step "
-                            + str(NRPy_FD_StepNumber) + " of " + str(NRPy_FD__Number_of_Steps) +
-                            ": Evaluate SymPy expressions and write to main memory:\n */\n")
+    Coutput.append(indent_Ccode("/*\n * NRPy+ Finite Difference Code Generation, Step "
+                                + str(NRPy_FD_StepNumber) + " of " + str(NRPy_FD__Number_of_Steps) +
+                                ": Evaluate SymPy expressions and write to main memory:\n */\n"))
     exprs = []
     lhsvarnames = []
     for i in range(len(sympyexpr_list)):
@@ -898,11 +917,13 @@ def construct_Ccode(sympyexpr_list, list_of_deriv_vars,
     for lhs in lhsvarnames:
         lhsvarnamestrings.append(str(lhs))
 
-    Coutput += indent_Ccode(outputC(exprs, lhsvarnamestrings, "returnstring",
-                                    params=FDparams.outCparams + ",CSE_varprefix=FDPart3,includebraces=False,preindent=0",
-                                    prestring="", poststring=write_to_mem_string))
+    Coutput.append(indent_Ccode(outputC(exprs, lhsvarnamestrings, "returnstring",
+                                        params=FDparams.outCparams + ",CSE_varprefix=FDPart3,includebraces=False,preindent=0",
+                                        prestring="", poststring=write_to_mem_string)))
 
-    return Coutput
+    if return_chunks:
+        return Coutput
+    return "".join(Coutput)
 #################################
 
 if __name__ == "__main__":
@@ -23,12 +23,46 @@ glb_gridfc = namedtuple('gridfunction', 'gftype name rank DIM f_infinity wavespe
 glb_gridfcs_list = []
 
 
+# Index of glb_gridfcs_list: name -> gridfunction.
+#   glb_gridfcs_list may be replaced wholesale (e.g., by
+#   pickling.unpickle_NRPy_env()), so the index is validated against the
+#   identity and length of the list it was built from: if the list was
+#   replaced it is rebuilt, and if elements were appended it is extended
+#   incrementally. The dict it holds must be treated as read-only.
+class _gridfcs_index:
+    def __init__(self):
+        self.lst = None
+        self.length = 0
+        self.by_name = {}
+
+    def sync(self, lst):
+        if lst is not self.lst or len(lst) < self.length:
+            self.lst = lst
+            self.length = 0
+            self.by_name = {}
+        for idx in range(self.length, len(lst)):
+            gf = lst[idx]
+            assert gf.name not in self.by_name, "Gridfunction '" + gf.name + "' appears twice in glb_gridfcs_list"
+            self.by_name[gf.name] = gf
+        self.length = len(lst)
+        return self
+
+
+_gridfcs_idx = _gridfcs_index()
+
+
+def gridfcs_index():
+    return _gridfcs_idx.sync(glb_gridfcs_list)
+
+
+# Returns a new dict (name -> gridfunction) on each call, which callers may modify
+#   freely; within this module the index's own dict is used read-only.
 def glb_gridfcs_map():
-    m = {}
-    for gf in glb_gridfcs_list:
-        m[gf.name] = gf
-    assert len(glb_gridfcs_list) == len(m)
-    return m
+    return dict(gridfcs_index().by_name)
+
+
+def gridfunction_is_registered(gf_name):
+    return gf_name in gridfcs_index().by_name
 
 
 # griddata_struct contains data needed by each grid
@@ -59,7 +93,7 @@ Cart_CoM_offset = par.Cparameters("REAL", thismodule, ["Cart_CoM_offsetx", "Cart
 
 
 def variable_type(var):
-    var_data = glb_gridfcs_map().get(str(var))
+    var_data = gridfcs_index().by_name.get(str(var))
     var_is_gf = var_data is not None
     var_is_parameter = False
     for param in par.glb_Cparams_list:
@@ -78,12 +112,12 @@ def variable_type(var):
 
 
 def find_gfnames():
-    return sorted(list(glb_gridfcs_map().keys()))
+    return sorted(list(gridfcs_index().by_name.keys()))
 
 
 def find_gftype(varname, fail_on_missing=True):
     assert isinstance(varname, str) or isinstance(varname, unicode)
-    var_data = glb_gridfcs_map().get(varname)
+    var_data = gridfcs_index().by_name.get(varname)
     if var_data is not None:
         return var_data.gftype
 
@@ -94,7 +128,7 @@ def find_gftype(varname, fail_on_missing=True):
 
 
 def find_gfmodule(varname, fail_on_missing=True):
-    var_data = glb_gridfcs_map().get(varname)
+    var_data = gridfcs_index().by_name.get(varname)
     if var_data is not None:
         return var_data.external_module
 
@@ -116,7 +150,7 @@ def gfaccess(gfarrayname="", varname="", ijklstring="", context="DECL"):
 
 
 def _gfaccess(gfarrayname, varname, ijklstring, context):
-    var_data = glb_gridfcs_map().get(varname, None)
+    var_data = gridfcs_index().by_name.get(varname, None)
 
     assert context in ["DECL", "USE"], "The context must be either DECL or USE, not '" + context + "'"
 
@@ -251,7 +285,7 @@ def verify_gridfunction_basename_is_valid(gf_basename):
 
 
 def find_centering(gf_name):
-    gf = glb_gridfcs_map().get(gf_name, None)
+    gf = gridfcs_index().by_name.get(gf_name, None)
     if gf is not None:
         return gf.centering
 
@@ -347,15 +381,17 @@ def register_gridfunctions(gf_type, gf_names, rank=0, is_indexed=False, DIM=3, f
     # Step 4: Check for duplicate grid function registrations. If:
     #         a) A duplicate is found, error out. Otherwise
     #         b) Add to map of gridfunctions, stored in glb_gridfcs_list
+    gfs_map = gridfcs_index().by_name
     for i, gf_name in enumerate(gf_names):
-        if gf_name in glb_gridfcs_map():
-            assert gf_type == glb_gridfcs_map()[gf_name].gftype, \
+        if gf_name in gfs_map:
+            assert gf_type == gfs_map[gf_name].gftype, \
                 'Error: Tried to register the gridfunction "' + gf_name + '" twice with different types'
+            continue
         # If no duplicate found, append to "gridfunctions" list:
         var_data = (glb_gridfc(gf_type, gf_name, rank, DIM, f_infinity[i], wavespeed[i], centering[i], external_module))
-        glb_gridfcs_map()[gf_name] = var_data
-        if gf_name not in glb_gridfcs_map():
-            glb_gridfcs_list.append(var_data)
+        glb_gridfcs_list.append(var_data)
+        # Appending to glb_gridfcs_list extends the index on its next sync:
+        gfs_map = gridfcs_index().by_name
 
     # Step 5: Return SymPy object corresponding to symbol or
     #         list of symbols representing gridfunction in
@@ -462,22 +498,19 @@ def gridfunction_defines():
     # If CarpetX: Do I need to do this for CORE vars? I don't think so.
 
     if (len(evolved_variables_list)) > 0:
+        gfs_map = gridfcs_index().by_name
         outstr += """\n\n// SET gridfunctions_f_infinity[i] = value of gridfunction i in the limit r->infinity:
 static const REAL gridfunctions_f_infinity[NUM_EVOL_GFS] = { """
         for evol_var in evolved_variables_list:  # This list is sorted
             #                                      We need to preserve the order to ensure consistency with the #defines
-            for gf in glb_gridfcs_list:
-                if gf.name == evol_var and gf.gftype == "EVOL":
-                    outstr += str(gf.f_infinity) + ", "
+            outstr += str(gfs_map[evol_var].f_infinity) + ", "
         outstr = outstr[:-2] + " };\n"
 
         outstr += """\n\n// SET gridfunctions_wavespeed[i] = gridfunction i's characteristic wave speed:
 static const REAL gridfunctions_wavespeed[NUM_EVOL_GFS] = { """
         for evol_var in evolved_variables_list:  # This list is sorted
             #                                      We need to preserve the order to ensure consistency with the #defines
-            for gf in glb_gridfcs_list:
-                if gf.name == evol_var and gf.gftype == "EVOL":
-                    outstr += str(gf.wavespeed) + ", "
+            outstr += str(gfs_map[evol_var].wavespeed) + ", "
         outstr = outstr[:-2] + " };\n"
 
         # This code could never have worked
@@ -485,9 +518,7 @@ static const REAL gridfunctions_wavespeed[NUM_EVOL_GFS] = { """
 //static const REAL gridfunctions_centering[NUM_EVOL_GFS] = { """
         for evol_var in evolved_variables_list:  # This list is sorted
             #                                      We need to preserve the order to ensure consistency with the #defines
-            for gf in glb_gridfcs_list:
-                if gf.name == evol_var and gf.gftype == "EVOL":
-                    outstr += str(gf.centering) + ", "
+            outstr += str(gfs_map[evol_var].centering) + ", "
         outstr = outstr[:-2] + " };\n"
 
     return outstr
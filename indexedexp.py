@@ -24,7 +24,7 @@ def get_group_name(gf_name):
     # Assume that if the name is not in the
     # rev_index_group, then it is in a group
     # with the same name as the gf
-    assert gf_name in gri.glb_gridfcs_map(), "Not a valid grid function: '" + gf_name + "'"
+    assert gri.gridfunction_is_registered(gf_name), "Not a valid grid function: '" + gf_name + "'"
     return gf_name
 
 
@@ -41,7 +41,7 @@ def get_all_group_names():
 def get_gfnames_for_group(gf_group):
     if gf_group in index_group:
         return index_group[gf_group]
-    assert gf_group in gri.glb_gridfcs_map(), "Not a valid grid group: '" + gf_group + "'"
+    assert gri.gridfunction_is_registered(gf_group), "Not a valid grid group: '" + gf_group + "'"
     return {gf_group: 1}
 
 
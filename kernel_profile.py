@@ -0,0 +1,320 @@
+# kernel_profile.py: Operation-count and register-pressure profiles of
+#                    the C kernels generated by outputC() and FD_outputC().
+#
+# When enabled, every outputC() call records, from the CSE results just
+#   before C code emission (i.e., the statements actually emitted,
+#   including SIMD intrinsics if enable_SIMD=True):
+#     ops: number of additions/subtractions ("add"), multiplications
+#          ("mul"), fused multiply-adds ("fma"), divisions ("div"),
+#          square roots ("sqrt"), and transcendental function calls
+#          ("transcendental": exp, log, sin, cbrt, pow, ...).
+#          For scalar code, every product term of a sum is counted as
+#          one FMA (as contracted by the C compiler), rather than as a
+#          mul plus an add; SIMD intrinsics are counted as emitted.
+#     CSE_temporaries: number of CSE temporaries (tmp0, tmp1, ...), and
+#     peak_live_CSE_temporaries: the largest number of CSE temporaries
+#          that are simultaneously live, which is a proxy for register
+#          pressure; see peak_live_temporaries().
+#   and every FD_outputC() call records the points read from memory
+#   for each gridfunction, from which the number of distinct
+#   gridfunction reads and the stencil footprint of each gridfunction
+#   are computed.
+#
+# Records accumulate in pending_profiles, until the C code they describe
+#   is registered by outputC.add_to_Cfunction_dict() (profiles are then
+#   keyed by C function name) or written to a file by outputC.output_Ccode()
+#   (keyed by file name). outputC.construct_Makefile_from_outC_function_dict()
+#   writes the profiles of all kernels to kernel_profiles.json, alongside
+#   the C files of outC_function_dict; write_json() may also be called
+#   directly. Profiles are cached alongside the C code in NRPy_cache.
+#
+# Switches (may be set at runtime, or via environment variable):
+#   kernel_profile.enable     (env: NRPY_KERNEL_PROFILE=1 enables)
+#
+# Compare two builds, e.g., with and without SIMD_find_more_FMAsFMSs:
+#   python kernel_profile.py build_old/kernel_profiles.json build_new/kernel_profiles.json
+
+import os, sys, json                          # Standard Python: multiplatform OS funcs, JSON I/O
+from contextlib import contextmanager         # Standard Python: context managers
+import sympy as sp                            # SymPy: The Python computer algebra package upon which NRPy+ depends
+
+enable = os.environ.get("NRPY_KERNEL_PROFILE", "0") not in ("0", "False", "false", "")
+
+op_kinds = ("add", "mul", "fma", "div", "sqrt", "transcendental")
+
+SIMD_intrinsic_op_kind = {"AddSIMD": "add", "SubSIMD": "add", "MulSIMD": "mul",
+                          "FusedMulAddSIMD": "fma", "FusedMulSubSIMD": "fma",
+                          "NegFusedMulAddSIMD": "fma", "NegFusedMulSubSIMD": "fma",
+                          "DivSIMD": "div", "SqrtSIMD": "sqrt",
+                          "CbrtSIMD": "transcendental", "ExpSIMD": "transcendental", "LogSIMD": "transcendental",
+                          "SinSIMD": "transcendental", "CosSIMD": "transcendental", "PowSIMD": "transcendental"}
+
+transcendental_functions = {"exp", "log", "sin", "cos", "tan", "asin", "acos", "atan", "atan2",
+                            "sinh", "cosh", "tanh", "asinh", "acosh", "atanh", "erf", "erfc"}
+
+# Profile records not yet attributed to a C function or file; see attach_pending().
+pending_profiles = []
+
+# Keys are C function (or file) names; values are lists of profile records.
+kernel_profile_dict = {}
+
+
+def _is_negative_power(expr):
+    return expr.is_Pow and expr.exp.is_Number and expr.exp.is_negative
+
+
+def _num_multiplications(expr):
+    # Number of multiplications performed at the top level of a product,
+    #   ignoring a coefficient of -1 (negation folds into the adjacent add).
+    if not expr.is_Mul:
+        return 0
+    numerator = [arg for arg in expr.args if arg != -1 and not _is_negative_power(arg)]
+    return max(len(numerator) - 1, 0)
+
+
+def _count(expr, counts):
+    # Explicit stack (rather than recursion), so that deeply nested
+    #   expressions never approach the Python recursion limit.
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        if expr.is_Atom:
+            continue
+        if expr.is_Add:
+            stack.extend(expr.args)
+            num_adds = len(expr.args) - 1
+            num_fmas = min(sum(1 for arg in expr.args if _num_multiplications(arg) > 0), num_adds)
+            counts["add"] += num_adds - num_fmas
+            counts["mul"] -= num_fmas
+            counts["fma"] += num_fmas
+        elif expr.is_Mul:
+            factors = [arg for arg in expr.args if arg != -1]
+            denominator = [arg for arg in factors if _is_negative_power(arg)]
+            numerator = [arg for arg in factors if not _is_negative_power(arg)]
+            stack.extend(numerator)
+            # a*b/(c*d): the denominator is multiplied out, then divided into once.
+            stack.extend(arg.base**(-arg.exp) for arg in denominator)
+            counts["mul"] += max(len(numerator) - 1, 0) + max(len(denominator) - 1, 0)
+            if denominator:
+                counts["div"] += 1
+        elif expr.is_Pow:
+            base, exponent = expr.args
+            stack.append(base)
+            if exponent.is_Number and abs(exponent) == sp.Rational(1, 2):
+                counts["sqrt"] += 1
+            elif exponent.is_Integer and 2 <= abs(exponent) <= 5:
+                # outputC emits small integer powers as repeated multiplication.
+                counts["mul"] += abs(int(exponent)) - 1
+            elif exponent != -1:
+                counts["transcendental"] += 1
+                stack.append(exponent)
+            if exponent.is_Number and exponent.is_negative:
+                counts["div"] += 1
+        else:
+            name = type(expr).__name__
+            if name in SIMD_intrinsic_op_kind:
+                counts[SIMD_intrinsic_op_kind[name]] += 1
+            elif name in transcendental_functions:
+                counts["transcendental"] += 1
+            stack.extend(expr.args)
+
+
+def count_ops(exprs):
+    """ Count the floating-point operations, by kind (see op_kinds), needed to evaluate
+        the SymPy expression(s) exprs as emitted by outputC().
+
+    >>> a, b, c, d = sp.symbols("a b c d")
+    >>> count_ops(a*b + c)
+    {'add': 0, 'mul': 0, 'fma': 1, 'div': 0, 'sqrt': 0, 'transcendental': 0}
+    >>> count_ops([a*b/(c*d) - a, sp.sqrt(a + b)/c, sp.exp(c)*d**3])
+    {'add': 1, 'mul': 4, 'fma': 1, 'div': 2, 'sqrt': 1, 'transcendental': 1}
+    >>> FusedMulAddSIMD, DivSIMD = sp.Function("FusedMulAddSIMD"), sp.Function("DivSIMD")
+    >>> count_ops(FusedMulAddSIMD(a, b, DivSIMD(c, d)))
+    {'add': 0, 'mul': 0, 'fma': 1, 'div': 1, 'sqrt': 0, 'transcendental': 0}
+    """
+    counts = dict.fromkeys(op_kinds, 0)
+    for expr in (exprs if isinstance(exprs, (list, tuple)) else [exprs]):
+        _count(sp.sympify(expr), counts)
+    return counts
+
+
+def peak_live_temporaries(CSE_replacements, CSE_reduced_exprs):
+    """ Given the CSE results (as returned by sp.cse()), in the order in which they are
+        emitted, return the largest number of CSE temporaries that are simultaneously live.
+        A temporary is live from the statement defining it through the last statement
+        that reads it.
+
+    >>> x, y, z, tmp0, tmp1, tmp2 = sp.symbols("x y z tmp0 tmp1 tmp2")
+    >>> peak_live_temporaries([(tmp0, x + y), (tmp1, tmp0**2), (tmp2, x*z)], [tmp1 + tmp2, tmp0*z])
+    3
+    >>> peak_live_temporaries([(tmp0, x + y), (tmp1, tmp0**2), (tmp2, tmp1*z)], [tmp2])
+    2
+    """
+    definition = {}
+    for idx, (symbol, _expr) in enumerate(CSE_replacements):
+        definition[symbol] = idx
+    last_use = dict(definition)
+    statements = [expr for _symbol, expr in CSE_replacements] + list(CSE_reduced_exprs)
+    for idx, expr in enumerate(statements):
+        for symbol in getattr(expr, "free_symbols", ()):
+            if symbol in definition:
+                last_use[symbol] = idx
+    # Sweep over statements: +1 where a temporary is defined, -1 after its last use.
+    change_in_live = [0] * (len(statements) + 1)
+    for symbol, idx in definition.items():
+        change_in_live[idx] += 1
+        change_in_live[last_use[symbol] + 1] -= 1
+    peak = live = 0
+    for change in change_in_live:
+        live += change
+        peak = max(peak, live)
+    return peak
+
+
+# Profile record for one outputC() call.
+def CSE_profile(CSE_replacements, CSE_reduced_exprs):
+    return {"ops": count_ops([expr for _symbol, expr in CSE_replacements] + list(CSE_reduced_exprs)),
+            "CSE_temporaries": len(CSE_replacements),
+            "peak_live_CSE_temporaries": peak_live_temporaries(CSE_replacements, CSE_reduced_exprs)}
+
+
+# Profile record for the gridfunction reads of one FD_outputC() call:
+#   points_read[gfname] is the list of points (offsets in each direction) read.
+def gridfunction_reads_profile(points_read):
+    return {"gridfunction_reads": {gfname: [list(point) for point in points] for gfname, points in points_read.items()}}
+
+
+def add_pending(record):
+    if enable:
+        pending_profiles.append(record)
+
+
+# Attribute all pending profile records to C function (or file) name; records already
+#   attributed to name are replaced, unless append=True.
+def attach_pending(name, append=False):
+    if not append:
+        kernel_profile_dict.pop(name, None)
+    if pending_profiles:
+        kernel_profile_dict.setdefault(name, []).extend(pending_profiles)
+        del pending_profiles[:]
+
+
+# Profiles generated within this context are kept apart from those
+#   pending outside of it; e.g., for helper functions registered while
+#   generating a kernel.
+@contextmanager
+def separate_pending_profiles():
+    outer = pending_profiles[:]
+    del pending_profiles[:]
+    try:
+        yield
+    finally:
+        pending_profiles[:] = outer
+
+
+def kernel_summary(records):
+    """ Combine all profile records of one kernel.
+
+    >>> x, y, tmp0 = sp.symbols("x y tmp0")
+    >>> records = [gridfunction_reads_profile({"uu": [(-1, 0, 0), (0, 0, 0), (1, 0, 0)], "vv": [(0, 0, 0)]}),
+    ...            CSE_profile([(tmp0, x*y)], [tmp0 + x, tmp0 - y])]
+    >>> summary = kernel_summary(records)
+    >>> summary["ops"]["mul"], summary["peak_live_CSE_temporaries"], summary["num_gridfunction_point_reads"]
+    (1, 1, 4)
+    >>> summary["stencil_footprint"]["uu"]
+    {'points': 3, 'extent': [[-1, 1], [0, 0], [0, 0]]}
+    """
+    ops = dict.fromkeys(op_kinds, 0)
+    num_outputC_calls = temporaries = peak = 0
+    reads = {}
+    for record in records:
+        if "ops" in record:
+            num_outputC_calls += 1
+            for kind in op_kinds:
+                ops[kind] += record["ops"][kind]
+            temporaries += record["CSE_temporaries"]
+            peak = max(peak, record["peak_live_CSE_temporaries"])
+        for gfname, points in record.get("gridfunction_reads", {}).items():
+            reads.setdefault(gfname, set()).update(tuple(point) for point in points)
+    footprint = {}
+    for gfname in sorted(reads):
+        points = reads[gfname]
+        footprint[gfname] = {"points": len(points),
+                             "extent": [[min(offsets), max(offsets)] for offsets in zip(*points)]}
+    return {"ops": ops, "num_outputC_calls": num_outputC_calls,
+            "CSE_temporaries": temporaries, "peak_live_CSE_temporaries": peak,
+            "num_gridfunctions_read": len(reads),
+            "num_gridfunction_point_reads": sum(len(points) for points in reads.values()),
+            "stencil_footprint": footprint}
+
+
+def write_json(filename):
+    with open(filename, "w") as file:
+        json.dump({name: kernel_summary(records) for name, records in sorted(kernel_profile_dict.items())},
+                  file, indent=1, sort_keys=True)
+        file.write("\n")
+
+
+def read_json(filename):
+    with open(filename, "r") as file:
+        return json.load(file)
+
+
+# Scalar metrics of a kernel summary that are compared by diff_profiles().
+def flat_metrics(summary):
+    metrics = {"ops." + kind: summary["ops"][kind] for kind in op_kinds}
+    metrics["ops.total"] = sum(summary["ops"].values())
+    for key in ("CSE_temporaries", "peak_live_CSE_temporaries", "num_gridfunctions_read",
+                "num_gridfunction_point_reads"):
+        metrics[key] = summary[key]
+    return metrics
+
+
+def diff_profiles(old, new):
+    """ List (kernel name, metric, old value, new value) for all metrics that differ
+        between the kernel summaries old and new (as read by read_json()). Kernels
+        present in only one of them are listed with metric "kernel" and value None.
+
+    >>> a, b, tmp0 = sp.symbols("a b tmp0")
+    >>> old = {"rhs_eval": kernel_summary([CSE_profile([(tmp0, a*b)], [tmp0 + a, tmp0*b])])}
+    >>> new = {"rhs_eval": kernel_summary([CSE_profile([], [a*b + a, a*b*b])]), "Ricci_eval": old["rhs_eval"]}
+    >>> for row in diff_profiles(old, new): print(row)
+    ('Ricci_eval', 'kernel', None, 'new')
+    ('rhs_eval', 'ops.add', 1, 0)
+    ('rhs_eval', 'ops.fma', 0, 1)
+    ('rhs_eval', 'CSE_temporaries', 1, 0)
+    ('rhs_eval', 'peak_live_CSE_temporaries', 1, 0)
+    """
+    rows = []
+    for name in sorted(set(old) | set(new)):
+        if name not in old:
+            rows.append((name, "kernel", None, "new"))
+        elif name not in new:
+            rows.append((name, "kernel", "removed", None))
+        else:
+            old_metrics, new_metrics = flat_metrics(old[name]), flat_metrics(new[name])
+            for metric in old_metrics:
+                if old_metrics[metric] != new_metrics[metric]:
+                    rows.append((name, metric, old_metrics[metric], new_metrics[metric]))
+    return rows
+
+
+def print_diff(old_filename, new_filename):
+    rows = diff_profiles(read_json(old_filename), read_json(new_filename))
+    if not rows:
+        print("No differences between " + old_filename + " and " + new_filename + ".")
+        return
+    print("%-50s %-28s %12s %12s %9s" % ("kernel", "metric", "old", "new", "change"))
+    for name, metric, old_value, new_value in rows:
+        if metric == "kernel":
+            print("%-50s %-28s %12s %12s" % (name, metric, old_value or "", new_value or ""))
+            continue
+        change = "%+8.1f%%" % (100.0 * (new_value - old_value) / old_value) if old_value else ""
+        print("%-50s %-28s %12d %12d %9s" % (name, metric, old_value, new_value, change))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python kernel_profile.py old/kernel_profiles.json new/kernel_profiles.json")
+        sys.exit(1)
+    print_diff(sys.argv[1], sys.argv[2])
@@ -143,6 +143,24 @@ def simple_loop(options, interior):
             } // END LOOP: for (int i1 = 0; i1 < Nxx_plus_2NGHOSTS1; i1++)
           } // END LOOP: for (int i2 = 0; i2 < Nxx_plus_2NGHOSTS2; i2++)
         <BLANKLINE>
+
+        'tile_size=[T0,T1,T2]' blocks the loop into tiles of T0 x T1 x T2 points
+        (T=0: no blocking in that direction), and parallelizes over the tiles:
+
+        >>> print(simple_loop('InteriorPoints,tile_size=[0,8,4]', '// <INTERIOR>'))
+          #pragma omp parallel for collapse(2)
+          for (int i2B = NGHOSTS; i2B < NGHOSTS+Nxx2; i2B += 4) {
+            for (int i1B = NGHOSTS; i1B < NGHOSTS+Nxx1; i1B += 8) {
+              for (int i2 = i2B; i2 < MIN(NGHOSTS+Nxx2, i2B + 4); i2++) {
+                for (int i1 = i1B; i1 < MIN(NGHOSTS+Nxx1, i1B + 8); i1++) {
+                  for (int i0 = NGHOSTS; i0 < NGHOSTS+Nxx0; i0++) {
+                    // <INTERIOR>
+                  } // END LOOP: for (int i0 = NGHOSTS; i0 < NGHOSTS+Nxx0; i0++)
+                } // END LOOP: for (int i1 = i1B; i1 < MIN(NGHOSTS+Nxx1, i1B + 8); i1++)
+              } // END LOOP: for (int i2 = i2B; i2 < MIN(NGHOSTS+Nxx2, i2B + 4); i2++)
+            } // END LOOP: for (int i1B = NGHOSTS; i1B < NGHOSTS+Nxx1; i1B += 8)
+          } // END LOOP: for (int i2B = NGHOSTS; i2B < NGHOSTS+Nxx2; i2B += 4)
+        <BLANKLINE>
     """
     if not options:
         return interior
@@ -195,6 +213,46 @@ def simple_loop(options, interior):
 
     padding = '  '
 
+    # 'tile_size=[T0,T1,T2]': cache blocking; with enable_SIMD, T0 must be 0 or a multiple of SIMD_width
+    tile_size = re.search(r'tile_size=\[\s*(\w+)\s*,\s*(\w+)\s*,\s*(\w+)\s*\]', options)
+    if tile_size and any(tile != "0" for tile in tile_size.groups()):
+        if "pragma_on_i1" in options or "pragma_on_i0" in options:
+            raise ValueError('tile_size and pragma_on_i1/pragma_on_i0 cannot both be enabled.')
+        # Otherwise the last SIMD vector of an i0 tile would write into the next tile,
+        #   which may be updated by another thread. SIMD_width is set at C compile time
+        #   (SIMD/SIMD_intrinsics.h; at most 8), so T0 must be SIMD_width or a multiple of 8.
+        T0 = tile_size.group(1)
+        if "enable_SIMD" in options and T0 not in ("0", "SIMD_width") and \
+                not (T0.isdigit() and int(T0) % 8 == 0):
+            raise ValueError('with enable_SIMD, tile_size T0 must be 0, SIMD_width, or a multiple of 8.')
+        # i2, i1, i0 order, as in the loop nest
+        tiles = [tile if tile != "0" else "" for tile in tile_size.groups()[::-1]]
+        tiled = [i for i in range(3) if tiles[i]]
+        if pragma and "OMP_custom_pragma" not in options and len(tiled) > 1:
+            pragma += " collapse(" + str(len(tiled)) + ")"
+        idx_var = ["i2", "i1", "i0"]
+        header_list, footer_list = [], []
+        # Loops over tiles, parallelized together, ...
+        for level, i in enumerate(tiled):
+            header, footer = loop1D(idx_var[i] + 'B', i2i1i0_mins[i], i2i1i0_maxs[i], tiles[i],
+                                    pragma if level == 0 else '', padding*(level + 1))
+            header_list.append(header)
+            footer_list.append(footer)
+        # ... then over the points of each tile
+        loop_order = ["", Read_1Darrays[2], Read_1Darrays[1]]
+        for i in range(3):
+            lower_bound, upper_bound = i2i1i0_mins[i], i2i1i0_maxs[i]
+            if tiles[i]:
+                lower_bound = idx_var[i] + 'B'
+                upper_bound = 'MIN(%s, %s + %s)' % (i2i1i0_maxs[i], idx_var[i] + 'B', tiles[i])
+            header, footer = loop1D(idx_var[i], lower_bound, upper_bound, increment[i], loop_order[i],
+                                    padding*(len(tiled) + i + 1))
+            header_list.append(header)
+            footer_list.append(footer)
+        interior = Read_1Darrays[0] + ("\n" if Read_1Darrays[0] else "") + interior
+        interior = [padding*(len(tiled) + 4) + line + '\n' for line in interior.split('\n')]
+        return ''.join(header_list) + ''.join(interior) + ''.join(footer_list[::-1])
+
     loop_order = [pragma, Read_1Darrays[2], Read_1Darrays[1]]
     if "pragma_on_i1" in options:
         loop_order = ["", Read_1Darrays[2] + "\n" + padding*2 + pragma, Read_1Darrays[1]]
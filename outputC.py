@@ -10,16 +10,19 @@
 #           list of symbols imported when
 #           "from outputC import *" is called.
 __all__ = ['lhrh', 'outCparams', 'nrpyAbs', 'superfast_uniq', 'check_if_string__error_if_not',
-           'outputC', 'parse_outCparams_string',
+           'outputC', 'output_Ccode', 'parse_outCparams_string',
            'outC_NRPy_basic_defines_h_dict',
-           'outC_function_prototype_dict', 'outC_function_dict', 'Cfunction', 'add_to_Cfunction_dict', 'outCfunction']
+           'outC_function_prototype_dict', 'outC_function_dict', 'Cfunction', 'add_to_Cfunction_dict',
+           'add_many_to_Cfunction_dict', 'outCfunction']
 
 import loop as lp                             # NRPy+: C code loop interface
 import NRPy_param_funcs as par                # NRPy+: parameter interface
 from SIMD import expr_convert_to_SIMD_intrins # NRPy+: SymPy expression => SIMD intrinsics interface
 from cse_helpers import cse_preprocess,cse_postprocess  # NRPy+: CSE preprocessing and postprocessing
+import NRPy_cache                             # NRPy+: Persistent on-disk cache for codegen results
+import kernel_profile                         # NRPy+: Operation-count and register-pressure profiles of generated C code
 import sympy as sp                            # SymPy: The Python computer algebra package upon which NRPy+ depends
-import re, sys, os, stat                      # Standard Python: regular expressions, system, and multiplatform OS funcs
+import re, sys, os, stat, types, hashlib      # Standard Python: regular expressions, system, multiplatform OS funcs, function types, and hashing
 from collections import namedtuple            # Standard Python: Enable namedtuple data type
 from var_access import var_from_access
 from suffixes import dosubs
@@ -70,17 +73,17 @@ def superfast_uniq(seq):  # Author: Dave Kirby
 
 def indent_Ccode(Ccode, indent="  "):
     Ccodesplit = Ccode.splitlines()
-    outstring = ""
+    outstring = []
     for line in Ccodesplit:
         if line != "":
             if line.lstrip().startswith("#"):
                 # Remove all indentation from preprocessor statements (lines that start with "#")
-                outstring += line.lstrip() + '\n'
+                outstring.append(line.lstrip() + '\n')
             else:
-                outstring += indent + line + '\n'
+                outstring.append(indent + line + '\n')
         else:
-            outstring += '\n'
-    return outstring.rstrip(" ")  # make sure to remove trailing whitespace!
+            outstring.append('\n')
+    return "".join(outstring).rstrip(" ")  # make sure to remove trailing whitespace!
 
 
 def check_if_string__error_if_not(allegedstring, stringdesc):
@@ -93,8 +96,13 @@ def check_if_string__error_if_not(allegedstring, stringdesc):
         sys.exit(1)
 
 
-def ccode_postproc(string):
-    PRECISION = par.parval_from_str("PRECISION")
+# ccode_postproc() regexes, compiled once per PRECISION; see _ccode_postproc_regex().
+_ccode_postproc_regex_dict = {}
+
+
+def _ccode_postproc_regex(PRECISION):
+    if PRECISION in _ccode_postproc_regex_dict:
+        return _ccode_postproc_regex_dict[PRECISION]
 
     # In the C math library, e.g., pow(x,y) assumes x and y are doubles, and returns a double.
     #  If x and y are floats, then for consistency should use powf(x,y) instead.
@@ -112,22 +120,53 @@ def ccode_postproc(string):
     else:
         print("Error: " + __name__ + "::PRECISION = \"" + PRECISION + "\" not supported")
         sys.exit(1)
-    # ... then we append the above suffix to standard C math library functions:
-    for func in ['pow', 'sqrt', 'cbrt', 'sin', 'cos', 'tan', 'sinh', 'cosh', 'tanh', 'exp', 'log', 'fabs', 'fmin',
-                 'fmax']:
-        string2 = re.sub(func + r'\(', func + cmathsuffix + "(", string)
-        string = string2
-
+    # ... then we append the above suffix to standard C math library functions.
     # Finally, SymPy prefers to output Rationals as long-double fractions.
     #  E.g., Rational(1,3) is output as 1.0L/3.0L.
     #  The Intel compiler vectorizer complains miserably about this,
     #  and strictly speaking it is useless when we're in double precision.
-    # So here we get rid of the "L" suffix on floating point numbers:
+    # So here we get rid of the "L" suffix on floating point numbers.
+    # Both rewrites are performed in a single pass: neither can create or
+    #  destroy a match of the other, so the result is identical to applying
+    #  one regex substitution per function name, followed by the Rational one.
+    patterns = []
+    if cmathsuffix != "":
+        patterns.append(r'(pow|sqrt|cbrt|sin|cos|tan|sinh|cosh|tanh|exp|log|fabs|fmin|fmax)\(')
     if PRECISION != "long double":
-        string2 = re.sub(r'([0-9.]+)L/([0-9.]+)L', '(\\1 / \\2)', string)
-        string = string2
+        patterns.append(r'([0-9.]+)L/([0-9.]+)L')
+    regex = None
+    if patterns:
+        regex = re.compile("|".join(patterns))
 
-    return string
+    def replace(match):
+        if cmathsuffix != "" and match.group(1) is not None:
+            return match.group(1) + cmathsuffix + "("
+        numer, denom = match.group(match.lastindex - 1), match.group(match.lastindex)
+        return "(" + numer + " / " + denom + ")"
+
+    _ccode_postproc_regex_dict[PRECISION] = (regex, replace)
+    return regex, replace
+
+
+def ccode_postproc(string):
+    """ Append float/long double suffixes to C math functions, and strip
+        the "L" suffix from SymPy's long-double Rationals.
+
+    >>> ccode_postproc("x = pow(y, 2.0L/3.0L) + sqrt(sinh(z)) + asin(1.0L/4.0L);")
+    'x = pow(y, (2.0 / 3.0)) + sqrt(sinh(z)) + asin((1.0 / 4.0));'
+    >>> import NRPy_param_funcs as par
+    >>> par.set_parval_from_str("PRECISION", "float")
+    >>> ccode_postproc("x = pow(y, 2.0L/3.0L) + sqrt(sinh(z)) + asin(1.0L/4.0L);")
+    'x = powf(y, (2.0 / 3.0)) + sqrtf(sinhf(z)) + asinf((1.0 / 4.0));'
+    >>> par.set_parval_from_str("PRECISION", "long double")
+    >>> ccode_postproc("x = pow(y, 2.0L/3.0L);")
+    'x = powl(y, 2.0L/3.0L);'
+    >>> par.set_parval_from_str("PRECISION", "double")
+    """
+    regex, replace = _ccode_postproc_regex(par.parval_from_str("PRECISION"))
+    if regex is None:
+        return string
+    return regex.sub(replace, string)
 
 
 def parse_outCparams_string(params):
@@ -230,58 +269,50 @@ def parse_outCparams_string(params):
                       enable_TYPE)
 
 
-# Input: sympyexpr = a single SymPy expression *or* a list of SymPy expressions
-#        output_varname_str = a single output variable name *or* a list of output
-#                             variable names, one per sympyexpr.
-# Output: C code, as a string.
-def outputC(sympyexpr, output_varname_str, filename="stdout", params="", prestring="", poststring=""):
-    outCparams = parse_outCparams_string(params)
+# Stable, hashable serialization of a custom_functions_for_SymPy_ccode
+#   value: strings as-is, lists element-wise, and Python functions
+#   (e.g., the Pow lambdas) by their bytecode, constants, names &
+#   closure contents, since their repr() contains a memory address.
+def ccode_user_function_signature(value):
+    if isinstance(value, types.FunctionType):
+        closure = tuple(cell.cell_contents for cell in value.__closure__) if value.__closure__ else ()
+        return ccode_user_function_signature(value.__code__), ccode_user_function_signature(closure)
+    if isinstance(value, types.CodeType):
+        return (value.co_code, tuple(ccode_user_function_signature(const) for const in value.co_consts),
+                value.co_names, value.co_varnames)
+    if isinstance(value, (list, tuple)):
+        return tuple(ccode_user_function_signature(item) for item in value)
+    return value
+
+
+# Key for the outputC() on-disk cache: a stable hash of the input SymPy
+#   expressions & output names, the parsed outCparams, the C type,
+#   and all global state that affects the emitted C code.
+def outputC_cache_key(sympyexpr, output_varname_str, outCparams, TYPE, prestring="", poststring=""):
+    import SIMD, cse_helpers, expr_tree, suffixes, var_access
+    gftypes = [find_gftype(var_from_access(name), fail_on_missing=False) for name in output_varname_str]
+    user_functions = sorted((name, ccode_user_function_signature(value))
+                            for name, value in custom_functions_for_SymPy_ccode.items())
+    return NRPy_cache.cache_key([sp.srepr(expr) for expr in sympyexpr], output_varname_str,
+                                tuple(outCparams), TYPE, par.parval_from_str("PRECISION"), sp.__version__,
+                                sys.version_info[:2], user_functions,
+                                prestring, poststring, gftypes, sorted(suffixes.subtable.items()),
+                                NRPy_cache.source_hash(sys.modules[__name__], SIMD, cse_helpers, expr_tree,
+                                                       suffixes, var_access))
+
+
+# Steps 3-7 of outputC(): perform CSE (if enabled) and construct
+#   the final C code string for the list of SymPy expressions.
+def construct_Ccode(sympyexpr, output_varname_str, outCparams, TYPE, prestring="", poststring=""):
     preindent = outCparams.preindent
-    TYPE = par.parval_from_str("PRECISION")
-
-    if outCparams.enable_TYPE == "False":
-        TYPE = ""
 
     # Step 0: Initialize
     #  commentblock: comment block containing the input SymPy string,
     #                set only if outCverbose==True
-    #  outstring:    the output C code string
+    #  outstring:    the output C code, as a list of chunks
+    #                (joined once, in Step 7)
     commentblock = ""
-    outstring = ""
-
-    # Step 1: If enable_SIMD==True, then check if TYPE=="double". If not, error out.
-    #         Otherwise set TYPE="REAL_SIMD_ARRAY", which should be #define'd
-    #         within the C code. For example for AVX-256, the C code should have
-    #         #define REAL_SIMD_ARRAY __m256d
-    if outCparams.enable_SIMD == "True":
-        if TYPE not in ('double', ''):
-            print("SIMD output currently only supports double precision or typeless. Sorry!")
-            sys.exit(1)
-        if TYPE == "double":
-            TYPE = "REAL_SIMD_ARRAY"
-
-    # Step 2a: Apply sanity checks when either sympyexpr or
-    #          output_varname_str is a list.
-    if isinstance(output_varname_str, list) and not isinstance(sympyexpr, list):
-        print("Error: Provided a list of output variable names, but only one SymPy expression.")
-        sys.exit(1)
-    if isinstance(sympyexpr, list):
-        if not isinstance(output_varname_str, list):
-            print("Error: Provided a list of SymPy expressions, but no corresponding list of output variable names")
-            sys.exit(1)
-        elif len(output_varname_str) != len(sympyexpr):
-            print("Error: Length of SymPy expressions list (" + str(len(sympyexpr)) +
-                  ") != Length of corresponding output variable name list (" + str(len(output_varname_str)) + ")")
-            sys.exit(1)
-    # Step 2b: If sympyexpr and output_varname_str are not lists,
-    #          convert them to lists of one element each, to
-    #          simplify proceeding code.
-    if not isinstance(output_varname_str, list) and not isinstance(sympyexpr, list):
-        output_varname_strtmp = [output_varname_str]
-        output_varname_str = output_varname_strtmp
-        sympyexprtmp = [sympyexpr]
-        sympyexpr = sympyexprtmp
-    sympyexpr = sympyexpr[:]  # pass-by-value (copy list)
+    outstring = []
 
     # Step 3: If outCparams.verbose = True, then output the original SymPy
     #         expression(s) in code comments prior to actual C code
@@ -332,8 +363,10 @@ def outputC(sympyexpr, output_varname_str, filename="stdout", params="", prestri
         # Synthesizing `muladd` calls seems to slow down the code
         # sympyexpr = list(map(map_synthesize_muladd, sympyexpr))
         for i, expr in enumerate(sympyexpr):
-            outstring += outtypestring + ccode_postproc(sp.ccode(dosubs(expr), output_varname_str[i],
-                                                                 user_functions=custom_functions_for_SymPy_ccode)) + "\n"
+            outstring.append(outtypestring + ccode_postproc(sp.ccode(dosubs(expr), output_varname_str[i],
+                                                                     user_functions=custom_functions_for_SymPy_ccode)) + "\n")
+        if kernel_profile.enable:
+            kernel_profile.add_pending(kernel_profile.CSE_profile([], sympyexpr))
     # Step 6b: If CSE enabled, then perform CSE using SymPy and then
     #          resulting C code.
     else:
@@ -411,30 +444,40 @@ def outputC(sympyexpr, output_varname_str, filename="stdout", params="", prestri
         sympyexpr_group = sympyexpr_group2
         names_group = names_group2
 
+        # Emitted (i.e., after conversion to SIMD intrinsics, if enabled) CSE results, for kernel_profile
+        emitted_replacements = []
+        emitted_reduced_exprs = []
         for commonsubexpression in CSE_results[0]:
             FULLTYPESTRING = "const " + TYPE + " "
             if outCparams.enable_TYPE == "False":
                 FULLTYPESTRING = ""
 
             if outCparams.enable_SIMD == "True":
-                outstring += indent + FULLTYPESTRING + str(commonsubexpression[0]) + " = " + \
-                             str(expr_convert_to_SIMD_intrins(commonsubexpression[1], map_sym_to_rat, varprefix,
-                                                              outCparams.SIMD_find_more_FMAsFMSs)) + ";\n"
+                SIMD_expr = expr_convert_to_SIMD_intrins(commonsubexpression[1], map_sym_to_rat, varprefix,
+                                                         outCparams.SIMD_find_more_FMAsFMSs)
+                emitted_replacements.append((commonsubexpression[0], SIMD_expr))
+                outstring.append(indent + FULLTYPESTRING + str(commonsubexpression[0]) + " = " +
+                                 str(SIMD_expr) + ";\n")
             else:
-                outstring += indent + FULLTYPESTRING + ccode_postproc(
+                emitted_replacements.append(commonsubexpression)
+                outstring.append(indent + FULLTYPESTRING + ccode_postproc(
                     sp.ccode(dosubs(commonsubexpression[1]), commonsubexpression[0],
-                             user_functions=custom_functions_for_SymPy_ccode)) + "\n"
+                             user_functions=custom_functions_for_SymPy_ccode)) + "\n")
 
         for i, result in enumerate(CSE_results[1]):
             if outCparams.enable_SIMD == "True":
-                outstring += outtypestring + names_group[i] + " = " + \
-                             str(expr_convert_to_SIMD_intrins(result, map_sym_to_rat, varprefix,
-                                                              outCparams.SIMD_find_more_FMAsFMSs)) + ";\n"
+                SIMD_expr = expr_convert_to_SIMD_intrins(result, map_sym_to_rat, varprefix,
+                                                         outCparams.SIMD_find_more_FMAsFMSs)
+                emitted_reduced_exprs.append(SIMD_expr)
+                outstring.append(outtypestring + names_group[i] + " = " + str(SIMD_expr) + ";\n")
             else:
+                emitted_reduced_exprs.append(result)
                 result = dosubs(result)
-                outstring += outtypestring + ccode_postproc(sp.ccode(result, names_group[i],
-                                                                     user_functions=custom_functions_for_SymPy_ccode)) + "\n"
+                outstring.append(outtypestring + ccode_postproc(sp.ccode(result, names_group[i],
+                                                                         user_functions=custom_functions_for_SymPy_ccode)) + "\n")
         # Finish processing a group
+        if kernel_profile.enable:
+            kernel_profile.add_pending(kernel_profile.CSE_profile(emitted_replacements, emitted_reduced_exprs))
 
         # Complication: SIMD functions require numerical constants to be stored in SIMD arrays
         # Resolution: This function extends lists "SIMD_const_varnms" and "SIMD_const_values",
@@ -476,32 +519,158 @@ def outputC(sympyexpr, output_varname_str, filename="stdout", params="", prestri
                     SIMD_RATIONAL_decls += indent + "const REAL_SIMD_ARRAY " + varname + " = ConstSIMD(" + "tmp" + varname + ");\n"
                 SIMD_RATIONAL_decls += "\n"
 
-    # Step 7: Construct final output string
-    final_Ccode_output_str = commentblock
+    # Step 7: Construct final output string, with a single join
+    chunks = [commentblock]
     # Step 7a: Output C code in indented curly brackets if
     #          outCparams.includebraces = True
-    if outCparams.includebraces == "True": final_Ccode_output_str += outCparams.preindent + "{\n"
-    final_Ccode_output_str += prestring + RATIONAL_decls + SIMD_RATIONAL_decls + outstring + poststring
-    if outCparams.includebraces == "True": final_Ccode_output_str += outCparams.preindent + "}\n"
-
-    # Step 8: If filename == "stdout", then output
-    #         C code to standard out (useful for copy-paste or interactive
-    #         mode). Otherwise output to file specified in variable name.
-    if filename == "stdout":
+    if outCparams.includebraces == "True": chunks.append(outCparams.preindent + "{\n")
+    chunks += [prestring, RATIONAL_decls, SIMD_RATIONAL_decls]
+    chunks += outstring
+    chunks.append(poststring)
+    if outCparams.includebraces == "True": chunks.append(outCparams.preindent + "}\n")
+
+    return "".join(chunks)
+
+
+# Input: sympyexpr = a single SymPy expression *or* a list of SymPy expressions
+#        output_varname_str = a single output variable name *or* a list of output
+#                             variable names, one per sympyexpr.
+# Output: C code, as a string.
+def outputC(sympyexpr, output_varname_str, filename="stdout", params="", prestring="", poststring=""):
+    outCparams = parse_outCparams_string(params)
+    TYPE = par.parval_from_str("PRECISION")
+
+    if outCparams.enable_TYPE == "False":
+        TYPE = ""
+
+    # Step 1: If enable_SIMD==True, then check if TYPE=="double". If not, error out.
+    #         Otherwise set TYPE="REAL_SIMD_ARRAY", which should be #define'd
+    #         within the C code. For example for AVX-256, the C code should have
+    #         #define REAL_SIMD_ARRAY __m256d
+    if outCparams.enable_SIMD == "True":
+        if TYPE not in ('double', ''):
+            print("SIMD output currently only supports double precision or typeless. Sorry!")
+            sys.exit(1)
+        if TYPE == "double":
+            TYPE = "REAL_SIMD_ARRAY"
+
+    # Step 2a: Apply sanity checks when either sympyexpr or
+    #          output_varname_str is a list.
+    if isinstance(output_varname_str, list) and not isinstance(sympyexpr, list):
+        print("Error: Provided a list of output variable names, but only one SymPy expression.")
+        sys.exit(1)
+    if isinstance(sympyexpr, list):
+        if not isinstance(output_varname_str, list):
+            print("Error: Provided a list of SymPy expressions, but no corresponding list of output variable names")
+            sys.exit(1)
+        elif len(output_varname_str) != len(sympyexpr):
+            print("Error: Length of SymPy expressions list (" + str(len(sympyexpr)) +
+                  ") != Length of corresponding output variable name list (" + str(len(output_varname_str)) + ")")
+            sys.exit(1)
+    # Step 2b: If sympyexpr and output_varname_str are not lists,
+    #          convert them to lists of one element each, to
+    #          simplify proceeding code.
+    if not isinstance(output_varname_str, list) and not isinstance(sympyexpr, list):
+        output_varname_strtmp = [output_varname_str]
+        output_varname_str = output_varname_strtmp
+        sympyexprtmp = [sympyexpr]
+        sympyexpr = sympyexprtmp
+    sympyexpr = sympyexpr[:]  # pass-by-value (copy list)
+
+    # Step 2c: Unless disabled, look up the final C code in the on-disk
+    #          cache (see NRPy_cache.py), keyed on everything that
+    #          determines it. On a cache miss, perform the CSE and
+    #          C code emission and store the result.
+    #          If kernel profiling is enabled (see kernel_profile.py), the
+    #          profile of the C code is cached alongside it; a cached C code
+    #          without a cached profile is regenerated.
+    final_Ccode_output_str = None
+    if NRPy_cache.enable:
+        key = outputC_cache_key(sympyexpr, output_varname_str, outCparams, TYPE, prestring, poststring)
+        final_Ccode_output_str = NRPy_cache.load("outputC", key)
+        if final_Ccode_output_str is not None and kernel_profile.enable:
+            profile = NRPy_cache.load("outputC_kernel_profile", key)
+            if profile is None:
+                final_Ccode_output_str = None
+            else:
+                kernel_profile.add_pending(profile)
+    if final_Ccode_output_str is None:
+        final_Ccode_output_str = construct_Ccode(sympyexpr, output_varname_str, outCparams, TYPE,
+                                                 prestring=prestring, poststring=poststring)
+        if NRPy_cache.enable:
+            NRPy_cache.store("outputC", key, final_Ccode_output_str)
+            if kernel_profile.enable:
+                # construct_Ccode() just added this call's profile to the pending list.
+                NRPy_cache.store("outputC_kernel_profile", key, kernel_profile.pending_profiles[-1])
+
+    # Step 8: Output the C code to filename; see output_Ccode().
+    return output_Ccode(final_Ccode_output_str, filename, outCparams.outCfileaccess)
+
+
+# Send C code, either a string or a list of string chunks, to the
+#   sink "filename", which may be
+#   "stdout"     : print to standard out (useful for copy-paste or interactive mode),
+#   "returnstring": return the string,
+#   a file-like object (anything with a write() method, e.g., an open
+#                  file or io.StringIO): write the string to it,
+#   a list       : append the chunk(s) to it; i.e., a list-of-chunks
+#                  builder whose owner joins all chunks once, at the end, or
+#   a file name  : write (outCfileaccess="w") or append ("a") to that file.
+# Kernel profiles pending (see kernel_profile.py) are attributed to that
+#   file, or dropped if printed to stdout; otherwise they remain pending
+#   until the C code is registered by add_to_Cfunction_dict().
+# Writing many kernels to one file-like object or chunk list avoids
+#   building large intermediate strings by repeated concatenation.
+def output_Ccode(Ccode, filename, outCfileaccess="w"):
+    """
+    >>> import io
+    >>> sink = io.StringIO()
+    >>> output_Ccode(["{\\n", "  a = b;\\n", "}\\n"], sink)
+    >>> output_Ccode("c = d;\\n", sink)
+    >>> print(sink.getvalue(), end="")
+    {
+      a = b;
+    }
+    c = d;
+    >>> chunks = []
+    >>> output_Ccode(["a = b;", "\\n"], chunks)
+    >>> output_Ccode(["a = b;", "\\n"], "returnstring")
+    'a = b;\\n'
+    >>> chunks
+    ['a = b;', '\\n']
+    """
+    if isinstance(filename, list):
+        if isinstance(Ccode, list):
+            filename.extend(Ccode)
+        else:
+            filename.append(Ccode)
+        return None
+    if isinstance(Ccode, list):
+        if hasattr(filename, "write"):
+            for chunk in Ccode:
+                filename.write(chunk)
+            return None
+        Ccode = "".join(Ccode)
+    if hasattr(filename, "write"):
+        filename.write(Ccode)
+    elif filename == "stdout":
         # Output to standard out (stdout; "the screen")
-        print(final_Ccode_output_str)
+        print(Ccode)
+        del kernel_profile.pending_profiles[:]
     elif filename == "returnstring":
-        return final_Ccode_output_str
+        return Ccode
     else:
         # Output to the file specified by the function input parameter string 'filename':
-        with open(filename, outCparams.outCfileaccess) as file:
-            file.write(final_Ccode_output_str)
+        with open(filename, outCfileaccess) as file:
+            file.write(Ccode)
+        kernel_profile.attach_pending(filename, append=(outCfileaccess == "a"))
         successstr = ""
-        if outCparams.outCfileaccess == "a":
+        if outCfileaccess == "a":
             successstr = "Appended "
-        elif outCparams.outCfileaccess == "w":
+        elif outCfileaccess == "w":
             successstr = "Wrote "
         print(successstr + "to file \"" + filename + "\"")
+    return None
 
 
 from defines_dict import outC_NRPy_basic_defines_h_dict
@@ -514,6 +683,60 @@ outC_function_element = namedtuple('outC_function_element',
 outC_function_master_list = []
 
 
+# Side set of hashable keys for the elements of outC_function_master_list, so
+#   that add_to_Cfunction_dict() need not compare each new element (including
+#   its possibly multi-MB body) against every registered one. A key is the
+#   function name plus a SHA-256 hash of all of the element's fields, so
+#   equal keys mean equal elements and hits need no confirmation.
+#   outC_function_master_list may be replaced, appended to, or have elements
+#   removed directly (e.g., FD functions moved to finite_difference_functions.h),
+#   so the set is validated against the identity and length of the list it was
+#   built from, and the identity of its last element: if the list was replaced,
+#   or any element was removed, it is rebuilt; if elements were only appended,
+#   it is extended incrementally.
+class _Cfunction_element_index:
+    def __init__(self):
+        self.lst = None
+        self.length = 0
+        self.last = None
+        self.keys = set()
+
+    def sync(self, lst):
+        if lst is not self.lst or len(lst) < self.length or \
+                (self.length > 0 and lst[self.length - 1] is not self.last):
+            self.lst = lst
+            self.length = 0
+            self.keys = set()
+        for idx in range(self.length, len(lst)):
+            self.keys.add(Cfunction_element_key(lst[idx]))
+        self.length = len(lst)
+        self.last = lst[-1] if lst else None
+        return self
+
+
+_Cfunc_element_idx = _Cfunction_element_index()
+
+
+def Cfunction_element_key(element):
+    # includes is a list (or None); hash it as a tuple, so that equal elements have equal keys.
+    if isinstance(element.includes, list):
+        element = element._replace(includes=tuple(element.includes))
+    return element.name, hashlib.sha256(repr(tuple(element)).encode("utf-8")).hexdigest()
+
+
+def outC_function_element_is_registered(element):
+    return Cfunction_element_key(element) in _Cfunc_element_idx.sync(outC_function_master_list).keys
+
+
+# C functions registered by add_many_to_Cfunction_dict(), whose prototypes and
+#   complete C code have not yet been constructed by Cfunction(). Keys are
+#   function names; values are outC_function_element's. These are moved to
+#   outC_function_prototype_dict and outC_function_dict by
+#   construct_pending_Cfunctions(), which is called before those dicts are
+#   written out or pickled.
+outC_function_pending_dict = {}
+
+
 def Cfunction(includes=None, prefunc="", desc="", c_type="void", name=None, params=None, preloop="", body=None,
               loopopts="", postloop="", enableCparameters=True, rel_path_to_Cparams=os.path.join("./")):
     if name is None or params is None or body is None:  # use "is None" instead of "==None", as the former is more correct.
@@ -562,23 +785,77 @@ def add_to_Cfunction_dict(includes=None, prefunc="", desc="", c_type="void", nam
                           rel_path_to_Cparams=os.path.join("./")):
     namesuffix = ""
 
-    if outC_function_element(includes, prefunc, desc, c_type, name + namesuffix, params,
-                             preloop, body, loopopts, postloop,
-                             enableCparameters, rel_path_to_Cparams) in outC_function_master_list:
+    element = outC_function_element(includes, prefunc, desc, c_type, name + namesuffix, params,
+                                    preloop, body, loopopts, postloop,
+                                    enableCparameters, rel_path_to_Cparams)
+    if outC_function_element_is_registered(element):
         print("OUCH! Found " + name + namesuffix + " in outC_function_master_list.")
 
-    outC_function_master_list.append(outC_function_element(includes, prefunc, desc, c_type, name + namesuffix, params,
-                                                           preloop, body, loopopts, postloop,
-                                                           enableCparameters, rel_path_to_Cparams))
+    outC_function_master_list.append(element)
 
     outC_function_outdir_dict[name + namesuffix] = path_from_rootsrcdir_to_this_Cfunc
     # print(name, namesuffix, path_from_rootsrcdir_to_this_Cfunc)
     # print(outC_function_outdir_dict)
+    # The most recent registration of a given name wins, even over a still-pending one:
+    outC_function_pending_dict.pop(name + namesuffix, None)
+    kernel_profile.attach_pending(name + namesuffix)
     outC_function_prototype_dict[name + namesuffix], outC_function_dict[name + namesuffix] = \
         Cfunction(includes, prefunc, desc, c_type, name + namesuffix, params, preloop, body, loopopts, postloop,
                   enableCparameters, rel_path_to_Cparams)
 
 
+# Default values of outC_function_element fields, as in add_to_Cfunction_dict()
+outC_function_element_defaults = dict(includes=None, prefunc="", desc="", c_type="void", name=None, params=None,
+                                      preloop="", body=None, loopopts="", postloop="", enableCparameters=True,
+                                      rel_path_to_Cparams=os.path.join("./"))
+
+
+# Register a batch of C functions. Each element of list_of_Cfunc_kwargs is a
+#   dict of keyword arguments to add_to_Cfunction_dict(). Unlike
+#   add_to_Cfunction_dict(), the function prototypes and complete C code are
+#   not constructed here, but by construct_pending_Cfunctions(), when
+#   outC_function_prototype_dict and outC_function_dict are written out
+#   (construct_Makefile_from_outC_function_dict(),
+#   construct_NRPy_function_prototypes_h()) or pickled (pickle_NRPy_env()).
+#   Code that reads those dicts directly must call
+#   construct_pending_Cfunctions() first. Kernel profiles pending (see
+#   kernel_profile.py) are attributed to the batch as a whole, under the
+#   names of its functions joined by "+".
+def add_many_to_Cfunction_dict(list_of_Cfunc_kwargs):
+    """
+    >>> add_many_to_Cfunction_dict([dict(name="doctest_f", params="REAL x", body="x *= 2.0;", enableCparameters=False),
+    ...                             dict(name="doctest_g", params="int i", body="i++;", c_type="static void",
+    ...                                  enableCparameters=False)])
+    >>> "doctest_f" in outC_function_dict, "doctest_f" in outC_function_pending_dict
+    (False, True)
+    >>> construct_pending_Cfunctions()
+    >>> outC_function_prototype_dict["doctest_g"], "doctest_f" in outC_function_pending_dict
+    ('static void doctest_g(int i);', False)
+    """
+    for kwargs in list_of_Cfunc_kwargs:
+        kwargs = dict(kwargs)
+        outdir = kwargs.pop("path_from_rootsrcdir_to_this_Cfunc", "default")
+        if kwargs.get("name") is None or kwargs.get("params") is None or kwargs.get("body") is None:
+            print("add_many_to_Cfunction_dict() error: strings must be provided for function name, parameters, and body")
+            print("Found: " + str(kwargs))
+            sys.exit(1)
+        element = outC_function_element(**dict(outC_function_element_defaults, **kwargs))
+        if outC_function_element_is_registered(element):
+            print("OUCH! Found " + element.name + " in outC_function_master_list.")
+        outC_function_master_list.append(element)
+        outC_function_outdir_dict[element.name] = outdir
+        outC_function_pending_dict[element.name] = element
+    kernel_profile.attach_pending("+".join(kwargs["name"] for kwargs in list_of_Cfunc_kwargs))
+
+
+# Construct prototypes and complete C code for all functions registered by
+#   add_many_to_Cfunction_dict(), in registration order.
+def construct_pending_Cfunctions():
+    for name, element in outC_function_pending_dict.items():
+        outC_function_prototype_dict[name], outC_function_dict[name] = Cfunction(*element)
+    outC_function_pending_dict.clear()
+
+
 def outCfunction(outfile="", includes=None, prefunc="", desc="",
                  c_type="void", name=None, params=None, preloop="", body=None, loopopts="", postloop="",
                  enableCparameters=True, rel_path_to_Cparams=os.path.join("./")):
@@ -592,10 +869,29 @@ def outCfunction(outfile="", includes=None, prefunc="", desc="",
         print("Output C function " + name + "() to file " + outfile)
 
 
+# Write contents to filename only if the file does not already exist with
+#   identical contents. Leaving unchanged files untouched preserves their
+#   mtimes, so that make only rebuilds the object files that actually
+#   changed. Returns True if the file was (re)written.
+def write_file_if_changed(filename, contents):
+    encoded = contents.encode("utf-8")
+    try:
+        if os.path.getsize(filename) == len(encoded):
+            with open(filename, "rb") as file:
+                if file.read() == encoded:
+                    return False
+    except OSError:
+        pass  # File does not exist (or is unreadable); (re)write it.
+    with open(filename, "w") as file:
+        file.write(contents)
+    return True
+
+
 def construct_Makefile_from_outC_function_dict(Ccodesrootdir, exec_name, uses_free_parameters_h=False,
                                                compiler_opt_option="fastdebug", addl_CFLAGS=None,
                                                addl_libraries=None, mkdir_Ccodesrootdir=True, use_make=True, CC="gcc",
                                                create_lib=False, include_dirs=None):
+    construct_pending_Cfunctions()
     if not create_lib and "main" not in outC_function_dict:
         print(
             "construct_Makefile_from_outC_function_dict() error: C codes will not compile if main() function not defined!")
@@ -618,23 +914,27 @@ def construct_Makefile_from_outC_function_dict(Ccodesrootdir, exec_name, uses_fr
         return os.path.join(Ccodesrootdir, path_and_file)
 
     list_of_uniq_functions = []
+    uniq_function_names = set()
     for item in outC_function_master_list:
-        if item.name not in list_of_uniq_functions:
+        if item.name not in uniq_function_names:
             # Convention: Output all C files ending in _gridN into the gridN/ subdirectory.
             if "__rfm__" in item.name:
                 subdir = item.name.split("__rfm__")[-1]
                 import cmdline_helper as cmd
                 cmd.mkdir(os.path.join(Ccodesrootdir, subdir))
-                with open(add_to_Makefile(Ccodesrootdir, os.path.join(subdir, item.name + ".c")), "w") as file:
-                    file.write(outC_function_dict[item.name])
+                write_file_if_changed(add_to_Makefile(Ccodesrootdir, os.path.join(subdir, item.name + ".c")),
+                                      outC_function_dict[item.name])
             elif outC_function_outdir_dict[item.name] != "default":
                 subdir = outC_function_outdir_dict[item.name]
-                with open(add_to_Makefile(Ccodesrootdir, os.path.join(subdir, item.name + ".c")), "w") as file:
-                    file.write(outC_function_dict[item.name])
+                write_file_if_changed(add_to_Makefile(Ccodesrootdir, os.path.join(subdir, item.name + ".c")),
+                                      outC_function_dict[item.name])
             else:
-                with open(add_to_Makefile(Ccodesrootdir, os.path.join(item.name + ".c")), "w") as file:
-                    file.write(outC_function_dict[item.name])
+                write_file_if_changed(add_to_Makefile(Ccodesrootdir, os.path.join(item.name + ".c")),
+                                      outC_function_dict[item.name])
             list_of_uniq_functions += [item.name]
+            uniq_function_names.add(item.name)
+    if kernel_profile.enable:
+        kernel_profile.write_json(os.path.join(Ccodesrootdir, "kernel_profiles.json"))
     CFLAGS = " -O2 -march=native -g -fopenmp -Wall -Wno-unused-variable"
     DEBUGCFLAGS = " -O2 -g -Wall -Wno-unused-variable -Wno-unknown-pragmas"  # OpenMP requires -fopenmp, and when disabling
     # -fopenmp, unknown pragma warnings appear.
@@ -658,18 +958,26 @@ def construct_Makefile_from_outC_function_dict(Ccodesrootdir, exec_name, uses_fr
             CFLAGS += " " + FLAG
             DEBUGCFLAGS += " " + FLAG
             FASTCFLAGS += " " + FLAG
+    # -MMD -MP: have the compiler emit a .d file alongside each object file, listing
+    #   the (non-system) headers it includes. The Makefile -include's these,
+    #   so changes to e.g., NRPy_basic_defines.h rebuild exactly the affected objects.
+    DEPFLAGS = "-MMD -MP"
     obj_dependency_str = ""
+    depfile_str = ""
     dep_list = []
     compile_list = []
     for c_file in Makefile_list_of_files:
         object_file = c_file.replace(".c", ".o")
         obj_dependency_str += " " + object_file
+        depfile_str += " " + c_file.replace(".c", ".d")
         addl_headers = ""
         if uses_free_parameters_h:
             if c_file == "main.c":
                 addl_headers += " free_parameters.h"
-        dep_list.append(object_file + ": " + c_file + addl_headers)
-        compile_list.append("\t$(CC) $(CFLAGS) $(INCLUDEDIRS)  -c " + c_file + " -o " + object_file)
+        # Objects also depend on the Makefile, so that changing CFLAGS triggers a rebuild;
+        #   the Makefile itself is only rewritten if its contents change.
+        dep_list.append(object_file + ": " + c_file + addl_headers + " Makefile")
+        compile_list.append("\t$(CC) $(CFLAGS) $(DEPFLAGS) $(INCLUDEDIRS)  -c " + c_file + " -o " + object_file)
 
     linked_libraries = ""
     if addl_libraries is not None:
@@ -682,35 +990,43 @@ def construct_Makefile_from_outC_function_dict(Ccodesrootdir, exec_name, uses_fr
     if "openmp" in CHOSEN_CFLAGS:
         linked_libraries += " -lgomp"
 
+    include_dirs_str = ""
+    if include_dirs is not None:
+        if not isinstance(include_dirs, list):
+            print("Error: construct_Makefile_from_outC_function_dict(): include_dirs must be a list!")
+            sys.exit(1)
+        for include_dir in include_dirs:
+            include_dirs_str += "-I" + include_dir + " "
+        include_dirs_str = include_dirs_str[:-1]
+
     if use_make:
-        with open(os.path.join(Ccodesrootdir, "Makefile"), "w") as Makefile:
-            Makefile.write("""CC     = """ + CC + """
+        Makefile = """CC     = """ + CC + """
 CFLAGS = """ + CHOSEN_CFLAGS + """
 #CFLAGS = """ + CFLAGS + """
 #CFLAGS = """ + DEBUGCFLAGS + """
-#CFLAGS = """ + FASTCFLAGS + "\n")
-            include_dirs_str = ""
-            if include_dirs is not None:
-                if not isinstance(include_dirs, list):
-                    print("Error: construct_Makefile_from_outC_function_dict(): include_dirs must be a list!")
-                    sys.exit(1)
-                for include_dir in include_dirs:
-                    include_dirs_str += "-I" + include_dir + " "
-                include_dirs_str = include_dirs_str[:-1]
-            Makefile.write("INCLUDEDIRS = " + include_dirs_str + "\n")
-            Makefile.write("all: " + exec_name + " " + obj_dependency_str + "\n")
-            for idx, dep in enumerate(dep_list):
-                Makefile.write(dep + "\n")
-                Makefile.write(compile_list[idx] + "\n\n")
-            Makefile.write(exec_name + ": " + obj_dependency_str + "\n")
-            ## LINKER STEP:
-            Makefile.write("\t$(CC) " + obj_dependency_str + " -o " + exec_name + linked_libraries + "\n")
-            ## MAKE CLEAN:
-            Makefile.write("\nclean:\n\trm -f *.o */*.o *~ */*~ ./#* *.txt *.dat *.avi *.png " + exec_name + "\n")
+#CFLAGS = """ + FASTCFLAGS + "\n"
+        Makefile += "DEPFLAGS = " + DEPFLAGS + "\n"
+        Makefile += "INCLUDEDIRS = " + include_dirs_str + "\n"
+        Makefile += "all: " + exec_name + " " + obj_dependency_str + "\n"
+        for idx, dep in enumerate(dep_list):
+            Makefile += dep + "\n"
+            Makefile += compile_list[idx] + "\n\n"
+        Makefile += exec_name + ": " + obj_dependency_str + "\n"
+        ## LINKER STEP:
+        Makefile += "\t$(CC) " + obj_dependency_str + " -o " + exec_name + linked_libraries + "\n"
+        ## HEADER DEPENDENCIES, generated by the compiler via $(DEPFLAGS):
+        Makefile += "\n-include" + depfile_str + "\n"
+        ## MAKE CLEAN:
+        Makefile += "\nclean:\n\trm -f *.o */*.o *.d */*.d *~ */*~ ./#* *.txt *.dat *.avi *.png " + exec_name + "\n"
+        write_file_if_changed(os.path.join(Ccodesrootdir, "Makefile"), Makefile)
     else:
         with open(os.path.join(Ccodesrootdir, "backup_script_nomake.sh"), "w") as backup:
             for compile_line in compile_list:
-                backup.write(compile_line.replace("$(CC)", CC).replace("$(CFLAGS)", CFLAGS).replace("\t", "") + "\n")
+                # Substitute all make variables, as bash would treat $(...) as command substitution.
+                #   There is no header dependency tracking without make, so $(DEPFLAGS) is dropped.
+                backup.write(compile_line.replace("$(CC)", CC).replace("$(CFLAGS)", CFLAGS)
+                             .replace(" $(DEPFLAGS)", "").replace("$(INCLUDEDIRS)", include_dirs_str)
+                             .replace("\t", "") + "\n")
             backup.write(CC + " " + CFLAGS + " " + obj_dependency_str + " -o " + exec_name + linked_libraries + "\n")
         os.chmod(os.path.join(Ccodesrootdir, "backup_script_nomake.sh"), stat.S_IRWXU)
 
@@ -727,35 +1043,39 @@ def construct_NRPy_basic_defines_h(Ccodesrootdir, enable_SIMD=False, supplementa
         filestream.write("// Basic definitions for module " + key + ":\n" + item)
         filestream.write("//********************************************\n")
 
-    with open(os.path.join(Ccodesrootdir, "NRPy_basic_defines.h"), "w") as file:
-        file.write("""// NRPy+ basic definitions, automatically generated from outC_NRPy_basic_defines_h_dict within outputC,
+    from io import StringIO
+    file = StringIO()
+    file.write("""// NRPy+ basic definitions, automatically generated from outC_NRPy_basic_defines_h_dict within outputC,
 //    and populated within NRPy+ modules. DO NOT EDIT THIS FILE BY HAND.\n\n""")
-        if enable_SIMD:
-            file.write(
-                "// construct_NRPy_basic_defines_h(...,enable_SIMD=True) was called so we #include SIMD intrinsics:\n")
-            file.write("""#include "SIMD/SIMD_intrinsics.h"\n""")
-        # The ordering here is based largely on data structure dependencies. E.g., griddata_struct contains bc_struct.
-        core_modules_list = ["outputC", "NRPy_param_funcs", "finite_difference", "reference_metric",
-                             "CurviBoundaryConditions", "MoL", "interpolate", "grid"]
-        for key in core_modules_list:
-            if key in outC_NRPy_basic_defines_h_dict:
-                output_key(file, key, outC_NRPy_basic_defines_h_dict[key])
-
-        for key in outC_NRPy_basic_defines_h_dict:
-            if key not in core_modules_list:
-                output_key(file, key, outC_NRPy_basic_defines_h_dict[key])
-
-        for key in supplemental_dict:
-            output_key(file, key, supplemental_dict[key])
+    if enable_SIMD:
+        file.write(
+            "// construct_NRPy_basic_defines_h(...,enable_SIMD=True) was called so we #include SIMD intrinsics:\n")
+        file.write("""#include "SIMD/SIMD_intrinsics.h"\n""")
+    # The ordering here is based largely on data structure dependencies. E.g., griddata_struct contains bc_struct.
+    core_modules_list = ["outputC", "NRPy_param_funcs", "finite_difference", "reference_metric",
+                         "CurviBoundaryConditions", "MoL", "interpolate", "grid"]
+    for key in core_modules_list:
+        if key in outC_NRPy_basic_defines_h_dict:
+            output_key(file, key, outC_NRPy_basic_defines_h_dict[key])
+
+    for key in outC_NRPy_basic_defines_h_dict:
+        if key not in core_modules_list:
+            output_key(file, key, outC_NRPy_basic_defines_h_dict[key])
+
+    for key in supplemental_dict:
+        output_key(file, key, supplemental_dict[key])
+    write_file_if_changed(os.path.join(Ccodesrootdir, "NRPy_basic_defines.h"), file.getvalue())
 
 
 def construct_NRPy_function_prototypes_h(Ccodesrootdir):
     if not os.path.isdir(Ccodesrootdir):
         print("Error (in construct_NRPy_function_prototypes_h): Directory \"" + Ccodesrootdir + "\" does not exist.")
         sys.exit(1)
-    with open(os.path.join(Ccodesrootdir, "NRPy_function_prototypes.h"), "w") as file:
-        for key, item in outC_function_prototype_dict.items():
-            file.write(item + "\n")
+    construct_pending_Cfunctions()
+    prototypes = ""
+    for key, item in outC_function_prototype_dict.items():
+        prototypes += item + "\n"
+    write_file_if_changed(os.path.join(Ccodesrootdir, "NRPy_function_prototypes.h"), prototypes)
 
 
 def outputC_register_C_functions_and_NRPy_basic_defines(addl_includes=None):
@@ -877,25 +1197,24 @@ def NRPy_param_funcs_register_C_functions_and_NRPy_basic_defines(directory=os.pa
         return returnstring
 
     # Next output header files for setting C parameters to current values within functions.
-    with open(os.path.join(directory, "set_Cparameters.h"), "w") as file:
-        file.write(gen_set_Cparameters(pointerEnable=True))
-    with open(os.path.join(directory, "set_Cparameters-nopointer.h"), "w") as file:
-        file.write(gen_set_Cparameters(pointerEnable=False))
+    write_file_if_changed(os.path.join(directory, "set_Cparameters.h"), gen_set_Cparameters(pointerEnable=True))
+    write_file_if_changed(os.path.join(directory, "set_Cparameters-nopointer.h"), gen_set_Cparameters(pointerEnable=False))
 
     # Step 4.b: Output SIMD version, set_Cparameters-SIMD.h
-    with open(os.path.join(directory, "set_Cparameters-SIMD.h"), "w") as file:
-        for Cparam in par.glb_Cparams_list:
-            # SIMD does not support char arrays.
-            if "char" not in Cparam.type:
-                Cptype, Cpparname = type_and_parname_from_Cparam(Cparam)
-                comment = "  // " + Cparam.module + "::" + Cpparname
-                if Cptype == "REAL" and Cparam.defaultval != 1e300:
-                    c_output = "const REAL            NOSIMD" + Cpparname + " = " + "params->" + Cpparname + ";" + comment + "\n"
-                    c_output += "const REAL_SIMD_ARRAY " + Cpparname + " = ConstSIMD(NOSIMD" + Cpparname + ");" + comment + "\n"
-                    file.write(c_output)
-                elif Cparam.defaultval != 1e300 and Cptype != "#define":
-                    c_output = "const " + Cptype + " " + Cpparname + " = " + "params->" + Cpparname + ";" + comment + "\n"
-                    file.write(c_output)
+    set_Cparameters_SIMD = ""
+    for Cparam in par.glb_Cparams_list:
+        # SIMD does not support char arrays.
+        if "char" not in Cparam.type:
+            Cptype, Cpparname = type_and_parname_from_Cparam(Cparam)
+            comment = "  // " + Cparam.module + "::" + Cpparname
+            if Cptype == "REAL" and Cparam.defaultval != 1e300:
+                c_output = "const REAL            NOSIMD" + Cpparname + " = " + "params->" + Cpparname + ";" + comment + "\n"
+                c_output += "const REAL_SIMD_ARRAY " + Cpparname + " = ConstSIMD(NOSIMD" + Cpparname + ");" + comment + "\n"
+                set_Cparameters_SIMD += c_output
+            elif Cparam.defaultval != 1e300 and Cptype != "#define":
+                c_output = "const " + Cptype + " " + Cpparname + " = " + "params->" + Cpparname + ";" + comment + "\n"
+                set_Cparameters_SIMD += c_output
+    write_file_if_changed(os.path.join(directory, "set_Cparameters-SIMD.h"), set_Cparameters_SIMD)
 
     # Set up the dictionary entry for grid in NRPy_basic_defines
     # Generate C code to declare C paramstruct;
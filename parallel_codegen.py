@@ -0,0 +1,190 @@
+# parallel_codegen.py: Schedule NRPy+ C-code registration functions
+#                      (e.g., BSSN_Ccodegen_library.add_rhs_eval_to_Cfunction_dict)
+#                      across a process pool, then merge the resulting
+#                      NRPy+ environments back into this process.
+#
+# Each task function must follow the rules listed at the top of
+#   BSSN/BSSN_Ccodegen_library.py: it must be runnable from a
+#   multiprocessing environment, and must return pickle_NRPy_env().
+#
+# Scheduling: tasks are dispatched longest-first (LPT), using the
+#   per-task wall-clock times recorded during previous runs. Tasks
+#   with no recorded timing are assumed to be the most expensive, so
+#   they are started first. Timings are written to disk only if the
+#   caller passes timings_filename, or if the on-disk NRPy_cache is
+#   enabled (NRPY_CACHE=1; then they are stored in its cache_dir).
+#   Otherwise they are kept in memory, for the lifetime of this process.
+#
+# Merging: worker environments are unpickled in the order the tasks
+#   were *provided*, not the order they finished, so the merged
+#   outC_function_dict and glb_Cparams_list are deterministic.
+#
+# Usage:
+#   import parallel_codegen as pcg
+#   tasks = [pcg.codegen_task(BCL.add_rhs_eval_to_Cfunction_dict, dict(includes=["NRPy_basic_defines.h"])),
+#            pcg.codegen_task(BCL.add_Ricci_eval_to_Cfunction_dict, dict(includes=["NRPy_basic_defines.h"]))]
+#   tasks += [pcg.codegen_task(BCL.add_psi4_part_to_Cfunction_dict, dict(whichpart=i)) for i in range(3)]
+#   pcg.run_codegen_tasks(tasks)
+
+import os, time, json                         # Standard Python: multiplatform OS funcs, timing, JSON I/O
+from collections import namedtuple            # Standard Python: Enable namedtuple data type
+import outputC as outC                        # NRPy+: Core C code output module
+from pickling import unpickle_NRPy_env        # NRPy+: Pickle/unpickle NRPy+ environment
+import NRPy_cache                             # NRPy+: Persistent on-disk cache; if enabled, timings are stored alongside
+
+# func: registration function; kwargs: dict of keyword arguments passed to func;
+# name: label used for timing history (default: func's module & name, plus kwargs).
+codegen_task = namedtuple('codegen_task', 'func kwargs name')
+codegen_task.__new__.__defaults__ = (None, None)
+
+# Per-task record: index into the task list, wall-clock start & end times, and worker process ID.
+task_timing = namedtuple('task_timing', 'idx name start end pid')
+
+# Timing history of this process, used when timings are not persisted to disk.
+timings_in_memory = {}
+
+
+def _timings_path(filename=None):
+    # Returns None if timings are to be kept in memory only.
+    if filename is not None:
+        return filename
+    if NRPy_cache.enable:
+        return os.path.join(NRPy_cache.cache_dir, "parallel_codegen_timings.json")
+    return None
+
+
+def task_name(task):
+    if task.name is not None:
+        return task.name
+    kwargs = task.kwargs if task.kwargs is not None else {}
+    name = task.func.__module__ + "." + task.func.__name__
+    if kwargs:
+        name += "(" + ",".join(key + "=" + repr(kwargs[key]) for key in sorted(kwargs)) + ")"
+    return name
+
+
+def read_timings(filename=None):
+    filename = _timings_path(filename)
+    if filename is None:
+        return dict(timings_in_memory)
+    try:
+        with open(filename, "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_timings(timings, filename=None):
+    filename = _timings_path(filename)
+    if filename is None:
+        timings_in_memory.update(timings)
+        return
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        with open(filename, "w") as file:
+            json.dump(timings, file, indent=1, sort_keys=True)
+    except OSError as err:
+        print("parallel_codegen warning: could not write timings file " + filename + ": " + str(err))
+
+
+def schedule_order(names, timings):
+    """ Return task indices in longest-processing-time-first order.
+
+    Tasks absent from timings are scheduled first; ties keep input order.
+
+    >>> schedule_order(["a", "b", "c", "d"], {"a": 1.0, "b": 30.0, "d": 5.0})
+    [2, 1, 3, 0]
+    """
+    return sorted(range(len(names)), key=lambda i: (names[i] in timings, -timings.get(names[i], 0.0), i))
+
+
+def critical_path(records):
+    """ Given task_timing records, return the tasks run by the worker that
+        finished last; these determine the wall-clock time of the parallel run.
+
+    >>> recs = [task_timing(0, "a", 0.0, 4.0, 11), task_timing(1, "b", 0.0, 1.0, 12),
+    ...         task_timing(2, "c", 1.0, 6.0, 12)]
+    >>> [rec.name for rec in critical_path(recs)]
+    ['b', 'c']
+    """
+    if not records:
+        return []
+    last = max(records, key=lambda rec: rec.end)
+    return sorted([rec for rec in records if rec.pid == last.pid], key=lambda rec: rec.start)
+
+
+def _run_task(args):
+    idx, name, func, kwargs = args
+    start = time.time()
+    NRPyEnv = func(**kwargs)
+    end = time.time()
+    return task_timing(idx, name, start, end, os.getpid()), NRPyEnv
+
+
+def print_report(records, wall_time):
+    total = sum(rec.end - rec.start for rec in records)
+    print("parallel_codegen: " + str(len(records)) + " tasks; sum of task times = " + str(round(total, 2)) +
+          "s; wall time = " + str(round(wall_time, 2)) + "s; speedup = " + str(round(total / max(wall_time, 1e-12), 2)))
+    print("parallel_codegen: critical path:")
+    t0 = min(rec.start for rec in records) if records else 0.0
+    for rec in critical_path(records):
+        print("    [" + str(round(rec.start - t0, 2)) + "s -> " + str(round(rec.end - t0, 2)) + "s] " + rec.name)
+
+
+# Run all tasks, in parallel if possible, falling back to serial
+#   evaluation (e.g., on Windows, or if nprocs == 1). On return, all
+#   C functions registered by the tasks are in outC_function_dict
+#   and outC_function_master_list of this process.
+# Returns the list of task_timing records, in task-list order.
+def run_codegen_tasks(tasks, nprocs=None, timings_filename=None, verbose=True):
+    tasks = [task if isinstance(task, codegen_task) else codegen_task(task) for task in tasks]
+    names = [task_name(task) for task in tasks]
+    timings = read_timings(timings_filename)
+    order = schedule_order(names, timings)
+    args = [(i, names[i], tasks[i].func, tasks[i].kwargs if tasks[i].kwargs is not None else {}) for i in order]
+
+    if nprocs is None:
+        nprocs = os.cpu_count() or 1
+    nprocs = min(nprocs, len(tasks))
+
+    wall_start = time.time()
+    records = []
+    NRPyEnvVars = [None] * len(tasks)
+    run_serially = nprocs <= 1 or os.name == 'nt'
+    if not run_serially:
+        try:
+            import multiprocessing
+            pool = multiprocessing.Pool(processes=nprocs)
+            try:
+                # chunksize=1 together with LPT order yields greedy longest-first list scheduling.
+                for record, NRPyEnv in pool.imap_unordered(_run_task, args, chunksize=1):
+                    records.append(record)
+                    NRPyEnvVars[record.idx] = NRPyEnv
+            finally:
+                # Also on failure: do not leave worker processes behind when falling back to serial codegen.
+                pool.terminate()
+                pool.join()
+        except Exception as err:  # pylint: disable=broad-except
+            print("parallel_codegen: FAILED PARALLEL CODEGEN (" + str(err) + "); falling back to serial codegen.")
+            records = []
+            run_serially = True
+    if run_serially:
+        # Serial codegen registers functions directly in this process; no unpickling needed.
+        for arg in sorted(args):
+            record, _NRPyEnv = _run_task(arg)
+            records.append(record)
+    else:
+        # Merge in task-list order, so the result does not depend on which worker finished first.
+        outCfunc_master_list = unpickle_NRPy_env([NRPyEnvVars])
+        for el in outCfunc_master_list:
+            if not outC.outC_function_element_is_registered(el):
+                outC.outC_function_master_list.append(el)
+    wall_time = time.time() - wall_start
+
+    records.sort(key=lambda rec: rec.idx)
+    for rec in records:
+        timings[rec.name] = rec.end - rec.start
+    write_timings(timings, timings_filename)
+    if verbose:
+        print_report(records, wall_time)
+    return records
@@ -0,0 +1,76 @@
+# parallel_symbolic.py: Evaluate independent components of symbolic (SymPy)
+#                       tensor expressions in a pool of worker processes.
+#
+# map_components(func, prereqs, indices) returns
+#   [func(prereqs, *index) for index in indices], where prereqs is a dict of
+#   shared prerequisite expressions (e.g., the tensors a component is built
+#   from). prereqs is pickled once per worker, when the worker starts, rather
+#   than once per component. Each component is computed by the same function,
+#   from the same expressions, as in serial evaluation, so results are
+#   identical to the serial path, independent of the number of processes.
+#
+# Components are evaluated serially if nprocs <= 1, on Windows, or when
+#   called from within a daemonic worker process (e.g., a task run by
+#   parallel_codegen), which cannot have children.
+#
+# Switches (may be set at runtime, or via environment variable):
+#   parallel_symbolic.nprocs   (env: NRPY_SYMBOLIC_NPROCS; default 1, i.e., serial;
+#                               0 means one process per CPU core)
+
+import os, pickle                             # Standard Python: multiplatform OS funcs, serialization
+
+nprocs = int(os.environ.get("NRPY_SYMBOLIC_NPROCS", "1"))
+
+_worker_prereqs = {}
+
+
+def _init_worker(pickled_prereqs):
+    global _worker_prereqs
+    _worker_prereqs = pickle.loads(pickled_prereqs)
+
+
+def _eval_component(args):
+    func, index = args
+    return func(_worker_prereqs, *index)
+
+
+def num_processes(num_components, nprocs_override=None):
+    procs = nprocs if nprocs_override is None else nprocs_override
+    if procs == 0:
+        procs = os.cpu_count() or 1
+    if procs <= 1 or num_components <= 1 or os.name == 'nt':
+        return 1
+    import multiprocessing
+    if multiprocessing.current_process().daemon:
+        return 1
+    return min(procs, num_components)
+
+
+def map_components(func, prereqs, indices, nprocs_override=None):
+    """ Returns [func(prereqs, *index) for index in indices], evaluated in parallel if
+        possible. func must be defined at module level, so that it can be pickled.
+
+    >>> import sympy as sp
+    >>> x, y = sp.symbols("x y")
+    >>> map_components(_example_component, {"f": sp.sin(x)*y}, [(x,), (y,)], nprocs_override=2)
+    [y*cos(x), sin(x)]
+    """
+    indices = [index if isinstance(index, tuple) else (index,) for index in indices]
+    procs = num_processes(len(indices), nprocs_override)
+    if procs == 1:
+        return [func(prereqs, *index) for index in indices]
+    import multiprocessing
+    pool = multiprocessing.Pool(processes=procs, initializer=_init_worker,
+                                initargs=(pickle.dumps(prereqs, protocol=pickle.HIGHEST_PROTOCOL),))
+    try:
+        # chunksize=1: components may differ greatly in cost.
+        results = pool.map(_eval_component, [(func, index) for index in indices], chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return results
+
+
+def _example_component(prereqs, var):
+    import sympy as sp
+    return sp.diff(prereqs["f"], var)
@@ -8,12 +8,15 @@
 import outputC as outC
 import NRPy_param_funcs as par   # NRPy+: Parameter interface
 import grid as gri               # NRPy+: Functions having to do with numerical grids
+import kernel_profile            # NRPy+: Operation-count and register-pressure profiles of generated C code
 
 def pickle_NRPy_env():
     # Store all NRPy+ environment variables to an output string so NRPy+ environment from within this subprocess can be easily restored
     import pickle
     # https://www.pythonforthelab.com/blog/storing-binary-data-and-serializing/
     outstr = []
+    # Functions registered via outC.add_many_to_Cfunction_dict() are pickled in their constructed form.
+    outC.construct_pending_Cfunctions()
     outstr.append(pickle.dumps(len(gri.glb_gridfcs_list)))
     for lst in gri.glb_gridfcs_list:
         outstr.append(pickle.dumps(lst.gftype))
@@ -67,6 +70,11 @@ def pickle_NRPy_env():
         outstr.append(pickle.dumps(Cfunc.postloop))
         outstr.append(pickle.dumps(Cfunc.enableCparameters))
         outstr.append(pickle.dumps(Cfunc.rel_path_to_Cparams))
+
+    outstr.append(pickle.dumps(len(kernel_profile.kernel_profile_dict)))
+    for Cfuncname, profile in kernel_profile.kernel_profile_dict.items():
+        outstr.append(pickle.dumps(Cfuncname))
+        outstr.append(pickle.dumps(profile))
     return outstr
 
 def unpickle_NRPy_env(NRPyEnvVars):
@@ -80,6 +88,7 @@ def unpickle_NRPy_env(NRPyEnvVars):
     outCfuncproto_dict = {}
     outCfuncoutdir_dict = {}
     outCfunc_master_list = []
+    kernel_prof_dict = {}
 
     for WhichParamSet in NRPyEnvVars[0]:
         # gridfunctions
@@ -151,6 +160,13 @@ def unpickle_NRPy_env(NRPyEnvVars):
                                                                 enableCparameters=enableCparameters,
                                                                 rel_path_to_Cparams=rel_path_to_Cparams)]
 
+        # kernel_profile.kernel_profile_dict
+        num_elements = pickle.loads(WhichParamSet[i]); i+=1
+        for lst in range(num_elements):
+            funcname = pickle.loads(WhichParamSet[i+0])
+            profile  = pickle.loads(WhichParamSet[i+1]); i+=2
+            kernel_prof_dict[funcname] = profile
+
 
     grfcs_list_uniq = []
     for gf_ntuple_stored in grfcs_list:
@@ -202,6 +218,9 @@ def unpickle_NRPy_env(NRPyEnvVars):
     for key, item in outCfuncoutdir_dict.items():
         outC.outC_function_outdir_dict[key] = item
 
+    for key, item in kernel_prof_dict.items():
+        kernel_profile.kernel_profile_dict[key] = item
+
     return outCfunc_master_list
     # outC.outC_function_master_list = []
     # for el in outCfunc_master_list:
@@ -28,6 +28,8 @@ from outputC import outC_NRPy_basic_defines_h_dict
 import NRPy_param_funcs as par      # NRPy+: Parameter interface
 import grid as gri                  # NRPy+: Functions having to do with numerical grids
 import indexedexp as ixp            # NRPy+: Symbolic indexed expression (e.g., tensors, vectors, etc.) support
+import loop as lp                   # NRPy+: Generate C code loops
+from parallel_symbolic import map_components  # NRPy+: Evaluate independent symbolic components in parallel
 import os, sys                      # Standard Python modules for multiplatform OS-level functions
 
 # Step 0a: Initialize parameters
@@ -506,6 +508,10 @@ def reference_metric(SymPySimplifyExpressions=True): #, enable_compute_hatted_qu
     # ref_metric__hatted_quantities(scalefactor_orthog_funcform,SymPySimplifyExpressions)
     # ref_metric__hatted_quantities(scalefactor_orthog,SymPySimplifyExpressions)
 
+def _simplified_ghatDDdD_component(prereqs, i, j, k):
+#    return sp.trigsimp(sp.diff(prereqs["ghatDD"][i][j], prereqs["xx"][k])) # FIXME: BAD: MUST BE SIMPLIFIED OR ANSWER IS INCORRECT! Must be some bug in sympy...
+    return sp.simplify(sp.diff(prereqs["ghatDD"][i][j], prereqs["xx"][k])) # FIXME: BAD: MUST BE SIMPLIFIED OR ANSWER IS INCORRECT! Must be some bug in sympy...
+
 def ref_metric__hatted_quantities(SymPySimplifyExpressions=True):
 
     enable_rfm_precompute = False
@@ -601,13 +607,17 @@ def ref_metric__hatted_quantities(SymPySimplifyExpressions=True):
     global ghatDDdD, ghatDDdDD
     ghatDDdD = ixp.zerorank3(DIM)
     ghatDDdDD = ixp.zerorank4(DIM)
+    if SymPySimplifyExpressions==True:
+        # The 27 simplifications are independent of one another, and are by far the most
+        #   expensive step here; evaluate them in parallel if parallel_symbolic.nprocs > 1.
+        indices = [(i, j, k) for i in range(DIM) for j in range(DIM) for k in range(DIM)]
+        simplified = map_components(_simplified_ghatDDdD_component, {"ghatDD": ghatDD, "xx": xx}, indices)
+        for (i, j, k), expr in zip(indices, simplified):
+            ghatDDdD[i][j][k] = expr
     for i in range(DIM):
         for j in range(DIM):
             for k in range(DIM):
-                if SymPySimplifyExpressions==True:
-#                    ghatDDdD[i][j][k] = sp.trigsimp(sp.diff(ghatDD[i][j], xx[k])) # FIXME: BAD: MUST BE SIMPLIFIED OR ANSWER IS INCORRECT! Must be some bug in sympy...
-                    ghatDDdD[i][j][k] = sp.simplify(sp.diff(ghatDD[i][j], xx[k])) # FIXME: BAD: MUST BE SIMPLIFIED OR ANSWER IS INCORRECT! Must be some bug in sympy...
-                else:
+                if SymPySimplifyExpressions!=True:
                     ghatDDdD[i][j][k] = (sp.diff(ghatDD[i][j], xx[k])) # FIXME: BAD: MUST BE SIMPLIFIED OR ANSWER IS INCORRECT! Must be some bug in sympy...
                 for l in range(DIM):
                     ghatDDdDD[i][j][k][l] = (sp.diff(ghatDDdD[i][j][k], xx[l]))
@@ -1088,9 +1098,33 @@ def ds_dirn(delxx):
     return ds_dirn
 
 
+# Split each ds_dirn[i] into factors that each depend on at most one of xx0,xx1,xx2:
+#   returns factors[i][d] (d = 0,1,2 for the factor depending on xx[d]; d = 3 for the
+#   xx-independent factor), or None if some ds_dirn[i] does not factor this way. Since
+#   |ds_dirn[i]| is then a product of nonnegative functions of single coordinates, its
+#   minimum over the grid is the product of their minima over the 1D xx arrays.
+def separable_ds_dirn_factors(ds_drn):
+    factors = []
+    for i in range(3):
+        # Absolute values are taken, so sqrt(a*b) -> sqrt(a)*sqrt(b) is safe here.
+        expr = sp.expand_power_base(sp.powsimp(ds_drn[i]), force=True)
+        factors.append([sp.sympify(1), sp.sympify(1), sp.sympify(1), sp.sympify(1)])
+        for factor in sp.Mul.make_args(expr):
+            dirns = [d for d in range(3) if xx[d] in factor.free_symbols]
+            if len(dirns) > 1:
+                return None
+            factors[i][dirns[0] if dirns else 3] *= factor
+    return factors
+
 # Find the appropriate timestep for the CFL condition.
+#   The minimum proper distance between neighboring grid points, dsmin, is found by an OpenMP
+#   reduction(min:dsmin) over the grid interior. If enable_separable_dsmin and every ds_dirn[i]
+#   factors per coordinate (see separable_ds_dirn_factors(); true for e.g., Spherical-,
+#   Cylindrical-, and Cartesian-like CoordSystems), dsmin is instead found from minima over
+#   the 1D xx arrays, in O(Nxx0+Nxx1+Nxx2) rather than O(Nxx0*Nxx1*Nxx2) operations.
 def add_to_Cfunction_dict__find_timestep(rel_path_to_Cparams=os.path.join("./"),
-                                         use_unit_wavespeed=False, set_dsmin_gridfunction=False):
+                                         use_unit_wavespeed=False, set_dsmin_gridfunction=False,
+                                         enable_separable_dsmin=True):
     ##############################
     # Step 1: Function description
     desc = "Find the CFL-constrained timestep"
@@ -1105,8 +1139,12 @@ def add_to_Cfunction_dict__find_timestep(rel_path_to_Cparams=os.path.join("./"),
     preloop = "  REAL dsmin = 1e38; // Start with a crazy high value... close to the largest number in single precision."
     ##############################
     # Step 5: Loop options
-    loopopts = "Read_xxs,DisableOpenMP"
-    loopopts += ",InteriorPoints"
+    loopopts = "Read_xxs,InteriorPoints"
+    if set_dsmin_gridfunction:
+        # dsminGF is set to the running minimum of dsmin, which depends on the loop order.
+        loopopts += ",DisableOpenMP"
+    else:
+        loopopts += ",OMP_custom_pragma='#pragma omp parallel for reduction(min:dsmin)'"
     ##############################
     # Step 6: function input parameters
     params = "const paramstruct *restrict params, REAL *restrict xx[3], const REAL CFL_FACTOR"
@@ -1122,18 +1160,50 @@ def add_to_Cfunction_dict__find_timestep(rel_path_to_Cparams=os.path.join("./"),
     # Step 7: function body
     # Compute proper distance in all 3 directions.
     ds_drn = ds_dirn(gri.dxx)
-    ds_dirn_h = outputC([ds_drn[0], ds_drn[1], ds_drn[2]], ["ds_dirn0", "ds_dirn1", "ds_dirn2"], "returnstring")
-    indent = "  "
-    body = ""
-    body += "REAL ds_dirn0, ds_dirn1, ds_dirn2;\n" + indent_Ccode(ds_dirn_h,indent) + """
+    factors = None
+    if enable_separable_dsmin and not set_dsmin_gridfunction:
+        factors = separable_ds_dirn_factors(ds_drn)
+    if factors is not None:
+        # dsmin = MIN over directions i of |const factor_i| * prod_d MIN over xx[d] of |factor_i(xx[d])|.
+        loopopts = ""
+        body = """#ifndef MIN
+#define MIN(A, B) ( ((A) < (B)) ? (A) : (B) )
+#endif
+// Each ds_dirn[i] factors into functions of single coordinates; find the minimum of each factor
+//   over the interior of the 1D xx arrays:
+"""
+        dsmin_dirn = ["fabs(ds_dirn%d_const)" % i for i in range(3)]
+        for d in range(3):
+            dirns = [i for i in range(3) if factors[i][d] != 1]
+            if not dirns:
+                continue
+            body += "".join("REAL ds_dirn%d_min_xx%d = 1e38;\n" % (i, d) for i in dirns)
+            interior = "const REAL xx%d = xx[%d][i%d];\n" % (d, d, d)
+            interior += "REAL " + ", ".join("ds_dirn%d_xx%d" % (i, d) for i in dirns) + ";\n"
+            interior += outputC([factors[i][d] for i in dirns], ["ds_dirn%d_xx%d" % (i, d) for i in dirns], "returnstring")
+            interior += "".join("ds_dirn%d_min_xx%d = MIN(ds_dirn%d_min_xx%d, fabs(ds_dirn%d_xx%d));\n" % (i, d, i, d, i, d)
+                                for i in dirns)
+            header, footer = lp.loop1D("i%d" % d, "NGHOSTS", "NGHOSTS+Nxx%d" % d, "1", pragma="")
+            body += header + indent_Ccode(interior, "  ") + footer
+            for i in dirns:
+                dsmin_dirn[i] += "*ds_dirn%d_min_xx%d" % (i, d)
+        body += "REAL ds_dirn0_const, ds_dirn1_const, ds_dirn2_const;\n"
+        body += outputC([factors[i][3] for i in range(3)], ["ds_dirn%d_const" % i for i in range(3)], "returnstring")
+        body += "// Set dsmin = MIN(dsmin, ds_dirn0, ds_dirn1, ds_dirn2) over the grid interior:\n"
+        body += "dsmin = MIN(dsmin, MIN(%s, MIN(%s, %s)));\n" % tuple(dsmin_dirn)
+    else:
+        ds_dirn_h = outputC([ds_drn[0], ds_drn[1], ds_drn[2]], ["ds_dirn0", "ds_dirn1", "ds_dirn2"], "returnstring")
+        indent = "  "
+        body = ""
+        body += "REAL ds_dirn0, ds_dirn1, ds_dirn2;\n" + indent_Ccode(ds_dirn_h,indent) + """
 #ifndef MIN
 #define MIN(A, B) ( ((A) < (B)) ? (A) : (B) )
 #endif\n"""
-    # not output_dt_local_h_only -> seeking dsmin over the entire grid, over all directions
-    body += "// Set dsmin = MIN(dsmin, ds_dirn0, ds_dirn1, ds_dirn2):\n"
-    body += "dsmin = MIN(dsmin, MIN(fabs(ds_dirn0), MIN(fabs(ds_dirn1), fabs(ds_dirn2))));\n"
-    if set_dsmin_gridfunction:
-        body += r"""
+        # not output_dt_local_h_only -> seeking dsmin over the entire grid, over all directions
+        body += "// Set dsmin = MIN(dsmin, ds_dirn0, ds_dirn1, ds_dirn2):\n"
+        body += "dsmin = MIN(dsmin, MIN(fabs(ds_dirn0), MIN(fabs(ds_dirn1), fabs(ds_dirn2))));\n"
+        if set_dsmin_gridfunction:
+            body += r"""
 {
   REAL ds_dirn0, ds_dirn1, ds_dirn2;
 """ + indent_Ccode(ds_dirn_h, indent) + r"""